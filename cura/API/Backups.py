@@ -33,3 +33,34 @@ class Backups:
     #   Cura version number.
     def restoreBackup(self, zip_file: bytes, meta_data: Dict[str, Any]) -> None:
         return self.manager.restoreBackup(zip_file, meta_data)
+
+    ##  Create a new back-up as a file on disk using the BackupsManager.
+    #   \return Tuple containing the path to a temporary ZIP file with the
+    #   back-up data and a dict with metadata about the back-up. The caller
+    #   should remove the file when it's done with it.
+    def createBackupFile(self) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        return self.manager.createBackupFile()
+
+    ##  Restore a back-up from a file on disk using the BackupsManager.
+    #   \param zip_file_path The path to a ZIP file containing the back-up data.
+    #   \param meta_data Some metadata needed for restoring a back-up, like the
+    #   Cura version number.
+    def restoreBackupFile(self, zip_file_path: str, meta_data: Dict[str, Any]) -> None:
+        return self.manager.restoreBackupFile(zip_file_path, meta_data)
+
+    ##  Create a new incremental back-up using the BackupsManager.
+    #   \param chunk_store_path The directory to store the back-up data in.
+    #   \param previous_manifest The manifest of the previous back-up in that
+    #   directory, if any. Unchanged files are not read again.
+    #   \return Tuple containing the manifest of the back-up and a dict with
+    #   metadata about the back-up.
+    def createIncrementalBackup(self, chunk_store_path: str, previous_manifest: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        return self.manager.createIncrementalBackup(chunk_store_path, previous_manifest)
+
+    ##  Restore an incremental back-up using the BackupsManager.
+    #   \param chunk_store_path The directory containing the back-up data.
+    #   \param manifest The manifest of the back-up to restore.
+    #   \param meta_data Some metadata needed for restoring a back-up, like the
+    #   Cura version number.
+    def restoreIncrementalBackup(self, chunk_store_path: str, manifest: Dict[str, Any], meta_data: Dict[str, Any]) -> None:
+        return self.manager.restoreIncrementalBackup(chunk_store_path, manifest, meta_data)
@@ -1,6 +1,6 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
-from typing import List
+from typing import List, Optional, Tuple
 
 from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
 from UM.Logger import Logger
@@ -28,6 +28,7 @@ LocationSuggestion = namedtuple("LocationSuggestion", ["x", "y", "penalty_points
 #   Note: Make sure the scale is the same between ShapeArray objects and the Arrange instance.
 class Arrange:
     build_volume = None
+    _disallowed_area_shapes = (None, None, [])  # type: Tuple[Optional[List[Polygon]], Optional[float], List[ShapeArray]]  # The last disallowed areas, the scale and their shape arrays.
 
     def __init__(self, x, y, offset_x, offset_y, scale= 0.5):
         self._scale = scale  # convert input coordinates to arrange coordinates
@@ -76,13 +77,22 @@ class Arrange:
 
         # If a build volume was set, add the disallowed areas
         if Arrange.build_volume:
-            disallowed_areas = Arrange.build_volume.getDisallowedAreasNoBrim()
-            for area in disallowed_areas:
-                points = copy.deepcopy(area._points)
-                shape_arr = ShapeArray.fromPolygon(points, scale = scale)
+            for shape_arr in cls._getDisallowedAreaShapes(Arrange.build_volume.getDisallowedAreasNoBrim(), scale):
                 arranger.place(0, 0, shape_arr, update_empty = False)
         return arranger
 
+    ##  Gets the shape arrays of the disallowed areas of the build volume.
+    #
+    #   The build volume keeps the same list of disallowed areas for as long as
+    #   they don't change, so the shape arrays of the last list are kept.
+    @classmethod
+    def _getDisallowedAreaShapes(cls, disallowed_areas: List[Polygon], scale: float) -> List[ShapeArray]:
+        cached_areas, cached_scale, shapes = cls._disallowed_area_shapes
+        if cached_areas is not disallowed_areas or cached_scale != scale:
+            shapes = [ShapeArray.fromPolygon(area.getPoints(), scale = scale) for area in disallowed_areas]
+            cls._disallowed_area_shapes = (disallowed_areas, scale, shapes)
+        return shapes
+
     ##  This resets the optimization for finding location based on size
     def resetLastPriority(self):
         self._last_priority = 0
@@ -1,17 +1,37 @@
-# Copyright (c) 2016 Ultimaker B.V.
+# Copyright (c) 2019 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
+import functools
+from typing import Dict, List, Set, TYPE_CHECKING
+
 from PyQt5.QtCore import QTimer
 
 from UM.Logger import Logger
+from UM.Settings.ContainerRegistry import ContainerRegistry
+
+from cura.Utils.BackgroundFileWriter import BackgroundFileWriter
+
+if TYPE_CHECKING:
+    from UM.Settings.ContainerStack import ContainerStack
+    from UM.Settings.Interfaces import ContainerInterface
 
 
+##  Periodically saves the containers and preferences that changed.
+#
+#   Instead of going through all containers in the registry, only the
+#   containers that may have changed since the last save are considered: the
+#   containers of the active stacks after a setting or profile change, and the
+#   containers the registry reports as added or changed. Of those, only the
+#   ones that are actually dirty get serialised. Changes are coalesced with a
+#   single-shot timer, and the serialised data is written to disk on a
+#   background thread so the interface doesn't hitch on slow disks.
 class AutoSave:
     def __init__(self, application):
         self._application = application
-        self._application.getPreferences().preferenceChanged.connect(self._triggerTimer)
+        self._application.getPreferences().preferenceChanged.connect(self._onPreferenceChanged)
 
         self._global_stack = None
+        self._active_stacks = []  # type: List[ContainerStack]
 
         self._application.getPreferences().addPreference("cura/autosave_delay", 1000 * 10)
 
@@ -21,32 +41,152 @@ class AutoSave:
 
         self._saving = False
 
+        self._changed_containers = {}  # type: Dict[str, ContainerInterface]
+        self._active_stacks_changed = False
+        self._preferences_changed = False
+
+        self._writer = BackgroundFileWriter()
+
     def initialize(self):
         # only initialise if the application is created and has started
         self._change_timer.timeout.connect(self._onTimeout)
         self._application.globalContainerStackChanged.connect(self._onGlobalStackChanged)
         self._onGlobalStackChanged()
+
+        container_registry = ContainerRegistry.getInstance()
+        container_registry.containerAdded.connect(self._onContainerChanged)
+        container_registry.containerMetaDataChanged.connect(self._onContainerChanged)
+        container_registry.containerRemoved.connect(self._onContainerRemoved)
+
+        self._application.getOnExitCallbackManager().addCallback(self._onApplicationExit)
+
+        self._active_stacks_changed = True
+        self._preferences_changed = True
         self._triggerTimer()
 
+    ##  Write everything that changed right away and wait until it is on disk.
+    def flush(self):
+        if self._change_timer.isActive():
+            self._change_timer.stop()
+            self._onTimeout()
+        self._writer.flush()
+
     def _triggerTimer(self, *args):
-        if not self._saving:
+        if not self._saving and not self._change_timer.isActive():
+            # Don't restart a running timer, so that a continuous stream of changes still gets saved regularly.
             self._change_timer.start()
 
+    def _onPreferenceChanged(self, *args):
+        self._preferences_changed = True
+        self._triggerTimer()
+
+    def _onActiveStackChanged(self, *args):
+        self._active_stacks_changed = True
+        self._triggerTimer()
+
+    def _onContainerChanged(self, container):
+        self._changed_containers[container.getId()] = container
+        self._triggerTimer()
+
+    def _onContainerRemoved(self, container):
+        self._changed_containers.pop(container.getId(), None)
+
     def _onGlobalStackChanged(self):
-        if self._global_stack:
-            self._global_stack.propertyChanged.disconnect(self._triggerTimer)
-            self._global_stack.containersChanged.disconnect(self._triggerTimer)
+        for stack in self._active_stacks:
+            stack.propertyChanged.disconnect(self._onActiveStackChanged)
+            stack.containersChanged.disconnect(self._onActiveStackChanged)
 
         self._global_stack = self._application.getGlobalContainerStack()
 
+        # A change to only the user changes of an extruder doesn't change the global stack, so listen to those too.
+        self._active_stacks = [self._global_stack] + list(self._global_stack.extruders.values()) if self._global_stack else []
+        for stack in self._active_stacks:
+            stack.propertyChanged.connect(self._onActiveStackChanged)
+            stack.containersChanged.connect(self._onActiveStackChanged)
         if self._global_stack:
-            self._global_stack.propertyChanged.connect(self._triggerTimer)
-            self._global_stack.containersChanged.connect(self._triggerTimer)
+            self._onActiveStackChanged()
+
+    ##  Adds the active stacks and all containers in them to the containers
+    #   that need to be checked.
+    def _addActiveStacks(self):
+        if not self._global_stack:
+            return
+        for stack in [self._global_stack] + list(self._global_stack.extruders.values()):
+            self._changed_containers[stack.getId()] = stack
+            for container in stack.getContainers():
+                self._changed_containers[container.getId()] = container
 
     def _onTimeout(self):
+        if not self._application.started or not self._application.getSaveDataEnabled():
+            # Do not do saving during application start or when data should not be saved on quit.
+            return
+
         self._saving = True # To prevent the save process from triggering another autosave.
         Logger.log("d", "Autosaving preferences, instances and profiles")
 
-        self._application.saveSettings()
+        if self._active_stacks_changed:
+            self._addActiveStacks()
+            self._active_stacks_changed = False
+
+        changed_containers = self._changed_containers
+        self._changed_containers = {}
+        container_registry = ContainerRegistry.getInstance()
+        saved_container_ids = set()  # type: Set[str]
+        with container_registry.lockFile():
+            for container in changed_containers.values():
+                self._saveContainer(container_registry, container, saved_container_ids)
+
+        if self._preferences_changed:
+            self._preferences_changed = False
+            self._application.savePreferences()
 
         self._saving = False
+
+    ##  Save one container if it has changes.
+    #
+    #   Serialising the container happens here, on the Qt thread, since the
+    #   containers are not thread-safe. Only writing the result to disk happens
+    #   in the background. Containers that were never saved before go through
+    #   the registry, which decides where they are stored.
+    #   \param saved_container_ids The containers that were already saved in
+    #   this autosave, so that a file is saved only once.
+    def _saveContainer(self, container_registry: ContainerRegistry, container: "ContainerInterface", saved_container_ids: Set[str]) -> None:
+        if not container.isDirty() or container.getMetaDataEntry("removed", False):
+            return
+        # The machine and nozzle specific profiles of a material are stored in the file of their base material.
+        base_file = container.getMetaDataEntry("base_file", None)
+        if base_file and base_file != container.getId():
+            base_containers = container_registry.findContainers(id = base_file)
+            if not base_containers:
+                return
+            container.setDirty(False)
+            container = base_containers[0]
+
+        if container.getId() in saved_container_ids:
+            return
+        saved_container_ids.add(container.getId())
+        if container_registry.isReadOnly(container.getId()):
+            return
+        path = container.getPath()
+        if not path:
+            container_registry.saveContainer(container)
+            return
+        try:
+            data = container.serialize()
+        except Exception:
+            Logger.logException("e", "An exception occurred when serializing container %s", container.getId())
+            return
+        # Cleared right away, so that changes made while the file is being written mark it dirty again.
+        container.setDirty(False)
+        self._writer.write(path, data, on_error = functools.partial(self._application.callLater, self._onWriteFailed, container))
+
+    ##  Mark a container as changed again if writing it failed, so that the
+    #   next autosave tries again.
+    def _onWriteFailed(self, container: "ContainerInterface") -> None:
+        container.setDirty(True)
+        self._onContainerChanged(container)
+
+    ##  Make sure the last changes are on disk before the application quits.
+    def _onApplicationExit(self):
+        self.flush()
+        self._application.triggerNextExitCheck()
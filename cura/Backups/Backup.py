@@ -5,8 +5,9 @@ import io
 import os
 import re
 import shutil
+import tempfile
 from zipfile import ZipFile, ZIP_DEFLATED, BadZipfile
-from typing import Dict, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
 
 from UM import i18nCatalog
 from UM.Logger import Logger
@@ -14,14 +15,19 @@ from UM.Message import Message
 from UM.Platform import Platform
 from UM.Resources import Resources
 
+from cura.Backups.IncrementalBackup import IncrementalBackup
+
 if TYPE_CHECKING:
+    from cura.Backups.ChunkStore import ChunkStore
     from cura.CuraApplication import CuraApplication
 
 
 ##  The back-up class holds all data about a back-up.
 #
 #   It is also responsible for reading and writing the zip file to the user data
-#   folder.
+#   folder. The zip file is written to a temporary file on disk rather than kept
+#   in memory. Alternatively, a back-up can be made incrementally into a chunk
+#   store, in which case it consists of a manifest of the stored chunks.
 class Backup:
     # These files should be ignored when making a backup.
     IGNORED_FILES = [r"cura\.log", r"plugins\.json", r"cache", r"__pycache__", r"\.qmlc", r"\.pyc"]
@@ -29,18 +35,82 @@ class Backup:
     # Re-use translation catalog.
     catalog = i18nCatalog("cura")
 
-    def __init__(self, application: "CuraApplication", zip_file: bytes = None, meta_data: Dict[str, str] = None) -> None:
+    def __init__(self, application: "CuraApplication", zip_file: bytes = None, meta_data: Dict[str, str] = None, zip_file_path: Optional[str] = None, manifest: Optional[Dict[str, Any]] = None) -> None:
         self._application = application
-        self.zip_file = zip_file  # type: Optional[bytes]
+        self._zip_file = zip_file  # type: Optional[bytes]
+        self.zip_file_path = zip_file_path  # type: Optional[str]
+        self.manifest = manifest  # type: Optional[Dict[str, Any]]
         self.meta_data = meta_data  # type: Optional[Dict[str, str]]
 
+    ##  The archive as bytes.
+    #
+    #   Only use this if the archive really needs to be in memory. Prefer
+    #   zip_file_path, which is where makeFromCurrent() writes the archive.
+    @property
+    def zip_file(self) -> Optional[bytes]:
+        if self._zip_file is None and self.zip_file_path is not None:
+            with open(self.zip_file_path, "rb") as f:
+                return f.read()
+        return self._zip_file
+
+    @zip_file.setter
+    def zip_file(self, zip_file: Optional[bytes]) -> None:
+        self._zip_file = zip_file
+
     ##  Create a back-up from the current user config folder.
+    #
+    #   The archive is written to a temporary file, stored in zip_file_path.
+    #   The caller is responsible for removing it when it's no longer needed.
     def makeFromCurrent(self) -> None:
         cura_release = self._application.getVersion()
         version_data_dir = Resources.getDataStoragePath()
 
         Logger.log("d", "Creating backup for Cura %s, using folder %s", cura_release, version_data_dir)
+        self._prepareDataDirectory(version_data_dir)
+
+        # Write the archive straight to disk.
+        file_descriptor, zip_file_path = tempfile.mkstemp(suffix = ".cura.zip")
+        with os.fdopen(file_descriptor, "wb") as archive_file:
+            archive = self._makeArchive(archive_file, version_data_dir)
+        if archive is None:
+            os.remove(zip_file_path)
+            return
+
+        # Store the archive and metadata so the BackupManager can fetch them when needed.
+        self.zip_file_path = zip_file_path
+        self.meta_data = self._makeMetaData(cura_release, archive.namelist())
+
+    ##  Create an incremental back-up from the current user config folder.
+    #
+    #   Only the chunks of files that are not in the chunk store yet are
+    #   stored. The back-up itself is the manifest, stored in self.manifest.
+    #   \param chunk_store The store to store the chunks of the files in.
+    #   \param previous_manifest The manifest of the previous back-up into the
+    #   same store, if any. Files that didn't change since are not read again.
+    def makeIncrementalFromCurrent(self, chunk_store: "ChunkStore", previous_manifest: Optional[Dict[str, Any]] = None) -> None:
+        cura_release = self._application.getVersion()
+        version_data_dir = Resources.getDataStoragePath()
 
+        Logger.log("d", "Creating incremental backup for Cura %s, using folder %s", cura_release, version_data_dir)
+        self._prepareDataDirectory(version_data_dir)
+
+        incremental_backup = IncrementalBackup(chunk_store, self.IGNORED_FILES)
+        try:
+            manifest = incremental_backup.create(version_data_dir, previous_manifest)
+        except EnvironmentError as error:
+            Logger.log("e", "Could not create incremental backup from user data directory: %s", error)
+            self._showMessage(
+                self.catalog.i18nc("@info:backup_failed",
+                                   "Could not create archive from user data directory: {}".format(error)))
+            return
+        Logger.log("d", "Stored %s new bytes for the incremental backup", incremental_backup.getStoredBytes())
+
+        self.manifest = manifest
+        self.meta_data = self._makeMetaData(cura_release, IncrementalBackup.getFileNames(manifest))
+
+    ##  Make sure the data directory contains everything that needs to be
+    #   backed up.
+    def _prepareDataDirectory(self, version_data_dir: str) -> None:
         # Ensure all current settings are saved.
         self._application.saveSettings()
 
@@ -54,22 +124,18 @@ class Backup:
                 Logger.log("d", "Copying preferences file from %s to %s", preferences_file, backup_preferences_file)
                 shutil.copyfile(preferences_file, backup_preferences_file)
 
-        # Create an empty buffer and write the archive to it.
-        buffer = io.BytesIO()
-        archive = self._makeArchive(buffer, version_data_dir)
-        if archive is None:
-            return
-        files = archive.namelist()
-
+    ##  Create the metadata of a back-up from the files in it.
+    @staticmethod
+    def _makeMetaData(cura_release: str, files: List[str]) -> Dict[str, str]:
         # Count the metadata items. We do this in a rather naive way at the moment.
-        machine_count = len([s for s in files if "machine_instances/" in s]) - 1
-        material_count = len([s for s in files if "materials/" in s]) - 1
-        profile_count = len([s for s in files if "quality_changes/" in s]) - 1
+        # The archive lists the directories too, an incremental backup doesn't.
+        directory_entries = {"machine_instances/", "materials/", "quality_changes/"} & set(files)
+        machine_count = len([s for s in files if "machine_instances/" in s]) - int("machine_instances/" in directory_entries)
+        material_count = len([s for s in files if "materials/" in s]) - int("materials/" in directory_entries)
+        profile_count = len([s for s in files if "quality_changes/" in s]) - int("quality_changes/" in directory_entries)
         plugin_count = len([s for s in files if "plugin.json" in s])
-        
-        # Store the archive and metadata so the BackupManager can fetch them when needed.
-        self.zip_file = buffer.getvalue()
-        self.meta_data = {
+
+        return {
             "cura_release": cura_release,
             "machine_count": str(machine_count),
             "material_count": str(material_count),
@@ -78,12 +144,13 @@ class Backup:
         }
 
     ##  Make a full archive from the given root path with the given name.
+    #   \param archive_file The file to write the archive to.
     #   \param root_path The root directory to archive recursively.
-    #   \return The archive as bytes.
-    def _makeArchive(self, buffer: "io.BytesIO", root_path: str) -> Optional[ZipFile]:
+    #   \return The archive, or None if it could not be created.
+    def _makeArchive(self, archive_file: Any, root_path: str) -> Optional[ZipFile]:
         ignore_string = re.compile("|".join(self.IGNORED_FILES))
         try:
-            archive = ZipFile(buffer, "w", ZIP_DEFLATED)
+            archive = ZipFile(archive_file, "w", ZIP_DEFLATED)
             for root, folders, files in os.walk(root_path):
                 for item_name in folders + files:
                     absolute_path = os.path.join(root, item_name)
@@ -106,7 +173,53 @@ class Backup:
     ##  Restore this back-up.
     #   \return Whether we had success or not.
     def restore(self) -> bool:
-        if not self.zip_file or not self.meta_data or not self.meta_data.get("cura_release", None):
+        if self.zip_file_path is not None:
+            archive_file = self.zip_file_path  # type: Union[str, io.BytesIO, None]
+        elif self._zip_file:
+            archive_file = io.BytesIO(self._zip_file)
+        else:
+            archive_file = None
+        if not self._canRestore(archive_file is not None) or archive_file is None:
+            return False
+
+        version_data_dir = Resources.getDataStoragePath()
+        with ZipFile(archive_file, "r") as archive:
+            extracted = self._extractArchive(archive, version_data_dir)
+        self._restorePreferences(version_data_dir)
+        return extracted
+
+    ##  Restore this incremental back-up.
+    #
+    #   The files are streamed from the chunk store one chunk at a time.
+    #   \param chunk_store The store containing the chunks of the back-up.
+    #   \return Whether we had success or not.
+    def restoreIncremental(self, chunk_store: "ChunkStore") -> bool:
+        manifest = self.manifest
+        if not self._canRestore(bool(manifest)) or manifest is None:
+            return False
+
+        version_data_dir = Resources.getDataStoragePath()
+        incremental_backup = IncrementalBackup(chunk_store, self.IGNORED_FILES)
+        if incremental_backup.getMissingChunks(manifest):
+            # Check this before removing the current data, so that we don't end up with nothing.
+            Logger.log("w", "Tried to restore an incremental Cura backup of which some data is missing.")
+            self._showMessage(
+                self.catalog.i18nc("@info:backup_failed",
+                                   "Tried to restore a Cura backup of which some data is missing."))
+            return False
+        Logger.log("d", "Removing current data in location: %s", version_data_dir)
+        Resources.factoryReset()
+        Logger.log("d", "Restoring incremental backup to location: %s", version_data_dir)
+        restored = incremental_backup.restore(manifest, version_data_dir)
+        self._restorePreferences(version_data_dir)
+        return restored
+
+    ##  Check whether this back-up has the information needed to restore it
+    #   and whether it's compatible with this version of Cura.
+    #   \param has_data Whether the back-up data (archive or manifest) is
+    #   available.
+    def _canRestore(self, has_data: bool) -> bool:
+        if not has_data or not self.meta_data or not self.meta_data.get("cura_release", None):
             # We can restore without the minimum required information.
             Logger.log("w", "Tried to restore a Cura backup without having proper data or meta data.")
             self._showMessage(
@@ -124,12 +237,11 @@ class Backup:
                 self.catalog.i18nc("@info:backup_failed",
                                    "Tried to restore a Cura backup that is higher than the current version."))
             return False
+        return True
 
-        version_data_dir = Resources.getDataStoragePath()
-        archive = ZipFile(io.BytesIO(self.zip_file), "r")
-        extracted = self._extractArchive(archive, version_data_dir)
-
-        # Under Linux, preferences are stored elsewhere, so we copy the file to there.
+    ##  Under Linux, preferences are stored elsewhere, so we copy the file to
+    #   there.
+    def _restorePreferences(self, version_data_dir: str) -> None:
         if Platform.isLinux():
             preferences_file_name = self._application.getApplicationName()
             preferences_file = Resources.getPath(Resources.Preferences, "{}.cfg".format(preferences_file_name))
@@ -137,8 +249,6 @@ class Backup:
             Logger.log("d", "Moving preferences file from %s to %s", backup_preferences_file, preferences_file)
             shutil.move(backup_preferences_file, preferences_file)
 
-        return extracted
-
     ##  Extract the whole archive to the given target path.
     #   \param archive The archive as ZipFile.
     #   \param target_path The target path.
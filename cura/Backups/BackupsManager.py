@@ -1,10 +1,12 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from typing import Dict, Optional, Tuple, TYPE_CHECKING
+import os
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
 
 from UM.Logger import Logger
 from cura.Backups.Backup import Backup
+from cura.Backups.ChunkStore import ChunkStore
 
 if TYPE_CHECKING:
     from cura.CuraApplication import CuraApplication
@@ -22,12 +24,43 @@ class BackupsManager:
     #   \return A tuple containing a ZipFile (the actual back-up) and a dict
     #   containing some metadata (like version).
     def createBackup(self) -> Tuple[Optional[bytes], Optional[Dict[str, str]]]:
+        zip_file_path, meta_data = self.createBackupFile()
+        if zip_file_path is None:
+            return None, meta_data
+        try:
+            with open(zip_file_path, "rb") as f:
+                return f.read(), meta_data
+        finally:
+            os.remove(zip_file_path)
+
+    ##  Get a back-up of the current configuration as a file on disk.
+    #
+    #   This doesn't need to keep the whole back-up in memory.
+    #   \return A tuple containing the path to a temporary zip file (the actual
+    #   back-up) and a dict containing some metadata (like version). The caller
+    #   should remove the file when it's done with it.
+    def createBackupFile(self) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
         self._disableAutoSave()
         backup = Backup(self._application)
         backup.makeFromCurrent()
         self._enableAutoSave()
         # We don't return a Backup here because we want plugins only to interact with our API and not full objects.
-        return backup.zip_file, backup.meta_data
+        return backup.zip_file_path, backup.meta_data
+
+    ##  Get an incremental back-up of the current configuration.
+    #
+    #   Only the parts of files that are not in the chunk store yet are stored.
+    #   \param chunk_store_path The directory of the chunk store.
+    #   \param previous_manifest The manifest of the previous back-up into the
+    #   same store, if any.
+    #   \return A tuple containing the manifest of the back-up and a dict
+    #   containing some metadata (like version).
+    def createIncrementalBackup(self, chunk_store_path: str, previous_manifest: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]:
+        self._disableAutoSave()
+        backup = Backup(self._application)
+        backup.makeIncrementalFromCurrent(ChunkStore(chunk_store_path), previous_manifest)
+        self._enableAutoSave()
+        return backup.manifest, backup.meta_data
 
     ##  Restore a back-up from a given ZipFile.
     #   \param zip_file A bytes object containing the actual back-up.
@@ -42,7 +75,39 @@ class BackupsManager:
         self._disableAutoSave()
 
         backup = Backup(self._application, zip_file = zip_file, meta_data = meta_data)
-        restored = backup.restore()
+        self._finishRestore(backup.restore())
+
+    ##  Restore a back-up from a zip file on disk.
+    #   \param zip_file_path The path to the zip file containing the back-up.
+    #   \param meta_data A dict containing some metadata that is needed to
+    #   restore the back-up correctly.
+    def restoreBackupFile(self, zip_file_path: str, meta_data: Dict[str, str]) -> None:
+        if not meta_data.get("cura_release", None):
+            Logger.log("w", "Tried to restore a backup without specifying a Cura version number.")
+            return
+
+        self._disableAutoSave()
+
+        backup = Backup(self._application, zip_file_path = zip_file_path, meta_data = meta_data)
+        self._finishRestore(backup.restore())
+
+    ##  Restore an incremental back-up.
+    #   \param chunk_store_path The directory of the chunk store that contains
+    #   the back-up.
+    #   \param manifest The manifest of the back-up.
+    #   \param meta_data A dict containing some metadata that is needed to
+    #   restore the back-up correctly.
+    def restoreIncrementalBackup(self, chunk_store_path: str, manifest: Dict[str, Any], meta_data: Dict[str, str]) -> None:
+        if not meta_data.get("cura_release", None):
+            Logger.log("w", "Tried to restore a backup without specifying a Cura version number.")
+            return
+
+        self._disableAutoSave()
+
+        backup = Backup(self._application, manifest = manifest, meta_data = meta_data)
+        self._finishRestore(backup.restoreIncremental(ChunkStore(chunk_store_path)))
+
+    def _finishRestore(self, restored: bool) -> None:
         if restored:
             # At this point, Cura will need to restart for the changes to take effect.
             # We don't want to store the data at this point as that would override the just-restored backup.
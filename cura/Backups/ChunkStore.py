@@ -0,0 +1,71 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import hashlib
+import os
+import zlib
+from typing import Iterable, List, Tuple
+
+
+##  A content-addressed store of compressed data chunks on disk.
+#
+#   Every chunk is stored once, under the SHA-256 hash of its (uncompressed)
+#   contents. Storing a chunk that is already in the store costs nothing, which
+#   is what makes incremental back-ups cheap: a file that didn't change
+#   results in the same chunks as last time.
+class ChunkStore:
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    def getPath(self) -> str:
+        return self._path
+
+    ##  Gets the hash that a chunk with the given contents would be stored as.
+    @staticmethod
+    def getHash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def hasChunk(self, chunk_hash: str) -> bool:
+        return os.path.isfile(self._getChunkPath(chunk_hash))
+
+    ##  Gets the hashes of the chunks that are not in the store.
+    def getMissingChunks(self, chunk_hashes: Iterable[str]) -> List[str]:
+        return [chunk_hash for chunk_hash in chunk_hashes if not self.hasChunk(chunk_hash)]
+
+    ##  Stores a chunk, if it isn't stored yet.
+    #
+    #   \param data The contents of the chunk.
+    #   \return The hash of the chunk and whether it was new to the store.
+    def putChunk(self, data: bytes) -> Tuple[str, bool]:
+        chunk_hash = self.getHash(data)
+        chunk_path = self._getChunkPath(chunk_hash)
+        if os.path.isfile(chunk_path):
+            return chunk_hash, False
+
+        os.makedirs(os.path.dirname(chunk_path), exist_ok = True)
+        temporary_path = chunk_path + ".tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(zlib.compress(data))
+        os.replace(temporary_path, chunk_path)  # Only complete chunks ever appear in the store.
+        return chunk_hash, True
+
+    ##  Gets the contents of a chunk.
+    #
+    #   \raises KeyError The chunk is not in the store.
+    #   \raises ValueError The chunk in the store is corrupt.
+    def getChunk(self, chunk_hash: str) -> bytes:
+        try:
+            with open(self._getChunkPath(chunk_hash), "rb") as f:
+                data = zlib.decompress(f.read())
+        except FileNotFoundError:
+            raise KeyError("Chunk {chunk_hash} is not in the store.".format(chunk_hash = chunk_hash))
+        except zlib.error as e:
+            raise ValueError("Chunk {chunk_hash} is corrupt: {err}".format(chunk_hash = chunk_hash, err = str(e)))
+        if self.getHash(data) != chunk_hash:
+            raise ValueError("Chunk {chunk_hash} is corrupt.".format(chunk_hash = chunk_hash))
+        return data
+
+    ##  Chunks are spread over subdirectories by the first two characters of
+    #   their hash to keep the directories small.
+    def _getChunkPath(self, chunk_hash: str) -> str:
+        return os.path.join(self._path, chunk_hash[:2], chunk_hash)
@@ -0,0 +1,151 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from UM.Logger import Logger
+
+from cura.Backups.ChunkStore import ChunkStore
+
+
+##  Makes and restores content-addressed, incremental back-ups of a directory.
+#
+#   Files are split into chunks that are stored in a ChunkStore. A back-up is
+#   then only a manifest listing the chunks of each file. Chunks that are
+#   already in the store (from earlier back-ups) are not stored again, and
+#   files that didn't change since the previous back-up (same modification
+#   time and size) are not even read again. A routine back-up of a large
+#   configuration directory therefore only stores the few chunks that changed.
+class IncrementalBackup:
+    ManifestVersion = 1
+
+    ChunkSize = 1024 * 1024  # 1MB
+
+    def __init__(self, chunk_store: ChunkStore, ignored_files: List[str]) -> None:
+        self._chunk_store = chunk_store
+        self._ignore_pattern = re.compile("|".join(ignored_files))
+        self._stored_bytes = 0
+
+    ##  Gets the number of (uncompressed) bytes stored in the chunk store by the
+    #   last call to create().
+    def getStoredBytes(self) -> int:
+        return self._stored_bytes
+
+    ##  Make a back-up of a directory.
+    #
+    #   \param root_path The directory to back up recursively.
+    #   \param previous_manifest The manifest of the previous back-up of the
+    #   same directory, if any. Files that didn't change since are not read.
+    #   \return The manifest of the new back-up.
+    def create(self, root_path: str, previous_manifest: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self._stored_bytes = 0
+        previous_files = {}  # type: Dict[str, Dict[str, Any]]
+        if previous_manifest is not None and previous_manifest.get("version") == self.ManifestVersion:
+            previous_files = previous_manifest["files"]
+
+        files = {}  # type: Dict[str, Dict[str, Any]]
+        for root, folders, file_names in os.walk(root_path):
+            folders[:] = [folder for folder in folders if not self._ignore_pattern.search(os.path.join(root, folder))]
+            for file_name in file_names:
+                absolute_path = os.path.join(root, file_name)
+                if self._ignore_pattern.search(absolute_path):
+                    continue
+                relative_path = os.path.relpath(absolute_path, root_path).replace(os.sep, "/")
+                stat = os.stat(absolute_path)
+
+                previous = previous_files.get(relative_path)
+                if previous is not None and previous["mtime_ns"] == stat.st_mtime_ns and previous["size"] == stat.st_size \
+                        and not self._chunk_store.getMissingChunks(previous["chunks"]):
+                    files[relative_path] = previous
+                    continue
+
+                files[relative_path] = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "chunks": self._storeFile(absolute_path)
+                }
+        return {"version": self.ManifestVersion, "files": files}
+
+    ##  Split a file into chunks and store the ones that are new.
+    #   \return The hashes of the chunks of the file, in order.
+    def _storeFile(self, path: str) -> List[str]:
+        chunk_hashes = []  # type: List[str]
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(self.ChunkSize)
+                if not data:
+                    break
+                chunk_hash, is_new = self._chunk_store.putChunk(data)
+                if is_new:
+                    self._stored_bytes += len(data)
+                chunk_hashes.append(chunk_hash)
+        return chunk_hashes
+
+    ##  Restore a back-up to a directory.
+    #
+    #   Files are written chunk by chunk, so the back-up never needs to be in
+    #   memory completely. Files in the target directory that are not in the
+    #   back-up are left alone.
+    #   \param manifest The manifest of the back-up to restore.
+    #   \param target_path The directory to restore the back-up to.
+    #   \return Whether the back-up was restored. If chunks are missing from
+    #   the store, nothing is restored.
+    def restore(self, manifest: Dict[str, Any], target_path: str) -> bool:
+        if manifest.get("version") != self.ManifestVersion:
+            Logger.log("w", "Unsupported back-up manifest version: {version}".format(version = manifest.get("version")))
+            return False
+        missing_chunks = self.getMissingChunks(manifest)
+        if missing_chunks:
+            Logger.log("w", "Can't restore back-up, {count} chunks are missing.".format(count = len(missing_chunks)))
+            return False
+
+        for relative_path, file_data in manifest["files"].items():
+            absolute_path = os.path.join(target_path, *relative_path.split("/"))
+            os.makedirs(os.path.dirname(absolute_path), exist_ok = True)
+            temporary_path = absolute_path + ".restore"
+            try:
+                with open(temporary_path, "wb") as f:
+                    for chunk_hash in file_data["chunks"]:
+                        f.write(self._chunk_store.getChunk(chunk_hash))
+                os.replace(temporary_path, absolute_path)
+            except (KeyError, ValueError) as e:
+                Logger.log("e", "Unable to restore {path}: {err}".format(path = relative_path, err = str(e)))
+                return False
+            finally:
+                if os.path.exists(temporary_path):  # Not moved into place, e.g. because the disk is full.
+                    os.remove(temporary_path)
+        return True
+
+    ##  Gets the chunks of a back-up that are not in the chunk store.
+    def getMissingChunks(self, manifest: Dict[str, Any]) -> List[str]:
+        all_chunks = {chunk_hash for file_data in manifest.get("files", {}).values() for chunk_hash in file_data["chunks"]}
+        return self._chunk_store.getMissingChunks(all_chunks)
+
+    ##  Gets the paths of all files in a back-up, relative to the backed up
+    #   directory.
+    @staticmethod
+    def getFileNames(manifest: Dict[str, Any]) -> List[str]:
+        return list(manifest.get("files", {}).keys())
+
+    @staticmethod
+    def saveManifest(manifest: Dict[str, Any], path: str) -> None:
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "w", encoding = "utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(temporary_path, path)
+
+    ##  Load a manifest from a file.
+    #   \return The manifest, or None if it doesn't exist or is corrupt.
+    @staticmethod
+    def loadManifest(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, encoding = "utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (EnvironmentError, ValueError) as e:
+            Logger.log("w", "Unable to read back-up manifest {path}: {err}".format(path = path, err = str(e)))
+            return None
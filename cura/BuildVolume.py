@@ -24,9 +24,8 @@ catalog = i18nCatalog("cura")
 
 import numpy
 import math
-import copy
 
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Radius of disallowed area in mm around prime. I.e. how much distance to keep from prime position.
 PRIME_CLEARANCE = 6.5
@@ -69,6 +68,8 @@ class BuildVolume(SceneNode):
         self._error_areas = []
         self._error_mesh = None
 
+        self._disallowed_area_stages = {}  # type: Dict[str, Tuple[Tuple[Any, ...], Any]]  # For each stage of computing the disallowed areas, its input and result.
+
         self.setCalculateBoundingBox(False)
         self._volume_aabb = None
 
@@ -678,8 +679,6 @@ class BuildVolume(SceneNode):
         if not self._global_container_stack:
             return
 
-        self._error_areas = []
-
         extruder_manager = ExtruderManager.getInstance()
         used_extruders = extruder_manager.getUsedExtruderStacks()
         disallowed_border_size = self.getEdgeDisallowedSize()
@@ -691,80 +690,151 @@ class BuildVolume(SceneNode):
             else:
                 used_extruders = [self._global_container_stack]
 
-        result_areas = self._computeDisallowedAreasStatic(disallowed_border_size, used_extruders) #Normal machine disallowed areas can always be added.
-        prime_areas = self._computeDisallowedAreasPrimeBlob(disallowed_border_size, used_extruders)
-        result_areas_no_brim = self._computeDisallowedAreasStatic(0, used_extruders) #Where the priming is not allowed to happen. This is not added to the result, just for collision checking.
-        prime_disallowed_areas = copy.deepcopy(result_areas_no_brim)
+        # Each stage is only computed again if the settings it depends on changed. See _getDisallowedAreasStage.
+        static_key = ("static", disallowed_border_size) + self._getDisallowedAreasStaticKey(used_extruders)
+        static_areas = self._getDisallowedAreasStage(static_key, lambda: self._computeDisallowedAreasStatic(disallowed_border_size, used_extruders)) #Normal machine disallowed areas can always be added.
+        static_no_brim_key = ("static_no_brim", 0) + static_key[2:]
+        static_areas_no_brim = self._getDisallowedAreasStage(static_no_brim_key, lambda: self._computeDisallowedAreasStatic(0, used_extruders)) #Where the priming is not allowed to happen. This is not added to the result, just for collision checking.
+        prime_key = ("prime_blob", disallowed_border_size) + self._getDisallowedAreasPrimeBlobKey(used_extruders)
+        prime_areas = self._getDisallowedAreasStage(prime_key, lambda: self._computeDisallowedAreasPrimeBlob(disallowed_border_size, used_extruders))
 
-        #Check if prime positions intersect with disallowed areas.
-        for extruder in used_extruders:
-            extruder_id = extruder.getId()
+        # Add prime tower location as disallowed area.
+        prime_tower_key = None
+        prime_tower_areas = {}
+        if len(used_extruders) > 1: #No prime tower in single-extrusion.
+            if len([x for x in used_extruders if x.isEnabled == True]) > 1: #No prime tower if only one extruder is enabled
+                prime_tower_key = ("prime_tower", ) + self._getDisallowedAreasPrintedKey(used_extruders)
+                prime_tower_areas = self._getDisallowedAreasStage(prime_tower_key, lambda: self._computeDisallowedAreasPrinted(used_extruders))
 
-            collision = False
-            for prime_polygon in prime_areas[extruder_id]:
-                for disallowed_polygon in prime_disallowed_areas[extruder_id]:
-                    if prime_polygon.intersectsPolygon(disallowed_polygon) is not None:
-                        collision = True
-                        break
-                if collision:
-                    break
+        nozzle_disallowed_areas = {extruder.getId(): extruder.getProperty("nozzle_disallowed_areas", "value") for extruder in used_extruders}
+        combined_key = ("combined", disallowed_border_size, static_key, static_no_brim_key, prime_key, prime_tower_key, tuple((extruder_id, repr(areas)) for extruder_id, areas in sorted(nozzle_disallowed_areas.items())))
+        self._disallowed_areas, self._disallowed_areas_no_brim, self._error_areas = self._getDisallowedAreasStage(combined_key,
+            lambda: self._combineDisallowedAreas(disallowed_border_size, used_extruders, static_areas, static_areas_no_brim, prime_areas, prime_tower_areas, nozzle_disallowed_areas))
+        self._has_errors = len(self._error_areas) > 0
 
-                #Also check other prime positions (without additional offset).
-                for other_extruder_id in prime_areas:
-                    if extruder_id == other_extruder_id: #It is allowed to collide with itself.
-                        continue
-                    for other_prime_polygon in prime_areas[other_extruder_id]:
-                        if prime_polygon.intersectsPolygon(other_prime_polygon):
-                            collision = True
-                            break
-                    if collision:
-                        break
-                if collision:
-                    break
+    ##  Gets the result of a stage of computing the disallowed areas, computing
+    #   it only if it's not yet known for the same input.
+    #
+    #   Many settings cause the disallowed areas to be updated, but most of
+    #   them only affect one of the stages. Each stage is identified by a key
+    #   containing the values of exactly the settings it depends on, and its
+    #   last result is remembered along with that key. This also makes sure that
+    #   the resulting lists remain the same objects as long as nothing changed,
+    #   so that their users (such as Arrange) can cache what they derive from
+    #   them.
+    #   \param key The name of the stage followed by all its inputs.
+    #   \param compute A function computing the stage. Its result must not be
+    #   modified afterwards.
+    def _getDisallowedAreasStage(self, key: Tuple[Any, ...], compute: Callable[[], Any]) -> Any:
+        cached = self._disallowed_area_stages.get(key[0])
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        result = compute()
+        self._disallowed_area_stages[key[0]] = (key, result)
+        return result
+
+    ##  Gets the input of _computeDisallowedAreasStatic, apart from the border
+    #   size.
+    def _getDisallowedAreasStaticKey(self, used_extruders) -> Tuple[Any, ...]:
+        return (
+            self._shape,
+            self._global_container_stack.getProperty("machine_width", "value"),
+            self._global_container_stack.getProperty("machine_depth", "value"),
+            repr(self._global_container_stack.getProperty("machine_disallowed_areas", "value")),
+            self._global_container_stack.getMetaDataEntry("nozzle_offsetting_for_disallowed_areas", True),
+            self._getNozzleOffsets(used_extruders),
+            self._getNozzleOffsets(ExtruderManager.getInstance().getActiveExtruderStacks())
+        )
+
+    ##  Gets the input of _computeDisallowedAreasPrimeBlob, apart from the
+    #   border size.
+    def _getDisallowedAreasPrimeBlobKey(self, used_extruders) -> Tuple[Any, ...]:
+        return (
+            self._global_container_stack.getProperty("machine_width", "value"),
+            self._global_container_stack.getProperty("machine_depth", "value"),
+            self._global_container_stack.getProperty("machine_center_is_zero", "value"),
+            tuple((extruder.getId(),
+                   extruder.getProperty("prime_blob_enable", "value"),
+                   extruder.getProperty("extruder_prime_pos_x", "value"),
+                   extruder.getProperty("extruder_prime_pos_y", "value")) for extruder in used_extruders)
+        )
+
+    ##  Gets the input of _computeDisallowedAreasPrinted.
+    def _getDisallowedAreasPrintedKey(self, used_extruders) -> Tuple[Any, ...]:
+        extruder_manager = ExtruderManager.getInstance()
+        last_extruder = used_extruders[-1]  # The brim of the prime tower is taken from this one.
+        return (
+            tuple(extruder.getId() for extruder in used_extruders),
+            extruder_manager.getResolveOrValue("prime_tower_enable"),
+            extruder_manager.getResolveOrValue("prime_tower_brim_enable"),
+            extruder_manager.getResolveOrValue("adhesion_type"),
+            self._global_container_stack.getProperty("prime_tower_size", "value"),
+            self._global_container_stack.getProperty("prime_tower_circular", "value"),
+            self._global_container_stack.getProperty("prime_tower_position_x", "value"),
+            self._global_container_stack.getProperty("prime_tower_position_y", "value"),
+            self._global_container_stack.getProperty("machine_width", "value"),
+            self._global_container_stack.getProperty("machine_depth", "value"),
+            self._global_container_stack.getProperty("machine_center_is_zero", "value"),
+            last_extruder.getProperty("brim_line_count", "value"),
+            last_extruder.getProperty("skirt_brim_line_width", "value"),
+            last_extruder.getProperty("initial_layer_line_width_factor", "value")
+        )
+
+    ##  Gets the ID and nozzle offset of each of the given extruders.
+    @staticmethod
+    def _getNozzleOffsets(extruders) -> Tuple[Tuple[str, Any, Any], ...]:
+        return tuple((extruder.getId(),
+                      extruder.getProperty("machine_nozzle_offset_x", "value"),
+                      extruder.getProperty("machine_nozzle_offset_y", "value")) for extruder in extruders)
+
+    ##  Combines the results of the stages into the final disallowed areas.
+    #
+    #   The results of the stages are not modified.
+    #   \return The disallowed areas, the disallowed areas without brim and the
+    #   areas that are in error.
+    def _combineDisallowedAreas(self, disallowed_border_size, used_extruders, static_areas, static_areas_no_brim, prime_areas, prime_tower_areas, nozzle_disallowed_areas):
+        result_areas = {extruder_id: list(areas) for extruder_id, areas in static_areas.items()}
+        result_areas_no_brim = {extruder_id: list(areas) for extruder_id, areas in static_areas_no_brim.items()}
+        error_areas = []
+
+        for extruder in used_extruders:
+            extruder_id = extruder.getId()
 
             result_areas[extruder_id].extend(prime_areas[extruder_id])
             result_areas_no_brim[extruder_id].extend(prime_areas[extruder_id])
 
-            nozzle_disallowed_areas = extruder.getProperty("nozzle_disallowed_areas", "value")
-            for area in nozzle_disallowed_areas:
+            for area in nozzle_disallowed_areas[extruder_id]:
                 polygon = Polygon(numpy.array(area, numpy.float32))
                 polygon_disallowed_border = polygon.getMinkowskiHull(Polygon.approximatedCircle(disallowed_border_size))
                 result_areas[extruder_id].append(polygon_disallowed_border) #Don't perform the offset on these.
-                #polygon_minimal_border = polygon.getMinkowskiHull(5)
                 result_areas_no_brim[extruder_id].append(polygon)  # no brim
 
-        # Add prime tower location as disallowed area.
-        if len(used_extruders) > 1: #No prime tower in single-extrusion.
-
-            if len([x for x in used_extruders if x.isEnabled == True]) > 1: #No prime tower if only one extruder is enabled
-                prime_tower_collision = False
-                prime_tower_areas = self._computeDisallowedAreasPrinted(used_extruders)
-                for extruder_id in prime_tower_areas:
-                    for i_area, prime_tower_area in enumerate(prime_tower_areas[extruder_id]):
-                        for area in result_areas[extruder_id]:
-                            if prime_tower_area.intersectsPolygon(area) is not None:
-                                prime_tower_collision = True
-                                break
-                        if prime_tower_collision: #Already found a collision.
-                            break
-                        if (ExtruderManager.getInstance().getResolveOrValue("prime_tower_brim_enable") and
-                            ExtruderManager.getInstance().getResolveOrValue("adhesion_type") != "raft"):
-                            prime_tower_areas[extruder_id][i_area] = prime_tower_area.getMinkowskiHull(
-                                Polygon.approximatedCircle(disallowed_border_size))
-                    if not prime_tower_collision:
-                        result_areas[extruder_id].extend(prime_tower_areas[extruder_id])
-                        result_areas_no_brim[extruder_id].extend(prime_tower_areas[extruder_id])
-                    else:
-                        self._error_areas.extend(prime_tower_areas[extruder_id])
-
-        self._has_errors = len(self._error_areas) > 0
+        prime_tower_brim = ExtruderManager.getInstance().getResolveOrValue("prime_tower_brim_enable") and ExtruderManager.getInstance().getResolveOrValue("adhesion_type") != "raft"
+        prime_tower_collision = False
+        for extruder_id in prime_tower_areas:
+            extruder_prime_tower_areas = list(prime_tower_areas[extruder_id])
+            for i_area, prime_tower_area in enumerate(extruder_prime_tower_areas):
+                for area in result_areas[extruder_id]:
+                    if prime_tower_area.intersectsPolygon(area) is not None:
+                        prime_tower_collision = True
+                        break
+                if prime_tower_collision: #Already found a collision.
+                    break
+                if prime_tower_brim:
+                    extruder_prime_tower_areas[i_area] = prime_tower_area.getMinkowskiHull(Polygon.approximatedCircle(disallowed_border_size))
+            if not prime_tower_collision:
+                result_areas[extruder_id].extend(extruder_prime_tower_areas)
+                result_areas_no_brim[extruder_id].extend(extruder_prime_tower_areas)
+            else:
+                error_areas.extend(extruder_prime_tower_areas)
 
-        self._disallowed_areas = []
+        disallowed_areas = []
         for extruder_id in result_areas:
-            self._disallowed_areas.extend(result_areas[extruder_id])
-        self._disallowed_areas_no_brim = []
+            disallowed_areas.extend(result_areas[extruder_id])
+        disallowed_areas_no_brim = []
         for extruder_id in result_areas_no_brim:
-            self._disallowed_areas_no_brim.extend(result_areas_no_brim[extruder_id])
+            disallowed_areas_no_brim.extend(result_areas_no_brim[extruder_id])
+        return disallowed_areas, disallowed_areas_no_brim, error_areas
 
     ##  Computes the disallowed areas for objects that are printed with print
     #   features.
@@ -4,7 +4,7 @@
 import os
 import sys
 import time
-from typing import cast, TYPE_CHECKING, Optional, Callable, List
+from typing import cast, TYPE_CHECKING, Optional, Callable, Dict, List
 
 import numpy
 
@@ -19,6 +19,7 @@ from UM.Decorators import override
 from UM.FlameProfiler import pyqtSlot
 from UM.Logger import Logger
 from UM.Message import Message
+from UM.MimeTypeDatabase import MimeTypeDatabase, MimeTypeNotFoundError
 from UM.Platform import Platform
 from UM.PluginError import PluginNotFoundError
 from UM.Resources import Resources
@@ -105,6 +106,7 @@ from cura.Settings.MaterialSettingsVisibilityHandler import MaterialSettingsVisi
 from cura.Settings.SettingInheritanceManager import SettingInheritanceManager
 from cura.Settings.SidebarCustomMenuItemsModel import SidebarCustomMenuItemsModel
 from cura.Settings.SimpleModeSettingsManager import SimpleModeSettingsManager
+from cura.Settings.VersionUpgradePipeline import VersionUpgradePipeline
 
 from cura.TaskManagement.OnExitCallbackManager import OnExitCallbackManager
 
@@ -435,8 +437,7 @@ class CuraApplication(QtApplication):
     # Initializes the version upgrade manager with by providing the paths for each resource type and the latest
     # versions.
     def __setLatestResouceVersionsForVersionUpgrade(self):
-        self._version_upgrade_manager.setCurrentVersions(
-            {
+        self._latest_resource_versions = {
                 ("quality", InstanceContainer.Version * 1000000 + self.SettingVersion):            (self.ResourceTypes.QualityInstanceContainer, "application/x-uranium-instancecontainer"),
                 ("quality_changes", InstanceContainer.Version * 1000000 + self.SettingVersion):    (self.ResourceTypes.QualityChangesInstanceContainer, "application/x-uranium-instancecontainer"),
                 ("machine_stack", ContainerStack.Version * 1000000 + self.SettingVersion):         (self.ResourceTypes.MachineStack, "application/x-cura-globalstack"),
@@ -445,8 +446,32 @@ class CuraApplication(QtApplication):
                 ("user", InstanceContainer.Version * 1000000 + self.SettingVersion):               (self.ResourceTypes.UserInstanceContainer, "application/x-uranium-instancecontainer"),
                 ("definition_changes", InstanceContainer.Version * 1000000 + self.SettingVersion): (self.ResourceTypes.DefinitionChangesContainer, "application/x-uranium-instancecontainer"),
                 ("variant", InstanceContainer.Version * 1000000 + self.SettingVersion):            (self.ResourceTypes.VariantInstanceContainer, "application/x-uranium-instancecontainer"),
-            }
-        )
+        }
+        self._version_upgrade_manager.setCurrentVersions(self._latest_resource_versions)
+
+    ##  Upgrades the configuration files of the user in one go, before
+    #   Uranium's version upgrade manager gets to them.
+    #
+    #   This way the version upgrade manager only needs to handle the files
+    #   that need an upgrade with side effects.
+    def _upgradeConfigurationFiles(self) -> None:
+        file_suffixes = {}  # type: Dict[str, str]
+        for (configuration_type, _), (_, mime_type_name) in self._latest_resource_versions.items():
+            try:
+                file_suffixes[configuration_type] = "." + MimeTypeDatabase.getMimeType(mime_type_name).preferredSuffix
+            except MimeTypeNotFoundError:
+                continue
+        journal_path = os.path.join(Resources.getCacheStoragePath(), "upgrade_journal")
+        pipeline = VersionUpgradePipeline.fromPluginRegistry(self._plugin_registry, file_suffixes, journal_path)
+
+        storage_paths = []  # type: List[str]
+        for storage_path in (Resources.getConfigStoragePath(), Resources.getDataStoragePath()):
+            if storage_path not in storage_paths:
+                storage_paths.append(storage_path)
+        with self._container_registry.lockFile():
+            upgraded_count = pipeline.upgrade(storage_paths)
+        if upgraded_count:
+            Logger.log("i", "Upgraded {count} configuration files.".format(count = upgraded_count))
 
     # Runs preparations that needs to be done before the starting process.
     def startSplashWindowPhase(self) -> None:
@@ -668,11 +693,16 @@ class CuraApplication(QtApplication):
     def setSaveDataEnabled(self, enabled: bool) -> None:
         self._save_data_enabled = enabled
 
+    def getSaveDataEnabled(self) -> bool:
+        return self._save_data_enabled
+
     # Cura has multiple locations where instance containers need to be saved, so we need to handle this differently.
     def saveSettings(self):
         if not self.started or not self._save_data_enabled:
             # Do not do saving during application start or when data should not be saved on quit.
             return
+        if self._auto_save is not None:
+            self._auto_save.flush()  # Don't let pending background writes overwrite what is saved here.
         ContainerRegistry.getInstance().saveDirtyContainers()
         self.savePreferences()
 
@@ -712,6 +742,8 @@ class CuraApplication(QtApplication):
 
         self._plugins_loaded = True
 
+        self._upgradeConfigurationFiles()
+
     def run(self):
         super().run()
         container_registry = self._container_registry
@@ -0,0 +1,376 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy
+
+##  A stretch of g-code in which the printer may execute commands faster than
+#   they can be sent to it, so that its planner buffer runs empty.
+#
+#   Commands are counted from 0, skipping empty lines and comments. Lines are
+#   the (0-based) line numbers in the g-code.
+BadFrame = NamedTuple("BadFrame", [("start_command", int), ("end_command", int), ("start_line", int), ("end_line", int), ("command_count", int), ("time", float)])
+
+# Kinds of commands, as far as the planner is concerned.
+_OTHER = 0
+_MOVE = 1  # G0, G1, G10 and G11.
+_SET_POSITION = 2  # G92.
+
+
+##  The outcome of simulating the planner on a piece of g-code.
+class PlannerSimulationResult:
+    def __init__(self, command_lines: numpy.ndarray, command_times: numpy.ndarray, bad_frames: List[BadFrame], layer_times: Dict[int, float], layer_bad_frame_counts: Dict[int, int]) -> None:
+        self._command_lines = command_lines
+        self._command_times = command_times
+        self._bad_frames = bad_frames
+        self._layer_times = layer_times
+        self._layer_bad_frame_counts = layer_bad_frame_counts
+
+    ##  Gets the estimated time to print the g-code, in seconds.
+    def getTotalTime(self) -> float:
+        return float(self._command_times.sum())
+
+    ##  Gets the line number of each command in the g-code.
+    def getCommandLines(self) -> numpy.ndarray:
+        return self._command_lines
+
+    ##  Gets the estimated time that each command takes to execute, in seconds.
+    def getCommandTimes(self) -> numpy.ndarray:
+        return self._command_times
+
+    ##  Gets where the planner buffer is expected to run empty.
+    def getBadFrames(self) -> List[BadFrame]:
+        return self._bad_frames
+
+    ##  Gets the estimated time of each layer, in seconds, by layer number.
+    #
+    #   Layers are found through the ;LAYER: comments. If a layer number occurs
+    #   more than once, like when printing one at a time, the times are added.
+    #   Any g-code before the first layer isn't part of a layer.
+    def getLayerTimes(self) -> Dict[int, float]:
+        return self._layer_times
+
+    ##  Gets the number of bad frames that end in each layer, by layer number.
+    def getLayerBadFrameCounts(self) -> Dict[int, int]:
+        return self._layer_bad_frame_counts
+
+
+##  Estimates how long g-code takes to print by simulating the planner of the
+#   firmware, and finds the places where the planner buffer may run empty.
+#
+#   This is the model of scripts/check_gcode_buffer.py, which plans one
+#   command at a time. Here the g-code is parsed into arrays once and all
+#   passes of the planner work on complete arrays. The junction speed passes
+#   are recurrences over consecutive moves; they are solved for all moves at
+#   once by pointer jumping, which takes a number of steps that is
+#   logarithmic in the length of the longest chain of moves that limit each
+#   other's speed.
+#
+#   Like the script, this models an Ultimaker S5 by default.
+class PlannerSimulator:
+    def __init__(self, max_feedrate: Tuple[float, float, float, float] = (300, 300, 40, 45),
+                 max_acceleration: Tuple[float, float, float, float] = (9000, 9000, 100, 10000),
+                 max_jerk_xy: float = 20, max_jerk_z: float = 0.4, max_jerk_e: float = 5,
+                 minimum_feedrate: float = 0.001, acceleration: float = 3000, minimum_planner_speed: float = 0.05,
+                 buffer_size: int = 15, buffer_filling_rate: float = 50.0) -> None:
+        self._max_feedrate = max_feedrate  # X, Y, Z and E, in mm/s.
+        self._max_acceleration = max_acceleration  # X, Y, Z and E, in mm/s².
+        self._max_jerk_xy = max_jerk_xy
+        self._max_jerk_z = max_jerk_z
+        self._max_jerk_e = max_jerk_e
+        self._minimum_feedrate = minimum_feedrate
+        self._acceleration = acceleration
+        self._minimum_planner_speed = minimum_planner_speed
+        self._buffer_size = buffer_size  # In number of commands.
+        self._buffer_filling_rate = buffer_filling_rate  # In commands per second.
+
+    ##  Simulates the planner on g-code.
+    #   \param lines The lines of g-code. This may be any iterable, so that
+    #   large files don't need to be read into memory at once.
+    def simulate(self, lines: Iterable[str]) -> PlannerSimulationResult:
+        parsed = self._parse(lines)
+        command_lines, kinds, position_commands, columns, set_all, retractions, dwells, settings_changes, layer_starts = parsed
+
+        command_times = numpy.zeros(len(command_lines), dtype = numpy.float64)
+        if len(position_commands):
+            move_commands, move_times = self._planMoves(kinds, position_commands, columns, set_all, retractions, settings_changes)
+            command_times[move_commands] = move_times
+        for command_index, dwell_time in dwells:
+            command_times[command_index] = dwell_time
+
+        bad_frames = self._findBadFrames(command_lines, command_times)
+        layer_times, layer_bad_frame_counts = self._getLayerStatistics(command_times, bad_frames, layer_starts)
+        return PlannerSimulationResult(command_lines, command_times, bad_frames, layer_times, layer_bad_frame_counts)
+
+    ##  Parses the g-code into arrays.
+    #
+    #   This is the only part that handles one line at a time, so it does as
+    #   little as possible. Everything that the planner needs to know about a
+    #   command that moves or sets the position is stored in columns of X, Y,
+    #   Z, E and F, with NaN for the values that the command doesn't specify.
+    #   The rare commands that change the machine settings or wait are kept in
+    #   lists.
+    def _parse(self, lines: Iterable[str]):
+        nan = float("nan")
+        command_lines = array("q")
+        kinds = array("b")
+        position_commands = array("q")  # Index of each command that moves or sets the position.
+        columns = array("d")  # X, Y, Z, E and F of each of those commands, one command after the other.
+        set_all = array("b")  # Whether the command is a G92 without parameters, which zeroes all axes.
+        retractions = array("d")  # How far a G10 or G11 moves the filament.
+        dwells = []  # type: List[Tuple[int, float]]
+        settings_changes = {"max_z_feedrate": [], "max_jerk_z": [], "max_jerk_e": []}  # type: Dict[str, List[Tuple[int, float]]]
+        layer_starts = []  # type: List[Tuple[int, int]]  # Index of the first command of each layer, and the layer number.
+
+        axes = {"X": 0, "Y": 1, "Z": 2, "E": 3, "F": 4, "x": 0, "y": 1, "z": 2, "e": 3, "f": 4}
+        for line_number, line in enumerate(lines):
+            line = line.strip()
+            if not line:
+                continue
+            if line[0] == ";":
+                if line.startswith(";LAYER:"):
+                    try:
+                        layer_starts.append((len(command_lines), int(line[7:])))
+                    except ValueError:
+                        pass
+                continue
+
+            parts = line.split(";", 1)[0].split()
+            command_index = len(command_lines)
+            command_lines.append(line_number)
+            code = parts[0][0].upper()
+            try:
+                number = int(parts[0][1:])
+            except ValueError:
+                kinds.append(_OTHER)
+                continue
+
+            if code == "G" and number in (0, 1, 10, 11, 92):
+                values = [nan, nan, nan, nan, nan]
+                if number == 10 or number == 11:
+                    # Firmware retraction. Behave as if the filament is moved 25mm.
+                    retractions.append(-25.0 if number == 10 else 25.0)
+                else:
+                    retractions.append(0.0)
+                    for part in parts[1:]:
+                        axis = axes.get(part[0])
+                        if axis is not None and (number != 92 or axis != 4):  # G92 doesn't set the feedrate.
+                            try:
+                                values[axis] = float(part[1:])
+                            except ValueError:
+                                pass
+                kinds.append(_SET_POSITION if number == 92 else _MOVE)
+                position_commands.append(command_index)
+                columns.extend(values)
+                set_all.append(number == 92 and len(parts) == 1)
+                continue
+
+            kinds.append(_OTHER)
+            if code == "G" and number == 4:  # Dwell, P in milliseconds or S in seconds.
+                for part in parts[1:]:
+                    try:
+                        if part[0].upper() == "P":
+                            dwells.append((command_index, float(part[1:]) / 1000))
+                        elif part[0].upper() == "S":
+                            dwells.append((command_index, float(part[1:])))
+                    except ValueError:
+                        pass
+            elif code == "M" and number in (203, 205):  # Maximum feedrates and jerks. Of these, only the ones for Z and E matter here.
+                for part in parts[1:]:
+                    key = {(203, "Z"): "max_z_feedrate", (205, "Z"): "max_jerk_z", (205, "E"): "max_jerk_e"}.get((number, part[0].upper()))
+                    if key is not None:
+                        try:
+                            settings_changes[key].append((command_index, float(part[1:])))
+                        except ValueError:
+                            pass
+
+        return (numpy.frombuffer(command_lines, dtype = numpy.int64), numpy.frombuffer(kinds, dtype = numpy.int8),
+                numpy.frombuffer(position_commands, dtype = numpy.int64), numpy.frombuffer(columns, dtype = numpy.float64).reshape((-1, 5)),
+                numpy.frombuffer(set_all, dtype = numpy.int8).astype(bool), numpy.frombuffer(retractions, dtype = numpy.float64),
+                dwells, settings_changes, layer_starts)
+
+    ##  Plans all moves and computes how long each of them takes.
+    #   \return The indices of the commands that move, and the time that each of
+    #   them takes.
+    def _planMoves(self, kinds: numpy.ndarray, position_commands: numpy.ndarray, columns: numpy.ndarray, set_all: numpy.ndarray, retractions: numpy.ndarray, settings_changes: Dict[str, List[Tuple[int, float]]]) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        with numpy.errstate(divide = "ignore", invalid = "ignore"):
+            # Track the position through all commands that move or set it.
+            positions = numpy.empty((len(position_commands), 4), dtype = numpy.float64)
+            for axis in range(3):
+                positions[:, axis] = self._forwardFill(numpy.where(set_all, 0.0, columns[:, axis]), 0.0)
+            # Retractions move relative to the current E, so add them up separately from the absolute values.
+            retracted = numpy.cumsum(retractions)
+            positions[:, 3] = self._forwardFill(numpy.where(set_all, 0.0, columns[:, 3]) - retracted, 0.0) + retracted
+            feedrates = numpy.maximum(self._forwardFill(columns[:, 4], 0.0) / 60.0, self._minimum_feedrate)
+
+            deltas = numpy.diff(numpy.vstack([numpy.zeros((1, 4)), positions]), axis = 0)
+            is_move = (kinds[position_commands] == _MOVE) & (numpy.abs(deltas).max(axis = 1) > 0)
+            move_commands = position_commands[is_move]
+            deltas = deltas[is_move]
+            nominal_feedrate = feedrates[is_move]
+            if len(move_commands) == 0:
+                return move_commands, numpy.zeros(0)
+
+            max_z_feedrate = self._getSettingPerMove("max_z_feedrate", self._max_feedrate[2], settings_changes, move_commands)
+            max_jerk_z = self._getSettingPerMove("max_jerk_z", self._max_jerk_z, settings_changes, move_commands)
+            max_jerk_e = self._getSettingPerMove("max_jerk_e", self._max_jerk_e, settings_changes, move_commands)
+
+            abs_deltas = numpy.abs(deltas)
+            distance = numpy.sqrt((abs_deltas[:, :3] ** 2).sum(axis = 1))
+            distance = numpy.where(distance == 0, abs_deltas[:, 3], distance)
+
+            current_feedrate = deltas * (nominal_feedrate / distance)[:, numpy.newaxis]
+            # The same simplified feedrate limit as the script: it only limits anything if a maximum is below 1mm/s.
+            feedrate_factor = numpy.minimum(min(1.0, self._max_feedrate[0], self._max_feedrate[1], self._max_feedrate[3]), max_z_feedrate)
+            current_feedrate *= feedrate_factor[:, numpy.newaxis]
+            current_abs_feedrate = numpy.abs(current_feedrate)
+            nominal_feedrate = nominal_feedrate * feedrate_factor
+
+            acceleration = numpy.full(len(distance), float(self._acceleration))
+            for axis in range(4):
+                acceleration = numpy.where(acceleration * abs_deltas[:, axis] / distance > self._max_acceleration[axis], float(self._max_acceleration[axis]), acceleration)
+
+            # The speed at which a move can safely start from standstill.
+            safe_speed = numpy.full(len(distance), self._max_jerk_xy / 2)
+            safe_speed = numpy.where(current_abs_feedrate[:, 2] > max_jerk_z / 2, numpy.minimum(safe_speed, max_jerk_z), safe_speed)
+            safe_speed = numpy.where(current_abs_feedrate[:, 3] > max_jerk_e / 2, numpy.minimum(safe_speed, max_jerk_e), safe_speed)
+            safe_speed = numpy.minimum(safe_speed, nominal_feedrate)
+
+            # The maximum junction speed with the previous move, limited by the jerk.
+            previous_feedrate = numpy.vstack([numpy.zeros((1, 4)), current_feedrate[:-1]])
+            previous_nominal_feedrate = numpy.concatenate([[0.0], nominal_feedrate[:-1]])
+            xy_jerk = numpy.sqrt(((current_feedrate[:, :2] - previous_feedrate[:, :2]) ** 2).sum(axis = 1))
+            junction_factor = numpy.where(xy_jerk > self._max_jerk_xy, self._max_jerk_xy / xy_jerk, 1.0)
+            z_jerk = numpy.abs(current_feedrate[:, 2] - previous_feedrate[:, 2])
+            junction_factor = numpy.where(z_jerk > max_jerk_z, numpy.minimum(junction_factor, max_jerk_z / z_jerk), junction_factor)
+            e_jerk = numpy.abs(current_feedrate[:, 3] - previous_feedrate[:, 3])
+            junction_factor = numpy.where(e_jerk > max_jerk_e, numpy.minimum(junction_factor, max_jerk_e / e_jerk), junction_factor)
+            max_entry_speed = numpy.where(previous_nominal_feedrate > 0.0001, numpy.minimum(previous_nominal_feedrate, nominal_feedrate * junction_factor), safe_speed)
+
+            # Speeds are planned as squares from here on. Accelerating over a move adds this to the square of the speed.
+            speed_gain = 2 * acceleration * distance
+            allowable_speed = numpy.sqrt(self._minimum_planner_speed ** 2 + speed_gain)
+            entry_speed = numpy.minimum(max_entry_speed, allowable_speed)
+            nominal_length = nominal_feedrate <= allowable_speed  # Whether the move is long enough to reach full speed from any entry speed.
+            initial_entry_speed = entry_speed[-1]
+
+            # Reverse pass: Maximise the entry speeds, but make sure that the next move can still be reached by decelerating.
+            move_count = len(distance)
+            squared_entry_speed = max_entry_speed ** 2
+            squared_entry_speed[[0, -1]] = entry_speed[[0, -1]] ** 2  # The script never plans the first and last moves in this pass.
+            limited = numpy.zeros(move_count, dtype = bool)
+            limited[1:-1] = (entry_speed[1:-1] != max_entry_speed[1:-1]) & ~nominal_length[1:-1] & (max_entry_speed[1:-1] > max_entry_speed[2:])
+            links = numpy.where(limited, numpy.arange(1, move_count + 1), -1)
+            squared_entry_speed = self._solveMinPlusChains(squared_entry_speed, links, speed_gain)
+
+            # Forward pass: Make sure that every move can be reached by accelerating from the previous one.
+            links = numpy.full(move_count, -1)
+            links[1:] = numpy.where(nominal_length[:-1], -1, numpy.arange(move_count - 1))
+            squared_entry_speed = self._solveMinPlusChains(squared_entry_speed, links, numpy.concatenate([[0.0], speed_gain[:-1]]))
+            entry_speed = numpy.sqrt(squared_entry_speed)
+
+            # Each move ends at the entry speed of the next. Like in the script, the last one keeps the speeds it got while parsing.
+            initial_feedrate = entry_speed.copy()
+            initial_feedrate[-1] = initial_entry_speed
+            final_feedrate = numpy.concatenate([entry_speed[1:], safe_speed[-1:]])
+
+            # Compute the trapezoids: accelerate, cruise at nominal speed, then decelerate.
+            accelerate_distance = (nominal_feedrate ** 2 - initial_feedrate ** 2) / (2 * acceleration)
+            decelerate_distance = (nominal_feedrate ** 2 - final_feedrate ** 2) / (2 * acceleration)
+            plateau_distance = distance - accelerate_distance - decelerate_distance
+            # Without room for a plateau, the move accelerates until it must start decelerating.
+            intersection_distance = numpy.clip((2 * acceleration * distance - initial_feedrate ** 2 + final_feedrate ** 2) / (4 * acceleration), 0, distance)
+            no_plateau = plateau_distance < 0
+            accelerate_distance = numpy.where(no_plateau, intersection_distance, accelerate_distance)
+            plateau_distance = numpy.where(no_plateau, 0.0, plateau_distance)
+            decelerate_distance = distance - accelerate_distance - plateau_distance
+
+            move_times = self._getAccelerationTime(initial_feedrate, accelerate_distance, acceleration)
+            move_times += plateau_distance / nominal_feedrate
+            move_times += self._getAccelerationTime(final_feedrate, decelerate_distance, acceleration)
+        return move_commands, move_times
+
+    ##  Finds where the buffer of the printer may run empty.
+    #
+    #   The frames are the same as in the script: for every command, the window
+    #   of commands before it that take at most a second to execute. If they
+    #   are more than fit in the buffer and take less time than it takes to
+    #   send that buffer, the printer may have to wait for commands. Frames that
+    #   start at the same command are reported once, up to the last command.
+    def _findBadFrames(self, command_lines: numpy.ndarray, command_times: numpy.ndarray) -> List[BadFrame]:
+        if len(command_times) == 0:
+            return []
+        cumulative_times = numpy.cumsum(command_times)
+        # The script counts the time of the first command in every frame, and the time of the command at the start of a frame never.
+        frame_starts = numpy.searchsorted(cumulative_times, cumulative_times + command_times[0] - 1.0, side = "left")
+        frame_ends = numpy.arange(len(command_times))
+        frame_starts = numpy.minimum(frame_starts, frame_ends)
+        frame_times = command_times[0] + cumulative_times - cumulative_times[frame_starts]
+        command_counts = frame_ends + 1 - frame_starts
+
+        bad = numpy.nonzero((frame_times <= self._buffer_size / self._buffer_filling_rate) & (command_counts > self._buffer_size))[0]
+        if len(bad) == 0:
+            return []
+        bad = bad[numpy.append(frame_starts[bad][1:] != frame_starts[bad][:-1], True)]  # Only the last frame with each start.
+        return [BadFrame(int(start), int(end), int(command_lines[start]), int(command_lines[end]), int(count), float(time))
+                for start, end, count, time in zip(frame_starts[bad], bad, command_counts[bad], frame_times[bad])]
+
+    @staticmethod
+    def _getLayerStatistics(command_times: numpy.ndarray, bad_frames: List[BadFrame], layer_starts: List[Tuple[int, int]]) -> Tuple[Dict[int, float], Dict[int, int]]:
+        layer_times = {}  # type: Dict[int, float]
+        layer_bad_frame_counts = {}  # type: Dict[int, int]
+        if not layer_starts:
+            return layer_times, layer_bad_frame_counts
+
+        start_commands = numpy.array([start for start, _ in layer_starts])
+        cumulative_times = numpy.concatenate([[0.0], numpy.cumsum(command_times)])
+        times = cumulative_times[numpy.append(start_commands[1:], len(command_times))] - cumulative_times[start_commands]
+        frame_layers = numpy.searchsorted(start_commands, [frame.end_command for frame in bad_frames], side = "right") - 1
+        frame_counts = numpy.bincount(frame_layers[frame_layers >= 0], minlength = len(layer_starts))
+        for (_, layer_number), time, frame_count in zip(layer_starts, times, frame_counts):
+            layer_times[layer_number] = layer_times.get(layer_number, 0.0) + float(time)
+            layer_bad_frame_counts[layer_number] = layer_bad_frame_counts.get(layer_number, 0) + int(frame_count)
+        return layer_times, layer_bad_frame_counts
+
+    ##  Gets the value of a setting that the g-code may change, at each move.
+    @staticmethod
+    def _getSettingPerMove(key: str, default: float, settings_changes: Dict[str, List[Tuple[int, float]]], move_commands: numpy.ndarray) -> numpy.ndarray:
+        changes = settings_changes[key]
+        values = numpy.array([default] + [value for _, value in changes], dtype = numpy.float64)
+        return values[numpy.searchsorted([command_index for command_index, _ in changes], move_commands, side = "right")]
+
+    ##  Replaces every NaN with the last value before it that isn't NaN.
+    @staticmethod
+    def _forwardFill(values: numpy.ndarray, initial: float) -> numpy.ndarray:
+        indices = numpy.where(numpy.isnan(values), -1, numpy.arange(len(values)))
+        indices = numpy.maximum.accumulate(indices)
+        return numpy.where(indices >= 0, values[numpy.maximum(indices, 0)], initial)
+
+    ##  Solves the recurrence result[i] = min(values[i], result[links[i]] +
+    #   weights[i]) for all i where links[i] isn't -1, and result[i] =
+    #   values[i] where it is.
+    #
+    #   Each step makes every element skip twice as far ahead in its chain, so
+    #   this takes a logarithmic number of steps in the length of the longest
+    #   chain. Chains may not be circular.
+    @staticmethod
+    def _solveMinPlusChains(values: numpy.ndarray, links: numpy.ndarray, weights: numpy.ndarray) -> numpy.ndarray:
+        result = values.copy()
+        links = links.copy()
+        weights = weights.copy()
+        active = numpy.nonzero(links >= 0)[0]
+        while len(active):
+            targets = links[active]
+            result[active] = numpy.minimum(result[active], result[targets] + weights[active])
+            weights[active] += weights[targets]
+            links[active] = links[targets]
+            active = active[links[active] >= 0]
+        return result
+
+    ##  Gets the time it takes to travel a distance, accelerating from a speed.
+    @staticmethod
+    def _getAccelerationTime(initial_feedrate: numpy.ndarray, distance: numpy.ndarray, acceleration: numpy.ndarray) -> numpy.ndarray:
+        discriminant = numpy.maximum(initial_feedrate ** 2 + 2 * acceleration * distance, 0)
+        return (-initial_feedrate + numpy.sqrt(discriminant)) / acceleration
@@ -2,16 +2,19 @@
 # Cura is released under the terms of the LGPLv3 or higher.
 from UM.Mesh.MeshData import MeshData
 
+from cura.LayerStatistics import LayerStatistics
+
 
 ##  Class to holds the layer mesh and information about the layers.
 # Immutable, use LayerDataBuilder to create one of these.
 class LayerData(MeshData):
     def __init__(self, vertices = None, normals = None, indices = None, colors = None, uvs = None, file_name = None,
-                 center_position = None, layers=None, element_counts=None, attributes=None):
+                 center_position = None, layers=None, element_counts=None, attributes=None, statistics=None):
         super().__init__(vertices=vertices, normals=normals, indices=indices, colors=colors, uvs=uvs,
                          file_name=file_name, center_position=center_position, attributes=attributes)
         self._layers = layers
         self._element_counts = element_counts
+        self._statistics = statistics
 
     def getLayer(self, layer):
         if layer in self._layers:
@@ -24,3 +27,9 @@ class LayerData(MeshData):
 
     def getElementCounts(self):
         return self._element_counts
+
+    ##  Gets the ranges of the feedrates and line thicknesses in the layers.
+    def getStatistics(self) -> LayerStatistics:
+        if self._statistics is None:
+            self._statistics = LayerStatistics.fromLayers(self._layers)
+        return self._statistics
@@ -226,6 +226,12 @@ class LayerPolygon:
 
         return normals
 
+    ##  Gets how many types of lines there are. Line types are numbered from
+    #   zero up to this number.
+    @classmethod
+    def getNumberOfTypes(cls) -> int:
+        return cls.__number_of_types
+
     __color_map = None # type: numpy.ndarray[Any]
 
     ##  Gets the instance of the VersionUpgradeManager, or creates one.
@@ -0,0 +1,111 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy
+
+from cura.LayerPolygon import LayerPolygon
+
+if TYPE_CHECKING:
+    from cura.Layer import Layer
+
+
+##  The ranges of the feedrates and line thicknesses in layer data, per layer
+#   and per line type.
+#
+#   These are computed once when the layer data is created, so that the layer
+#   view doesn't need to go through all lines again to show its legend. Ranges
+#   of all layers and line types are known immediately. Ranges of a part of
+#   the layers or line types take time in the number of layers.
+#
+#   The minimum line thickness leaves out lines with a thickness of zero, since
+#   g-code files have those for travel moves.
+class LayerStatistics:
+    def __init__(self, layer_numbers: numpy.ndarray, min_feedrates: numpy.ndarray, max_feedrates: numpy.ndarray, min_thicknesses: numpy.ndarray, max_thicknesses: numpy.ndarray) -> None:
+        self._layer_numbers = layer_numbers  # Sorted. Only the layers with polygons.
+        # Arrays with a row for each layer and a column for each line type.
+        # Without any lines, the minimum is infinity and the maximum minus infinity.
+        self._min_feedrates = min_feedrates
+        self._max_feedrates = max_feedrates
+        self._min_thicknesses = min_thicknesses
+        self._max_thicknesses = max_thicknesses
+
+        self._feedrate_range = self._findRange(self._min_feedrates, self._max_feedrates)
+        self._thickness_range = self._findRange(self._min_thicknesses, self._max_thicknesses)
+
+    ##  Computes the statistics of layers.
+    #   \param layers The layers, by layer number.
+    @classmethod
+    def fromLayers(cls, layers: Dict[int, "Layer"]) -> "LayerStatistics":
+        layer_numbers = numpy.array(sorted(layer_number for layer_number, layer in layers.items() if layer.polygons), dtype = numpy.int64)
+        type_count = LayerPolygon.getNumberOfTypes()
+        shape = (len(layer_numbers), type_count)
+        min_feedrates = numpy.full(shape, numpy.inf)
+        max_feedrates = numpy.full(shape, -numpy.inf)
+        min_thicknesses = numpy.full(shape, numpy.inf)
+        max_thicknesses = numpy.full(shape, -numpy.inf)
+
+        for row, layer_number in enumerate(layer_numbers):
+            polygons = layers[layer_number].polygons
+            types = numpy.concatenate([polygon.types.ravel() for polygon in polygons])
+            feedrates = numpy.concatenate([polygon.lineFeedrates.ravel() for polygon in polygons])
+            thicknesses = numpy.concatenate([polygon.lineThicknesses.ravel() for polygon in polygons])
+            for line_type in numpy.unique(types):  # Only a few types appear in each layer.
+                mask = types == line_type
+                type_feedrates = feedrates[mask]
+                type_thicknesses = thicknesses[mask]
+                min_feedrates[row, line_type] = type_feedrates.min()
+                max_feedrates[row, line_type] = type_feedrates.max()
+                max_thicknesses[row, line_type] = type_thicknesses.max()
+                nonzero_thicknesses = type_thicknesses[type_thicknesses != 0]
+                if len(nonzero_thicknesses) > 0:
+                    min_thicknesses[row, line_type] = nonzero_thicknesses.min()
+
+        return cls(layer_numbers, min_feedrates, max_feedrates, min_thicknesses, max_thicknesses)
+
+    ##  Gets the numbers of the layers that have polygons, in order.
+    def getLayerNumbers(self) -> List[int]:
+        return self._layer_numbers.tolist()
+
+    ##  Gets the lowest and highest feedrate.
+    #   \param min_layer Only look at layers from this number on.
+    #   \param max_layer Only look at layers up to and including this number.
+    #   \param line_types Only look at lines of these types.
+    #   \return The lowest and highest feedrate, or None if there are no lines.
+    def getFeedrateRange(self, min_layer: Optional[int] = None, max_layer: Optional[int] = None, line_types: Optional[Iterable[int]] = None) -> Optional[Tuple[float, float]]:
+        if min_layer is None and max_layer is None and line_types is None:
+            return self._feedrate_range
+        return self._findRange(*self._select(self._min_feedrates, self._max_feedrates, min_layer, max_layer, line_types))
+
+    ##  Gets the lowest thickness that isn't zero and the highest thickness.
+    #   \param min_layer Only look at layers from this number on.
+    #   \param max_layer Only look at layers up to and including this number.
+    #   \param line_types Only look at lines of these types.
+    #   \return The lowest and highest thickness, or None if there are no lines.
+    #   The lowest thickness is infinity if all lines have a thickness of zero.
+    def getThicknessRange(self, min_layer: Optional[int] = None, max_layer: Optional[int] = None, line_types: Optional[Iterable[int]] = None) -> Optional[Tuple[float, float]]:
+        if min_layer is None and max_layer is None and line_types is None:
+            return self._thickness_range
+        return self._findRange(*self._select(self._min_thicknesses, self._max_thicknesses, min_layer, max_layer, line_types))
+
+    ##  Gets the part of the per-layer arrays for some layers and line types.
+    def _select(self, minima: numpy.ndarray, maxima: numpy.ndarray, min_layer: Optional[int], max_layer: Optional[int], line_types: Optional[Iterable[int]]) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        first_row = 0 if min_layer is None else int(numpy.searchsorted(self._layer_numbers, min_layer, side = "left"))
+        end_row = len(self._layer_numbers) if max_layer is None else int(numpy.searchsorted(self._layer_numbers, max_layer, side = "right"))
+        minima = minima[first_row:end_row]
+        maxima = maxima[first_row:end_row]
+        if line_types is not None:
+            columns = [line_type for line_type in line_types if 0 <= line_type < minima.shape[1]]
+            minima = minima[:, columns]
+            maxima = maxima[:, columns]
+        return minima, maxima
+
+    @staticmethod
+    def _findRange(minima: numpy.ndarray, maxima: numpy.ndarray) -> Optional[Tuple[float, float]]:
+        if maxima.size == 0:
+            return None
+        maximum = float(maxima.max())
+        if maximum == -numpy.inf:  # No lines at all.
+            return None
+        return float(minima.min()), maximum
@@ -2,10 +2,12 @@
 # Cura is released under the terms of the LGPLv3 or higher.
 
 import sys
+from typing import Any, List, Optional, Tuple
 
-from shapely import affinity
-from shapely.geometry import Polygon
+import numpy
 
+from UM.Math.AxisAlignedBox import AxisAlignedBox
+from UM.Math.Polygon import Polygon
 from UM.Scene.Iterator.Iterator import Iterator
 from UM.Scene.SceneNode import SceneNode
 
@@ -31,7 +33,10 @@ from UM.Scene.SceneNode import SceneNode
 #
 # This iterator determines the print order following the rules above.
 #
+# The order is cached until a node moves or its hulls change, since it is computed again for every slice.
+#
 class OneAtATimeIterator(Iterator):
+    _cached_order = (None, [])  # type: Tuple[Optional[Tuple[Any, ...]], List[SceneNode]]  # The last computed order and what it was computed from.
 
     def __init__(self, scene_node):
         from cura.CuraApplication import CuraApplication
@@ -67,10 +72,9 @@ class OneAtATimeIterator(Iterator):
         return min_coord
 
     def _checkForCollisions(self) -> bool:
-        all_nodes = []
-        for node in self._scene_node.getChildren():
-            if not issubclass(type(node), SceneNode):
-                continue
+        bounding_boxes = []  # type: List[Polygon]
+        head_hulls = []  # type: List[Polygon]
+        for node in self._getNodes():
             convex_hull = node.callDecoration("getConvexHullHead")
             if not convex_hull:
                 continue
@@ -78,31 +82,12 @@ class OneAtATimeIterator(Iterator):
             bounding_box = node.getBoundingBox()
             if not bounding_box:
                 continue
-            from UM.Math.Polygon import Polygon
-            bounding_box_polygon = Polygon([[bounding_box.left, bounding_box.front],
-                                            [bounding_box.left, bounding_box.back],
-                                            [bounding_box.right, bounding_box.back],
-                                            [bounding_box.right, bounding_box.front]])
-
-            all_nodes.append({"node": node,
-                              "bounding_box": bounding_box_polygon,
-                              "convex_hull": convex_hull})
-
-        has_collisions = False
-        for i, node_dict in enumerate(all_nodes):
-            for j, other_node_dict in enumerate(all_nodes):
-                if i == j:
-                    continue
-                if node_dict["bounding_box"].intersectsPolygon(other_node_dict["convex_hull"]):
-                    has_collisions = True
-                    break
-
-            if has_collisions:
-                break
+            bounding_boxes.append(self._getBoundingBoxPolygon(bounding_box))
+            head_hulls.append(convex_hull)
 
-        return has_collisions
+        return self._hasCollisions(bounding_boxes, head_hulls)
 
-    def _fillStack(self):
+    def _fillStack(self) -> None:
         min_coord = self.getMachineNearestCornerToExtruder(self._global_stack)
         transform_x = -int(round(min_coord[0] / abs(min_coord[0])))
         transform_y = -int(round(min_coord[1] / abs(min_coord[1])))
@@ -110,40 +95,85 @@ class OneAtATimeIterator(Iterator):
         machine_size = [self._global_stack.getProperty("machine_width", "value"),
                         self._global_stack.getProperty("machine_depth", "value")]
 
-        def flip_x(polygon):
-            tm2 = [-1, 0, 0, 1, 0, 0]
-            return affinity.affine_transform(affinity.translate(polygon, xoff = -machine_size[0]), tm2)
-
-        def flip_y(polygon):
-            tm2 = [1, 0, 0, -1, 0, 0]
-            return affinity.affine_transform(affinity.translate(polygon, yoff = -machine_size[1]), tm2)
-
-        if self._checkForCollisions():
-            self._node_stack = []
+        nodes = self._getNodes()
+        convex_hulls = [node.callDecoration("getConvexHull") for node in nodes]
+        head_hulls = [node.callDecoration("getConvexHullHead") for node in nodes]
+        bounding_boxes = [node.getBoundingBox() for node in nodes]
+
+        # The order only changes if a node or its hulls move or change shape, or if the machine changes.
+        cache_key = (transform_x, transform_y, tuple(machine_size)) + tuple(
+            (id(node), self._getPolygonKey(convex_hull), self._getPolygonKey(head_hull),
+             (bounding_box.left, bounding_box.right, bounding_box.front, bounding_box.back) if bounding_box else None)
+            for node, convex_hull, head_hull, bounding_box in zip(nodes, convex_hulls, head_hulls, bounding_boxes))
+        if OneAtATimeIterator._cached_order[0] == cache_key:
+            self._node_stack = list(OneAtATimeIterator._cached_order[1])
             return
 
-        node_list = []
-        for node in self._scene_node.getChildren():
-            if not issubclass(type(node), SceneNode):
-                continue
-
-            convex_hull = node.callDecoration("getConvexHull")
-            if convex_hull:
-                xmin = min(x for x, _ in convex_hull._points)
-                xmax = max(x for x, _ in convex_hull._points)
-                ymin = min(y for _, y in convex_hull._points)
-                ymax = max(y for _, y in convex_hull._points)
-
-                convex_hull_polygon = Polygon.from_bounds(xmin, ymin, xmax, ymax)
-                if transform_x < 0:
-                    convex_hull_polygon = flip_x(convex_hull_polygon)
-                if transform_y < 0:
-                    convex_hull_polygon = flip_y(convex_hull_polygon)
-
-                node_list.append({"node": node,
-                                  "min_coord": [convex_hull_polygon.bounds[0], convex_hull_polygon.bounds[1]],
-                                  })
-
-        node_list = sorted(node_list, key = lambda d: d["min_coord"])
-
-        self._node_stack = [d["node"] for d in node_list]
+        collision_boxes = [self._getBoundingBoxPolygon(bounding_box) for head_hull, bounding_box in zip(head_hulls, bounding_boxes) if head_hull and bounding_box]
+        collision_hulls = [head_hull for head_hull, bounding_box in zip(head_hulls, bounding_boxes) if head_hull and bounding_box]
+        if self._hasCollisions(collision_boxes, collision_hulls):
+            node_stack = []  # type: List[SceneNode]
+        else:
+            ordered_nodes = [node for node, convex_hull in zip(nodes, convex_hulls) if convex_hull and len(convex_hull.getPoints()) > 0]
+            bounds = self._getBounds([convex_hull for convex_hull in convex_hulls if convex_hull and len(convex_hull.getPoints()) > 0])
+
+            # Flip the hulls such that the corner nearest to the extruder is at the origin, then start printing nearest to the origin.
+            min_x = machine_size[0] - bounds[:, 2] if transform_x < 0 else bounds[:, 0]
+            min_y = machine_size[1] - bounds[:, 3] if transform_y < 0 else bounds[:, 1]
+            node_stack = [ordered_nodes[index] for index in numpy.lexsort((min_y, min_x))]
+
+        OneAtATimeIterator._cached_order = (cache_key, node_stack)
+        self._node_stack = list(node_stack)
+
+    def _getNodes(self) -> List[SceneNode]:
+        return [node for node in self._scene_node.getChildren() if issubclass(type(node), SceneNode)]
+
+    ##  Whether any of the bounding boxes intersects with the head hull of
+    #   another node.
+    #
+    #   Rather than testing every pair, the head hulls are sorted by their
+    #   left side, so that for each bounding box only the hulls that start left
+    #   of its right side need to be considered. Of those, only the ones whose
+    #   bounds overlap with the bounding box are tested exactly.
+    #   \param bounding_boxes The bounding box of each node.
+    #   \param head_hulls The head hull of each node, in the same order.
+    @classmethod
+    def _hasCollisions(cls, bounding_boxes: List[Polygon], head_hulls: List[Polygon]) -> bool:
+        if len(bounding_boxes) < 2:
+            return False
+        box_bounds = cls._getBounds(bounding_boxes)
+        hull_bounds = cls._getBounds(head_hulls)
+
+        order = numpy.argsort(hull_bounds[:, 0], kind = "mergesort")
+        sorted_hull_min_x = hull_bounds[order, 0]
+        for index, (min_x, min_y, max_x, max_y) in enumerate(box_bounds):
+            candidates = order[:numpy.searchsorted(sorted_hull_min_x, max_x, side = "right")]
+            candidates = candidates[(hull_bounds[candidates, 2] >= min_x) & (hull_bounds[candidates, 1] <= max_y) & (hull_bounds[candidates, 3] >= min_y) & (candidates != index)]
+            for other_index in candidates:
+                if bounding_boxes[index].intersectsPolygon(head_hulls[other_index]):
+                    return True
+        return False
+
+    ##  Gets the bounds of each of the polygons, as rows of minimum X, minimum
+    #   Y, maximum X and maximum Y.
+    @staticmethod
+    def _getBounds(polygons: List[Polygon]) -> numpy.ndarray:
+        if not polygons:
+            return numpy.zeros((0, 4), dtype = numpy.float64)
+        points = [polygon.getPoints() for polygon in polygons]
+        starts = numpy.cumsum([0] + [len(polygon_points) for polygon_points in points[:-1]])
+        all_points = numpy.concatenate(points).astype(numpy.float64)
+        return numpy.hstack([numpy.minimum.reduceat(all_points, starts, axis = 0), numpy.maximum.reduceat(all_points, starts, axis = 0)])
+
+    @staticmethod
+    def _getBoundingBoxPolygon(bounding_box: AxisAlignedBox) -> Polygon:
+        return Polygon([[bounding_box.left, bounding_box.front],
+                        [bounding_box.left, bounding_box.back],
+                        [bounding_box.right, bounding_box.back],
+                        [bounding_box.right, bounding_box.front]])
+
+    @staticmethod
+    def _getPolygonKey(polygon: Optional[Polygon]) -> Optional[bytes]:
+        if not polygon:
+            return None
+        return polygon.getPoints().tobytes()
@@ -0,0 +1,109 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import tempfile
+import threading
+import zlib
+from typing import List
+
+from UM.Job import Job
+from UM.Logger import Logger
+
+
+##  Compresses g-code with gzip into a temporary file, on a worker thread.
+#
+#   The g-code is compressed in batches as one gzip stream, so neither the
+#   complete g-code nor the complete compressed data is ever held in memory.
+#
+#   When the job is done with, call close() to delete the temporary file.
+class CompressGCodeJob(Job):
+    BatchSize = 256 * 1024  # Number of characters of g-code to compress at once.
+
+    def __init__(self, gcode: List[str], compress_level: int = 9) -> None:
+        super().__init__()
+        self._gcode = gcode
+        self._compress_level = compress_level
+
+        handle, self._path = tempfile.mkstemp(suffix = ".gcode.gz")
+        os.close(handle)
+
+        self._lock = threading.Lock()
+        self._done = False
+        self._abort_requested = False
+        self._remove_requested = False
+
+    ##  Aborts the compression.
+    #
+    #   Like with the other jobs, this is a request. The worker thread stops
+    #   compressing after the current batch of g-code.
+    def abort(self) -> None:
+        with self._lock:
+            self._abort_requested = True
+
+    def isAborted(self) -> bool:
+        return self._abort_requested
+
+    ##  Whether the compression stopped, because it finished, was aborted or
+    #   failed.
+    def isDone(self) -> bool:
+        with self._lock:
+            return self._done
+
+    ##  Gets the path to the file with the compressed g-code.
+    def getPath(self) -> str:
+        return self._path
+
+    ##  Aborts the compression if it is still running, and deletes the
+    #   temporary file.
+    def close(self) -> None:
+        with self._lock:
+            if not self._done:
+                # The worker thread removes the file when it stops.
+                self._abort_requested = True
+                self._remove_requested = True
+                return
+        self._removeFile()
+
+    def run(self) -> None:
+        compressor = zlib.compressobj(self._compress_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # 16 + the window size gives a gzip header.
+        line_count = len(self._gcode)
+        try:
+            with open(self._path, "wb") as f:
+                batched_lines = []  # type: List[str]
+                batched_lines_count = 0
+
+                # If the g-code was read from a file, it's a list of all lines in that file.
+                # Compressing line by line is extremely slow in that case, so we need to batch them.
+                for index, line in enumerate(self._gcode):
+                    if self._abort_requested:
+                        return
+                    batched_lines.append(line)
+                    batched_lines_count += len(line)
+
+                    if batched_lines_count >= self.BatchSize:
+                        f.write(compressor.compress("".join(batched_lines).encode("utf-8")))
+                        batched_lines = []
+                        batched_lines_count = 0
+                        self.progress.emit(self, 100 * (index + 1) / line_count)
+
+                f.write(compressor.compress("".join(batched_lines).encode("utf-8")) + compressor.flush())
+                self.setResult(self._path)
+                self.progress.emit(self, 100)
+        except EnvironmentError as e:
+            Logger.logException("e", "Unable to write the compressed g-code to {path}.".format(path = self._path))
+            self.setError(e)
+        finally:
+            with self._lock:
+                self._done = True
+                remove = self._remove_requested
+            if remove:
+                self._removeFile()
+
+    def _removeFile(self) -> None:
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
+        except EnvironmentError:
+            Logger.log("w", "Unable to remove the temporary file {path}.".format(path = self._path))
@@ -0,0 +1,170 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import QObject, QUrl, pyqtSignal
+from PyQt5.QtGui import QImage
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+from UM.Logger import Logger
+
+from cura.PrinterOutput.MJPGStreamParser import MJPGStreamParser
+
+
+##  Downloads a network MJPEG stream and decodes its frames on a worker thread.
+#
+#   The Qt thread only receives the data and picks out the frames, which is
+#   cheap. Decoding happens on a worker thread that only ever holds on to the
+#   latest frame: if frames come in faster than they can be decoded, or faster
+#   than the maximum frame rate, the older ones are dropped.
+#
+#   There is one stream per URL, shared by all views on that URL. Get it with
+#   acquire() and give it back with release() when the view is done with it.
+class MJPGStream(QObject):
+    _streams = {}  # type: Dict[str, MJPGStream]
+
+    ##  Emitted (on the Qt thread) when a new frame was decoded.
+    frameDecoded = pyqtSignal()
+
+    def __init__(self, url: QUrl, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._url = url
+
+        self._network_manager = None  # type: Optional[QNetworkAccessManager]
+        self._reply = None  # type: Optional[QNetworkReply]
+        self._parser = MJPGStreamParser()
+
+        self._max_frame_rates = []  # type: List[float]  # The maximum frame rate requested by each view.
+
+        self._condition = threading.Condition()
+        self._pending_frame = None  # type: Optional[bytes]
+        self._image = QImage()
+        self._generation = 0  # Incremented on every start, so that the decode thread of a previous run stops.
+
+    ##  Get the stream of a URL, starting it if nobody was watching it yet.
+    #
+    #   \param url The URL of the stream.
+    #   \param max_frame_rate The maximum number of frames per second that the
+    #   caller wants to see, or 0 for no limit. The stream decodes at the highest
+    #   rate that any of its views wants.
+    @classmethod
+    def acquire(cls, url: QUrl, max_frame_rate: float = 0) -> "MJPGStream":
+        key = url.toString()
+        stream = cls._streams.get(key)
+        if stream is None:
+            stream = MJPGStream(url)
+            cls._streams[key] = stream
+        stream._max_frame_rates.append(max_frame_rate)
+        if len(stream._max_frame_rates) == 1:
+            stream._start()
+        return stream
+
+    ##  Indicate that a view is no longer watching this stream. The stream is
+    #   stopped once nobody is watching it any more.
+    #
+    #   \param max_frame_rate The maximum frame rate that was passed to acquire().
+    def release(self, max_frame_rate: float = 0) -> None:
+        if max_frame_rate in self._max_frame_rates:
+            self._max_frame_rates.remove(max_frame_rate)
+        if self._max_frame_rates:
+            return
+        self._stop()
+        key = self._url.toString()
+        if self._streams.get(key) is self:
+            del self._streams[key]
+
+    def getUrl(self) -> QUrl:
+        return self._url
+
+    ##  Gets the last decoded frame.
+    def getImage(self) -> QImage:
+        with self._condition:
+            return self._image
+
+    ##  Gets the maximum number of frames per second that are decoded, or 0 if
+    #   there is no limit.
+    def getMaxFrameRate(self) -> float:
+        if not self._max_frame_rates or 0 in self._max_frame_rates:
+            return 0
+        return max(self._max_frame_rates)
+
+    def _start(self) -> None:
+        with self._condition:
+            self._generation += 1
+            self._pending_frame = None
+        threading.Thread(target = self._decodeFrames, args = (self._generation, ), name = "MJPGStream", daemon = True).start()
+
+        if self._network_manager is None:
+            self._network_manager = QNetworkAccessManager()
+        self._parser.reset()
+        self._reply = self._network_manager.get(QNetworkRequest(self._url))
+        self._reply.downloadProgress.connect(self._onStreamDownloadProgress)
+
+    def _stop(self) -> None:
+        if self._reply:
+            try:
+                try:
+                    self._reply.downloadProgress.disconnect(self._onStreamDownloadProgress)
+                except Exception:
+                    pass
+
+                if not self._reply.isFinished():
+                    self._reply.close()
+            except Exception:  # RuntimeError
+                pass  # It can happen that the wrapped c++ object is already deleted.
+            self._reply = None
+        self._network_manager = None
+        self._parser.reset()
+
+        with self._condition:
+            self._generation += 1
+            self._pending_frame = None
+            self._condition.notify_all()
+
+    def _onStreamDownloadProgress(self, bytes_received: int, bytes_total: int) -> None:
+        if self._reply is None:
+            return
+        try:
+            frame = self._parser.feed(bytes(self._reply.readAll()))
+        except ValueError:
+            Logger.log("w", "MJPEG buffer exceeds reasonable size. Restarting stream...")
+            self._stop()
+            self._start()
+            return
+
+        if frame is not None:
+            with self._condition:
+                self._pending_frame = frame  # Replaces any frame that wasn't decoded yet.
+                self._condition.notify_all()
+
+    ##  Decodes the latest frame whenever there is one, at no more than the
+    #   maximum frame rate. Runs on the worker thread, until the stream is
+    #   stopped or restarted.
+    #   \param generation The value of _generation when this thread was started.
+    def _decodeFrames(self, generation: int) -> None:
+        last_frame_time = 0.0
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending_frame is not None or self._generation != generation)
+                if self._generation != generation:
+                    return
+                frame = self._pending_frame
+                self._pending_frame = None
+
+            image = QImage.fromData(frame)
+            if image.isNull():
+                continue
+            with self._condition:
+                if self._generation != generation:
+                    return
+                self._image = image
+            self.frameDecoded.emit()
+
+            max_frame_rate = self.getMaxFrameRate()
+            if max_frame_rate > 0:
+                # Frames that come in while waiting replace each other, so only the latest one gets decoded.
+                time.sleep(max(0.0, last_frame_time + 1.0 / max_frame_rate - time.monotonic()))
+            last_frame_time = time.monotonic()
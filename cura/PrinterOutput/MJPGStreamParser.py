@@ -0,0 +1,137 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import re
+from typing import Optional
+
+
+##  Picks the JPEG frames out of an MJPEG stream as it comes in.
+#
+#   An MJPEG stream is a multipart stream with a JPEG image in every part. The
+#   headers of a part usually say how long the image is, in which case the
+#   frame is simply the given number of bytes after the headers.
+#
+#   If a part has no Content-Length, or the stream is just concatenated JPEG
+#   images without part headers, the frame is found by its markers instead.
+#   JPEG images start with the marker 0xFFD8 and end with 0xFFD9. A frame can
+#   contain another JPEG image, like the thumbnail in its EXIF data, so the
+#   markers are matched in pairs: the frame ends at the end marker that closes
+#   its own start marker. The data is scanned only once: the parser remembers
+#   where it left off, so feeding it a chunk only scans that chunk.
+#
+#   If a chunk completes more than one frame, only the last one is returned,
+#   so frames never pile up.
+class MJPGStreamParser:
+    MaximumFrameSize = 2000000  # No single camera frame should be 2 MB or larger.
+
+    _Markers = re.compile(b"\xff[\xd8\xd9]")  # The start and end of image markers.
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._frame_length = None  # type: Optional[int]  # The Content-Length of the part that is being received, if known.
+        self._frame_start = -1  # Where the frame that is being received starts in the buffer, if it's found by its markers.
+        self._depth = 0  # How many images in the frame that is being received are not closed yet.
+        self._scan_position = 0  # Where to continue looking for the next marker.
+
+    ##  Forget all data received so far.
+    def reset(self) -> None:
+        self._buffer = bytearray()
+        self._frame_length = None
+        self._frame_start = -1
+        self._depth = 0
+        self._scan_position = 0
+
+    ##  Add data received from the stream.
+    #
+    #   \param data The data that was received.
+    #   \return The last frame that was completed by this data, or None if no
+    #   frame was completed.
+    #   \raises ValueError The stream contains a frame that is too large to be
+    #   a camera frame. The parser is reset.
+    def feed(self, data: bytes) -> Optional[bytes]:
+        self._buffer += data
+
+        latest_frame = None
+        while True:
+            if self._frame_length is not None:
+                if len(self._buffer) < self._frame_length:
+                    break
+                latest_frame = bytes(self._buffer[:self._frame_length])
+                self._discard(self._frame_length)
+                self._frame_length = None
+                continue
+
+            if self._frame_start == -1:  # Between frames, so the headers of the next part may come first.
+                self._discard(len(self._buffer) - len(self._buffer.lstrip(b"\r\n")))  # The line break after the previous frame.
+                if len(self._buffer) < 2:
+                    break  # Can't tell yet whether part headers or a frame come next.
+                if self._buffer.startswith(b"--"):  # The boundary.
+                    if not self._readPartHeaders():
+                        break
+                    continue
+
+            frame = self._scanForFrame()
+            if frame is None:
+                break
+            latest_frame = frame
+
+        if len(self._buffer) > self.MaximumFrameSize or (self._frame_length is not None and self._frame_length > self.MaximumFrameSize):
+            self.reset()
+            raise ValueError("MJPEG frame exceeds reasonable size.")
+        return latest_frame
+
+    ##  Reads the headers of the part at the start of the buffer, and removes
+    #   them from the buffer.
+    #
+    #   If the headers contain the Content-Length, the length of the frame is
+    #   stored in self._frame_length.
+    #   \return Whether the headers were complete.
+    def _readPartHeaders(self) -> bool:
+        headers_end = self._buffer.find(b"\r\n\r\n")
+        if headers_end == -1:
+            return False
+        for line in bytes(self._buffer[:headers_end]).split(b"\r\n")[1:]:  # The first line is the boundary.
+            name, _, value = line.partition(b":")
+            if name.strip().lower() != b"content-length":
+                continue
+            try:
+                frame_length = int(value.strip())
+            except ValueError:  # Find the end of the frame by its markers instead.
+                continue
+            if frame_length > 0:
+                self._frame_length = frame_length
+        self._discard(headers_end + len(b"\r\n\r\n"))
+        return True
+
+    ##  Finds the end of the frame that is being received by its markers.
+    #   \return The frame, if it is complete.
+    def _scanForFrame(self) -> Optional[bytes]:
+        while True:
+            match = self._Markers.search(self._buffer, self._scan_position)
+            if match is None:
+                # Keep looking from the last byte, since that may be the first half of a marker.
+                self._scan_position = max(self._scan_position, len(self._buffer) - 1)
+                # Drop everything before the frame that is being received.
+                self._discard(self._frame_start if self._frame_start != -1 else self._scan_position)
+                return None
+            self._scan_position = match.end()
+            if match.group() == b"\xff\xd8":
+                if self._frame_start == -1:
+                    self._frame_start = match.start()
+                self._depth += 1
+            elif self._frame_start != -1:  # An end marker outside of a frame is ignored.
+                self._depth -= 1
+                if self._depth == 0:
+                    frame = bytes(self._buffer[self._frame_start:match.end()])
+                    self._frame_start = -1
+                    self._discard(match.end())
+                    return frame
+
+    ##  Removes data from the start of the buffer.
+    def _discard(self, length: int) -> None:
+        if length <= 0:
+            return
+        del self._buffer[:length]
+        self._scan_position = max(0, self._scan_position - length)
+        if self._frame_start != -1:
+            self._frame_start -= length
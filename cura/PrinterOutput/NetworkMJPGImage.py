@@ -1,27 +1,27 @@
 # Copyright (c) 2018 Aldo Hoeben / fieldOfView
 # NetworkMJPGImage is released under the terms of the LGPLv3 or higher.
 
-from PyQt5.QtCore import QUrl, pyqtProperty, pyqtSignal, pyqtSlot, QRect, QByteArray
+from typing import Optional
+
+from PyQt5.QtCore import QUrl, pyqtProperty, pyqtSignal, pyqtSlot, QRect
 from PyQt5.QtGui import QImage, QPainter
 from PyQt5.QtQuick import QQuickPaintedItem
-from PyQt5.QtNetwork import QNetworkRequest, QNetworkReply, QNetworkAccessManager
 
 from UM.Logger import Logger
 
+from cura.PrinterOutput.MJPGStream import MJPGStream
+
 #
-# A QQuickPaintedItem that progressively downloads a network mjpeg stream,
-# picks it apart in individual jpeg frames, and paints it.
+# A QQuickPaintedItem that shows a network mjpeg stream. The stream is downloaded and decoded by an MJPGStream, which
+# is shared by all items showing the same URL.
 #
 class NetworkMJPGImage(QQuickPaintedItem):
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
 
-        self._stream_buffer = QByteArray()
-        self._stream_buffer_start_index = -1
-        self._network_manager = None  # type: QNetworkAccessManager
-        self._image_request = None  # type: QNetworkRequest
-        self._image_reply = None  # type: QNetworkReply
+        self._stream = None  # type: Optional[MJPGStream]
+        self._stream_max_frame_rate = 0.0  # The maximum frame rate the stream was acquired with.
         self._image = QImage()
         self._image_rect = QRect()
 
@@ -29,6 +29,7 @@ class NetworkMJPGImage(QQuickPaintedItem):
         self._started = False
 
         self._mirror = False
+        self._max_frame_rate = 0.0
 
         self.setAntialiasing(True)
 
@@ -70,6 +71,22 @@ class NetworkMJPGImage(QQuickPaintedItem):
     mirrorChanged = pyqtSignal()
     mirror = pyqtProperty(bool, fget = getMirror, fset = setMirror, notify = mirrorChanged)
 
+    ##  Set the maximum number of frames per second to show, or 0 to show every
+    #   frame.
+    def setMaxFrameRate(self, max_frame_rate: float) -> None:
+        if max_frame_rate == self._max_frame_rate:
+            return
+        self._max_frame_rate = max_frame_rate
+        self.maxFrameRateChanged.emit()
+        if self._started:
+            self.start()
+
+    def getMaxFrameRate(self) -> float:
+        return self._max_frame_rate
+
+    maxFrameRateChanged = pyqtSignal()
+    maxFrameRate = pyqtProperty(float, fget = getMaxFrameRate, fset = setMaxFrameRate, notify = maxFrameRateChanged)
+
     imageSizeChanged = pyqtSignal()
 
     @pyqtProperty(int, notify = imageSizeChanged)
@@ -90,64 +107,31 @@ class NetworkMJPGImage(QQuickPaintedItem):
             return
         self._started = True
 
-        self._image_request = QNetworkRequest(self._source_url)
-        if self._network_manager is None:
-            self._network_manager = QNetworkAccessManager()
-
-        self._image_reply = self._network_manager.get(self._image_request)
-        self._image_reply.downloadProgress.connect(self._onStreamDownloadProgress)
+        self._stream_max_frame_rate = self._max_frame_rate
+        self._stream = MJPGStream.acquire(self._source_url, self._stream_max_frame_rate)
+        self._stream.frameDecoded.connect(self._onFrameDecoded)
+        if not self._stream.getImage().isNull():  # Another view is already showing this stream.
+            self._onFrameDecoded()
 
     @pyqtSlot()
     def stop(self) -> None:
-        self._stream_buffer = QByteArray()
-        self._stream_buffer_start_index = -1
-
-        if self._image_reply:
+        if self._stream:
             try:
-                try:
-                    self._image_reply.downloadProgress.disconnect(self._onStreamDownloadProgress)
-                except Exception:
-                    pass
-
-                if not self._image_reply.isFinished():
-                    self._image_reply.close()
-            except Exception as e:  # RuntimeError
+                self._stream.frameDecoded.disconnect(self._onFrameDecoded)
+            except Exception:  # RuntimeError or TypeError
                 pass  # It can happen that the wrapped c++ object is already deleted.
-
-            self._image_reply = None
-            self._image_request = None
-
-        self._network_manager = None
+            self._stream.release(self._stream_max_frame_rate)
+            self._stream = None
 
         self._started = False
 
-
-    def _onStreamDownloadProgress(self, bytes_received: int, bytes_total: int) -> None:
-        # An MJPG stream is (for our purpose) a stream of concatenated JPG images.
-        # JPG images start with the marker 0xFFD8, and end with 0xFFD9
-        if self._image_reply is None:
+    def _onFrameDecoded(self) -> None:
+        if self._stream is None:
             return
-        self._stream_buffer += self._image_reply.readAll()
+        self._image = self._stream.getImage()
 
-        if len(self._stream_buffer) > 2000000:  # No single camera frame should be 2 Mb or larger
-            Logger.log("w", "MJPEG buffer exceeds reasonable size. Restarting stream...")
-            self.stop()  # resets stream buffer and start index
-            self.start()
-            return
+        if self._image.rect() != self._image_rect:
+            self._image_rect = self._image.rect()
+            self.imageSizeChanged.emit()
 
-        if self._stream_buffer_start_index == -1:
-            self._stream_buffer_start_index = self._stream_buffer.indexOf(b'\xff\xd8')
-        stream_buffer_end_index = self._stream_buffer.lastIndexOf(b'\xff\xd9')
-        # If this happens to be more than a single frame, then so be it; the JPG decoder will
-        # ignore the extra data. We do it like this in order not to get a buildup of frames
-
-        if self._stream_buffer_start_index != -1 and stream_buffer_end_index != -1:
-            jpg_data = self._stream_buffer[self._stream_buffer_start_index:stream_buffer_end_index + 2]
-            self._stream_buffer = self._stream_buffer[stream_buffer_end_index + 2:]
-            self._stream_buffer_start_index = -1
-            self._image.loadFromData(jpg_data)
-
-            if self._image.rect() != self._image_rect:
-                self.imageSizeChanged.emit()
-
-            self.update()
+        self.update()
@@ -7,16 +7,16 @@ from UM.Scene.SceneNode import SceneNode #For typing.
 from cura.API import Account
 from cura.CuraApplication import CuraApplication
 
+from cura.PrinterOutput.CompressGCodeJob import CompressGCodeJob
 from cura.PrinterOutput.PrinterOutputDevice import PrinterOutputDevice, ConnectionState, ConnectionType
 
 from PyQt5.QtNetwork import QHttpMultiPart, QHttpPart, QNetworkRequest, QNetworkAccessManager, QNetworkReply, QAuthenticator
-from PyQt5.QtCore import pyqtProperty, pyqtSignal, pyqtSlot, QObject, QUrl, QCoreApplication
+from PyQt5.QtCore import pyqtProperty, pyqtSignal, pyqtSlot, QIODevice, QObject, QUrl
 from time import time
 from typing import Callable, Dict, List, Optional, Union
 from enum import IntEnum
 
 import os  # To get the username
-import gzip
 
 from cura.Settings.CuraContainerRegistry import CuraContainerRegistry
 
@@ -58,6 +58,7 @@ class NetworkedPrinterOutputDevice(PrinterOutputDevice):
         self._sending_gcode = False
         self._compressing_gcode = False
         self._gcode = []                    # type: List[str]
+        self._compress_gcode_job = None     # type: Optional[CompressGCodeJob]
         self._connection_state_before_timeout = None    # type: Optional[ConnectionState]
 
     def requestWrite(self, nodes: List[SceneNode], file_name: Optional[str] = None, limit_mimetypes: bool = False,
@@ -73,47 +74,41 @@ class NetworkedPrinterOutputDevice(PrinterOutputDevice):
     def authenticationState(self) -> AuthState:
         return self._authentication_state
 
-    def _compressDataAndNotifyQt(self, data_to_append: str) -> bytes:
-        compressed_data = gzip.compress(data_to_append.encode("utf-8"))
-        self._progress_message.setProgress(-1)  # Tickle the message so that it's clear that it's still being used.
-        QCoreApplication.processEvents()  # Ensure that the GUI does not freeze.
-
-        # Pretend that this is a response, as zipping might take a bit of time.
-        # If we don't do this, the device might trigger a timeout.
-        self._last_response_time = time()
-        return compressed_data
-
-    def _compressGCode(self) -> Optional[bytes]:
+    ##  Starts compressing the g-code in self._gcode on a worker thread.
+    #
+    #   While compressing, the device doesn't time out. Setting
+    #   self._compressing_gcode to False aborts the compression.
+    #   \param on_finished Called on the Qt thread with the job when the
+    #   compression stopped. Check whether the job was aborted or has an error
+    #   before using the result. The job has to be closed when its result is no
+    #   longer needed.
+    #   \return The job compressing the g-code.
+    def _compressGCode(self, on_finished: Callable[[CompressGCodeJob], None]) -> CompressGCodeJob:
+        if self._compress_gcode_job is not None:
+            self._compress_gcode_job.close()
         self._compressing_gcode = True
 
-        ## Mash the data into single string
-        max_chars_per_line = int(1024 * 1024 / 4)  # 1/4 MB per line.
-        file_data_bytes_list = []
-        batched_lines = []
-        batched_lines_count = 0
-
-        for line in self._gcode:
-            if not self._compressing_gcode:
-                self._progress_message.hide()
-                # Stop trying to zip / send as abort was called.
-                return None
-
-            # if the gcode was read from a gcode file, self._gcode will be a list of all lines in that file.
-            # Compressing line by line in this case is extremely slow, so we need to batch them.
-            batched_lines.append(line)
-            batched_lines_count += len(line)
+        job = CompressGCodeJob(self._gcode)
+        self._compress_gcode_job = job
+        job.progress.connect(self._onCompressGCodeProgress)
+        job.finished.connect(self._onCompressGCodeFinished)
+        job.finished.connect(on_finished)
+        job.start()
+        return job
+
+    def _onCompressGCodeProgress(self, job: CompressGCodeJob, progress: float) -> None:
+        if not self._compressing_gcode:
+            # Stop compressing, as abort was called.
+            job.abort()
+            return
 
-            if batched_lines_count >= max_chars_per_line:
-                file_data_bytes_list.append(self._compressDataAndNotifyQt("".join(batched_lines)))
-                batched_lines = []
-                batched_lines_count = 0
+        # Pretend that this is a response, as compressing might take a bit of time.
+        # If we don't do this, the device might trigger a timeout.
+        self._last_response_time = time()
 
-        # Don't miss the last batch (If any)
-        if len(batched_lines) != 0:
-            file_data_bytes_list.append(self._compressDataAndNotifyQt("".join(batched_lines)))
-
-        self._compressing_gcode = False
-        return b"".join(file_data_bytes_list)
+    def _onCompressGCodeFinished(self, job: CompressGCodeJob) -> None:
+        if job is self._compress_gcode_job:
+            self._compressing_gcode = False
 
     def _update(self) -> None:
         if self._last_response_time:
@@ -299,12 +294,28 @@ class NetworkedPrinterOutputDevice(PrinterOutputDevice):
         else:
             Logger.log("e", "Could not find manager.")
 
-    def postForm(self, target: str, header_data: str, body_data: bytes, on_finished: Optional[Callable[[QNetworkReply], None]], on_progress: Callable = None) -> None:
+    ##  Sends a form with a single part.
+    #  \param body_data The data of the part, or a device that is opened for
+    #  reading to take the data from, such as a QFile. The device is deleted
+    #  along with the request.
+    #  \return The reply to the request, or None if it could not be sent. The
+    #  device is closed in that case.
+    def postForm(self, target: str, header_data: str, body_data: Union[bytes, QIODevice], on_finished: Optional[Callable[[QNetworkReply], None]], on_progress: Callable = None) -> Optional[QNetworkReply]:
         post_part = QHttpPart()
         post_part.setHeader(QNetworkRequest.ContentDispositionHeader, header_data)
-        post_part.setBody(body_data)
+        if isinstance(body_data, QIODevice):
+            post_part.setBodyDevice(body_data)
+        else:
+            post_part.setBody(body_data)
 
-        self.postFormWithParts(target, [post_part], on_finished, on_progress)
+        reply = self.postFormWithParts(target, [post_part], on_finished, on_progress)
+        if isinstance(body_data, QIODevice):
+            if reply is None:
+                body_data.close()
+                return None
+            # The device has to stay alive until the data is sent, so tie it to the multi-part that is kept alive.
+            body_data.setParent(self._kept_alive_multiparts.get(reply))
+        return reply
 
     def _onAuthenticationRequired(self, reply: QNetworkReply, authenticator: QAuthenticator) -> None:
         Logger.log("w", "Request to {url} required authentication, which was not implemented".format(url = reply.url().toString()))
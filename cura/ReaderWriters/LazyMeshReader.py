@@ -0,0 +1,49 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, Union
+
+from UM.Logger import Logger
+from UM.Mesh.MeshReader import MeshReader
+
+if TYPE_CHECKING:
+    from UM.Scene.SceneNode import SceneNode
+
+
+##  A mesh reader that only imports and creates the actual reader of its
+#   plug-in when a file is read with it for the first time.
+#
+#   The file types it accepts are taken from the "mesh_reader" metadata of the
+#   plug-in, so registering it doesn't require importing the implementation
+#   of the reader (and its dependencies such as numpy or Qt modules). This
+#   keeps start-up fast and memory use low for readers of file types that are
+#   rarely used.
+class LazyMeshReader(MeshReader):
+    ##  Creates the lazy reader.
+    #
+    #   \param reader_metadata The "mesh_reader" metadata of the plug-in.
+    #   \param create_reader Function that imports and creates the actual
+    #   reader.
+    def __init__(self, reader_metadata: List[Dict[str, Any]], create_reader: Callable[[], MeshReader]) -> None:
+        super().__init__()
+        self._supported_extensions = ["." + file_type["extension"] for file_type in reader_metadata]
+        self._create_reader = create_reader
+        self._reader = None  # type: Optional[MeshReader]
+
+    ##  Gets the actual reader, creating it if it wasn't created yet.
+    def getReader(self) -> MeshReader:
+        if self._reader is None:
+            Logger.log("d", "Activating mesh reader of plug-in {plugin_id} on first use.".format(plugin_id = self.getPluginId()))
+            self._reader = self._create_reader()
+            self._reader.setPluginId(self.getPluginId())
+            self._reader.setVersion(self.getVersion())
+        return self._reader
+
+    def isActivated(self) -> bool:
+        return self._reader is not None
+
+    def preRead(self, file_name: str, *args: Any, **kwargs: Any) -> MeshReader.PreReadResult:
+        return self.getReader().preRead(file_name, *args, **kwargs)
+
+    def read(self, file_name: str) -> Union["SceneNode", List["SceneNode"]]:
+        return self.getReader().read(file_name)
@@ -0,0 +1,38 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from typing import Callable, Optional
+
+from UM.Logger import Logger
+
+from cura.ReaderWriters.ProfileReader import ProfileReader
+
+
+##  A profile reader that only imports and creates the actual reader of its
+#   plug-in when a profile is imported with it for the first time.
+#
+#   \sa LazyMeshReader
+class LazyProfileReader(ProfileReader):
+    ##  Creates the lazy reader.
+    #
+    #   \param create_reader Function that imports and creates the actual
+    #   reader.
+    def __init__(self, create_reader: Callable[[], ProfileReader]) -> None:
+        super().__init__()
+        self._create_reader = create_reader
+        self._reader = None  # type: Optional[ProfileReader]
+
+    ##  Gets the actual reader, creating it if it wasn't created yet.
+    def getReader(self) -> ProfileReader:
+        if self._reader is None:
+            Logger.log("d", "Activating profile reader of plug-in {plugin_id} on first use.".format(plugin_id = self.getPluginId()))
+            self._reader = self._create_reader()
+            self._reader.setPluginId(self.getPluginId())
+            self._reader.setVersion(self.getVersion())
+        return self._reader
+
+    def isActivated(self) -> bool:
+        return self._reader is not None
+
+    def read(self, file_name):
+        return self.getReader().read(file_name)
@@ -0,0 +1,142 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+import numpy
+
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshData import MeshData
+from UM.Scene.SceneNode import SceneNode
+
+if TYPE_CHECKING:
+    from cura.Scene.ConvexHullNode import ConvexHullNode
+
+
+##  Draws the shadows of many convex hull nodes in a single draw call.
+#
+#   Every convex hull node has its own small mesh. Queueing each of them
+#   separately means a draw call per hull (and another one per head hull in
+#   one-at-a-time mode), which is slow with hundreds of objects. All hulls
+#   are drawn with the same shader, and their meshes are already in scene
+#   coordinates, so they are packed into a single mesh here instead.
+#
+#   The packed mesh is only rebuilt completely when hulls are added or removed.
+#   When a hull is recomputed, e.g. every frame while its object is dragged,
+#   only the part of the packed arrays that belongs to that hull is rewritten,
+#   as long as its number of vertices didn't change. Moving the camera or
+#   re-rendering for other reasons reuses the mesh that was uploaded before.
+class ConvexHullBatch:
+    def __init__(self) -> None:
+        self._meshes = []  # type: List[MeshData]  # The meshes that were packed, in order.
+        self._ranges = []  # type: List[Tuple[int, int]]  # Where the vertices of each of those meshes are in the packed arrays.
+        self._vertices = None  # type: Optional[numpy.ndarray]
+        self._normals = None  # type: Optional[numpy.ndarray]  # None if the normals were calculated for the packed mesh.
+        self._mesh = None  # type: Optional[MeshData]
+
+        # The packed mesh is queued with this node, which is not in the scene, so that it isn't transformed.
+        self._node = SceneNode()
+        self._node.setCalculateBoundingBox(False)
+
+    ##  Queues the hulls of the given nodes for rendering.
+    #   \param renderer The renderer to queue the hulls in.
+    #   \param hull_nodes The convex hull nodes to draw. Nodes that shouldn't be
+    #   rendered at the moment are skipped.
+    def render(self, renderer, hull_nodes: List["ConvexHullNode"]) -> None:
+        meshes = []  # type: List[MeshData]
+        shader = None
+        for hull_node in hull_nodes:
+            if not hull_node.shouldBeRendered():
+                continue
+            shader = hull_node.getShader()
+            meshes.append(hull_node.getMeshData())
+            head_mesh = hull_node.getConvexHullHeadMesh()
+            if head_mesh:
+                meshes.append(head_mesh)
+
+        if not self._updateMeshes(meshes):
+            self._packMeshes(meshes)
+
+        if self._mesh is not None:
+            renderer.queueNode(self._node, mesh = self._mesh, shader = shader, transparent = True, backface_cull = True, sort = -8)
+
+    ##  Rewrites the parts of the packed arrays of the meshes that changed
+    #   since they were packed.
+    #   \param meshes The meshes to draw, in the same order as last time.
+    #   \return Whether the packed mesh is up to date now. If meshes were added
+    #   or removed, or if a changed mesh has a different number of vertices,
+    #   everything needs to be packed again.
+    def _updateMeshes(self, meshes: List[MeshData]) -> bool:
+        if len(meshes) != len(self._meshes):
+            return False
+        changed_indices = [index for index, (mesh, packed_mesh) in enumerate(zip(meshes, self._meshes)) if mesh is not packed_mesh]
+        if not changed_indices:
+            return True
+        if self._vertices is None or self._normals is None:
+            return False
+
+        updates = []
+        for index in changed_indices:
+            vertices, normals = self._getTriangles(meshes[index])
+            start, end = self._ranges[index]
+            if normals is None or len(vertices) != end - start:
+                return False
+            updates.append((start, end, vertices, normals))
+        for start, end, vertices, normals in updates:
+            self._vertices[start:end] = vertices
+            self._normals[start:end] = normals
+
+        self._meshes = meshes
+        self._mesh = MeshData(vertices = self._vertices, normals = self._normals)  # Copies the arrays, so they can be changed again later.
+        return True
+
+    ##  Packs the triangles of all given meshes into a single mesh.
+    #
+    #   The shader lights the hulls, so the normals are packed along with the
+    #   vertices. If a mesh has no normals, they are calculated for the packed
+    #   mesh instead.
+    def _packMeshes(self, meshes: List[MeshData]) -> None:
+        vertex_arrays = []
+        normal_arrays = []
+        ranges = []
+        vertex_count = 0
+        for mesh in meshes:
+            vertices, normals = self._getTriangles(mesh)
+            ranges.append((vertex_count, vertex_count + len(vertices)))
+            vertex_count += len(vertices)
+            vertex_arrays.append(vertices)
+            normal_arrays.append(normals)
+
+        self._meshes = meshes
+        self._ranges = ranges
+        if vertex_count == 0:
+            self._vertices = None
+            self._normals = None
+            self._mesh = None
+            return
+
+        self._vertices = numpy.concatenate(vertex_arrays).astype(numpy.float32)
+        if all(normals is not None for normals in normal_arrays):
+            self._normals = numpy.concatenate(normal_arrays).astype(numpy.float32)
+            self._mesh = MeshData(vertices = self._vertices, normals = self._normals)
+        else:
+            self._normals = None
+            builder = MeshBuilder()
+            builder.setVertices(self._vertices)
+            builder.calculateNormals()
+            self._mesh = builder.build()
+
+    ##  Gets the vertices of the triangles of a mesh, without indices, and
+    #   their normals if the mesh has them.
+    @staticmethod
+    def _getTriangles(mesh: MeshData) -> Tuple[numpy.ndarray, Optional[numpy.ndarray]]:
+        vertices = mesh.getVertices()
+        if vertices is None:
+            return numpy.zeros((0, 3), dtype = numpy.float32), numpy.zeros((0, 3), dtype = numpy.float32)
+        normals = mesh.getNormals() if mesh.hasNormals() else None
+        if mesh.hasIndices():
+            indices = mesh.getIndices().ravel()
+            vertices = vertices[indices]
+            if normals is not None:
+                normals = normals[indices]
+        return vertices, normals
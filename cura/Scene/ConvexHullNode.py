@@ -2,6 +2,8 @@
 # Cura is released under the terms of the LGPLv3 or higher.
 from typing import Optional
 
+import numpy
+
 from UM.Application import Application
 from UM.Math.Polygon import Polygon
 from UM.Qt.QtApplication import QtApplication
@@ -9,6 +11,7 @@ from UM.Scene.SceneNode import SceneNode
 from UM.Resources import Resources
 from UM.Math.Color import Color
 from UM.Mesh.MeshBuilder import MeshBuilder  # To create a mesh to display the convex hull with.
+from UM.Mesh.MeshData import MeshData
 from UM.View.GL.OpenGL import OpenGL
 
 
@@ -43,7 +46,8 @@ class ConvexHullNode(SceneNode):
 
         # The node this mesh is "watching"
         self._node = node
-        self._convex_hull_head_mesh = None
+        self._convex_hull_head_mesh = None  # type: Optional[MeshData]
+        self._convex_hull_head = None  # type: Optional[Polygon]  # The head hull that the mesh was built from.
 
         self._node.decoratorsChanged.connect(self._onNodeDecoratorsChanged)
         self._onNodeDecoratorsChanged(self._node)
@@ -68,23 +72,39 @@ class ConvexHullNode(SceneNode):
     def getWatchedNode(self):
         return self._node
 
-    def render(self, renderer):
+    ##  Gets the shader that all hulls are drawn with.
+    def getShader(self):
         if not ConvexHullNode.shader:
             ConvexHullNode.shader = OpenGL.getInstance().createShaderProgram(Resources.getPath(Resources.Shaders, "transparent_object.shader"))
             ConvexHullNode.shader.setUniformValue("u_diffuseColor", self._color)
             ConvexHullNode.shader.setUniformValue("u_opacity", 0.6)
+        return ConvexHullNode.shader
+
+    def render(self, renderer):
+        self.getShader()
 
-        if self.getParent():
-            if self.getMeshData() and isinstance(self._node, SceneNode) and self._node.callDecoration("getBuildPlateNumber") == Application.getInstance().getMultiBuildPlateModel().activeBuildPlate:
-                renderer.queueNode(self, transparent = True, shader = ConvexHullNode.shader, backface_cull = True, sort = -8)
-                if self._convex_hull_head_mesh:
-                    renderer.queueNode(self, shader = ConvexHullNode.shader, transparent = True, mesh = self._convex_hull_head_mesh, backface_cull = True, sort = -8)
+        if self.shouldBeRendered():
+            renderer.queueNode(self, transparent = True, shader = ConvexHullNode.shader, backface_cull = True, sort = -8)
+            if self._convex_hull_head_mesh:
+                renderer.queueNode(self, shader = ConvexHullNode.shader, transparent = True, mesh = self._convex_hull_head_mesh, backface_cull = True, sort = -8)
 
         return True
 
+    ##  Whether this hull should currently be shown, i.e. whether it is in the
+    #   scene and its node is on the active build plate.
+    def shouldBeRendered(self) -> bool:
+        if not self.getParent() or not self.getMeshData() or not isinstance(self._node, SceneNode):
+            return False
+        return self._node.callDecoration("getBuildPlateNumber") == Application.getInstance().getMultiBuildPlateModel().activeBuildPlate
+
+    ##  Gets the mesh of the head hull, for one-at-a-time mode, if any.
+    def getConvexHullHeadMesh(self) -> Optional[MeshData]:
+        return self._convex_hull_head_mesh
+
     def _onNodeDecoratorsChanged(self, node: SceneNode) -> None:
         convex_hull_head = self._node.callDecoration("getConvexHullHead")
-        if convex_hull_head:
+        if convex_hull_head and (self._convex_hull_head is None or not numpy.array_equal(convex_hull_head.getPoints(), self._convex_hull_head.getPoints())):
+            self._convex_hull_head = convex_hull_head  # Only build the mesh again if the head hull actually changed.
             convex_hull_head_builder = MeshBuilder()
             convex_hull_head_builder.addConvexPolygon(convex_hull_head.getPoints(), self._mesh_height - self._thickness)
             self._convex_hull_head_mesh = convex_hull_head_builder.build()
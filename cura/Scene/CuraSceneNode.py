@@ -9,6 +9,7 @@ from UM.Math.AxisAlignedBox import AxisAlignedBox
 from UM.Math.Polygon import Polygon #For typing.
 from UM.Scene.SceneNode import SceneNode
 from UM.Scene.SceneNodeDecorator import SceneNodeDecorator #To cast the deepcopy of every decorator back to SceneNodeDecorator.
+from UM.Signal import Signal
 
 import cura.CuraApplication #To get the build plate.
 from cura.Settings.ExtruderStack import ExtruderStack #For typing.
@@ -22,9 +23,15 @@ class CuraSceneNode(SceneNode):
         if not no_setting_override:
             self.addDecorator(SettingOverrideDecorator())  # now we always have a getActiveExtruderPosition, unless explicitly disabled
         self._outside_buildarea = False
+        # Emitted when the node moves into or out of the build area. The build volume checks that after the scene
+        # changed, so sceneChanged isn't emitted for it.
+        self.outsideBuildAreaChanged = Signal()
 
     def setOutsideBuildArea(self, new_value: bool) -> None:
+        if self._outside_buildarea == new_value:
+            return
         self._outside_buildarea = new_value
+        self.outsideBuildAreaChanged.emit(self)
 
     def isOutsideBuildArea(self) -> bool:
         return self._outside_buildarea or self.callDecoration("getBuildPlateNumber") < 0
@@ -0,0 +1,142 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import pickle
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+from UM.Logger import Logger
+
+
+##  One cached file: the stat signature it was parsed with and all metadata it
+#   produced. Material files produce more than one metadata dict (one per
+#   machine/variant combination), so the metadata is stored as a list.
+#
+#   The dependencies are a fingerprint of whatever else the parser looked at,
+#   or None if the metadata only depends on the file itself.
+_CacheEntry = NamedTuple("_CacheEntry", [("mtime_ns", int), ("size", int), ("dependencies", Optional[str]), ("metadata", List[Dict[str, Any]])])
+
+
+##  On-disk cache of container metadata, keyed by the file it was parsed from.
+#
+#   Parsing every definition, quality, variant and material file on start-up
+#   is the bulk of the "Loading machines..." phase. This cache stores the
+#   result of that parsing in a single pickle file. An entry is only used if
+#   the file on disk still has the same modification time and size as when it
+#   was parsed, so only changed files get parsed again. Metadata that also
+#   depends on other files, like that of materials, which depends on the
+#   machines and build plates that are installed, is stored with a fingerprint
+#   of those dependencies and is only used while that fingerprint is the same.
+#
+#   The cache is invalidated as a whole when the schema version or the
+#   application version changes, since the parsers may produce different
+#   metadata in a different version.
+class ContainerMetadataCache:
+    Version = 2
+
+    def __init__(self, cache_file_path: str, application_version: str = "") -> None:
+        self._cache_file_path = cache_file_path
+        self._application_version = application_version
+        self._entries = {}  # type: Dict[str, _CacheEntry]
+        self._used_paths = set()  # type: Set[str]
+        self._is_dirty = False
+
+    def getCacheFilePath(self) -> str:
+        return self._cache_file_path
+
+    ##  Read the cache file from disk in one go.
+    #
+    #   A missing, corrupt or outdated cache file results in an empty cache.
+    def load(self) -> None:
+        self._entries = {}
+        self._used_paths = set()
+        self._is_dirty = False
+        try:
+            with open(self._cache_file_path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:  # Pickle can raise just about anything on a corrupt file.
+            Logger.log("w", "Unable to read container metadata cache {path}: {err}".format(path = self._cache_file_path, err = str(e)))
+            self._is_dirty = True  # Overwrite the corrupt file.
+            return
+
+        if not isinstance(data, dict) or data.get("version") != self.Version or data.get("application_version") != self._application_version:
+            Logger.log("i", "Container metadata cache is outdated, it will be rebuilt.")
+            self._is_dirty = True
+            return
+        self._entries = data.get("entries", {})
+
+    ##  Write the cache to disk if anything changed since it was loaded.
+    #
+    #   Entries for files that were not looked up since the last load are
+    #   dropped, so the cache doesn't keep growing with deleted files. The file
+    #   is first written to a temporary file and then moved into place, so an
+    #   interrupted write never leaves a truncated cache behind.
+    def save(self) -> None:
+        if not self._used_paths and not self._is_dirty:
+            return  # Nothing was looked up, so we can't tell which entries are stale.
+        stale_paths = set(self._entries.keys()) - self._used_paths
+        if stale_paths:
+            for path in stale_paths:
+                del self._entries[path]
+            self._is_dirty = True
+        if not self._is_dirty:
+            return
+
+        data = {
+            "version": self.Version,
+            "application_version": self._application_version,
+            "entries": self._entries
+        }
+        temporary_path = self._cache_file_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self._cache_file_path), exist_ok = True)
+            with open(temporary_path, "wb") as f:
+                pickle.dump(data, f, protocol = pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self._cache_file_path)
+        except EnvironmentError as e:
+            Logger.log("w", "Unable to write container metadata cache {path}: {err}".format(path = self._cache_file_path, err = str(e)))
+            return
+        self._is_dirty = False
+
+    ##  Get the metadata that was parsed from a file, if it is still valid.
+    #
+    #   \param file_path The file the metadata was parsed from.
+    #   \param dependencies The current fingerprint of the other files that the
+    #   metadata may depend on.
+    #   \return The list of metadata parsed from that file, or None if the file
+    #   is not in the cache, changed since it was parsed or if the metadata
+    #   depends on other files that changed.
+    def get(self, file_path: str, dependencies: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        self._used_paths.add(file_path)
+        entry = self._entries.get(file_path)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except EnvironmentError:
+            return None
+        if stat.st_mtime_ns != entry.mtime_ns or stat.st_size != entry.size:
+            return None
+        if entry.dependencies is not None and entry.dependencies != dependencies:
+            return None
+        return entry.metadata
+
+    ##  Store the metadata that was parsed from a file.
+    #
+    #   \param file_path The file the metadata was parsed from.
+    #   \param metadata All metadata that was parsed from that file.
+    #   \param dependencies A fingerprint of the other files that the metadata
+    #   depends on, or None if it only depends on the file itself.
+    def put(self, file_path: str, metadata: List[Dict[str, Any]], dependencies: Optional[str] = None) -> None:
+        try:
+            stat = os.stat(file_path)
+        except EnvironmentError:
+            return
+        self._used_paths.add(file_path)
+        self._entries[file_path] = _CacheEntry(mtime_ns = stat.st_mtime_ns, size = stat.st_size, dependencies = dependencies, metadata = metadata)
+        self._is_dirty = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
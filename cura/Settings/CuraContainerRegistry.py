@@ -1,6 +1,7 @@
 # Copyright (c) 2019 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
+import hashlib
 import os
 import re
 import configparser
@@ -25,6 +26,8 @@ from UM.Resources import Resources
 
 from . import ExtruderStack
 from . import GlobalStack
+from .ContainerMetadataCache import ContainerMetadataCache
+from .SideLoadedContainerProvider import SideLoadedContainerProvider
 
 import cura.CuraApplication
 from cura.Machines.QualityManager import getMachineDefinitionIDForQualitySearch
@@ -43,6 +46,10 @@ class CuraContainerRegistry(ContainerRegistry):
         # is added, we check to see if an extruder stack needs to be added.
         self.containerAdded.connect(self._onContainerAdded)
 
+        self._metadata_cache = None  # type: Optional[ContainerMetadataCache]
+        self._material_dependencies = None  # type: Optional[str]
+        self._side_loaded_providers = {}  # type: Dict[Any, SideLoadedContainerProvider]
+
     ##  Overridden from ContainerRegistry
     #
     #   Adds a container to the registry.
@@ -327,6 +334,108 @@ class CuraContainerRegistry(ContainerRegistry):
         self._registerSingleExtrusionMachinesExtruderStacks()
         self._connectUpgradedExtruderStacksToMachines()
 
+    ##  Overridden from ContainerRegistry
+    #
+    #   Loads the metadata of all containers, but takes the metadata of files
+    #   that didn't change since the previous start from the metadata cache
+    #   instead of parsing them again.
+    @override(ContainerRegistry)
+    def loadAllMetadata(self) -> None:
+        if self._metadata_cache is None:
+            application = Application.getInstance()
+            cache_path = os.path.join(Resources.getCacheStoragePath(), "container_metadata.cache")
+            self._metadata_cache = ContainerMetadataCache(cache_path, application.getVersion() if application else "")
+        self._metadata_cache.load()
+        self._material_dependencies = self._getMaterialDependencies()
+
+        try:
+            for provider in self._providers:  # Automatically sorted by priority.
+                for container_id in list(provider.getAllIds()):  # Make a copy, since side-loading containers adds IDs.
+                    if container_id in self.metadata:
+                        continue
+                    self._application.processEvents()  # Update the user interface because loading takes a while. Specifically the loading screen.
+                    metadata = self._loadProviderMetadata(provider, container_id)
+                    if not self._isMetadataValid(metadata):
+                        Logger.log("w", "Invalid metadata for container {container_id}: {metadata}".format(container_id = container_id, metadata = metadata))
+                        continue
+                    self.metadata[container_id] = metadata
+                    self.source_provider[container_id] = provider
+        finally:
+            self._metadata_cache.save()
+
+    ##  Load the metadata of a container from its provider, through the
+    #   metadata cache if the provider stores its containers in files.
+    #   \param provider The container provider that contains the container.
+    #   \param container_id The container to load the metadata of.
+    #   \return The metadata of the requested container, or None if it could
+    #   not be loaded.
+    def _loadProviderMetadata(self, provider, container_id: str) -> Optional[Dict[str, Any]]:
+        if self._metadata_cache is None or not hasattr(provider, "getContainerFilePathById"):
+            return provider.loadMetadata(container_id)
+        file_path = provider.getContainerFilePathById(container_id)
+        if not isinstance(file_path, str):
+            return provider.loadMetadata(container_id)
+
+        cached_metadata = self._metadata_cache.get(file_path, self._material_dependencies)
+        if cached_metadata is not None:
+            requested_metadata = None
+            for metadata in cached_metadata:
+                if metadata["id"] == container_id:
+                    requested_metadata = metadata
+            if requested_metadata is not None:
+                for metadata in cached_metadata:
+                    if metadata["id"] != container_id and metadata["id"] not in self.metadata:
+                        self._registerSideLoadedMetadata(provider, container_id, metadata)
+                return requested_metadata
+
+        known_ids = set(self.metadata.keys())
+        requested_metadata = provider.loadMetadata(container_id)
+        if requested_metadata is not None:
+            side_loaded_ids = set(self.metadata.keys()) - known_ids
+            dependencies = self._material_dependencies if requested_metadata.get("type") == "material" else None
+            self._metadata_cache.put(file_path, [requested_metadata] + [self.metadata[side_loaded_id] for side_loaded_id in side_loaded_ids], dependencies)
+        return requested_metadata
+
+    ##  Get a fingerprint of the files that the metadata of materials depends
+    #   on.
+    #
+    #   The metadata of a material file is not only made from the file itself.
+    #   The material profile looks up the machine definitions and the build
+    #   plate variants in the registry to create the metadata of the machine
+    #   and nozzle specific profiles in the file. So if any of those files are
+    #   added, removed or changed, the material files need to be parsed again.
+    #   \return A fingerprint of all definition and variant files.
+    def _getMaterialDependencies(self) -> str:
+        fingerprint = hashlib.sha1()
+        for resource_type in (Resources.DefinitionContainers, cura.CuraApplication.CuraApplication.ResourceTypes.VariantInstanceContainer):
+            for file_path in sorted(Resources.getAllResourcesOfType(resource_type)):
+                try:
+                    stat = os.stat(file_path)
+                except EnvironmentError:
+                    continue
+                fingerprint.update("{path}:{mtime}:{size}\n".format(path = file_path, mtime = stat.st_mtime_ns, size = stat.st_size).encode("utf-8"))
+        return fingerprint.hexdigest()
+
+    ##  Register a container that is stored in the same file as another
+    #   container, like the machine and nozzle specific profiles in a material
+    #   file.
+    #
+    #   This does what the provider does when it parses such a file: the
+    #   container is added to the registry. Since the provider didn't parse the
+    #   file, it doesn't know about the container, so the container is loaded
+    #   by loading the container that was requested from the file instead.
+    #   \param provider The container provider that contains both containers.
+    #   \param base_container_id The container that was requested from the
+    #   file.
+    #   \param metadata The metadata of the other container in the file.
+    def _registerSideLoadedMetadata(self, provider, base_container_id: str, metadata: Dict[str, Any]) -> None:
+        if provider not in self._side_loaded_providers:
+            self._side_loaded_providers[provider] = SideLoadedContainerProvider(provider)
+        side_loaded_provider = self._side_loaded_providers[provider]
+        side_loaded_provider.addSideLoadedContainer(metadata["id"], base_container_id)
+        self.metadata[metadata["id"]] = metadata
+        self.source_provider[metadata["id"]] = side_loaded_provider
+
     ##  Check if the metadata for a container is okay before adding it.
     #
     #   This overrides the one from UM.Settings.ContainerRegistry because we
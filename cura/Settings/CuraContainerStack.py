@@ -1,7 +1,9 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from typing import Any, cast, List, Optional
+from enum import Enum
+import threading
+from typing import Any, cast, Dict, List, Optional, Set
 from PyQt5.QtCore import pyqtProperty, pyqtSignal, QObject
 
 from UM.Application import Application
@@ -12,7 +14,9 @@ from UM.Settings.ContainerStack import ContainerStack, InvalidContainerStackErro
 from UM.Settings.InstanceContainer import InstanceContainer
 from UM.Settings.DefinitionContainer import DefinitionContainer
 from UM.Settings.ContainerRegistry import ContainerRegistry
-from UM.Settings.Interfaces import ContainerInterface, DefinitionContainerInterface
+from UM.Settings.Interfaces import ContainerInterface, DefinitionContainerInterface, PropertyEvaluationContext
+from UM.Settings.SettingFunction import SettingFunction
+from UM.Settings.SettingRelation import RelationType
 from cura.Settings import cura_empty_instance_containers
 
 from . import Exceptions
@@ -36,6 +40,8 @@ from . import Exceptions
 #   Internally, this class ensures the mentioned containers are always there and kept in a specific order.
 #   This also means that operations on the stack that modifies the container ordering is prohibited and
 #   will raise an exception.
+#
+#   The results of getProperty without an evaluation context are cached, see _getCachedProperty.
 class CuraContainerStack(ContainerStack):
     def __init__(self, container_id: str) -> None:
         super().__init__(container_id)
@@ -53,11 +59,21 @@ class CuraContainerStack(ContainerStack):
         self._containers[_ContainerIndexes.Material] = self._empty_material
         self._containers[_ContainerIndexes.Variant] = self._empty_variant
 
+        self._property_cache = {}  # type: Dict[str, Dict[str, Any]]  # Results of getProperty, by setting key and then by property name.
+        self._property_cache_generation = 0  # Increased whenever results are removed, so that results computed meanwhile aren't stored.
+        self._property_cache_lock = threading.Lock()
+        self._watched_containers = []  # type: List[ContainerInterface]  # The containers that remove results from the cache when they change.
+        # Only used on the stack at the bottom of the machine, see _getMachineStacks.
+        self._dependent_settings = {}  # type: Dict[str, Set[str]]  # For each setting, itself and all settings that depend on it.
+        self._formula_dependents = None  # type: Optional[Dict[str, Set[str]]]  # For each setting, the settings with formulas in instance containers that use it.
+
         self.containersChanged.connect(self._onContainersChanged)
 
         import cura.CuraApplication #Here to prevent circular imports.
         self.setMetaDataEntry("setting_version", cura.CuraApplication.CuraApplication.SettingVersion)
 
+        self.metaDataChanged.connect(self._onMetaDataChanged)
+
     # This is emitted whenever the containersChanged signal from the ContainerStack base class is emitted.
     pyqtContainersChanged = pyqtSignal()
 
@@ -231,6 +247,7 @@ class CuraContainerStack(ContainerStack):
             return
 
         super().replaceContainer(index, container, postpone_emit)
+        self.clearPropertyCache()  # Also when the containersChanged signal is postponed.
 
     ##  Overridden from ContainerStack
     #
@@ -274,6 +291,7 @@ class CuraContainerStack(ContainerStack):
                     new_containers[index] = self._empty_instance_container
 
         self._containers = new_containers
+        self.clearPropertyCache()
 
         # CURA-5281
         # Some stacks can have empty definition_changes containers which will cause problems.
@@ -285,12 +303,156 @@ class CuraContainerStack(ContainerStack):
         ## TODO; Deserialize the containers.
         return serialized
 
+    ##  Forgets the cached results of getProperty of this stack and of the
+    #   other stacks of its machine.
+    #
+    #   Changes in the containers of the stacks do this automatically. This is
+    #   only needed when something outside of the stacks changes that formulas
+    #   depend on, such as the default extruder.
+    def clearPropertyCache(self) -> None:
+        machine_stacks = self._getMachineStacks()
+        machine_stacks[0]._clearSettingDependencies()
+        for stack in machine_stacks:
+            stack._removeCachedProperties()
+
     ## protected:
 
     # Helper to make sure we emit a PyQt signal on container changes.
     def _onContainersChanged(self, container: Any) -> None:
+        self.clearPropertyCache()
         Application.getInstance().callLater(self.pyqtContainersChanged.emit)
 
+    ##  Gets a property of a setting like getProperty does without an
+    #   evaluation context, but remembers the result.
+    #
+    #   The results are kept until a setting changes that they depend on,
+    #   according to the relations between the settings in the definitions and
+    #   the formulas in the instance containers. Values of a stack can depend on
+    #   the containers of all stacks of the machine, so every change in one of
+    #   those removes the results of the setting and of the settings that depend
+    #   on it from all stacks of the machine. Replacing a container, or changing
+    #   metadata, removes all results.
+    #
+    #   Only immutable results are kept, since callers may change lists that
+    #   they get.
+    def _getCachedProperty(self, key: str, property_name: str) -> Any:
+        properties = self._property_cache.get(key)
+        if properties is not None and property_name in properties:
+            return properties[property_name]
+
+        generation = self._property_cache_generation
+        for stack in self._getMachineStacks():
+            stack._watchContainers()
+        result = self.getProperty(key, property_name, PropertyEvaluationContext())  # Evaluates like getProperty without a context.
+        if isinstance(result, _immutable_types):
+            with self._property_cache_lock:
+                if generation == self._property_cache_generation:  # Nothing changed while the result was computed.
+                    self._property_cache.setdefault(key, {})[property_name] = result
+        return result
+
+    ##  Whether the results of getProperty can be cached right now.
+    #
+    #   Results can't be cached while the current thread is resolving settings,
+    #   since a setting evaluates differently while its resolve is computed.
+    def _canCacheProperties(self) -> bool:
+        return True
+
+    ##  Gets the stacks of the machine that this stack belongs to. The first one
+    #   is the stack at the bottom, usually the global stack.
+    def _getMachineStacks(self) -> List["CuraContainerStack"]:
+        return [self]
+
+    ##  Removes cached results of getProperty of this stack.
+    #   \param keys The settings to remove the results of, or None to remove all
+    #   results.
+    def _removeCachedProperties(self, keys: Optional[Set[str]] = None) -> None:
+        with self._property_cache_lock:
+            self._property_cache_generation += 1
+            if keys is None:
+                self._property_cache.clear()
+            else:
+                for key in keys:
+                    self._property_cache.pop(key, None)
+
+    ##  Makes sure that changes in the current containers of this stack remove
+    #   results from the cache.
+    def _watchContainers(self) -> None:
+        if len(self._watched_containers) == len(self._containers) and all(watched is container for watched, container in zip(self._watched_containers, self._containers)):
+            return
+        for container in self._watched_containers:
+            container.propertyChanged.disconnect(self._onContainerPropertyChanged)
+        self._watched_containers = list(self._containers)
+        for container in self._watched_containers:
+            container.propertyChanged.connect(self._onContainerPropertyChanged)
+
+    def _onContainerPropertyChanged(self, key: str, property_name: str) -> None:
+        if key in _machine_wide_settings:
+            self.clearPropertyCache()
+            return
+
+        machine_stacks = self._getMachineStacks()
+        if property_name == "value":  # The setting may have gotten or lost a formula.
+            machine_stacks[0]._clearSettingDependencies()
+        keys = machine_stacks[0]._getDependentSettings(key)
+        for stack in machine_stacks:
+            stack._removeCachedProperties(keys)
+
+    def _onMetaDataChanged(self, container: Any) -> None:
+        self.clearPropertyCache()  # E.g. enabling an extruder changes the values of extruderValues().
+
+    ##  Gets a setting and all settings that depend on it, directly or through
+    #   other settings, in any stack of the machine of this stack.
+    def _getDependentSettings(self, key: str) -> Set[str]:
+        if key in self._dependent_settings:
+            return self._dependent_settings[key]
+
+        machine_stacks = self._getMachineStacks()
+        definitions = [stack.getDefinition() for stack in machine_stacks]
+        if self._formula_dependents is None:
+            self._formula_dependents = self._findFormulaDependents(machine_stacks)
+
+        result = {key}
+        to_visit = [key]
+        while to_visit:
+            current_key = to_visit.pop()
+            dependents = set(self._formula_dependents.get(current_key, set()))
+            for definition in definitions:
+                setting_definitions = definition.findDefinitions(key = current_key)
+                if not setting_definitions:
+                    continue
+                for relation in setting_definitions[0].relations:
+                    if relation.type == RelationType.RequiredByTarget:
+                        dependents.add(relation.target.key)
+            for dependent in dependents:
+                if dependent not in result:
+                    result.add(dependent)
+                    to_visit.append(dependent)
+
+        self._dependent_settings[key] = result
+        return result
+
+    ##  Finds which settings the formulas in the instance containers of stacks
+    #   use. Profiles can have other formulas than the definition, so the
+    #   relations of the definition don't tell about those.
+    #   \return For each setting, the settings with a formula that uses it.
+    @staticmethod
+    def _findFormulaDependents(stacks: List["CuraContainerStack"]) -> Dict[str, Set[str]]:
+        result = {}  # type: Dict[str, Set[str]]
+        for stack in stacks:
+            for index, container in enumerate(stack._containers):
+                if index == _ContainerIndexes.Definition:
+                    continue
+                for key in container.getAllKeys():
+                    value = container.getProperty(key, "value")
+                    if isinstance(value, SettingFunction):
+                        for used_key in value.getUsedSettingKeys():
+                            result.setdefault(used_key, set()).add(key)
+        return result
+
+    def _clearSettingDependencies(self) -> None:
+        self._dependent_settings = {}
+        self._formula_dependents = None
+
     # Helper that can be overridden to get the "machine" definition, that is, the definition that defines the machine
     # and its properties rather than, for example, the extruder. Defaults to simply returning the definition property.
     def _getMachineDefinition(self) -> DefinitionContainer:
@@ -326,6 +488,13 @@ class CuraContainerStack(ContainerStack):
 
 ## private:
 
+# The types of results of getProperty that are cached. Other results, like lists, are computed on every call.
+_immutable_types = (type(None), bool, int, float, str, Enum)
+
+# Settings that change the values of many settings without relations to them, like the extruders that extruderValues()
+# looks at. Changing these removes all cached results.
+_machine_wide_settings = {"machine_extruder_count", "extruders_enabled_count"}
+
 # Private helper class to keep track of container positions and their types.
 class _ContainerIndexes:
     UserChanges = 0
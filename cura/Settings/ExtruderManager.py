@@ -14,10 +14,14 @@ from UM.Scene.Iterator.BreadthFirstIterator import BreadthFirstIterator
 from UM.Settings.ContainerRegistry import ContainerRegistry  # Finding containers by ID.
 from UM.Settings.ContainerStack import ContainerStack
 
-from typing import Any, cast, Dict, List, Optional, TYPE_CHECKING, Union
+from UM.Signal import Signal
+
+from typing import Any, cast, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
 
 if TYPE_CHECKING:
     from cura.Settings.ExtruderStack import ExtruderStack
+    from cura.Settings.MachineManager import MachineManager
+    from UM.Settings.Interfaces import ContainerInterface
 
 
 ##  Manages all existing extruder stacks.
@@ -42,9 +46,21 @@ class ExtruderManager(QObject):
         # TODO; I have no idea why this is a union of ID's and extruder stacks. This needs to be fixed at some point.
         self._selected_object_extruders = []  # type: List[Union[str, "ExtruderStack"]]
 
+        # The result of getUsedExtruderStacks, until anything that it depends on changes.
+        self._used_extruder_stacks = None  # type: Optional[List[ContainerStack]]
+        self._used_extruder_stacks_global_stack = None  # type: Optional[GlobalStack]  # The machine that the result is for.
+        self._used_extruder_stacks_generation = 0  # Increased on every change, to not cache results that were computed during a change.
+        # What getUsedExtruderStacks is listening to, to know when to compute it again.
+        self._used_extruders_scene_root = None  # type: Optional[SceneNode]
+        self._used_extruders_stacks = []  # type: List[ContainerStack]
+        self._used_extruders_nodes = {}  # type: Dict[SceneNode, Tuple[Optional[ContainerStack], Optional[Signal]]]  # The per-object stack and active extruder signal of each node.
+        self._used_extruders_machine_manager = None  # type: Optional[MachineManager]
+        self._used_extruders_containers = []  # type: List[ContainerInterface]  # The containers in all of those stacks.
+
         self._addCurrentMachineExtruders()
 
         Selection.selectionChanged.connect(self.resetSelectedObjectExtruders)
+        self.extrudersChanged.connect(self._onUsedExtrudersChanged)
 
     ##  Signal to notify other components when the list of extruders for a machine definition changes.
     extrudersChanged = pyqtSignal(QVariant)
@@ -204,8 +220,36 @@ class ExtruderManager(QObject):
     #   If there are no extruders, this returns the global stack as a singleton
     #   list.
     #
+    #   The result is cached until a node is added to or removed from the
+    #   scene, the decorators or per-object settings of a node change, or a
+    #   setting of the machine or its extruders changes.
+    #
     #   \return A list of extruder stacks.
     def getUsedExtruderStacks(self) -> List["ContainerStack"]:
+        global_stack = self._application.getGlobalContainerStack()
+        if self._used_extruder_stacks is not None and global_stack is self._used_extruder_stacks_global_stack:
+            return list(self._used_extruder_stacks)  # A copy, so that callers can't change the cached result.
+
+        generation = self._used_extruder_stacks_generation
+        result = self._findUsedExtruderStacks()
+        if result is None:  # Nothing to cache without a machine and its extruders.
+            return []
+        if generation == self._used_extruder_stacks_generation:  # Not changed while it was computed.
+            self._used_extruder_stacks = result
+            self._used_extruder_stacks_global_stack = global_stack
+        return list(result)
+
+    ##  Forgets the cached result of getUsedExtruderStacks, so that it is
+    #   computed again the next time it is asked for.
+    def clearUsedExtruderStacks(self) -> None:
+        self._used_extruder_stacks = None
+        self._used_extruder_stacks_generation += 1
+
+    ##  Finds the used extruder stacks, and starts listening to changes that
+    #   affect them.
+    #   \return The used extruder stacks, or None if the machine or its
+    #   extruders aren't there.
+    def _findUsedExtruderStacks(self) -> Optional[List["ContainerStack"]]:
         global_stack = self._application.getGlobalContainerStack()
         container_registry = ContainerRegistry.getInstance()
 
@@ -220,10 +264,11 @@ class ExtruderManager(QObject):
 
         # If no extruders are registered in the extruder manager yet, return an empty array
         if len(self.extruderIds) == 0:
-            return []
+            return None
 
         # Get the extruders of all printable meshes in the scene
         meshes = [node for node in DepthFirstIterator(scene_root) if isinstance(node, SceneNode) and node.isSelectable()] #type: ignore #Ignore type error because iter() should get called automatically by Python syntax.
+        self._watchUsedExtruders(scene_root, global_stack, meshes)
 
         # Exclude anti-overhang meshes
         mesh_list = []
@@ -285,7 +330,86 @@ class ExtruderManager(QObject):
             return [container_registry.findContainerStacks(id = stack_id)[0] for stack_id in used_extruder_stack_ids]
         except IndexError:  # One or more of the extruders was not found.
             Logger.log("e", "Unable to find one or more of the extruders in %s", used_extruder_stack_ids)
-            return []
+            return None
+
+    ##  Listens to everything that the used extruders depend on: the nodes in
+    #   the scene, their per-object settings and active extruders, and the
+    #   settings of the machine and its extruders.
+    #
+    #   Setting changes are taken from the containers in the stacks. A
+    #   container stack only emits propertyChanged later, so listening to the
+    #   stacks would leave a window in which the old result is returned.
+    def _watchUsedExtruders(self, scene_root: SceneNode, global_stack: GlobalStack, nodes: List[SceneNode]) -> None:
+        if scene_root is not self._used_extruders_scene_root:
+            if self._used_extruders_scene_root is not None:
+                self._used_extruders_scene_root.childrenChanged.disconnect(self._onUsedExtrudersChanged)
+            scene_root.childrenChanged.connect(self._onUsedExtrudersChanged)  # Also emitted when a child of a child is added or removed.
+            self._used_extruders_scene_root = scene_root
+
+        machine_manager = self._application.getMachineManager()
+        if machine_manager is not self._used_extruders_machine_manager:
+            machine_manager.extruderChanged.connect(self._onUsedExtrudersChanged)  # The default extruder of the adhesion.
+            self._used_extruders_machine_manager = machine_manager
+
+        stacks = [global_stack] + list(global_stack.extruders.values())  # type: List[ContainerStack]
+        if stacks != self._used_extruders_stacks:
+            for stack in self._used_extruders_stacks:
+                stack.containersChanged.disconnect(self._onUsedExtrudersChanged)
+            if self._used_extruders_stacks:
+                self._used_extruders_stacks[0].extrudersChanged.disconnect(self._onUsedExtrudersChanged)
+            for stack in stacks:
+                stack.containersChanged.connect(self._onUsedExtrudersChanged)
+            global_stack.extrudersChanged.connect(self._onUsedExtrudersChanged)
+            self._used_extruders_stacks = stacks
+
+        watched_nodes = {}  # type: Dict[SceneNode, Tuple[Optional[ContainerStack], Optional[Signal]]]
+        for node in nodes:
+            listeners = (node.callDecoration("getStack"), node.callDecoration("getActiveExtruderChangedSignal"))
+            previous_listeners = self._used_extruders_nodes.get(node)
+            if previous_listeners is None:
+                node.decoratorsChanged.connect(self._onUsedExtrudersChanged)
+            if listeners != previous_listeners:  # A new node, or its decorators changed since the last time.
+                if previous_listeners is not None:
+                    self._disconnectNodeListeners(*previous_listeners)
+                per_object_stack, active_extruder_changed = listeners
+                if per_object_stack is not None:
+                    per_object_stack.containersChanged.connect(self._onUsedExtrudersChanged)
+                if active_extruder_changed is not None:
+                    active_extruder_changed.connect(self._onUsedExtrudersChanged)
+            watched_nodes[node] = listeners
+        for node, previous_listeners in self._used_extruders_nodes.items():
+            if node not in watched_nodes:  # Removed from the scene.
+                node.decoratorsChanged.disconnect(self._onUsedExtrudersChanged)
+                self._disconnectNodeListeners(*previous_listeners)
+        self._used_extruders_nodes = watched_nodes
+
+        containers = {}  # type: Dict[int, ContainerInterface]  # By ID of the object, since stacks share e.g. the empty containers.
+        for stack in stacks + [per_object_stack for per_object_stack, _ in watched_nodes.values() if per_object_stack is not None]:
+            for container in stack.getContainers():
+                containers.setdefault(id(container), container)
+        self._watchUsedExtrudersContainers(list(containers.values()))
+
+    ##  Listens to the property changes of the given containers, and no longer
+    #   to those of the containers that were listened to before.
+    def _watchUsedExtrudersContainers(self, containers: List["ContainerInterface"]) -> None:
+        if len(containers) == len(self._used_extruders_containers) and all(container is watched for container, watched in zip(containers, self._used_extruders_containers)):
+            return
+        for container in self._used_extruders_containers:
+            container.propertyChanged.disconnect(self._onUsedExtrudersChanged)
+        self._used_extruders_containers = containers
+        for container in containers:
+            container.propertyChanged.connect(self._onUsedExtrudersChanged)
+
+    def _disconnectNodeListeners(self, per_object_stack: Optional["ContainerStack"], active_extruder_changed: Optional[Signal]) -> None:
+        if per_object_stack is not None:
+            per_object_stack.containersChanged.disconnect(self._onUsedExtrudersChanged)
+        if active_extruder_changed is not None:
+            active_extruder_changed.disconnect(self._onUsedExtrudersChanged)
+
+    ##  Called when anything changes that the used extruders depend on. The
+    #   signals that this listens to have different arguments.
+    def _onUsedExtrudersChanged(self, *args, **kwargs) -> None:
+        self.clearUsedExtruderStacks()
 
     ##  Removes the container stack and user profile for the extruders for a specific machine.
     #
@@ -1,7 +1,7 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from typing import Any, Dict, TYPE_CHECKING, Optional
+from typing import Any, Dict, List, TYPE_CHECKING, Optional
 
 from PyQt5.QtCore import pyqtProperty, pyqtSignal
 
@@ -43,6 +43,7 @@ class ExtruderStack(CuraContainerStack):
         super().setNextStack(stack)
         stack.addExtruder(self)
         self.setMetaDataEntry("machine", stack.id)
+        self.clearPropertyCache()
 
         # For backward compatibility: Register the extruder with the Extruder Manager
         ExtruderManager.getInstance().registerExtruder(self, stack.id)
@@ -121,6 +122,9 @@ class ExtruderStack(CuraContainerStack):
         if not self._next_stack:
             raise Exceptions.NoGlobalStackError("Extruder {id} is missing the next stack!".format(id = self.id))
 
+        if context is None and self._canCacheProperties():
+            return self._getCachedProperty(key, property_name)
+
         if context is None:
             context = PropertyEvaluationContext()
         context.pushContainer(self)
@@ -146,6 +150,21 @@ class ExtruderStack(CuraContainerStack):
         context.popContainer()
         return result
 
+    @override(CuraContainerStack)
+    def _canCacheProperties(self) -> bool:
+        return self.getNextStack()._canCacheProperties()
+
+    ##  The stacks of the machine are those of the global stack, starting with
+    #   the global stack itself.
+    @override(CuraContainerStack)
+    def _getMachineStacks(self) -> List[CuraContainerStack]:
+        if not self.getNextStack():
+            return [self]
+        machine_stacks = self.getNextStack()._getMachineStacks()
+        if self not in machine_stacks:  # Without a position, the global stack doesn't know this extruder.
+            machine_stacks.append(self)
+        return machine_stacks
+
     @override(CuraContainerStack)
     def _getMachineDefinition(self) -> ContainerInterface:
         if not self.getNextStack():
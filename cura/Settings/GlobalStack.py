@@ -32,10 +32,10 @@ class GlobalStack(CuraContainerStack):
     def __init__(self, container_id: str) -> None:
         super().__init__(container_id)
 
-        self.setMetaDataEntry("type", "machine")  # For backward compatibility
-
         self._extruders = {}  # type: Dict[str, "ExtruderStack"]
 
+        self.setMetaDataEntry("type", "machine")  # For backward compatibility
+
         # This property is used to track which settings we are calculating the "resolve" for
         # and if so, to bypass the resolve to prevent an infinite recursion that would occur
         # if the resolve function tried to access the same property it is a resolve for.
@@ -145,6 +145,7 @@ class GlobalStack(CuraContainerStack):
             return
 
         self._extruders[position] = extruder
+        self.clearPropertyCache()
         self.extrudersChanged.emit()
         Logger.log("i", "Extruder[%s] added to [%s] at position [%s]", extruder.id, self.id, position)
 
@@ -161,6 +162,9 @@ class GlobalStack(CuraContainerStack):
     #   \return The value of the property for the specified setting, or None if not found.
     @override(ContainerStack)
     def getProperty(self, key: str, property_name: str, context: Optional[PropertyEvaluationContext] = None) -> Any:
+        if context is None and self._canCacheProperties():
+            return self._getCachedProperty(key, property_name)
+
         if not self.definition.findDefinitions(key = key):
             return None
 
@@ -209,6 +213,14 @@ class GlobalStack(CuraContainerStack):
 
     # protected:
 
+    @override(CuraContainerStack)
+    def _canCacheProperties(self) -> bool:
+        return not self._resolving_settings[threading.current_thread().name]
+
+    @override(CuraContainerStack)
+    def _getMachineStacks(self) -> List[CuraContainerStack]:
+        return [self] + list(self._extruders.values())
+
     # Determine whether or not we should try to get the "resolve" property instead of the
     # requested property.
     def _shouldResolve(self, key: str, property_name: str, context: Optional[PropertyEvaluationContext] = None) -> bool:
@@ -241,6 +241,7 @@ class MachineManager(QObject):
         # Update the local global container stack reference
         self._global_container_stack = self._application.getGlobalContainerStack()
         if self._global_container_stack:
+            self._global_container_stack.clearPropertyCache()  # Formulas look at the active machine, so results from before may be of another machine.
             self.updateDefaultExtruder()
             self.updateNumberExtrudersEnabled()
         self.globalContainerChanged.emit()
@@ -994,6 +995,7 @@ class MachineManager(QObject):
                 break
         if new_default_position != old_position:
             self._default_extruder_position = new_default_position
+            self._global_container_stack.clearPropertyCache()  # Settings with limit_to_extruder -1 use the default extruder.
             self.extruderChanged.emit()
 
     def updateNumberExtrudersEnabled(self) -> None:
@@ -0,0 +1,56 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from UM.Settings.ContainerRegistry import ContainerRegistry
+
+if TYPE_CHECKING:
+    from UM.Settings.ContainerProvider import ContainerProvider
+    from UM.Settings.Interfaces import ContainerInterface
+
+
+##  Provides the containers that are stored in the file of another container,
+#   like the machine and nozzle specific profiles in a material file, when
+#   their metadata was taken from the metadata cache.
+#
+#   A container provider only learns about such containers when it parses the
+#   file they are in. To load one of them, this loads the container that the
+#   file belongs to through the registry instead. Parsing that file adds all
+#   other containers in it to the registry, just like when the provider was
+#   asked for their metadata. Everything else is asked from the provider
+#   itself.
+class SideLoadedContainerProvider:
+    def __init__(self, provider: "ContainerProvider") -> None:
+        self._provider = provider
+        self._base_container_ids = {}  # type: Dict[str, str]
+
+    ##  Indicate that a container is stored in the file of another container
+    #   of the provider.
+    #   \param container_id The container that is stored in the file.
+    #   \param base_container_id The container that the file belongs to.
+    def addSideLoadedContainer(self, container_id: str, base_container_id: str) -> None:
+        self._base_container_ids[container_id] = base_container_id
+
+    def getBaseContainerId(self, container_id: str) -> str:
+        return self._base_container_ids.get(container_id, container_id)
+
+    def loadContainer(self, container_id: str) -> "ContainerInterface":
+        registry = ContainerRegistry.getInstance()
+        base_container_id = self._base_container_ids[container_id]  # Raises KeyError if this container is not side-loaded.
+        registry.findContainers(id = base_container_id)
+        if not registry.isLoaded(container_id):
+            raise KeyError("Container {container_id} was not found in the file of {base_container_id}.".format(container_id = container_id, base_container_id = base_container_id))
+        return registry.findContainers(id = container_id)[0]
+
+    def loadMetadata(self, container_id: str) -> Optional[Dict[str, Any]]:
+        return ContainerRegistry.getInstance().metadata.get(container_id)
+
+    def isReadOnly(self, container_id: str) -> bool:
+        return self._provider.isReadOnly(self.getBaseContainerId(container_id))
+
+    def getContainerFilePathById(self, container_id: str) -> Optional[str]:
+        return self._provider.getContainerFilePathById(self.getBaseContainerId(container_id))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._provider, name)
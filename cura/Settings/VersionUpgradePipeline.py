@@ -0,0 +1,321 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, TYPE_CHECKING
+
+from UM.Logger import Logger
+
+if TYPE_CHECKING:
+    from UM.PluginRegistry import PluginRegistry
+
+UpgradeFunction = Callable[[str, str], Tuple[List[str], List[str]]]
+GetVersionFunction = Callable[[str], int]
+
+##  The upgrades that need to be applied to files of one type and version to
+#   bring them to the latest version, in order.
+_UpgradeChain = NamedTuple("_UpgradeChain", [("final_type", str), ("final_version", int), ("functions", List[UpgradeFunction])])
+
+##  A configuration file that was found in one of the storage paths.
+_SourceFile = NamedTuple("_SourceFile", [("storage_path", str), ("relative_path", str), ("configuration_type", str), ("name", str)])
+
+##  The result of upgrading a single file: the version it had and the
+#   (file name without extension, serialised data) pairs it was upgraded to.
+_UpgradeResult = NamedTuple("_UpgradeResult", [("absolute_path", str), ("version", int), ("final_type", str), ("files", List[Tuple[str, str]])])
+
+
+##  Apply all upgrade functions of a chain to a serialised file.
+#
+#   An upgrade may split a file into multiple files. Every next step is then
+#   applied to each of those.
+def _applyChain(functions: List[UpgradeFunction], name: str, serialised: str) -> List[Tuple[str, str]]:
+    files = [(name, serialised)]
+    for upgrade_function in functions:
+        next_files = []  # type: List[Tuple[str, str]]
+        for file_name, file_data in files:
+            new_names, new_data = upgrade_function(file_data, file_name)
+            next_files.extend(zip(new_names, new_data))
+        files = next_files
+    return files
+
+
+##  Upgrade the files of one configuration type.
+#
+#   Each file is read and its version determined here, so every file is only
+#   read once.
+#   \param get_version The function that gets the version of a file of this
+#   type.
+#   \param chains The upgrade chain for each version of this file type that
+#   needs to be upgraded.
+#   \param files A list of (absolute path, name without extension) of the
+#   files to upgrade.
+#   \return For each file that was upgraded, the result of the upgrade.
+def _upgradeFiles(get_version: GetVersionFunction, chains: Dict[int, _UpgradeChain], files: List[Tuple[str, str]]) -> List[_UpgradeResult]:
+    results = []  # type: List[_UpgradeResult]
+    for absolute_path, name in files:
+        try:
+            with open(absolute_path, encoding = "utf-8") as f:
+                serialised = f.read()
+            version = get_version(serialised)
+        except Exception:  # Not a file of this type, or unreadable. Leave it alone.
+            continue
+        chain = chains.get(version)
+        if chain is None:  # Already up to date, or we don't know how to upgrade it.
+            continue
+        try:
+            upgraded_files = _applyChain(chain.functions, name, serialised)
+        except Exception as e:
+            Logger.log("w", "Unable to upgrade {path}: {err}".format(path = absolute_path, err = str(e)))
+            continue
+        results.append(_UpgradeResult(absolute_path, version, chain.final_type, upgraded_files))
+    return results
+
+
+##  Upgrades configuration files through all intermediate versions in one go.
+#
+#   Uranium's version upgrade manager upgrades each file through each version
+#   one by one on the main thread. This pipeline composes the consecutive
+#   upgrades of each file type and version into one chain so that every file
+#   is read, upgraded and written in one go, without writing the intermediate
+#   versions to disk.
+#
+#   The results of the upgrades are recorded in a journal before they replace
+#   the original files. If the upgrade gets interrupted, the next run picks up
+#   the recorded results instead of upgrading those files again.
+#
+#   Upgrades that have side effects outside of the file they upgrade (they
+#   write other files or keep state between files) can't be composed with
+#   other upgrades. Their plug-ins mark them with ``HasSideEffects = True``.
+#   Files that need such an upgrade are left alone, so that Uranium's version
+#   upgrade manager upgrades them afterwards.
+#
+#   The files are upgraded one after another, in this process. The upgrade
+#   functions are methods of plug-in objects, which can't be sent to spawned
+#   worker processes, and forking the application to inherit them isn't safe
+#   once its threads run. The speed-up comes from reading, parsing and writing
+#   every file only once, not from upgrading files at the same time.
+class VersionUpgradePipeline:
+    ##  Creates a pipeline.
+    #
+    #   \param upgrades The upgrade routes, in the format of the
+    #   "version_upgrade" metadata of version upgrade plug-ins: a mapping from
+    #   (type, version) to (new type, new version, upgrade function).
+    #   \param sources The sources of configuration files, in the format of
+    #   the "sources" metadata of version upgrade plug-ins: a mapping from type
+    #   to a dictionary with a "get_version" function and a set of "location"s.
+    #   \param file_suffixes The file suffix (e.g. ".inst.cfg") of each
+    #   configuration type in its latest version.
+    #   \param journal_path Directory to record upgrade results in while the
+    #   upgrade is running.
+    def __init__(self, upgrades: Dict[Tuple[str, int], Tuple[str, int, UpgradeFunction]], sources: Dict[str, Dict[str, Any]], file_suffixes: Dict[str, str], journal_path: str) -> None:
+        self._upgrades = upgrades
+        self._sources = sources
+        self._file_suffixes = file_suffixes
+        self._journal_path = journal_path
+        self._chain_cache = {}  # type: Dict[Tuple[str, int], Optional[_UpgradeChain]]
+
+    ##  Creates a pipeline with the upgrades of all active version upgrade
+    #   plug-ins.
+    @classmethod
+    def fromPluginRegistry(cls, plugin_registry: "PluginRegistry", file_suffixes: Dict[str, str], journal_path: str) -> "VersionUpgradePipeline":
+        upgrades = {}  # type: Dict[Tuple[str, int], Tuple[str, int, UpgradeFunction]]
+        sources = {}  # type: Dict[str, Dict[str, Any]]
+        for plugin_id in plugin_registry.getActivePlugins():
+            metadata = plugin_registry.getMetaData(plugin_id)
+            if "version_upgrade" not in metadata:
+                continue
+            upgrades.update(metadata["version_upgrade"])
+            for configuration_type, source in metadata.get("sources", {}).items():
+                if configuration_type not in sources:
+                    sources[configuration_type] = {"get_version": source["get_version"], "location": set()}
+                sources[configuration_type]["location"] |= set(source["location"])
+        return cls(upgrades, sources, file_suffixes, journal_path)
+
+    ##  Gets the composed upgrade chain for files of a type and version.
+    #
+    #   \return The chain, or None if the file is up to date, can't be
+    #   upgraded to the latest version or needs an upgrade with side effects.
+    def getChain(self, configuration_type: str, version: int) -> Optional[_UpgradeChain]:
+        key = (configuration_type, version)
+        if key in self._chain_cache:
+            return self._chain_cache[key]
+
+        functions = []  # type: List[UpgradeFunction]
+        visited = set()  # type: Set[Tuple[str, int]]
+        chain = None  # type: Optional[_UpgradeChain]
+        while key in self._upgrades and key not in visited:
+            visited.add(key)
+            new_type, new_version, upgrade_function = self._upgrades[key]
+            if getattr(getattr(upgrade_function, "__self__", None), "HasSideEffects", False):
+                functions = []
+                break
+            functions.append(upgrade_function)
+            key = (new_type, new_version)
+        else:
+            if functions and key not in visited:
+                chain = _UpgradeChain(key[0], key[1], functions)
+        self._chain_cache[(configuration_type, version)] = chain
+        return chain
+
+    ##  Upgrade all configuration files in the given storage paths.
+    #
+    #   \param storage_paths The directories that the source locations are
+    #   relative to.
+    #   \return The number of files that were upgraded.
+    def upgrade(self, storage_paths: List[str]) -> int:
+        self._resumeJournal()
+
+        source_files = self._findSourceFiles(storage_paths)
+        by_path = {os.path.join(source.storage_path, source.relative_path): source for source in source_files}
+
+        results = []  # type: List[_UpgradeResult]
+        for configuration_type in sorted({source.configuration_type for source in source_files}):
+            chains = {}  # type: Dict[int, _UpgradeChain]
+            for old_type, old_version in self._upgrades:
+                if old_type != configuration_type:
+                    continue
+                chain = self.getChain(old_type, old_version)
+                if chain is not None:
+                    chains[old_version] = chain
+            if not chains:
+                continue
+
+            files = []  # type: List[Tuple[str, str]]
+            for absolute_path, source in by_path.items():
+                if source.configuration_type != configuration_type:
+                    continue
+                journalled = self._readJournalEntry(absolute_path)
+                if journalled is not None:  # Upgraded in a previous, interrupted run.
+                    results.append(journalled)
+                    continue
+                files.append((absolute_path, source.name))
+            for result in _upgradeFiles(self._sources[configuration_type]["get_version"], chains, files):
+                self._writeJournalEntry(by_path[result.absolute_path], result)
+                results.append(result)
+
+        for result in results:
+            self._commit(by_path[result.absolute_path], result)
+        return len(results)
+
+    ##  Find all files in the source locations of all configuration types.
+    def _findSourceFiles(self, storage_paths: List[str]) -> List[_SourceFile]:
+        source_files = []  # type: List[_SourceFile]
+        seen_paths = set()  # type: Set[str]
+        for storage_path in storage_paths:
+            for configuration_type, source in self._sources.items():
+                for location in source["location"]:
+                    directory = os.path.normpath(os.path.join(storage_path, location))
+                    try:
+                        entries = list(os.scandir(directory))
+                    except EnvironmentError:
+                        continue  # Location doesn't exist in this storage path.
+                    for entry in entries:
+                        if not entry.is_file() or entry.path in seen_paths:
+                            continue
+                        seen_paths.add(entry.path)
+                        source_files.append(_SourceFile(storage_path, os.path.relpath(entry.path, storage_path), configuration_type, self._stripSuffix(entry.name, configuration_type)))
+        return source_files
+
+    def _stripSuffix(self, file_name: str, configuration_type: str) -> str:
+        suffix = self._file_suffixes.get(configuration_type, "")
+        if suffix and file_name.endswith(suffix):
+            return file_name[:-len(suffix)]
+        return os.path.splitext(file_name)[0]
+
+    ##  Replace the original file with the upgraded files.
+    #
+    #   The upgraded files are first written next to their destination. Then
+    #   the original file is moved to the "old" directory and the upgraded
+    #   files are moved into place. Once that's done, the journal entry is
+    #   removed.
+    def _commit(self, source: _SourceFile, result: _UpgradeResult) -> None:
+        # Like Uranium's version upgrade manager, the upgraded files are stored in the location where the original was.
+        destination_directory = os.path.join(source.storage_path, os.path.dirname(source.relative_path))
+        suffix = self._file_suffixes.get(result.final_type, "")
+        temporary_files = []  # type: List[Tuple[str, str]]
+        try:
+            os.makedirs(destination_directory, exist_ok = True)
+            for name, data in result.files:
+                destination = os.path.join(destination_directory, name + suffix)
+                with open(destination + ".upgrade", "w", encoding = "utf-8") as f:
+                    f.write(data)
+                temporary_files.append((destination + ".upgrade", destination))
+
+            if os.path.exists(result.absolute_path):
+                backup_path = os.path.join(source.storage_path, "old", str(result.version), source.relative_path)
+                os.makedirs(os.path.dirname(backup_path), exist_ok = True)
+                os.replace(result.absolute_path, backup_path)
+            for temporary_path, destination in temporary_files:
+                os.replace(temporary_path, destination)
+        except EnvironmentError as e:
+            Logger.log("e", "Unable to store upgraded version of {path}: {err}".format(path = result.absolute_path, err = str(e)))
+            return
+        self._removeJournalEntry(result.absolute_path)
+
+    ##  Finish committing upgrades of which the original file was already
+    #   moved away when the previous run got interrupted.
+    def _resumeJournal(self) -> None:
+        try:
+            entries = [entry for entry in os.scandir(self._journal_path) if entry.name.endswith(".json")]
+        except EnvironmentError:
+            return  # No journal, so nothing to resume.
+        for entry in entries:
+            try:
+                with open(entry.path, encoding = "utf-8") as f:
+                    data = json.load(f)
+            except (EnvironmentError, ValueError):
+                os.remove(entry.path)
+                continue
+            if os.path.exists(data["absolute_path"]):
+                continue  # Will be picked up by _readJournalEntry.
+            Logger.log("i", "Finishing interrupted upgrade of {path}.".format(path = data["absolute_path"]))
+            result = _UpgradeResult(data["absolute_path"], data["version"], data["final_type"], [(name, file_data) for name, file_data in data["files"]])
+            self._commit(_SourceFile(data["storage_path"], data["relative_path"], data["configuration_type"], ""), result)
+
+    def _getJournalEntryPath(self, absolute_path: str) -> str:
+        return os.path.join(self._journal_path, hashlib.sha1(absolute_path.encode("utf-8")).hexdigest() + ".json")
+
+    ##  Get the upgrade result that an earlier run recorded for a file, if the
+    #   file didn't change since.
+    def _readJournalEntry(self, absolute_path: str) -> Optional[_UpgradeResult]:
+        journal_entry_path = self._getJournalEntryPath(absolute_path)
+        try:
+            with open(journal_entry_path, encoding = "utf-8") as f:
+                data = json.load(f)
+            stat = os.stat(absolute_path)
+        except (EnvironmentError, ValueError):
+            return None
+        if data["mtime_ns"] != stat.st_mtime_ns or data["size"] != stat.st_size:
+            os.remove(journal_entry_path)
+            return None
+        return _UpgradeResult(absolute_path, data["version"], data["final_type"], [(name, file_data) for name, file_data in data["files"]])
+
+    def _writeJournalEntry(self, source: _SourceFile, result: _UpgradeResult) -> None:
+        try:
+            stat = os.stat(result.absolute_path)
+            data = {
+                "absolute_path": result.absolute_path,
+                "storage_path": source.storage_path,
+                "relative_path": source.relative_path,
+                "configuration_type": source.configuration_type,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "version": result.version,
+                "final_type": result.final_type,
+                "files": result.files
+            }
+            os.makedirs(self._journal_path, exist_ok = True)
+            journal_entry_path = self._getJournalEntryPath(result.absolute_path)
+            with open(journal_entry_path + ".tmp", "w", encoding = "utf-8") as f:
+                json.dump(data, f)
+            os.replace(journal_entry_path + ".tmp", journal_entry_path)
+        except EnvironmentError as e:
+            Logger.log("w", "Unable to record upgrade of {path} in the journal: {err}".format(path = result.absolute_path, err = str(e)))
+
+    def _removeJournalEntry(self, absolute_path: str) -> None:
+        try:
+            os.remove(self._getJournalEntryPath(absolute_path))
+        except EnvironmentError:
+            pass  # There was no entry.
@@ -2,9 +2,9 @@
 # Cura is released under the terms of the LGPLv3 or higher.
 
 from collections import defaultdict
-from typing import Dict
+from typing import Any, Dict, List, Tuple
 
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import Qt, QTimer
 
 from UM.Application import Application
 from UM.Qt.ListModel import ListModel
@@ -18,10 +18,27 @@ catalog = i18nCatalog("cura")
 
 
 ##  Keep track of all objects in the project
+#
+#   The list is updated incrementally: only the rows of objects that were
+#   added, removed, renamed or otherwise changed are touched. Scene changes that
+#   don't affect the list at all, such as moving, rotating or scaling objects,
+#   are ignored.
 class ObjectsModel(ListModel):
+    NameRole = Qt.UserRole + 1
+    SelectedRole = Qt.UserRole + 2
+    OutsideAreaRole = Qt.UserRole + 3
+    BuildPlateNumberRole = Qt.UserRole + 4
+    NodeRole = Qt.UserRole + 5
+
     def __init__(self) -> None:
         super().__init__()
 
+        self.addRoleName(self.NameRole, "name")
+        self.addRoleName(self.SelectedRole, "isSelected")
+        self.addRoleName(self.OutsideAreaRole, "isOutsideBuildArea")
+        self.addRoleName(self.BuildPlateNumberRole, "buildPlateNumber")
+        self.addRoleName(self.NodeRole, "node")
+
         Application.getInstance().getController().getScene().sceneChanged.connect(self._updateSceneDelayed)
         Application.getInstance().getPreferences().preferenceChanged.connect(self._updateDelayed)
 
@@ -32,28 +49,52 @@ class ObjectsModel(ListModel):
 
         self._build_plate_number = -1
 
+        # For each node in the scene, by ID, the node and everything about it that could affect the list during the last update.
+        self._node_states = {}  # type: Dict[int, Tuple[SceneNode, Tuple[Any, ...]]]
+
     def setActiveBuildPlate(self, nr: int) -> None:
         if self._build_plate_number != nr:
             self._build_plate_number = nr
             self._update()
 
     def _updateSceneDelayed(self, source) -> None:
-        if not isinstance(source, Camera):
-            self._update_timer.start()
+        if isinstance(source, Camera):
+            return
+        node_state = self._node_states.get(id(source))
+        if node_state is not None and node_state[0] is source and node_state[1] == self._getNodeState(source):
+            return  # Only the transformation or something else that isn't listed changed.
+        self._update_timer.start()
 
     def _updateDelayed(self, *args) -> None:
         self._update_timer.start()
 
+    ##  Gets everything about a node that could affect the list of objects.
+    @staticmethod
+    def _getNodeState(node: SceneNode) -> Tuple[Any, ...]:
+        return (
+            node.getName(),
+            node.getParent(),
+            len(node.getChildren()),
+            node.getMeshData() is not None,
+            node.callDecoration("getLayerData") is not None,
+            node.callDecoration("isGroup"),
+            node.callDecoration("isSliceable"),
+            node.callDecoration("getBuildPlateNumber"),
+            Selection.isSelected(node)
+        )
+
     def _update(self, *args) -> None:
         nodes = []
         filter_current_build_plate = Application.getInstance().getPreferences().getValue("view/filter_current_build_plate")
         active_build_plate_number = self._build_plate_number
         group_nr = 1
         name_count_dict = defaultdict(int)  # type: Dict[str, int]
+        scene_nodes = []  # type: List[SceneNode]
 
         for node in DepthFirstIterator(Application.getInstance().getController().getScene().getRoot()):  # type: ignore
             if not isinstance(node, SceneNode):
                 continue
+            scene_nodes.append(node)
             if (not node.getMeshData() and not node.callDecoration("getLayerData")) and not node.callDecoration("isGroup"):
                 continue
 
@@ -93,11 +134,63 @@ class ObjectsModel(ListModel):
                 "buildPlateNumber": node_build_plate_number,
                 "node": node
             })
-       
-        nodes = sorted(nodes, key=lambda n: n["name"])
-        self.setItems(nodes)
 
-        self.itemsChanged.emit()
+        # Only now, after the duplicate names were changed.
+        node_states = {id(node): (node, self._getNodeState(node)) for node in scene_nodes}
+        self._watchOutsideBuildArea(node_states)
+        self._node_states = node_states
+
+        nodes = sorted(nodes, key=lambda n: n["name"])
+        if self._updateItems(nodes):
+            self.itemsChanged.emit()
+
+    ##  Listen to whether the nodes are outside of the build area.
+    #
+    #   The build volume only checks that some time after the scene changed,
+    #   so it isn't part of the node state. Nodes that left the scene are no
+    #   longer listened to.
+    #   \param node_states The new node states, by node ID.
+    def _watchOutsideBuildArea(self, node_states: Dict[int, Tuple[SceneNode, Tuple[Any, ...]]]) -> None:
+        for node_id, (node, _) in self._node_states.items():
+            new_state = node_states.get(node_id)
+            if (new_state is None or new_state[0] is not node) and hasattr(node, "outsideBuildAreaChanged"):
+                node.outsideBuildAreaChanged.disconnect(self._updateDelayed)  # type: ignore
+        for node_id, (node, _) in node_states.items():
+            old_state = self._node_states.get(node_id)
+            if (old_state is None or old_state[0] is not node) and hasattr(node, "outsideBuildAreaChanged"):
+                node.outsideBuildAreaChanged.connect(self._updateDelayed)  # type: ignore
+
+    ##  Changes the list to the new items, only touching the rows that changed.
+    #   \param items The new items, sorted by name.
+    #   \return Whether anything changed.
+    def _updateItems(self, items: List[Dict[str, Any]]) -> bool:
+        new_items = {id(item["node"]): item for item in items}
+        changed = False
+
+        # Remove the objects that are no longer listed, and the ones that were renamed since those move to another row.
+        for index in range(len(self._items) - 1, -1, -1):
+            new_item = new_items.get(id(self._items[index]["node"]))
+            if new_item is None or new_item["node"] is not self._items[index]["node"] or new_item["name"] != self._items[index]["name"]:
+                self.removeItem(index)
+                changed = True
+
+        # The remaining objects should be in the same order as in the new list. If not (e.g. with equal names), start over.
+        remaining_ids = [id(item["node"]) for item in self._items]
+        remaining_id_set = set(remaining_ids)
+        if remaining_ids != [id(item["node"]) for item in items if id(item["node"]) in remaining_id_set]:
+            self.setItems(items)
+            return True
+
+        for index, item in enumerate(items):
+            if index >= len(self._items) or self._items[index]["node"] is not item["node"]:
+                self.insertItem(index, item)
+                changed = True
+                continue
+            for key in ("isSelected", "isOutsideBuildArea", "buildPlateNumber"):
+                if self._items[index][key] != item[key]:
+                    self.setProperty(index, key, item[key])
+                    changed = True
+        return changed
 
     @staticmethod
     def createObjectsModel():
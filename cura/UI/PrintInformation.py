@@ -5,7 +5,7 @@ import json
 import math
 import os
 import unicodedata
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, NamedTuple, Optional, Set, TYPE_CHECKING
 
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtProperty, pyqtSlot
 
@@ -17,9 +17,14 @@ from UM.MimeTypeDatabase import MimeTypeDatabase, MimeTypeNotFoundError
 
 if TYPE_CHECKING:
     from cura.CuraApplication import CuraApplication
+    from cura.Settings.ExtruderStack import ExtruderStack
 
 catalog = i18nCatalog("cura")
 
+##  What the material information of an extruder is calculated from. It is kept
+#   until the material of the extruder changes.
+_MaterialInfo = NamedTuple("_MaterialInfo", [("material_id", str), ("guid", str), ("name", str), ("density", float), ("radius", float), ("weight_per_spool", float)])
+
 
 ##  A class for processing and the print times per build plate as well as managing the job name
 #
@@ -40,6 +45,10 @@ class PrintInformation(QObject):
         self._material_weights = {}  # type: Dict[int, List[float]]
         self._material_costs = {}   # type: Dict[int, List[float]]
         self._material_names = {}  # type: Dict[int, List[str]]
+        self._material_amounts = {}  # type: Dict[int, List[float]]  # The amounts of the last slice of each build plate, to calculate the rest from.
+
+        self._material_preference_values = None  # type: Optional[Dict[str, Any]]  # The parsed cura/material_settings preference.
+        self._material_info = {}  # type: Dict[str, _MaterialInfo]  # By extruder position.
 
         self._pre_sliced = False
 
@@ -66,7 +75,6 @@ class PrintInformation(QObject):
         self._application.getInstance().getPreferences().preferenceChanged.connect(self._onPreferencesChanged)
 
         self._multi_build_plate_model.activeBuildPlateChanged.connect(self._onActiveBuildPlateChanged)
-        self._material_amounts = []  # type: List[float]
         self._onActiveMaterialsChanged()
 
     def initializeCuraMessagePrintTimeProperties(self) -> None:
@@ -158,7 +166,8 @@ class PrintInformation(QObject):
         self._updateTotalPrintTimePerFeature(build_plate_number, print_times_per_feature)
         self.currentPrintTimeChanged.emit()
 
-        self._material_amounts = material_amounts
+        self._material_amounts[build_plate_number] = material_amounts
+        self._updateMaterialInfo()  # The settings may have changed since the last slice.
         self._calculateInformation(build_plate_number)
 
     def _updateTotalPrintTimePerFeature(self, build_plate_number: int, print_times_per_feature: Dict[str, int]) -> None:
@@ -185,44 +194,44 @@ class PrintInformation(QObject):
         self._current_print_time[build_plate_number].setDuration(total_estimated_time)
 
     def _calculateInformation(self, build_plate_number: int) -> None:
+        if self._updateBuildPlateInformation(build_plate_number):
+            self._emitMaterialInformationChanged()
+
+    ##  Calculates the material lengths, weights and costs of a build plate
+    #   from the amounts of material that its last slice needs.
+    #   \return Whether there was a machine to calculate them for.
+    def _updateBuildPlateInformation(self, build_plate_number: int) -> bool:
         global_stack = self._application.getGlobalContainerStack()
         if global_stack is None:
-            return
+            return False
 
-        self._material_lengths[build_plate_number] = []
-        self._material_weights[build_plate_number] = []
-        self._material_costs[build_plate_number] = []
-        self._material_names[build_plate_number] = []
+        material_lengths = []  # type: List[float]
+        material_weights = []  # type: List[float]
+        material_costs = []  # type: List[float]
+        material_names = []  # type: List[str]
 
-        material_preference_values = json.loads(self._application.getInstance().getPreferences().getValue("cura/material_settings"))
+        material_preference_values = self._getMaterialPreferenceValues()
+        material_amounts = self._material_amounts.get(build_plate_number, [])
 
         extruder_stacks = global_stack.extruders
 
         for position in extruder_stacks:
-            extruder_stack = extruder_stacks[position]
             index = int(position)
-            if index >= len(self._material_amounts):
+            if index >= len(material_amounts):
                 continue
-            amount = self._material_amounts[index]
-            # Find the right extruder stack. As the list isn't sorted because it's a annoying generator, we do some
-            # list comprehension filtering to solve this for us.
-            density = extruder_stack.getMetaDataEntry("properties", {}).get("density", 0)
-            material = extruder_stack.material
-            radius = extruder_stack.getProperty("material_diameter", "value") / 2
-
-            weight = float(amount) * float(density) / 1000
-            cost = 0.
+            amount = material_amounts[index]
+            material_info = self._getMaterialInfo(position)
 
-            material_guid = material.getMetaDataEntry("GUID")
-            material_name = material.getName()
+            weight = float(amount) * material_info.density / 1000
+            cost = 0.
 
-            if material_guid in material_preference_values:
-                material_values = material_preference_values[material_guid]
+            if material_info.guid in material_preference_values:
+                material_values = material_preference_values[material_info.guid]
 
                 if material_values and "spool_weight" in material_values:
                     weight_per_spool = float(material_values["spool_weight"])
                 else:
-                    weight_per_spool = float(extruder_stack.getMetaDataEntry("properties", {}).get("weight", 0))
+                    weight_per_spool = material_info.weight_per_spool
 
                 cost_per_spool = float(material_values["spool_cost"] if material_values and "spool_cost" in material_values else 0)
 
@@ -232,27 +241,104 @@ class PrintInformation(QObject):
                     cost = 0
 
             # Material amount is sent as an amount of mm^3, so calculate length from that
-            if radius != 0:
-                length = round((amount / (math.pi * radius ** 2)) / 1000, 2)
+            if material_info.radius != 0:
+                length = round((amount / (math.pi * material_info.radius ** 2)) / 1000, 2)
             else:
                 length = 0
 
-            self._material_weights[build_plate_number].append(weight)
-            self._material_lengths[build_plate_number].append(length)
-            self._material_costs[build_plate_number].append(cost)
-            self._material_names[build_plate_number].append(material_name)
+            material_weights.append(weight)
+            material_lengths.append(length)
+            material_costs.append(cost)
+            material_names.append(material_info.name)
+
+        self._material_lengths[build_plate_number] = material_lengths
+        self._material_weights[build_plate_number] = material_weights
+        self._material_costs[build_plate_number] = material_costs
+        self._material_names[build_plate_number] = material_names
+        return True
+
+    ##  Calculates the material information again for the build plates of which
+    #   the last slice uses any of the given extruders. The other build plates
+    #   stay the same.
+    def _recalculateBuildPlates(self, positions: Set[str]) -> None:
+        indices = {int(position) for position in positions}
+        changed = False
+        for build_plate_number in range(self._multi_build_plate_model.maxBuildPlate + 1):
+            material_amounts = self._material_amounts.get(build_plate_number, [])
+            if any(index < len(material_amounts) for index in indices):
+                changed |= self._updateBuildPlateInformation(build_plate_number)
+        if changed:
+            self._emitMaterialInformationChanged()
 
+    def _emitMaterialInformationChanged(self) -> None:
         self.materialLengthsChanged.emit()
         self.materialWeightsChanged.emit()
         self.materialCostsChanged.emit()
         self.materialNamesChanged.emit()
 
+    ##  Gets the parsed cura/material_settings preference. It is only parsed
+    #   again when the preference changes.
+    def _getMaterialPreferenceValues(self) -> Dict[str, Any]:
+        if self._material_preference_values is None:
+            self._material_preference_values = json.loads(self._application.getInstance().getPreferences().getValue("cura/material_settings"))
+        return self._material_preference_values
+
+    ##  Gets what the material information of an extruder is calculated from.
+    def _getMaterialInfo(self, position: str) -> _MaterialInfo:
+        extruder_stack = self._application.getGlobalContainerStack().extruders[position]
+        material_info = self._material_info.get(position)
+        if material_info is None or material_info.material_id != extruder_stack.material.getId():
+            material_info = self._createMaterialInfo(extruder_stack)
+            self._material_info[position] = material_info
+        return material_info
+
+    @staticmethod
+    def _createMaterialInfo(extruder_stack: "ExtruderStack") -> _MaterialInfo:
+        material = extruder_stack.material
+        properties = extruder_stack.getMetaDataEntry("properties", {})
+        return _MaterialInfo(
+            material_id = material.getId(),
+            guid = material.getMetaDataEntry("GUID"),
+            name = material.getName(),
+            density = float(properties.get("density", 0)),
+            radius = extruder_stack.getProperty("material_diameter", "value") / 2,
+            weight_per_spool = float(properties.get("weight", 0))
+        )
+
+    ##  Reads the material information of all extruders again.
+    #   \return The positions of the extruders of which it changed.
+    def _updateMaterialInfo(self) -> Set[str]:
+        global_stack = self._application.getGlobalContainerStack()
+        if global_stack is None:
+            return set()
+
+        changed_positions = set()  # type: Set[str]
+        material_info = {}  # type: Dict[str, _MaterialInfo]
+        for position, extruder_stack in global_stack.extruders.items():
+            material_info[position] = self._createMaterialInfo(extruder_stack)
+            if material_info[position] != self._material_info.get(position):
+                changed_positions.add(position)
+        self._material_info = material_info
+        return changed_positions
+
     def _onPreferencesChanged(self, preference: str) -> None:
         if preference != "cura/material_settings":
             return
 
-        for build_plate_number in range(self._multi_build_plate_model.maxBuildPlate + 1):
-            self._calculateInformation(build_plate_number)
+        previous_values = self._material_preference_values
+        self._material_preference_values = None
+        values = self._getMaterialPreferenceValues()
+
+        # Only the extruders with a material of which the spool weight or cost changed.
+        global_stack = self._application.getGlobalContainerStack()
+        if global_stack is None:
+            return
+        if previous_values is None:
+            changed_positions = set(global_stack.extruders.keys())
+        else:
+            changed_guids = {guid for guid in set(previous_values) | set(values) if previous_values.get(guid) != values.get(guid)}
+            changed_positions = {position for position in global_stack.extruders if self._getMaterialInfo(position).guid in changed_guids}
+        self._recalculateBuildPlates(changed_positions)
 
     def _onActiveBuildPlateChanged(self) -> None:
         new_active_build_plate = self._multi_build_plate_model.activeBuildPlate
@@ -269,8 +355,7 @@ class PrintInformation(QObject):
             self.currentPrintTimeChanged.emit()
 
     def _onActiveMaterialsChanged(self, *args, **kwargs) -> None:
-        for build_plate_number in range(self._multi_build_plate_model.maxBuildPlate + 1):
-            self._calculateInformation(build_plate_number)
+        self._recalculateBuildPlates(self._updateMaterialInfo())  # Only for the extruders of which the material changed.
 
     # Manual override of job name should also set the base name so that when the printer prefix is updated, it the
     # prefix can be added to the manually added name, not the old base name
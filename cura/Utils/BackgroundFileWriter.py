@@ -0,0 +1,73 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from UM.Logger import Logger
+from UM.SaveFile import SaveFile
+
+
+##  Writes files on a background thread.
+#
+#   Writes are coalesced per file: if a file is queued again before the
+#   previous data was written, only the latest data gets written. Every file is
+#   written through SaveFile, so it is replaced atomically and a crash in the
+#   middle of a write never leaves a truncated file behind.
+#
+#   Callbacks for failed writes are called on the background thread.
+class BackgroundFileWriter:
+    def __init__(self) -> None:
+        self._pending = {}  # type: Dict[str, Tuple[str, Optional[Callable[[], None]]]]
+        self._is_writing = False
+        self._condition = threading.Condition()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    ##  Queue a file to be written.
+    #
+    #   \param path The file to write to.
+    #   \param data The new contents of the file.
+    #   \param on_error Called if the file could not be written. Not called if
+    #   newer data for the same file was queued before this data got written.
+    def write(self, path: str, data: str, on_error: Optional[Callable[[], None]] = None) -> None:
+        with self._condition:
+            self._pending[path] = (data, on_error)
+            if self._thread is None:
+                self._thread = threading.Thread(target = self._run, name = "BackgroundFileWriter", daemon = True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    ##  Wait until all queued files have been written.
+    #
+    #   \param timeout The maximum time to wait, in seconds. None to wait until
+    #   everything is written.
+    #   \return Whether everything was written in time.
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._is_writing, timeout = timeout)
+
+    ##  Gets whether there are files that are queued or being written.
+    def isBusy(self) -> bool:
+        with self._condition:
+            return bool(self._pending) or self._is_writing
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: bool(self._pending))
+                pending = self._pending
+                self._pending = {}
+                self._is_writing = True
+
+            for path, (data, on_error) in pending.items():
+                try:
+                    with SaveFile(path, "wt") as f:
+                        f.write(data)
+                except EnvironmentError as e:
+                    Logger.log("e", "Unable to write {path}: {err}".format(path = path, err = str(e)))
+                    if on_error is not None:
+                        on_error()
+
+            with self._condition:
+                self._is_writing = False
+                self._condition.notify_all()
@@ -1,8 +1,10 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from typing import Optional
-import os.path
+import concurrent.futures
+import threading
+from typing import Any, Iterator, List, Optional, Tuple
+import os
 import zipfile
 
 import numpy
@@ -14,6 +16,7 @@ from UM.Logger import Logger
 from UM.Math.Matrix import Matrix
 from UM.Math.Vector import Vector
 from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshData import MeshData
 from UM.Mesh.MeshReader import MeshReader
 from UM.Scene.GroupDecorator import GroupDecorator
 from UM.MimeTypeDatabase import MimeTypeDatabase, MimeType
@@ -38,9 +41,20 @@ except ImportError:
 
 ##    Base implementation for reading 3MF files. Has no support for textures. Only loads meshes!
 class ThreeMFReader(MeshReader):
-    def __init__(self) -> None:
+    ##  \param max_workers The number of threads to convert meshes with. None
+    #   to use one thread per core, up to four. 0 to convert them on the
+    #   calling thread.
+    def __init__(self, max_workers: Optional[int] = None) -> None:
         super().__init__()
 
+        if max_workers is None:
+            max_workers = min(4, os.cpu_count() or 1)
+        self._max_workers = max_workers
+
+        self._prefetch_executor = None  # type: Optional[concurrent.futures.ThreadPoolExecutor]
+        self._prefetched = None  # type: Optional[Tuple[Tuple[str, int, int], concurrent.futures.Future]]
+        self._prefetch_lock = threading.Lock()  # Prefetching happens on the Qt thread, reading on the thread of the read job.
+
         MimeTypeDatabase.addMimeType(
             MimeType(
                 name = "application/vnd.ms-package.3dmanufacturing-3dmodel+xml",
@@ -85,9 +99,55 @@ class ThreeMFReader(MeshReader):
 
         return temp_mat
 
+    ##  Convert the mesh of a SceneNode object (as obtained from libSavitar) to
+    #   mesh data.
+    #
+    #   This doesn't touch the scene, so it is safe to call from any thread. The
+    #   vertices are a view on the bytes from libSavitar rather than a copy; the
+    #   view is read-only, so MeshData can use it as is without copying it again.
+    #   \return The mesh data, or None if the node has no vertices.
+    @staticmethod
+    def _convertSavitarMeshData(savitar_node) -> Optional[MeshData]:
+        data = numpy.frombuffer(savitar_node.getMeshData().getFlatVerticesAsBytes(), dtype = numpy.float32)
+        vertex_count = data.size // 3
+        if vertex_count == 0:
+            return None
+
+        mesh_builder = MeshBuilder()
+        mesh_builder.setVertices(data[:vertex_count * 3].reshape(-1, 3))
+        if vertex_count % 3 == 0:  # The normals are computed per triangle, so incomplete triangles get no normals.
+            mesh_builder.calculateNormals(fast = True)
+        return mesh_builder.build()
+
+    ##  Gets all nodes in a tree of SceneNode objects from libSavitar, depth
+    #   first, in the order in which _convertSavitarNodeToUMNode visits them.
+    def _flattenSavitarNodes(self, savitar_nodes) -> List:
+        result = []
+        for savitar_node in savitar_nodes:
+            result.append(savitar_node)
+            result.extend(self._flattenSavitarNodes(savitar_node.getChildren()))
+        return result
+
+    ##  Convert the meshes of all nodes in a 3MF scene.
+    #
+    #   The meshes of the objects are independent of each other, so they are
+    #   converted concurrently. Computing the normals is the bulk of the work and
+    #   numpy releases the GIL while doing so.
+    #   \return The mesh data of each node, in the order of
+    #   _flattenSavitarNodes.
+    def _convertSavitarMeshes(self, savitar_nodes) -> List[Optional[MeshData]]:
+        all_nodes = self._flattenSavitarNodes(savitar_nodes)
+        if self._max_workers <= 0 or len(all_nodes) < 2:
+            return [self._convertSavitarMeshData(savitar_node) for savitar_node in all_nodes]
+        with concurrent.futures.ThreadPoolExecutor(max_workers = self._max_workers) as executor:
+            return list(executor.map(self._convertSavitarMeshData, all_nodes))
+
     ##  Convenience function that converts a SceneNode object (as obtained from libSavitar) to a Uranium scene node.
+    #   \param savitar_node The node to convert.
+    #   \param mesh_data_iterator The converted mesh data of the node and its
+    #   children, as returned by _convertSavitarMeshes.
     #   \returns Uranium scene node.
-    def _convertSavitarNodeToUMNode(self, savitar_node):
+    def _convertSavitarNodeToUMNode(self, savitar_node, mesh_data_iterator: Iterator[Optional[MeshData]]):
         self._object_count += 1
         node_name = "Object %s" % self._object_count
 
@@ -98,20 +158,13 @@ class ThreeMFReader(MeshReader):
         um_node.setName(node_name)
         transformation = self._createMatrixFromTransformationString(savitar_node.getTransformation())
         um_node.setTransformation(transformation)
-        mesh_builder = MeshBuilder()
-
-        data = numpy.fromstring(savitar_node.getMeshData().getFlatVerticesAsBytes(), dtype=numpy.float32)
 
-        vertices = numpy.resize(data, (int(data.size / 3), 3))
-        mesh_builder.setVertices(vertices)
-        mesh_builder.calculateNormals(fast=True)
-        mesh_data = mesh_builder.build()
-
-        if len(mesh_data.getVertices()):
+        mesh_data = next(mesh_data_iterator)
+        if mesh_data is not None:
             um_node.setMeshData(mesh_data)
 
         for child in savitar_node.getChildren():
-            child_node = self._convertSavitarNodeToUMNode(child)
+            child_node = self._convertSavitarNodeToUMNode(child, mesh_data_iterator)
             if child_node:
                 um_node.addChild(child_node)
 
@@ -161,18 +214,81 @@ class ThreeMFReader(MeshReader):
             um_node.addDecorator(sliceable_decorator)
         return um_node
 
+    ##  Parse the model in a 3MF file and convert its meshes.
+    #
+    #   This doesn't touch the scene, so it can run in the background.
+    #   \return The libSavitar scene, its top-level nodes and the mesh data of
+    #   all nodes as returned by _convertSavitarMeshes. The scene is returned
+    #   too since it owns the nodes.
+    def _parseFile(self, file_name: str) -> Tuple[Any, List, List[Optional[MeshData]]]:
+        with zipfile.ZipFile(file_name, "r") as archive:
+            model = archive.read("3D/3dmodel.model")
+        parser = Savitar.ThreeMFParser()
+        scene_3mf = parser.parse(model)
+        savitar_nodes = scene_3mf.getSceneNodes()
+        return scene_3mf, savitar_nodes, self._convertSavitarMeshes(savitar_nodes)
+
+    @staticmethod
+    def _getFileSignature(file_name: str) -> Tuple[str, int, int]:
+        stat = os.stat(file_name)
+        return os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size
+
+    ##  Start parsing a file and converting its meshes in the background.
+    #
+    #   The next read() of the same file then uses the result, if the file
+    #   didn't change in the meantime. The project reader uses this to decode
+    #   the meshes while the user is looking at the project dialog.
+    def prefetch(self, file_name: str) -> None:
+        try:
+            signature = self._getFileSignature(file_name)
+        except EnvironmentError:
+            return
+        with self._prefetch_lock:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+            if self._prefetched is not None:
+                self._prefetched[1].cancel()
+            self._prefetched = (signature, self._prefetch_executor.submit(self._parseFile, file_name))
+
+    ##  Drop the result of prefetch(), e.g. because the user decided not to
+    #   open the file after all.
+    def cancelPrefetch(self) -> None:
+        with self._prefetch_lock:
+            prefetched = self._prefetched
+            self._prefetched = None
+        if prefetched is not None:
+            prefetched[1].cancel()  # Only stops it if it didn't start yet. Otherwise the result is dropped once it's done.
+
+    ##  Get the result of prefetch() for a file, if it was prefetched.
+    #   \return The result of _parseFile, or None if the file wasn't prefetched.
+    def _takePrefetched(self, file_name: str) -> Optional[Tuple[Any, List, List[Optional[MeshData]]]]:
+        with self._prefetch_lock:
+            prefetched = self._prefetched
+            self._prefetched = None
+        if prefetched is None:
+            return None
+        signature, future = prefetched
+        try:
+            if self._getFileSignature(file_name) != signature:
+                return None
+        except EnvironmentError:
+            return None
+        return future.result()
+
     def _read(self, file_name):
         result = []
         self._object_count = 0  # Used to name objects as there is no node name yet.
         # The base object of 3mf is a zipped archive.
         try:
-            archive = zipfile.ZipFile(file_name, "r")
             self._base_name = os.path.basename(file_name)
-            parser = Savitar.ThreeMFParser()
-            scene_3mf = parser.parse(archive.open("3D/3dmodel.model").read())
+            parsed = self._takePrefetched(file_name)
+            if parsed is None:
+                parsed = self._parseFile(file_name)
+            scene_3mf, savitar_nodes, mesh_data_list = parsed
             self._unit = scene_3mf.getUnit()
-            for node in scene_3mf.getSceneNodes():
-                um_node = self._convertSavitarNodeToUMNode(node)
+            mesh_data_iterator = iter(mesh_data_list)
+            for node in savitar_nodes:
+                um_node = self._convertSavitarNodeToUMNode(node, mesh_data_iterator)
                 if um_node is None:
                     continue
                 # compensate for original center position, if object(s) is/are not around its zero position
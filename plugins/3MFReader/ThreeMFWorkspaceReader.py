@@ -4,7 +4,7 @@
 from configparser import ConfigParser
 import zipfile
 import os
-from typing import Dict, List, Tuple, cast
+from typing import Callable, Dict, List, Optional, Tuple, cast
 
 import xml.etree.ElementTree as ET
 
@@ -81,6 +81,72 @@ class ExtruderInfo:
         self.user_changes_info = None
 
 
+##  All Cura files in a project archive, each read from the archive and parsed
+#   only once.
+#
+#   The index is made in preRead() and reused by read(), as long as the file
+#   didn't change in between. Parsers are shared between everyone asking for
+#   the same file, so they must not be modified.
+class ArchiveIndex:
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+        self._signature = self._getFileSignature(file_name)
+        self._serialized = {}  # type: Dict[str, str]
+        with zipfile.ZipFile(file_name, "r") as archive:
+            for name in archive.namelist():
+                if name.startswith("Cura/"):
+                    self._serialized[name] = archive.read(name).decode("utf-8")
+
+        self._updated_serialized = {}  # type: Dict[str, str]
+        self._parsers = {}  # type: Dict[Tuple[str, Optional[Callable[[str, str], str]], bool], ConfigParser]
+
+    @staticmethod
+    def _getFileSignature(file_name: str) -> Tuple[str, int, int]:
+        stat = os.stat(file_name)
+        return os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size
+
+    ##  Whether this index is still up to date for a file.
+    def isValidFor(self, file_name: str) -> bool:
+        try:
+            return self._getFileSignature(file_name) == self._signature
+        except EnvironmentError:
+            return False
+
+    ##  Gets the names of all files in the Cura/ directory of the archive.
+    def getFileNames(self) -> List[str]:
+        return list(self._serialized.keys())
+
+    ##  Gets the contents of a file.
+    #   \raises KeyError The file is not in the archive.
+    def getSerialized(self, file_name: str) -> str:
+        return self._serialized[file_name]
+
+    ##  Gets the contents of a file, upgraded to the current version.
+    #   \param update_function The _updateSerialized function of the container
+    #   class of the file.
+    def getUpdatedSerialized(self, file_name: str, update_function: Callable[[str, str], str]) -> str:
+        if file_name not in self._updated_serialized:
+            self._updated_serialized[file_name] = update_function(self.getSerialized(file_name), file_name)
+        return self._updated_serialized[file_name]
+
+    ##  Gets a file parsed as an INI file.
+    #   \param update_function If given, the file is upgraded to the current
+    #   version with this function before parsing it.
+    #   \param empty_lines_in_values Whether values can span empty lines, like
+    #   in ConfigParser.
+    def getParser(self, file_name: str, update_function: Optional[Callable[[str, str], str]] = None, empty_lines_in_values: bool = True) -> ConfigParser:
+        key = (file_name, update_function, empty_lines_in_values)
+        if key not in self._parsers:
+            if update_function is None:
+                serialized = self.getSerialized(file_name)
+            else:
+                serialized = self.getUpdatedSerialized(file_name, update_function)
+            parser = ConfigParser(interpolation = None, empty_lines_in_values = empty_lines_in_values)
+            parser.read_string(serialized)
+            self._parsers[key] = parser
+        return self._parsers[key]
+
+
 ##    Base implementation for reading 3MF workspace files.
 class ThreeMFWorkspaceReader(WorkspaceReader):
     def __init__(self) -> None:
@@ -115,6 +181,7 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
         self._is_same_machine_type = False
         self._old_new_materials = {} # type: Dict[str, str]
         self._machine_info = None
+        self._archive_index = None  # type: Optional[ArchiveIndex]
 
     def _clearState(self):
         self._is_same_machine_type = False
@@ -129,13 +196,19 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
             self._id_mapping[old_id] = self._container_registry.uniqueName(old_id)
         return self._id_mapping[old_id]
 
+    ##  Gets the index of a project file, reusing the one made by preRead() if
+    #   the file didn't change since.
+    def _getArchiveIndex(self, file_name: str) -> ArchiveIndex:
+        if self._archive_index is None or self._archive_index.file_name != file_name or not self._archive_index.isValidFor(file_name):
+            self._archive_index = ArchiveIndex(file_name)
+        return self._archive_index
+
     ##  Separates the given file list into a list of GlobalStack files and a list of ExtruderStack files.
     #
     #   In old versions, extruder stack files have the same suffix as container stack files ".stack.cfg".
     #
-    def _determineGlobalAndExtruderStackFiles(self, project_file_name: str, file_list: List[str]) -> Tuple[str, List[str]]:
-        archive = zipfile.ZipFile(project_file_name, "r")
-
+    def _determineGlobalAndExtruderStackFiles(self, archive_index: ArchiveIndex, file_list: List[str]) -> Tuple[str, List[str]]:
+        project_file_name = archive_index.file_name
         global_stack_file_list = [name for name in file_list if name.endswith(self._global_stack_suffix)]
         extruder_stack_file_list = [name for name in file_list if name.endswith(self._extruder_stack_suffix)]
 
@@ -146,9 +219,7 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
             # We need to know the type of the stack file, but we can only know it if we deserialize it.
             # The default ContainerStack.deserialize() will connect signals, which is not desired in this case.
             # Since we know that the stack files are INI files, so we directly use the ConfigParser to parse them.
-            serialized = archive.open(file_name).read().decode("utf-8")
-            stack_config = ConfigParser(interpolation = None)
-            stack_config.read_string(serialized)
+            stack_config = archive_index.getParser(file_name)
 
             # sanity check
             if not stack_config.has_option("metadata", "type"):
@@ -191,8 +262,9 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
         variant_type_name = i18n_catalog.i18nc("@label", "Nozzle")
 
         # Check if there are any conflicts, so we can ask the user.
-        archive = zipfile.ZipFile(file_name, "r")
-        cura_file_names = [name for name in archive.namelist() if name.startswith("Cura/")]
+        self._archive_index = None
+        archive_index = self._getArchiveIndex(file_name)
+        cura_file_names = archive_index.getFileNames()
 
         resolve_strategy_keys = ["machine", "material", "quality_changes"]
         self._resolve_strategies = {k: None for k in resolve_strategy_keys}
@@ -208,9 +280,9 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
         for definition_container_file in definition_container_files:
             container_id = self._stripFileToId(definition_container_file)
             definitions = self._container_registry.findDefinitionContainersMetadata(id = container_id)
-            serialized = archive.open(definition_container_file).read().decode("utf-8")
 
             if not definitions:
+                serialized = archive_index.getSerialized(definition_container_file)
                 definition_container = DefinitionContainer.deserializeMetadata(serialized, container_id)[0]
             else:
                 definition_container = definitions[0]
@@ -243,7 +315,7 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
             for material_container_file in material_container_files:
                 container_id = self._stripFileToId(material_container_file)
 
-                serialized = archive.open(material_container_file).read().decode("utf-8")
+                serialized = archive_index.getSerialized(material_container_file)
                 metadata_list = xml_material_profile.deserializeMetadata(serialized, container_id)
                 reverse_map = {metadata["id"]: container_id for metadata in metadata_list}
                 reverse_material_id_dict.update(reverse_map)
@@ -270,17 +342,15 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
         for instance_container_file_name in instance_container_files:
             container_id = self._stripFileToId(instance_container_file_name)
 
-            serialized = archive.open(instance_container_file_name).read().decode("utf-8")
-
             # Qualities and variants don't have upgrades, so don't upgrade them
-            parser = ConfigParser(interpolation = None)
-            parser.read_string(serialized)
+            parser = archive_index.getParser(instance_container_file_name)
             container_type = parser["metadata"]["type"]
             if container_type not in ("quality", "variant"):
-                serialized = InstanceContainer._updateSerialized(serialized, instance_container_file_name)
+                serialized = archive_index.getUpdatedSerialized(instance_container_file_name, InstanceContainer._updateSerialized)
+                parser = archive_index.getParser(instance_container_file_name, InstanceContainer._updateSerialized)
+            else:
+                serialized = archive_index.getSerialized(instance_container_file_name)
 
-            parser = ConfigParser(interpolation = None)
-            parser.read_string(serialized)
             container_info = ContainerInfo(instance_container_file_name, serialized, parser)
             instance_container_info_dict[container_id] = container_info
 
@@ -331,7 +401,7 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
         # Load ContainerStack files and ExtruderStack files
         try:
             global_stack_file, extruder_stack_files = self._determineGlobalAndExtruderStackFiles(
-                file_name, cura_file_names)
+                archive_index, cura_file_names)
         except FileNotFoundError:
             return WorkspaceReader.PreReadResult.failed
         machine_conflict = False
@@ -340,8 +410,8 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
         #  - the global stack DOESN'T exist but some/all of the extruder stacks exist
         # To simplify this, only check if the global stack exists or not
         global_stack_id = self._stripFileToId(global_stack_file)
-        serialized = archive.open(global_stack_file).read().decode("utf-8")
-        machine_name = self._getMachineNameFromSerializedStack(serialized)
+        stack_parser = archive_index.getParser(global_stack_file, empty_lines_in_values = False)
+        machine_name = stack_parser["general"].get("name", "")
         stacks = self._container_registry.findContainerStacks(name = machine_name, type = "machine")
         self._is_same_machine_type = True
         existing_global_stack = None
@@ -350,7 +420,7 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
             existing_global_stack = global_stack
             containers_found_dict["machine"] = True
             # Check if there are any changes at all in any of the container stacks.
-            id_list = self._getContainerIdListFromSerialized(serialized)
+            id_list = self._getContainerIdListFromParser(stack_parser)
             for index, container_id in enumerate(id_list):
                 # take into account the old empty container IDs
                 container_id = self._old_empty_profile_id_dict.get(container_id, container_id)
@@ -360,18 +430,14 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
             self._is_same_machine_type = global_stack.definition.getId() == machine_definition_id
 
         # Get quality type
-        parser = ConfigParser(interpolation = None)
-        parser.read_string(serialized)
+        parser = archive_index.getParser(global_stack_file)
         quality_container_id = parser["containers"][str(_ContainerIndexes.Quality)]
         quality_type = "empty_quality"
         if quality_container_id not in ("empty", "empty_quality"):
             quality_type = instance_container_info_dict[quality_container_id].parser["metadata"]["quality_type"]
 
         # Get machine info
-        serialized = archive.open(global_stack_file).read().decode("utf-8")
-        serialized = GlobalStack._updateSerialized(serialized, global_stack_file)
-        parser = ConfigParser(interpolation = None)
-        parser.read_string(serialized)
+        parser = archive_index.getParser(global_stack_file, GlobalStack._updateSerialized)
         definition_changes_id = parser["containers"][str(_ContainerIndexes.DefinitionChanges)]
         if definition_changes_id not in ("empty", "empty_definition_changes"):
             self._machine_info.definition_changes_info = instance_container_info_dict[definition_changes_id]
@@ -402,10 +468,7 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
 
         # if the global stack is found, we check if there are conflicts in the extruder stacks
         for extruder_stack_file in extruder_stack_files:
-            serialized = archive.open(extruder_stack_file).read().decode("utf-8")
-            serialized = ExtruderStack._updateSerialized(serialized, extruder_stack_file)
-            parser = ConfigParser(interpolation = None)
-            parser.read_string(serialized)
+            parser = archive_index.getParser(extruder_stack_file, ExtruderStack._updateSerialized)
 
             # The check should be done for the extruder stack that's associated with the existing global stack,
             # and those extruder stacks may have different IDs.
@@ -437,7 +500,7 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
 
                 existing_extruder_stack = global_stack.extruders[position]
                 # check if there are any changes at all in any of the container stacks.
-                id_list = self._getContainerIdListFromSerialized(serialized)
+                id_list = self._getContainerIdListFromParser(archive_index.getParser(extruder_stack_file, ExtruderStack._updateSerialized, empty_lines_in_values = False))
                 for index, container_id in enumerate(id_list):
                     # take into account the old empty container IDs
                     container_id = self._old_empty_profile_id_dict.get(container_id, container_id)
@@ -448,7 +511,7 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
         num_visible_settings = 0
         try:
             temp_preferences = Preferences()
-            serialized = archive.open("Cura/preferences.cfg").read().decode("utf-8")
+            serialized = archive_index.getSerialized("Cura/preferences.cfg")
             temp_preferences.deserialize(serialized)
 
             visible_settings_string = temp_preferences.getValue("general/visible_settings")
@@ -506,6 +569,11 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
                 is_printer_group = True
                 machine_name = group_name
 
+        # Start decoding the meshes while the user is looking at the dialog.
+        prefetch = getattr(self._3mf_mesh_reader, "prefetch", None)
+        if prefetch is not None:
+            prefetch(file_name)
+
         # Show the dialog, informing the user what is about to happen.
         self._dialog.setMachineConflict(machine_conflict)
         self._dialog.setIsPrinterGroup(is_printer_group)
@@ -530,6 +598,9 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
         self._dialog.waitForClose()
 
         if self._dialog.getResult() == {}:
+            cancel_prefetch = getattr(self._3mf_mesh_reader, "cancelPrefetch", None)
+            if cancel_prefetch is not None:
+                cancel_prefetch()
             return WorkspaceReader.PreReadResult.cancelled
 
         self._resolve_strategies = self._dialog.getResult()
@@ -579,14 +650,15 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
         application = CuraApplication.getInstance()
         material_manager = application.getMaterialManager()
 
-        archive = zipfile.ZipFile(file_name, "r")
+        archive_index = self._getArchiveIndex(file_name)
+        self._archive_index = None  # Only needed for this read. Don't keep the whole project in memory.
 
-        cura_file_names = [name for name in archive.namelist() if name.startswith("Cura/")]
+        cura_file_names = archive_index.getFileNames()
 
         # Create a shadow copy of the preferences (we don't want all of the preferences, but we do want to re-use its
         # parsing code.
         temp_preferences = Preferences()
-        serialized = archive.open("Cura/preferences.cfg").read().decode("utf-8")
+        serialized = archive_index.getSerialized("Cura/preferences.cfg")
         temp_preferences.deserialize(serialized)
 
         # Copy a number of settings from the temp preferences to the global
@@ -638,7 +710,7 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
             if not definitions:
                 definition_container = DefinitionContainer(container_id)
                 try:
-                    definition_container.deserialize(archive.open(definition_container_file).read().decode("utf-8"),
+                    definition_container.deserialize(archive_index.getSerialized(definition_container_file),
                                                      file_name = definition_container_file)
                 except ContainerFormatError:
                     # We cannot just skip the definition file because everything else later will just break if the
@@ -685,7 +757,7 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
                 if to_deserialize_material:
                     material_container = xml_material_profile(container_id)
                     try:
-                        material_container.deserialize(archive.open(material_container_file).read().decode("utf-8"),
+                        material_container.deserialize(archive_index.getSerialized(material_container_file),
                                                        file_name = container_id + "." + self._material_container_suffix)
                     except ContainerFormatError:
                         Logger.logException("e", "Failed to deserialize material file %s in project file %s",
@@ -1019,11 +1091,8 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
     def _getXmlProfileClass(self):
         return self._container_registry.getContainerForMimeType(MimeTypeDatabase.getMimeType("application/x-ultimaker-material-profile"))
 
-    ##  Get the list of ID's of all containers in a container stack by partially parsing it's serialized data.
-    def _getContainerIdListFromSerialized(self, serialized):
-        parser = ConfigParser(interpolation = None, empty_lines_in_values = False)
-        parser.read_string(serialized)
-
+    ##  Get the list of ID's of all containers in a container stack from its parsed serialized data.
+    def _getContainerIdListFromParser(self, parser: ConfigParser) -> List[str]:
         container_ids = []
         if "containers" in parser:
             for index, container_id in parser.items("containers"):
@@ -1041,11 +1110,6 @@ class ThreeMFWorkspaceReader(WorkspaceReader):
 
         return container_ids
 
-    def _getMachineNameFromSerializedStack(self, serialized):
-        parser = ConfigParser(interpolation = None, empty_lines_in_values = False)
-        parser.read_string(serialized)
-        return parser["general"].get("name", "")
-
     def _getMaterialLabelFromSerialized(self, serialized):
         data = ET.fromstring(serialized)
         metadata = data.iterfind("./um:metadata/um:name/um:label", {"um": "http://www.ultimaker.com/material"})
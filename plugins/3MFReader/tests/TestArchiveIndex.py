@@ -0,0 +1,72 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import zipfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..ThreeMFWorkspaceReader import ArchiveIndex
+
+_stack_file = """[general]
+version = 4
+name = Test Printer
+
+[metadata]
+type = machine
+"""
+
+
+@pytest.fixture
+def project_file(tmpdir):
+    path = os.path.join(str(tmpdir), "project.3mf")
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("3D/3dmodel.model", "<model />")
+        archive.writestr("Cura/test_printer.global.cfg", _stack_file)
+        archive.writestr("Cura/preferences.cfg", "[general]\nversion = 6\n")
+    return path
+
+
+def test_onlyCuraFiles(project_file):
+    index = ArchiveIndex(project_file)
+    assert sorted(index.getFileNames()) == ["Cura/preferences.cfg", "Cura/test_printer.global.cfg"]
+    with pytest.raises(KeyError):
+        index.getSerialized("3D/3dmodel.model")
+
+
+def test_parsedOnce(project_file):
+    index = ArchiveIndex(project_file)
+    update_function = MagicMock(side_effect = lambda serialized, file_name: serialized.replace("Test Printer", "Upgraded"))
+
+    parser = index.getParser("Cura/test_printer.global.cfg")
+    assert parser["general"]["name"] == "Test Printer"
+    assert index.getParser("Cura/test_printer.global.cfg") is parser
+
+    updated_parser = index.getParser("Cura/test_printer.global.cfg", update_function)
+    assert updated_parser["general"]["name"] == "Upgraded"
+    assert index.getParser("Cura/test_printer.global.cfg", update_function) is updated_parser
+    assert index.getUpdatedSerialized("Cura/test_printer.global.cfg", update_function).startswith("[general]")
+    assert update_function.call_count == 1
+
+
+def test_parsersPerOptions(project_file):
+    index = ArchiveIndex(project_file)
+
+    parser = index.getParser("Cura/test_printer.global.cfg")
+    strict_parser = index.getParser("Cura/test_printer.global.cfg", empty_lines_in_values = False)
+    assert strict_parser is not parser
+    assert index.getParser("Cura/test_printer.global.cfg", empty_lines_in_values = False) is strict_parser
+
+    first_update = MagicMock(side_effect = lambda serialized, file_name: serialized)
+    second_update = MagicMock(side_effect = lambda serialized, file_name: serialized)
+    assert index.getParser("Cura/test_printer.global.cfg", first_update) is not index.getParser("Cura/test_printer.global.cfg", second_update)
+
+
+def test_isValidFor(project_file):
+    index = ArchiveIndex(project_file)
+    assert index.isValidFor(project_file)
+
+    with zipfile.ZipFile(project_file, "a") as archive:
+        archive.writestr("Cura/extra.inst.cfg", "[general]\n")
+    assert not index.isValidFor(project_file)
@@ -0,0 +1,58 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock
+
+import numpy
+import pytest
+
+from ..ThreeMFReader import ThreeMFReader
+
+
+##  Creates a node like libSavitar gives them, with the given vertices.
+def createSavitarNode(vertices, children = None):
+    savitar_node = MagicMock()
+    savitar_node.getMeshData().getFlatVerticesAsBytes = MagicMock(return_value = numpy.array(vertices, dtype = numpy.float32).tobytes())
+    savitar_node.getChildren = MagicMock(return_value = children or [])
+    return savitar_node
+
+
+def createTriangle(offset):
+    return [offset, 0, 0, offset + 1, 0, 0, offset, 1, 0]
+
+
+def test_convertMeshData():
+    mesh_data = ThreeMFReader._convertSavitarMeshData(createSavitarNode(createTriangle(0) + createTriangle(10)))
+
+    assert mesh_data.getVertexCount() == 6
+    assert numpy.array_equal(mesh_data.getVertices()[3], [10, 0, 0])
+    assert mesh_data.hasNormals()
+
+
+def test_convertMeshDataEmpty():
+    assert ThreeMFReader._convertSavitarMeshData(createSavitarNode([])) is None
+
+
+##  Meshes with less than a whole triangle keep their vertices, like before
+#   meshes were converted in parallel.
+@pytest.mark.parametrize("float_count", [3, 6, 12])
+def test_convertMeshDataIncompleteTriangles(float_count):
+    mesh_data = ThreeMFReader._convertSavitarMeshData(createSavitarNode(list(range(float_count))))
+
+    assert mesh_data is not None
+    assert mesh_data.getVertexCount() == float_count // 3
+
+
+##  The meshes of all nodes are converted in the order in which the nodes are
+#   converted to scene nodes, also when converting them in parallel.
+@pytest.mark.parametrize("max_workers", [0, 4])
+def test_convertMeshesOrder(max_workers):
+    grandchild = createSavitarNode(createTriangle(3))
+    child = createSavitarNode(createTriangle(2), children = [grandchild])
+    savitar_nodes = [createSavitarNode(createTriangle(1), children = [child]), createSavitarNode([]), createSavitarNode(createTriangle(4))]
+    reader = ThreeMFReader.__new__(ThreeMFReader)  # Not registering the MIME types.
+    reader._max_workers = max_workers
+
+    meshes = reader._convertSavitarMeshes(savitar_nodes)
+
+    assert [mesh_data.getVertices()[0][0] if mesh_data is not None else None for mesh_data in meshes] == [1, 2, 3, None, 4]
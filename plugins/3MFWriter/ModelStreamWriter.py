@@ -0,0 +1,171 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import collections
+import concurrent.futures
+import os
+import sys
+import tempfile
+import zipfile
+from typing import Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy
+
+
+##  Everything that needs to be known of a scene node to write it as an object
+#   in the 3MF model. This is collected on the Qt thread, so that the scene can
+#   keep changing while the model is being written.
+#
+#   MeshData is immutable, so the vertices and indices can safely be used from
+#   another thread.
+ModelObject = NamedTuple("ModelObject", [
+    ("object_id", int),
+    ("vertices", Optional[numpy.ndarray]),
+    ("indices", Optional[numpy.ndarray]),
+    ("settings", Dict[str, str]),
+    ("components", List[Tuple[int, str]])  # Object ID and transformation of each child of this object.
+])
+
+##  A top-level object in the model, with its transformation on the build
+#   plate.
+BuildItem = NamedTuple("BuildItem", [("object_id", int), ("transformation", str)])
+
+
+_vertex_template = "<vertex x=\"%.9g\" y=\"%.9g\" z=\"%.9g\" />"
+_triangle_template = "<triangle v1=\"%d\" v2=\"%d\" v3=\"%d\" />"
+
+
+##  Format a block of vertices as XML.
+#   \param vertices An array of vertices, with three coordinates per row.
+def _formatVertices(vertices: numpy.ndarray) -> bytes:
+    return ((_vertex_template * len(vertices)) % tuple(vertices.ravel().tolist())).encode("utf-8")
+
+
+##  Format a block of triangles as XML.
+#   \param triangles An array of vertex indices, with three indices per row.
+def _formatTriangles(triangles: numpy.ndarray) -> bytes:
+    return ((_triangle_template * len(triangles)) % tuple(triangles.ravel().tolist())).encode("utf-8")
+
+
+##  Writes the 3D/3dmodel.model file of a 3MF archive, one object at a time.
+#
+#   The XML of the meshes is never built for the whole model at once. The
+#   vertices and triangles of each mesh are split into blocks, which are
+#   formatted in a thread pool and then compressed into the archive entry in
+#   order. Only a limited number of blocks is in flight at any time, so memory
+#   use doesn't grow with the size of the model. Compressing a block releases
+#   the GIL, so it overlaps with formatting the next blocks.
+class ModelStreamWriter:
+    BlockSize = 16384  # Vertices or triangles per block.
+
+    def __init__(self, namespaces: Dict[str, str], max_workers: Optional[int] = None) -> None:
+        self._namespaces = namespaces
+        if max_workers is None:
+            max_workers = min(4, os.cpu_count() or 1)
+        self._max_workers = max_workers
+
+    ##  Write the model file to an archive.
+    #
+    #   \param archive The archive to add the model file to.
+    #   \param model_file The entry in the archive to write the model to.
+    #   \param objects All objects in the model.
+    #   \param build_items The objects that are placed on the build plate.
+    #   \param progress_callback Called with the progress of writing, from 0 to
+    #   100.
+    def write(self, archive: zipfile.ZipFile, model_file: zipfile.ZipInfo, objects: List[ModelObject], build_items: List[BuildItem],
+              progress_callback: Optional[Callable[[float], None]] = None) -> None:
+        parts = self._generateParts(objects, build_items)
+        total_elements = sum(self._countElements(model_object) for model_object in objects)
+
+        if sys.version_info >= (3, 6):
+            with archive.open(model_file, "w", force_zip64 = True) as f:
+                self._writeParts(f, parts, total_elements, progress_callback)
+            return
+
+        # Before Python 3.6 entries can't be written to incrementally, so go through a temporary file.
+        handle, temporary_path = tempfile.mkstemp(suffix = ".model")
+        try:
+            with os.fdopen(handle, "wb") as f:
+                self._writeParts(f, parts, total_elements, progress_callback)
+            archive.write(temporary_path, model_file.filename, compress_type = model_file.compress_type)
+        finally:
+            os.remove(temporary_path)
+
+    ##  Gets the number of vertices and triangles of an object.
+    @staticmethod
+    def _countElements(model_object: ModelObject) -> int:
+        if model_object.vertices is None:
+            return 0
+        triangle_count = len(model_object.indices) if model_object.indices is not None else len(model_object.vertices) // 3
+        return len(model_object.vertices) + triangle_count
+
+    ##  Writes the parts of the model to a file, formatting the blocks of mesh
+    #   data in a thread pool while keeping them in order.
+    def _writeParts(self, f, parts: Iterator[Union[bytes, Tuple[Callable[[numpy.ndarray], bytes], numpy.ndarray]]], total_elements: int,
+                    progress_callback: Optional[Callable[[float], None]]) -> None:
+        written_elements = 0
+
+        def writeResult(future: concurrent.futures.Future, element_count: int) -> None:
+            nonlocal written_elements
+            f.write(future.result())
+            written_elements += element_count
+            if element_count and progress_callback is not None and total_elements:
+                progress_callback(100 * written_elements / total_elements)
+
+        in_flight = collections.deque()  # type: Deque[Tuple[concurrent.futures.Future, int]]
+        with concurrent.futures.ThreadPoolExecutor(max_workers = max(1, self._max_workers)) as executor:
+            for part in parts:
+                if isinstance(part, bytes):
+                    future = concurrent.futures.Future()  # type: concurrent.futures.Future
+                    future.set_result(part)
+                    in_flight.append((future, 0))
+                else:
+                    format_function, block = part
+                    in_flight.append((executor.submit(format_function, block), len(block)))
+
+                # Keep a few blocks ahead, but no more than that to limit the memory use.
+                while len(in_flight) > 2 * self._max_workers or (in_flight and in_flight[0][0].done()):
+                    writeResult(*in_flight.popleft())
+
+            while in_flight:
+                writeResult(*in_flight.popleft())
+
+    ##  Generates the model file in order, as pieces of XML or as blocks of mesh
+    #   data along with the function that formats them.
+    def _generateParts(self, objects: List[ModelObject], build_items: List[BuildItem]) -> Iterator[Union[bytes, Tuple[Callable[[numpy.ndarray], bytes], numpy.ndarray]]]:
+        yield ("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+               "<model unit=\"millimeter\" xml:lang=\"en-US\" xmlns={core} xmlns:cura={cura}>"
+               "<resources>").format(core = quoteattr(self._namespaces["3mf"]), cura = quoteattr(self._namespaces["cura"])).encode("utf-8")
+
+        for model_object in objects:
+            header = "<object id=\"{object_id}\" type=\"model\">".format(object_id = model_object.object_id)
+            if model_object.settings:
+                header += "<metadatagroup>"
+                for key, value in model_object.settings.items():
+                    header += "<metadata name={name} preserve=\"true\" type=\"xs:string\">{value}</metadata>".format(name = quoteattr("cura:" + key), value = escape(value))
+                header += "</metadatagroup>"
+            yield header.encode("utf-8")
+
+            if model_object.vertices is not None:
+                vertices = model_object.vertices
+                triangles = model_object.indices
+                if triangles is None:
+                    triangles = numpy.arange(len(vertices) - len(vertices) % 3, dtype = numpy.int32).reshape(-1, 3)
+                yield b"<mesh><vertices>"
+                for start in range(0, len(vertices), self.BlockSize):
+                    yield _formatVertices, vertices[start:start + self.BlockSize]
+                yield b"</vertices><triangles>"
+                for start in range(0, len(triangles), self.BlockSize):
+                    yield _formatTriangles, triangles[start:start + self.BlockSize]
+                yield b"</triangles></mesh>"
+
+            if model_object.components:
+                components = "".join("<component objectid=\"{object_id}\" transform=\"{transformation}\" />".format(object_id = object_id, transformation = transformation)
+                                     for object_id, transformation in model_object.components)
+                yield "<components>{components}</components>".format(components = components).encode("utf-8")
+            yield b"</object>"
+
+        items = "".join("<item objectid=\"{object_id}\" transform=\"{transformation}\" />".format(object_id = item.object_id, transformation = item.transformation)
+                        for item in build_items)
+        yield "</resources><build>{items}</build></model>".format(items = items).encode("utf-8")
@@ -1,8 +1,10 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
+import collections
 import configparser
 from io import StringIO
+from typing import Dict
 import zipfile
 
 from UM.Application import Application
@@ -17,38 +19,67 @@ class ThreeMFWorkspaceWriter(WorkspaceWriter):
     def __init__(self):
         super().__init__()
 
-    @call_on_qt_thread
+    ##  Write the project.
+    #
+    #   The meshes are written on the calling thread, which is normally the
+    #   thread of the WriteFileJob. Only collecting the data that is written
+    #   happens on the Qt thread.
     def write(self, stream, nodes, mode=WorkspaceWriter.OutputMode.BinaryMode):
         application = Application.getInstance()
-        machine_manager = application.getMachineManager()
 
         mesh_writer = application.getMeshFileHandler().getWriter("3MFWriter")
 
         if not mesh_writer:  # We need to have the 3mf mesh writer, otherwise we can't save the entire workspace
             return False
 
+        # Serialise the settings up front, so they are consistent with each other even if they change while the meshes are written.
+        workspace_files = self._serializeWorkspace()
+
         # Indicate that the 3mf mesh writer should not close the archive just yet (we still need to add stuff to it).
         mesh_writer.setStoreArchive(True)
-        mesh_writer.write(stream, nodes, mode)
-
-        archive = mesh_writer.getArchive()
+        try:
+            mesh_writer.write(stream, nodes, mode)
+            archive = mesh_writer.getArchive()
+        finally:
+            mesh_writer.setStoreArchive(False)
         if archive is None:  # This happens if there was no mesh data to write.
             archive = zipfile.ZipFile(stream, "w", compression = zipfile.ZIP_DEFLATED)
 
+        for file_name, data in workspace_files.items():
+            file_in_archive = zipfile.ZipInfo(file_name)
+            # For some reason we have to set the compress type of each file as well (it doesn't keep the type of the entire archive)
+            file_in_archive.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(file_in_archive, data)
+
+        # Close the archive & reset states.
+        archive.close()
+        return True
+
+    ##  Serialise the stacks, preferences and version information of the
+    #   workspace.
+    #
+    #   This runs on the Qt thread, since the containers are not thread-safe.
+    #   \return The file name and contents of each file to add to the archive.
+    @call_on_qt_thread
+    def _serializeWorkspace(self) -> Dict[str, str]:
+        application = Application.getInstance()
+        machine_manager = application.getMachineManager()
+        workspace_files = collections.OrderedDict()  # type: Dict[str, str]
+
         global_stack = machine_manager.activeMachine
 
         # Add global container stack data to the archive.
-        self._writeContainerToArchive(global_stack, archive)
+        self._serializeContainer(global_stack, workspace_files)
 
         # Also write all containers in the stack to the file
         for container in global_stack.getContainers():
-            self._writeContainerToArchive(container, archive)
+            self._serializeContainer(container, workspace_files)
 
         # Check if the machine has extruders and save all that data as well.
         for extruder_stack in global_stack.extruders.values():
-            self._writeContainerToArchive(extruder_stack, archive)
+            self._serializeContainer(extruder_stack, workspace_files)
             for container in extruder_stack.getContainers():
-                self._writeContainerToArchive(container, archive)
+                self._serializeContainer(container, workspace_files)
 
         # Write preferences to archive
         original_preferences = Application.getInstance().getPreferences() #Copy only the preferences that we use to the workspace.
@@ -58,11 +89,9 @@ class ThreeMFWorkspaceWriter(WorkspaceWriter):
             temp_preferences.setValue(preference, original_preferences.getValue(preference))
         preferences_string = StringIO()
         temp_preferences.writeToFile(preferences_string)
-        preferences_file = zipfile.ZipInfo("Cura/preferences.cfg")
-        archive.writestr(preferences_file, preferences_string.getvalue())
+        workspace_files["Cura/preferences.cfg"] = preferences_string.getvalue()
 
         # Save Cura version
-        version_file = zipfile.ZipInfo("Cura/version.ini")
         version_config_parser = configparser.ConfigParser(interpolation = None)
         version_config_parser.add_section("versions")
         version_config_parser.set("versions", "cura_version", application.getVersion())
@@ -71,18 +100,14 @@ class ThreeMFWorkspaceWriter(WorkspaceWriter):
 
         version_file_string = StringIO()
         version_config_parser.write(version_file_string)
-        archive.writestr(version_file, version_file_string.getvalue())
+        workspace_files["Cura/version.ini"] = version_file_string.getvalue()
+        return workspace_files
 
-        # Close the archive & reset states.
-        archive.close()
-        mesh_writer.setStoreArchive(False)
-        return True
-
-    ##  Helper function that writes ContainerStacks, InstanceContainers and DefinitionContainers to the archive.
+    ##  Helper function that serialises ContainerStacks, InstanceContainers and DefinitionContainers for the archive.
     #   \param container That follows the \type{ContainerInterface} to archive.
-    #   \param archive The archive to write to.
+    #   \param workspace_files The files to write to the archive, by file name.
     @staticmethod
-    def _writeContainerToArchive(container, archive):
+    def _serializeContainer(container, workspace_files: Dict[str, str]) -> None:
         if isinstance(container, type(ContainerRegistry.getInstance().getEmptyInstanceContainer())):
             return  # Empty file, do nothing.
 
@@ -96,15 +121,9 @@ class ThreeMFWorkspaceWriter(WorkspaceWriter):
 
         file_name = "Cura/%s.%s" % (container.getId(), file_suffix)
 
-        if file_name in archive.namelist():
+        if file_name in workspace_files:
             return  # File was already saved, no need to do it again. Uranium guarantees unique ID's, so this should hold.
 
-        file_in_archive = zipfile.ZipInfo(file_name)
-        # For some reason we have to set the compress type of each file as well (it doesn't keep the type of the entire archive)
-        file_in_archive.compress_type = zipfile.ZIP_DEFLATED
-
         # Do not include the network authentication keys
         ignore_keys = {"network_authentication_id", "network_authentication_key", "octoprint_api_key"}
-        serialized_data = container.serialize(ignored_metadata_keys = ignore_keys)
-
-        archive.writestr(file_in_archive, serialized_data)
+        workspace_files[file_name] = container.serialize(ignored_metadata_keys = ignore_keys)
@@ -7,8 +7,12 @@ from UM.Logger import Logger
 from UM.Math.Matrix import Matrix
 from UM.Application import Application
 from UM.Scene.SceneNode import SceneNode
+from UM.Signal import Signal
 
 from cura.CuraApplication import CuraApplication
+from cura.Utils.Threading import call_on_qt_thread
+
+from .ModelStreamWriter import BuildItem, ModelObject, ModelStreamWriter
 
 import Savitar
 
@@ -22,6 +26,7 @@ except ImportError:
     Logger.log("w", "Unable to load cElementTree, switching to slower version")
     import xml.etree.ElementTree as ET
 
+from typing import List, Tuple
 import zipfile
 import UM.Application
 
@@ -42,6 +47,11 @@ class ThreeMFWriter(MeshWriter):
         self._unit_matrix_string = self._convertMatrixToString(Matrix())
         self._archive = None
         self._store_archive = False
+        self._stream_model = True
+
+        # Emitted with the progress of writing the meshes, from 0 to 100, while writing a file. This is emitted from the
+        # thread that writes the file. Output devices that start the write job forward it to the progress of the job.
+        self.writeProgress = Signal()
 
     def _convertMatrixToString(self, matrix):
         result = ""
@@ -65,6 +75,14 @@ class ThreeMFWriter(MeshWriter):
     def setStoreArchive(self, store_archive):
         self._store_archive = store_archive
 
+    ##  Whether the meshes are streamed into the archive.
+    #
+    #   When streaming, the model XML is written one block of mesh data at a time
+    #   and the mesh data is formatted in a thread pool. Otherwise the whole
+    #   scene is converted by libSavitar in one go.
+    def setStreamModel(self, stream_model: bool) -> None:
+        self._stream_model = stream_model
+
     ##  Convenience function that converts an Uranium SceneNode object to a SavitarSceneNode
     #   \returns Uranium Scene node.
     def _convertUMNodeToSavitarNode(self, um_node, transformation = Matrix()):
@@ -114,6 +132,123 @@ class ThreeMFWriter(MeshWriter):
 
         return savitar_node
 
+    ##  Collect the data of a scene node and its children to write them to the
+    #   model file.
+    #
+    #   \param um_node The node to collect.
+    #   \param objects The list to add the objects of the node and its children
+    #   to.
+    #   \param active_build_plate_nr Only nodes on this build plate are written.
+    #   \return The object ID of the node, or None if it is not written.
+    def _collectModelObject(self, um_node, objects: List[ModelObject], active_build_plate_nr: int):
+        if not isinstance(um_node, SceneNode):
+            return None
+        if um_node.callDecoration("getBuildPlateNumber") != active_build_plate_nr:
+            return None
+
+        vertices = None
+        indices = None
+        mesh_data = um_node.getMeshData()
+        if mesh_data is not None:
+            vertices = mesh_data.getVertices()
+            indices = mesh_data.getIndices()
+
+        settings = {}
+        # Handle per object settings (if any)
+        stack = um_node.callDecoration("getStack")
+        if stack is not None:
+            changed_setting_keys = stack.getTop().getAllKeys()
+
+            # Ensure that we save the extruder used for this object in a multi-extrusion setup
+            if stack.getProperty("machine_extruder_count", "value") > 1:
+                changed_setting_keys.add("extruder_nr")
+
+            for key in changed_setting_keys:
+                settings[key] = str(stack.getProperty(key, "value"))
+
+        components = []  # type: List[Tuple[int, str]]
+        for child_node in um_node.getChildren():
+            child_id = self._collectModelObject(child_node, objects, active_build_plate_nr)
+            if child_id is not None:
+                components.append((child_id, self._convertMatrixToString(child_node.getLocalTransformation())))
+
+        object_id = len(objects) + 1
+        objects.append(ModelObject(object_id = object_id, vertices = vertices, indices = indices, settings = settings, components = components))
+        return object_id
+
+    ##  Get the transformation from Cura's coordinates to those of 3MF.
+    #
+    #   This uses the settings of the printer, so it has to be called on the Qt
+    #   thread.
+    def _getTransformationMatrix(self) -> Matrix:
+        transformation_matrix = Matrix()
+        transformation_matrix._data[1, 1] = 0
+        transformation_matrix._data[1, 2] = -1
+        transformation_matrix._data[2, 1] = 1
+        transformation_matrix._data[2, 2] = 0
+
+        global_container_stack = Application.getInstance().getGlobalContainerStack()
+        # Second step: 3MF defines the left corner of the machine as center, whereas cura uses the center of the
+        # build volume.
+        if global_container_stack:
+            translation_vector = Vector(x=global_container_stack.getProperty("machine_width", "value") / 2,
+                                        y=global_container_stack.getProperty("machine_depth", "value") / 2,
+                                        z=0)
+            translation_matrix = Matrix()
+            translation_matrix.setByTranslation(translation_vector)
+            transformation_matrix.preMultiply(translation_matrix)
+        return transformation_matrix
+
+    ##  Collect everything that needs to be written to the model file.
+    #
+    #   This is done on the Qt thread, so the scene and the settings don't
+    #   change halfway. The meshes themselves are immutable, so they can be
+    #   written from any thread afterwards.
+    #   \return The objects to write and the objects to put on the build plate.
+    @call_on_qt_thread
+    def _collectModel(self, nodes) -> Tuple[List[ModelObject], List[BuildItem]]:
+        transformation = self._getTransformationMatrix()
+        active_build_plate_nr = CuraApplication.getInstance().getMultiBuildPlateModel().activeBuildPlate
+        objects = []  # type: List[ModelObject]
+        build_items = []  # type: List[BuildItem]
+
+        root_node = UM.Application.Application.getInstance().getController().getScene().getRoot()
+        top_level_nodes = []
+        for node in nodes:
+            if node == root_node:
+                top_level_nodes.extend(node.getChildren())
+            else:
+                top_level_nodes.append(node)
+        for node in top_level_nodes:
+            object_id = self._collectModelObject(node, objects, active_build_plate_nr)
+            if object_id is not None:
+                matrix_string = self._convertMatrixToString(node.getLocalTransformation().preMultiply(transformation))
+                build_items.append(BuildItem(object_id = object_id, transformation = matrix_string))
+        return objects, build_items
+
+    ##  Convert the nodes to a libSavitar scene.
+    #
+    #   This is done on the Qt thread, since it reads the settings of the nodes.
+    @call_on_qt_thread
+    def _convertNodesToSavitarScene(self, nodes) -> Savitar.Scene:
+        transformation_matrix = self._getTransformationMatrix()
+        savitar_scene = Savitar.Scene()
+        root_node = UM.Application.Application.getInstance().getController().getScene().getRoot()
+        for node in nodes:
+            if node == root_node:
+                for root_child in node.getChildren():
+                    savitar_node = self._convertUMNodeToSavitarNode(root_child, transformation_matrix)
+                    if savitar_node:
+                        savitar_scene.addSceneNode(savitar_node)
+            else:
+                savitar_node = self._convertUMNodeToSavitarNode(node, transformation_matrix)
+                if savitar_node:
+                    savitar_scene.addSceneNode(savitar_node)
+        return savitar_scene
+
+    def _onModelProgress(self, progress: float) -> None:
+        self.writeProgress.emit(self, progress)
+
     def getArchive(self):
         return self._archive
 
@@ -138,40 +273,15 @@ class ThreeMFWriter(MeshWriter):
             relations_element = ET.Element("Relationships", xmlns = self._namespaces["relationships"])
             model_relation_element = ET.SubElement(relations_element, "Relationship", Target = "/3D/3dmodel.model", Id = "rel0", Type = "http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel")
 
-            savitar_scene = Savitar.Scene()
-            transformation_matrix = Matrix()
-            transformation_matrix._data[1, 1] = 0
-            transformation_matrix._data[1, 2] = -1
-            transformation_matrix._data[2, 1] = 1
-            transformation_matrix._data[2, 2] = 0
-
-            global_container_stack = Application.getInstance().getGlobalContainerStack()
-            # Second step: 3MF defines the left corner of the machine as center, whereas cura uses the center of the
-            # build volume.
-            if global_container_stack:
-                translation_vector = Vector(x=global_container_stack.getProperty("machine_width", "value") / 2,
-                                            y=global_container_stack.getProperty("machine_depth", "value") / 2,
-                                            z=0)
-                translation_matrix = Matrix()
-                translation_matrix.setByTranslation(translation_vector)
-                transformation_matrix.preMultiply(translation_matrix)
-
-            root_node = UM.Application.Application.getInstance().getController().getScene().getRoot()
-            for node in nodes:
-                if node == root_node:
-                    for root_child in node.getChildren():
-                        savitar_node = self._convertUMNodeToSavitarNode(root_child, transformation_matrix)
-                        if savitar_node:
-                            savitar_scene.addSceneNode(savitar_node)
-                else:
-                    savitar_node = self._convertUMNodeToSavitarNode(node, transformation_matrix)
-                    if savitar_node:
-                        savitar_scene.addSceneNode(savitar_node)
-
-            parser = Savitar.ThreeMFParser()
-            scene_string = parser.sceneToString(savitar_scene)
+            if self._stream_model:
+                objects, build_items = self._collectModel(nodes)
+                ModelStreamWriter(self._namespaces).write(archive, model_file, objects, build_items, progress_callback = self._onModelProgress)
+            else:
+                savitar_scene = self._convertNodesToSavitarScene(nodes)
+                parser = Savitar.ThreeMFParser()
+                scene_string = parser.sceneToString(savitar_scene)
+                archive.writestr(model_file, scene_string)
 
-            archive.writestr(model_file, scene_string)
             archive.writestr(content_types_file, b'<?xml version="1.0" encoding="UTF-8"?> \n' + ET.tostring(content_types))
             archive.writestr(relations_file, b'<?xml version="1.0" encoding="UTF-8"?> \n' + ET.tostring(relations_element))
         except Exception as e:
@@ -0,0 +1,74 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import io
+import xml.etree.ElementTree as ET
+import zipfile
+
+import numpy
+import pytest
+
+from ..ModelStreamWriter import BuildItem, ModelObject, ModelStreamWriter
+
+namespaces = {
+    "3mf": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02",
+    "cura": "http://software.ultimaker.com/xml/cura/3mf/2015/10"
+}
+
+
+def writeModel(objects, build_items, max_workers):
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w", compression = zipfile.ZIP_DEFLATED) as archive:
+        model_file = zipfile.ZipInfo("3D/3dmodel.model")
+        model_file.compress_type = zipfile.ZIP_DEFLATED
+        writer = ModelStreamWriter(namespaces, max_workers = max_workers)
+        writer.BlockSize = 7  # Force the meshes to be split into multiple blocks.
+        progress = []
+        writer.write(archive, model_file, objects, build_items, progress_callback = progress.append)
+    with zipfile.ZipFile(stream) as archive:
+        return ET.fromstring(archive.read("3D/3dmodel.model")), progress
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_writeMesh(max_workers):
+    vertices = numpy.arange(30 * 3, dtype = numpy.float32).reshape(-1, 3) / 4
+    objects = [ModelObject(object_id = 1, vertices = vertices, indices = None, settings = {"infill_sparse_density": "20 < 30"}, components = [])]
+    build_items = [BuildItem(object_id = 1, transformation = "1 0 0 0 1 0 0 0 1 10 20 0")]
+
+    model, progress = writeModel(objects, build_items, max_workers)
+
+    prefix = "{" + namespaces["3mf"] + "}"
+    mesh_object = model.find(prefix + "resources/" + prefix + "object")
+    written_vertices = [[float(vertex.get(axis)) for axis in "xyz"] for vertex in mesh_object.iter(prefix + "vertex")]
+    assert numpy.array_equal(numpy.array(written_vertices, dtype = numpy.float32), vertices)
+    written_triangles = [[int(triangle.get(index)) for index in ("v1", "v2", "v3")] for triangle in mesh_object.iter(prefix + "triangle")]
+    assert written_triangles == numpy.arange(30).reshape(-1, 3).tolist()
+
+    setting = mesh_object.find(prefix + "metadatagroup/" + prefix + "metadata")
+    assert setting.get("name") == "cura:infill_sparse_density"
+    assert setting.text == "20 < 30"
+
+    item = model.find(prefix + "build/" + prefix + "item")
+    assert item.get("objectid") == "1"
+    assert item.get("transform") == "1 0 0 0 1 0 0 0 1 10 20 0"
+
+    assert progress == sorted(progress)
+    assert progress[-1] == pytest.approx(100)
+
+
+def test_writeGroup():
+    child_vertices = numpy.zeros((3, 3), dtype = numpy.float32)
+    child_indices = numpy.array([[0, 1, 2]], dtype = numpy.int32)
+    objects = [
+        ModelObject(object_id = 1, vertices = child_vertices, indices = child_indices, settings = {}, components = []),
+        ModelObject(object_id = 2, vertices = None, indices = None, settings = {}, components = [(1, "1 0 0 0 1 0 0 0 1 0 0 5")])
+    ]
+
+    model, _ = writeModel(objects, [BuildItem(object_id = 2, transformation = "1 0 0 0 1 0 0 0 1 0 0 0")], 2)
+
+    prefix = "{" + namespaces["3mf"] + "}"
+    group = model.findall(prefix + "resources/" + prefix + "object")[1]
+    assert group.find(prefix + "mesh") is None
+    component = group.find(prefix + "components/" + prefix + "component")
+    assert component.get("objectid") == "1"
+    assert component.get("transform") == "1 0 0 0 1 0 0 0 1 0 0 5"
@@ -3,6 +3,7 @@
 
 import base64
 import hashlib
+import os
 from datetime import datetime
 from tempfile import NamedTemporaryFile
 from typing import Any, Optional, List, Dict
@@ -65,22 +66,23 @@ class DriveApiService:
     def createBackup(self) -> None:
         self.creatingStateChanged.emit(is_creating = True)
 
-        # Create the backup.
-        backup_zip_file, backup_meta_data = self._cura_api.backups.createBackup()
-        if not backup_zip_file or not backup_meta_data:
+        # Create the backup. It's written to a temporary file so that it doesn't need to fit in memory.
+        backup_zip_file_path, backup_meta_data = self._cura_api.backups.createBackupFile()
+        if not backup_zip_file_path or not backup_meta_data:
             self.creatingStateChanged.emit(is_creating = False, error_message ="Could not create backup.")
             return
 
         # Create an upload entry for the backup.
         timestamp = datetime.now().isoformat()
         backup_meta_data["description"] = "{}.backup.{}.cura.zip".format(timestamp, backup_meta_data["cura_release"])
-        backup_upload_url = self._requestBackupUpload(backup_meta_data, len(backup_zip_file))
+        backup_upload_url = self._requestBackupUpload(backup_meta_data, os.path.getsize(backup_zip_file_path))
         if not backup_upload_url:
+            os.remove(backup_zip_file_path)
             self.creatingStateChanged.emit(is_creating = False, error_message ="Could not upload backup.")
             return
 
         # Upload the backup to storage.
-        upload_backup_job = UploadBackupJob(backup_upload_url, backup_zip_file)
+        upload_backup_job = UploadBackupJob(backup_upload_url, backup_zip_file_path)
         upload_backup_job.finished.connect(self._onUploadFinished)
         upload_backup_job.start()
 
@@ -117,9 +119,8 @@ class DriveApiService:
             return self._emitRestoreError()
 
         # Tell Cura to place the backup back in the user data folder.
-        with open(temporary_backup_file.name, "rb") as read_backup:
-            self._cura_api.backups.restoreBackup(read_backup.read(), backup.get("metadata", {}))
-            self.restoringStateChanged.emit(is_restoring = False)
+        self._cura_api.backups.restoreBackupFile(temporary_backup_file.name, backup.get("metadata", {}))
+        self.restoringStateChanged.emit(is_restoring = False)
 
     def _emitRestoreError(self) -> None:
         self.restoringStateChanged.emit(is_restoring = False,
@@ -132,9 +133,12 @@ class DriveApiService:
     #   \return: Success or not.
     @staticmethod
     def _verifyMd5Hash(file_path: str, known_hash: str) -> bool:
+        md5_hash = hashlib.md5()
         with open(file_path, "rb") as read_backup:
-            local_md5_hash = base64.b64encode(hashlib.md5(read_backup.read()).digest(), altchars = b"_-").decode("utf-8")
-            return known_hash == local_md5_hash
+            for block in iter(lambda: read_backup.read(1024 * 1024), b""):
+                md5_hash.update(block)
+        local_md5_hash = base64.b64encode(md5_hash.digest(), altchars = b"_-").decode("utf-8")
+        return known_hash == local_md5_hash
 
     def deleteBackup(self, backup_id: str) -> bool:
         access_token = self._cura_api.account.accessToken
@@ -1,6 +1,8 @@
 # Copyright (c) 2018 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
+import os
+
 import requests
 
 from UM.Job import Job
@@ -16,10 +18,11 @@ class UploadBackupJob(Job):
 
     # This job is responsible for uploading the backup file to cloud storage.
     # As it can take longer than some other tasks, we schedule this using a Cura Job.
-    def __init__(self, signed_upload_url: str, backup_zip: bytes) -> None:
+    # The backup is streamed from the file, which is removed when the upload is done.
+    def __init__(self, signed_upload_url: str, backup_zip_path: str) -> None:
         super().__init__()
         self._signed_upload_url = signed_upload_url
-        self._backup_zip = backup_zip
+        self._backup_zip_path = backup_zip_path
         self._upload_success = False
         self.backup_upload_error_message = ""
 
@@ -27,7 +30,11 @@ class UploadBackupJob(Job):
         upload_message = Message(catalog.i18nc("@info:backup_status", "Uploading your backup..."), title = self.MESSAGE_TITLE, progress = -1)
         upload_message.show()
 
-        backup_upload = requests.put(self._signed_upload_url, data = self._backup_zip)
+        try:
+            with open(self._backup_zip_path, "rb") as backup_zip:
+                backup_upload = requests.put(self._signed_upload_url, data = backup_zip)
+        finally:
+            os.remove(self._backup_zip_path)
         upload_message.hide()
 
         if backup_upload.status_code >= 300:
@@ -3,7 +3,7 @@
 
 import numpy
 
-from PyQt5.QtGui import QImage, qRed, qGreen, qBlue
+from PyQt5.QtGui import QImage
 from PyQt5.QtCore import Qt
 
 from UM.Mesh.MeshReader import MeshReader
@@ -94,13 +94,7 @@ class ImageReader(MeshReader):
         texel_width = 1.0 / (width_minus_one) * scale_vector.x
         texel_height = 1.0 / (height_minus_one) * scale_vector.z
 
-        height_data = numpy.zeros((height, width), dtype=numpy.float32)
-
-        for x in range(0, width):
-            for y in range(0, height):
-                qrgb = img.pixel(x, y)
-                avg = float(qRed(qrgb) + qGreen(qrgb) + qBlue(qrgb)) / (3 * 255)
-                height_data[y, x] = avg
+        height_data = self._getBrightness(img)
 
         Job.yieldThread()
 
@@ -108,34 +102,74 @@ class ImageReader(MeshReader):
             height_data = 1 - height_data
 
         for _ in range(0, blur_iterations):
-            copy = numpy.pad(height_data, ((1, 1), (1, 1)), mode= "edge")
-
-            height_data += copy[1:-1, 2:]
-            height_data += copy[1:-1, :-2]
-            height_data += copy[2:, 1:-1]
-            height_data += copy[:-2, 1:-1]
-
-            height_data += copy[2:, 2:]
-            height_data += copy[:-2, 2:]
-            height_data += copy[2:, :-2]
-            height_data += copy[:-2, :-2]
-
-            height_data /= 9
-
+            height_data = self._blur(height_data)
             Job.yieldThread()
 
         height_data *= scale_vector.y
         height_data += base_height
 
-        heightmap_face_count = 2 * height_minus_one * width_minus_one
-        total_face_count = heightmap_face_count + (width_minus_one * 2) * (height_minus_one * 2) + 2
+        heightmap_vertices = self._generateHeightmapVertices(height_data, texel_width, texel_height, base_height)
+        Job.yieldThread()
+        wall_vertices = self._generateWallVertices(height_data, texel_width, texel_height)
+
+        vertices = numpy.concatenate([heightmap_vertices, wall_vertices])
+        mesh.setVertices(vertices)
+        mesh.setIndices(numpy.arange(len(vertices), dtype = numpy.int32).reshape(-1, 3))
+        mesh.calculateNormals(fast=True)
 
-        mesh.reserveFaceCount(total_face_count)
+        scene_node.setMeshData(mesh.build())
+
+        return scene_node
+
+    ##  Get the brightness of every pixel of an image, from 0 to 1.
+    #
+    #   The pixels are read through a numpy view on the image data rather than
+    #   one by one.
+    #   \return An array with the brightness of each pixel, indexed by [y, x].
+    @staticmethod
+    def _getBrightness(img: QImage) -> numpy.ndarray:
+        # This is the format QImage.pixel() returns, whatever the format of the file is.
+        img = img.convertToFormat(QImage.Format_ARGB32)
+        pointer = img.constBits()
+        pointer.setsize(img.bytesPerLine() * img.height())
+        # Lines may be padded, but each pixel is one 32-bit 0xAARRGGBB value.
+        pixels = numpy.frombuffer(pointer, dtype = numpy.uint32).reshape(img.height(), img.bytesPerLine() // 4)[:, :img.width()]
+
+        brightness = ((pixels >> 16) & 0xff).astype(numpy.float32)
+        brightness += (pixels >> 8) & 0xff
+        brightness += pixels & 0xff
+        brightness /= 3 * 255
+        return brightness
+
+    ##  Blur a height map with a 3x3 box filter.
+    #
+    #   The box filter is separable, so it is applied as a horizontal and a
+    #   vertical pass of three samples each. The edges are extended to keep the
+    #   size of the height map.
+    @staticmethod
+    def _blur(height_data: numpy.ndarray) -> numpy.ndarray:
+        padded = numpy.pad(height_data, ((0, 0), (1, 1)), mode = "edge")
+        horizontal = padded[:, :-2] + padded[:, 1:-1]
+        horizontal += padded[:, 2:]
+
+        padded = numpy.pad(horizontal, ((1, 1), (0, 0)), mode = "edge")
+        result = padded[:-2] + padded[1:-1]
+        result += padded[2:]
+        result /= 9
+        return result
+
+    ##  Generate the top surface of the mesh: two triangles per texel quad.
+    #   \return The vertices of the triangles, three per triangle.
+    @staticmethod
+    def _generateHeightmapVertices(height_data: numpy.ndarray, texel_width: float, texel_height: float, base_height: float) -> numpy.ndarray:
+        height, width = height_data.shape
+        width_minus_one = width - 1
+        height_minus_one = height - 1
 
         # initialize to texel space vertex offsets.
         # 6 is for 6 vertices for each texel quad.
-        heightmap_vertices = numpy.zeros((width_minus_one * height_minus_one, 6, 3), dtype = numpy.float32)
-        heightmap_vertices = heightmap_vertices + numpy.array([[
+        heightmap_vertices = numpy.zeros((height_minus_one * width_minus_one, 6, 3), dtype = numpy.float32)
+        heightmap_vertices += numpy.array([[
             [0, base_height, 0],
             [0, base_height, texel_height],
             [texel_width, base_height, texel_height],
@@ -144,13 +178,10 @@ class ImageReader(MeshReader):
             [0, base_height, 0]
         ]], dtype = numpy.float32)
 
-        offsetsz, offsetsx = numpy.mgrid[0: height_minus_one, 0: width - 1]
-        offsetsx = numpy.array(offsetsx, numpy.float32).reshape(-1, 1) * texel_width
-        offsetsz = numpy.array(offsetsz, numpy.float32).reshape(-1, 1) * texel_height
-
         # offsets for each texel quad
-        heightmap_vertex_offsets = numpy.concatenate([offsetsx, numpy.zeros((offsetsx.shape[0], offsetsx.shape[1]), dtype=numpy.float32), offsetsz], 1)
-        heightmap_vertices += heightmap_vertex_offsets.repeat(6, 0).reshape(-1, 6, 3)
+        offsetsz, offsetsx = numpy.mgrid[0: height_minus_one, 0: width_minus_one]
+        heightmap_vertices[:, :, 0] += (offsetsx.reshape(-1, 1) * texel_width).astype(numpy.float32)
+        heightmap_vertices[:, :, 2] += (offsetsz.reshape(-1, 1) * texel_height).astype(numpy.float32)
 
         # apply height data to y values
         heightmap_vertices[:, 0, 1] = heightmap_vertices[:, 5, 1] = height_data[:-1, :-1].reshape(-1)
@@ -158,57 +189,60 @@ class ImageReader(MeshReader):
         heightmap_vertices[:, 2, 1] = heightmap_vertices[:, 3, 1] = height_data[1:, 1:].reshape(-1)
         heightmap_vertices[:, 4, 1] = height_data[:-1, 1:].reshape(-1)
 
-        heightmap_indices = numpy.array(numpy.mgrid[0:heightmap_face_count * 3], dtype=numpy.int32).reshape(-1, 3)
-
-        mesh._vertices[0:(heightmap_vertices.size // 3), :] = heightmap_vertices.reshape(-1, 3)
-        mesh._indices[0:(heightmap_indices.size // 3), :] = heightmap_indices
-
-        mesh._vertex_count = heightmap_vertices.size // 3
-        mesh._face_count = heightmap_indices.size // 3
+        return heightmap_vertices.reshape(-1, 3)
 
+    ##  Generate the bottom and the side walls of the mesh.
+    #   \return The vertices of the triangles, three per triangle.
+    @staticmethod
+    def _generateWallVertices(height_data: numpy.ndarray, texel_width: float, texel_height: float) -> numpy.ndarray:
+        height, width = height_data.shape
+        width_minus_one = width - 1
+        height_minus_one = height - 1
         geo_width = width_minus_one * texel_width
         geo_height = height_minus_one * texel_height
 
         # bottom
-        mesh.addFaceByPoints(0, 0, 0, 0, 0, geo_height, geo_width, 0, geo_height)
-        mesh.addFaceByPoints(geo_width, 0, geo_height, geo_width, 0, 0, 0, 0, 0)
-
-        # north and south walls
-        for n in range(0, width_minus_one):
-            x = n * texel_width
-            nx = (n + 1) * texel_width
-
-            hn0 = height_data[0, n]
-            hn1 = height_data[0, n + 1]
-
-            hs0 = height_data[height_minus_one, n]
-            hs1 = height_data[height_minus_one, n + 1]
-
-            mesh.addFaceByPoints(x, 0, 0, nx, 0, 0, nx, hn1, 0)
-            mesh.addFaceByPoints(nx, hn1, 0, x, hn0, 0, x, 0, 0)
-
-            mesh.addFaceByPoints(x, 0, geo_height, nx, 0, geo_height, nx, hs1, geo_height)
-            mesh.addFaceByPoints(nx, hs1, geo_height, x, hs0, geo_height, x, 0, geo_height)
+        bottom = numpy.array([
+            [0, 0, 0], [0, 0, geo_height], [geo_width, 0, geo_height],
+            [geo_width, 0, geo_height], [geo_width, 0, 0], [0, 0, 0]
+        ], dtype = numpy.float32)
+
+        # north and south walls: two triangles for each texel along each wall.
+        x = numpy.arange(width_minus_one, dtype = numpy.float32) * texel_width
+        nx = numpy.arange(1, width, dtype = numpy.float32) * texel_width
+        north_south = numpy.zeros((width_minus_one, 2, 6, 3), dtype = numpy.float32)
+        for wall, z, row in ((0, 0, 0), (1, geo_height, height_minus_one)):
+            h0 = height_data[row, :-1]
+            h1 = height_data[row, 1:]
+            faces = north_south[:, wall]
+            faces[:, :, 2] = z
+            faces[:, 0, 0] = x
+            faces[:, 1, 0] = nx
+            faces[:, 2, 0] = nx
+            faces[:, 2, 1] = h1
+            faces[:, 3, 0] = nx
+            faces[:, 3, 1] = h1
+            faces[:, 4, 0] = x
+            faces[:, 4, 1] = h0
+            faces[:, 5, 0] = x
 
         # west and east walls
-        for n in range(0, height_minus_one):
-            y = n * texel_height
-            ny = (n + 1) * texel_height
-
-            hw0 = height_data[n, 0]
-            hw1 = height_data[n + 1, 0]
-
-            he0 = height_data[n, width_minus_one]
-            he1 = height_data[n + 1, width_minus_one]
-
-            mesh.addFaceByPoints(0, 0, y, 0, 0, ny, 0, hw1, ny)
-            mesh.addFaceByPoints(0, hw1, ny, 0, hw0, y, 0, 0, y)
-
-            mesh.addFaceByPoints(geo_width, 0, y, geo_width, 0, ny, geo_width, he1, ny)
-            mesh.addFaceByPoints(geo_width, he1, ny, geo_width, he0, y, geo_width, 0, y)
-
-        mesh.calculateNormals(fast=True)
-
-        scene_node.setMeshData(mesh.build())
-
-        return scene_node
+        y = numpy.arange(height_minus_one, dtype = numpy.float32) * texel_height
+        ny = numpy.arange(1, height, dtype = numpy.float32) * texel_height
+        west_east = numpy.zeros((height_minus_one, 2, 6, 3), dtype = numpy.float32)
+        for wall, wall_x, column in ((0, 0, 0), (1, geo_width, width_minus_one)):
+            h0 = height_data[:-1, column]
+            h1 = height_data[1:, column]
+            faces = west_east[:, wall]
+            faces[:, :, 0] = wall_x
+            faces[:, 0, 2] = y
+            faces[:, 1, 2] = ny
+            faces[:, 2, 2] = ny
+            faces[:, 2, 1] = h1
+            faces[:, 3, 2] = ny
+            faces[:, 3, 1] = h1
+            faces[:, 4, 2] = y
+            faces[:, 4, 1] = h0
+            faces[:, 5, 2] = y
+
+        return numpy.concatenate([bottom, north_south.reshape(-1, 3), west_east.reshape(-1, 3)])
@@ -1,9 +1,10 @@
 # Copyright (c) 2015 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from . import ImageReader
-
 from UM.i18n import i18nCatalog
+
+from cura.ReaderWriters.LazyMeshReader import LazyMeshReader
+
 i18n_catalog = i18nCatalog("cura")
 
 def getMetaData():
@@ -33,5 +34,11 @@ def getMetaData():
     }
 
 
+def _createReader():
+    from . import ImageReader
+    return ImageReader.ImageReader()
+
+
 def register(app):
-    return {"mesh_reader": ImageReader.ImageReader()}
+    # Only import the reader (and create its dialog) when the first image is read.
+    return {"mesh_reader": LazyMeshReader(getMetaData()["mesh_reader"], _createReader)}
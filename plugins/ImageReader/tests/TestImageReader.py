@@ -0,0 +1,43 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import numpy
+
+from ..ImageReader import ImageReader
+
+
+def test_blurIsBoxFilter():
+    height_data = numpy.random.RandomState(1).rand(7, 9).astype(numpy.float32)
+
+    # A straightforward 3x3 box filter, with the edges extended.
+    padded = numpy.pad(height_data, ((1, 1), (1, 1)), mode = "edge")
+    expected = sum(padded[1 + dy:padded.shape[0] - 1 + dy, 1 + dx:padded.shape[1] - 1 + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)) / 9
+
+    assert numpy.allclose(ImageReader._blur(height_data), expected)
+
+
+def test_heightmapVertices():
+    height_data = numpy.array([[1, 2, 3], [4, 5, 6]], dtype = numpy.float32)
+
+    vertices = ImageReader._generateHeightmapVertices(height_data, 0.5, 2, 0)
+
+    assert vertices.shape == (2 * 1 * 2 * 3, 3)  # Two triangles per texel quad.
+    assert vertices.dtype == numpy.float32
+    # The corners of the mesh are at the heights of the corner pixels.
+    assert [0, 1, 0] in vertices.tolist()
+    assert [1, 3, 0] in vertices.tolist()
+    assert [0, 4, 2] in vertices.tolist()
+    assert [1, 6, 2] in vertices.tolist()
+
+
+def test_wallVertices():
+    height_data = numpy.random.RandomState(2).rand(5, 8).astype(numpy.float32)
+
+    vertices = ImageReader._generateWallVertices(height_data, 1, 1)
+
+    # Bottom, plus two triangles per texel along each of the four sides.
+    assert vertices.shape == ((2 + 2 * 2 * 7 + 2 * 2 * 4) * 3, 3)
+    assert vertices[:, 1].min() == 0
+    # Every wall vertex is on the outline of the mesh.
+    on_outline = (vertices[:, 0] == 0) | (vertices[:, 0] == 7) | (vertices[:, 2] == 0) | (vertices[:, 2] == 4)
+    assert on_outline.all()
@@ -1,9 +1,10 @@
 # Copyright (c) 2015 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from . import LegacyProfileReader
-
 from UM.i18n import i18nCatalog
+
+from cura.ReaderWriters.LazyProfileReader import LazyProfileReader
+
 catalog = i18nCatalog("cura")
 
 def getMetaData():
@@ -16,5 +17,10 @@ def getMetaData():
         ]
     }
 
+def _createReader():
+    from . import LegacyProfileReader
+    return LegacyProfileReader.LegacyProfileReader()
+
 def register(app):
-    return { "profile_reader": LegacyProfileReader.LegacyProfileReader() }
+    # Only import the reader when the first legacy profile is imported.
+    return { "profile_reader": LazyProfileReader(_createReader) }
@@ -2,6 +2,7 @@
 # Cura is released under the terms of the LGPLv3 or higher.
 
 import os
+from typing import Dict, List, Optional, Set, Tuple
 
 from PyQt5.QtCore import QObject, pyqtSlot, pyqtSignal, pyqtProperty, QTimer
 
@@ -10,6 +11,7 @@ from UM.Extension import Extension
 from UM.Logger import Logger
 from UM.Message import Message
 from UM.Scene.Camera import Camera
+from UM.Scene.SceneNode import SceneNode
 from UM.i18n import i18nCatalog
 from UM.PluginRegistry import PluginRegistry
 from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
@@ -26,6 +28,13 @@ class ModelChecker(QObject, Extension):
 
         self._button_view = None
 
+        self._has_warnings = False  # The result of the last check.
+        self._warning_node_names = []  # type: List[str]  # The models in the message of the last check.
+        # The inputs and the result of the last check of each node: its size, its extruder and the shrinkage of the material of that extruder.
+        self._node_results = {}  # type: Dict[SceneNode, Tuple[Tuple[Tuple[float, float, float], str, float], bool]]
+        self._changed_nodes = set()  # type: Set[SceneNode]  # Nodes of which the size may have changed since the last check, with their children.
+        self._material_shrinkage = None  # type: Optional[Dict[str, float]]  # Per extruder position, until the materials change.
+
         self._caution_message = Message("", #Message text gets set when the message gets shown, to display the models in question.
             lifetime = 0,
             title = catalog.i18nc("@info:title", "3D Model Assistant"))
@@ -33,28 +42,52 @@ class ModelChecker(QObject, Extension):
         self._change_timer = QTimer()
         self._change_timer.setInterval(200)
         self._change_timer.setSingleShot(True)
-        self._change_timer.timeout.connect(self.onChanged)
+        self._change_timer.timeout.connect(self._checkObjects)
 
         Application.getInstance().initializationFinished.connect(self._pluginsInitialized)
         Application.getInstance().getController().getScene().sceneChanged.connect(self._onChanged)
         Application.getInstance().globalContainerStackChanged.connect(self._onChanged)
 
+    ##  Called when the scene or the machine changed. Many changes in a row, like
+    #   while dragging a model, are checked at once after they are done.
     def _onChanged(self, *args, **kwargs):
         # Ignore camera updates.
-        if len(args) == 0:
+        if len(args) == 0:  # The machine changed.
+            self._material_shrinkage = None
             self._change_timer.start()
             return
         if not isinstance(args[0], Camera):
+            if isinstance(args[0], SceneNode):
+                self._changed_nodes.add(args[0])
             self._change_timer.start()
 
+    def _onMaterialsChanged(self):
+        self._material_shrinkage = None
+        self._change_timer.start()
+
+    ##  Checks the models after changes, and notifies if that changes whether
+    #   there are warnings.
+    def _checkObjects(self):
+        has_warnings = self.checkObjectsForShrinkage()
+        if has_warnings != self._has_warnings:
+            self._has_warnings = has_warnings
+            self.onChanged.emit()
+
     ##  Called when plug-ins are initialized.
     #
     #   This makes sure that we listen to changes of the material and that the
     #   button is created that indicates warnings with the current set-up.
     def _pluginsInitialized(self):
-        Application.getInstance().getMachineManager().rootMaterialChanged.connect(self.onChanged)
+        Application.getInstance().getMachineManager().rootMaterialChanged.connect(self._onMaterialsChanged)
         self._createView()
+        self._change_timer.start()
 
+    ##  Checks which models are too large for the shrinkage of their material.
+    #
+    #   The result of each model is kept until its size, its extruder or the
+    #   shrinkage of the material of its extruder changes. Only the size of the
+    #   models that changed since the last check is measured again.
+    #   \return Whether any models are too large.
     def checkObjectsForShrinkage(self):
         shrinkage_threshold = 0.5 #From what shrinkage percentage a warning will be issued about the model size.
         warning_size_xy = 150 #The horizontal size of a model that would be too large when dealing with shrinking materials.
@@ -68,7 +101,15 @@ class ModelChecker(QObject, Extension):
 
         material_shrinkage = self._getMaterialShrinkage()
 
+        scene_root = Application.getInstance().getController().getScene().getRoot()
+        changed_nodes = set()  # type: Set[SceneNode]
+        for changed_node in self._changed_nodes:
+            if changed_node is scene_root:  # Models were added or removed. New models are measured anyway.
+                continue
+            changed_nodes.update(DepthFirstIterator(changed_node))  # A group that is scaled changes the size of its children.
+
         warning_nodes = []
+        node_results = {}  # type: Dict[SceneNode, Tuple[Tuple[Tuple[float, float, float], str, float], bool]]
 
         # Check node material shrinkage and bounding box size
         for node in self.sliceableNodes():
@@ -77,21 +118,40 @@ class ModelChecker(QObject, Extension):
             # This function can be triggered in the middle of a machine change, so do not proceed if the machine change
             # has not done yet.
             if str(node_extruder_position) not in global_container_stack.extruders:
-                Application.getInstance().callLater(lambda: self.onChanged.emit())
+                self._material_shrinkage = None
+                Application.getInstance().callLater(self._change_timer.start)
                 return False
 
-            if material_shrinkage[node_extruder_position] > shrinkage_threshold:
+            previous_result = self._node_results.get(node)
+            if previous_result is None or node in changed_nodes:
                 bbox = node.getBoundingBox()
-                if bbox.width >= warning_size_xy or bbox.depth >= warning_size_xy or bbox.height >= warning_size_z:
-                    warning_nodes.append(node)
-
-        self._caution_message.setText(catalog.i18nc(
-            "@info:status",
-            "<p>One or more 3D models may not print optimally due to the model size and material configuration:</p>\n"
-            "<p>{model_names}</p>\n"
-            "<p>Find out how to ensure the best possible print quality and reliability.</p>\n"
-            "<p><a href=\"https://ultimaker.com/3D-model-assistant\">View print quality guide</a></p>"
-            ).format(model_names = ", ".join([n.getName() for n in warning_nodes])))
+                size = (bbox.width, bbox.depth, bbox.height)
+            else:
+                size = previous_result[0][0]
+            inputs = (size, node_extruder_position, material_shrinkage[node_extruder_position])
+
+            if previous_result is not None and previous_result[0] == inputs:
+                is_too_large = previous_result[1]
+            else:
+                width, depth, height = size
+                is_too_large = inputs[2] > shrinkage_threshold and (width >= warning_size_xy or depth >= warning_size_xy or height >= warning_size_z)
+            node_results[node] = (inputs, is_too_large)
+            if is_too_large:
+                warning_nodes.append(node)
+
+        self._node_results = node_results  # Without the nodes that were removed.
+        self._changed_nodes.clear()
+
+        warning_node_names = [n.getName() for n in warning_nodes]
+        if warning_node_names != self._warning_node_names:
+            self._warning_node_names = warning_node_names
+            self._caution_message.setText(catalog.i18nc(
+                "@info:status",
+                "<p>One or more 3D models may not print optimally due to the model size and material configuration:</p>\n"
+                "<p>{model_names}</p>\n"
+                "<p>Find out how to ensure the best possible print quality and reliability.</p>\n"
+                "<p><a href=\"https://ultimaker.com/3D-model-assistant\">View print quality guide</a></p>"
+                ).format(model_names = ", ".join(warning_node_names)))
 
         return len(warning_nodes) > 0
 
@@ -115,19 +175,24 @@ class ModelChecker(QObject, Extension):
 
         Logger.log("d", "Model checker view created.")
 
+    ##  Whether the last check found any problems. The checks are done after
+    #   changes, not every time that this is asked for.
     @pyqtProperty(bool, notify = onChanged)
     def hasWarnings(self):
-        danger_shrinkage = self.checkObjectsForShrinkage()
-        return any((danger_shrinkage, )) #If any of the checks fail, show the warning button.
+        return self._has_warnings #If any of the checks fail, show the warning button.
 
     @pyqtSlot()
     def showWarnings(self):
         self._caution_message.show()
 
+    ##  Gets the shrinkage of the material of each extruder. It is read again
+    #   when the materials or the machine changed.
     def _getMaterialShrinkage(self):
         global_container_stack = Application.getInstance().getGlobalContainerStack()
         if global_container_stack is None:
             return {}
+        if self._material_shrinkage is not None:
+            return self._material_shrinkage
 
         material_shrinkage = {}
         # Get all shrinkage values of materials used
@@ -136,4 +201,5 @@ class ModelChecker(QObject, Extension):
             if shrinkage is None:
                 shrinkage = 0
             material_shrinkage[extruder_position] = shrinkage
+        self._material_shrinkage = material_shrinkage
         return material_shrinkage
@@ -0,0 +1,201 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from UM.Scene.SceneNode import SceneNode
+
+from ..ModelChecker import ModelChecker
+
+
+##  Creates a node of the given size, printed with the given extruder.
+def createNode(name, size, extruder_position = "0", children = None):
+    node = MagicMock(spec = SceneNode)
+    node.getName = MagicMock(return_value = name)
+    node.getChildren = MagicMock(return_value = children or [])
+    node.setSize = lambda new_size: setattr(node, "bounding_box", MagicMock(width = new_size[0], depth = new_size[1], height = new_size[2]))
+    node.setSize(size)
+    node.getBoundingBox = MagicMock(side_effect = lambda: node.bounding_box)
+    node.decorations = {"isSliceable": True, "getActiveExtruderPosition": extruder_position}
+    node.callDecoration = MagicMock(side_effect = lambda function, *args, **kwargs: node.decorations.get(function))
+    return node
+
+
+def createExtruder(shrinkage):
+    extruder = MagicMock()
+    extruder.material.getProperty = MagicMock(side_effect = lambda key, property_name: extruder.shrinkage)
+    extruder.shrinkage = shrinkage
+    return extruder
+
+
+@pytest.fixture()
+def scene_root():
+    root = MagicMock(spec = SceneNode)
+    root.getChildren = MagicMock(return_value = [])
+    root.callDecoration = MagicMock(return_value = None)
+    return root
+
+
+@pytest.fixture()
+def application(scene_root):
+    application = MagicMock()
+    application.getController().getScene().getRoot = MagicMock(return_value = scene_root)
+    global_stack = MagicMock()
+    global_stack.extruders = {"0": createExtruder(0.2), "1": createExtruder(1.5)}  # Like PLA and nylon.
+    application.getGlobalContainerStack = MagicMock(return_value = global_stack)
+    return application
+
+
+@pytest.fixture()
+def model_checker(application):
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value = application)):
+        model_checker = ModelChecker()
+        model_checker._change_timer = MagicMock()
+        yield model_checker
+
+
+##  Adds a node to the scene, like loading a model does.
+def addNode(model_checker, scene_root, node):
+    scene_root.getChildren.return_value = scene_root.getChildren() + [node]
+    model_checker._onChanged(scene_root)
+
+
+##  Checks like the change timer does after the changes are done.
+def finishChanges(model_checker):
+    assert model_checker._change_timer.start.called
+    model_checker._change_timer.start.reset_mock()
+    model_checker._checkObjects()
+
+
+def test_smallNodes(model_checker, scene_root):
+    addNode(model_checker, scene_root, createNode("Small", (50, 50, 50), "1"))
+    addNode(model_checker, scene_root, createNode("Large", (200, 200, 200), "0"))  # Not with a shrinking material.
+    finishChanges(model_checker)
+
+    assert not model_checker.hasWarnings
+
+
+def test_addLargeNode(model_checker, scene_root):
+    addNode(model_checker, scene_root, createNode("Small", (50, 50, 50), "1"))
+    finishChanges(model_checker)
+
+    addNode(model_checker, scene_root, createNode("Large", (200, 50, 50), "1"))
+    finishChanges(model_checker)
+
+    assert model_checker.hasWarnings
+    assert model_checker._warning_node_names == ["Large"]
+
+
+def test_removeLargeNode(model_checker, scene_root):
+    addNode(model_checker, scene_root, createNode("Large", (200, 50, 50), "1"))
+    finishChanges(model_checker)
+
+    scene_root.getChildren.return_value = []
+    model_checker._onChanged(scene_root)
+    finishChanges(model_checker)
+
+    assert not model_checker.hasWarnings
+    assert model_checker._node_results == {}
+
+
+def test_scaleNode(model_checker, scene_root):
+    node = createNode("Scaled", (50, 50, 50), "1")
+    addNode(model_checker, scene_root, node)
+    finishChanges(model_checker)
+
+    node.setSize((50, 50, 120))
+    model_checker._onChanged(node)
+    finishChanges(model_checker)
+    assert model_checker.hasWarnings
+
+    node.setSize((50, 50, 60))
+    model_checker._onChanged(node)
+    finishChanges(model_checker)
+    assert not model_checker.hasWarnings
+
+
+def test_scaleGroup(model_checker, scene_root):
+    child = createNode("Child", (50, 50, 50), "1")
+    group = createNode("Group", (50, 50, 50), "1", children = [child])
+    group.decorations["isSliceable"] = False
+    addNode(model_checker, scene_root, group)
+    finishChanges(model_checker)
+
+    child.setSize((160, 160, 160))
+    group.setSize((160, 160, 160))
+    model_checker._onChanged(group)  # The scene only tells that the group changed.
+    finishChanges(model_checker)
+
+    assert model_checker.hasWarnings
+    assert model_checker._warning_node_names == ["Child"]
+
+
+def test_reassignNode(model_checker, scene_root):
+    node = createNode("Reassigned", (200, 50, 50), "0")
+    addNode(model_checker, scene_root, node)
+    finishChanges(model_checker)
+    assert not model_checker.hasWarnings
+
+    node.decorations["getActiveExtruderPosition"] = "1"
+    model_checker._onChanged(node)
+    finishChanges(model_checker)
+
+    assert model_checker.hasWarnings
+
+
+def test_materialChanged(model_checker, scene_root, application):
+    addNode(model_checker, scene_root, createNode("Large", (200, 50, 50), "0"))
+    finishChanges(model_checker)
+    assert not model_checker.hasWarnings
+
+    application.getGlobalContainerStack().extruders["0"].shrinkage = 2
+    model_checker._onMaterialsChanged()
+    finishChanges(model_checker)
+
+    assert model_checker.hasWarnings
+
+
+def test_onlyChangedNodesMeasured(model_checker, scene_root):
+    nodes = [createNode("Node {index}".format(index = index), (50, 50, 50), str(index % 2)) for index in range(100)]
+    for node in nodes:
+        addNode(model_checker, scene_root, node)
+    finishChanges(model_checker)
+
+    nodes[3].setSize((50, 50, 150))
+    model_checker._onChanged(nodes[3])
+    finishChanges(model_checker)
+
+    assert [node.getBoundingBox.call_count for node in nodes] == [2 if index == 3 else 1 for index in range(100)]
+    assert model_checker._warning_node_names == ["Node 3"]
+
+
+def test_onlyAddedNodeMeasured(model_checker, scene_root):
+    nodes = [createNode("Node {index}".format(index = index), (50, 50, 50)) for index in range(10)]
+    for node in nodes:
+        addNode(model_checker, scene_root, node)
+    finishChanges(model_checker)
+
+    added_node = createNode("Added", (50, 50, 50))
+    addNode(model_checker, scene_root, added_node)
+    finishChanges(model_checker)
+
+    assert [node.getBoundingBox.call_count for node in nodes] == [1] * 10
+    assert added_node.getBoundingBox.call_count == 1
+
+
+def test_changesCoalesced(model_checker, scene_root):
+    addNode(model_checker, scene_root, createNode("Large", (200, 50, 50), "1"))
+
+    with patch.object(model_checker, "checkObjectsForShrinkage", MagicMock(return_value = True)) as check:
+        for _ in range(50):
+            model_checker._onChanged(scene_root)  # Like dragging a model.
+        model_checker._onMaterialsChanged()
+        model_checker.hasWarnings
+        check.assert_not_called()
+
+        finishChanges(model_checker)
+
+    check.assert_called_once_with()
+    assert model_checker.hasWarnings
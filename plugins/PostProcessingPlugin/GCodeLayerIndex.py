@@ -0,0 +1,64 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# The PostProcessingPlugin is released under the terms of the AGPLv3 or higher.
+
+import re
+from typing import List, Optional
+
+_integer_regex = re.compile(r"-?[0-9]+")
+
+
+##  What the index knows about one entry in the g-code list.
+#
+#   This searches with str.find, which is a lot faster than matching regular
+#   expressions against every line.
+class _EntrySummary:
+    def __init__(self, entry: str) -> None:
+        self.layer_numbers = self._findLayerNumbers(entry)  # type: List[int]
+
+    @staticmethod
+    def _findLayerNumbers(entry: str) -> List[int]:
+        layer_numbers = []
+        position = entry.find(";LAYER:")
+        while position != -1:
+            if position == 0 or entry[position - 1] == "\n":  # Only at the start of a line.
+                match = _integer_regex.match(entry, position + len(";LAYER:"))
+                if match is not None:
+                    layer_numbers.append(int(match.group(0)))
+            position = entry.find(";LAYER:", position + 1)
+        return layer_numbers
+
+
+##  An index of the g-code that the post-processing scripts work on.
+#
+#   The g-code list has an entry for every layer, plus a few entries for the
+#   start and end g-code. The index finds the entries of layers without
+#   splitting the g-code into lines. Every entry is searched once, until it is
+#   changed, so that scripts can share the work.
+class GCodeLayerIndex:
+    def __init__(self, data: List[str]) -> None:
+        self._data = data
+        self._summaries = [None] * len(data)  # type: List[Optional[_EntrySummary]]
+
+    def getEntryCount(self) -> int:
+        return len(self._data)
+
+    ##  Gets the numbers of the layers that start in an entry, in the order
+    #   that they appear in.
+    def getLayerNumbers(self, entry_index: int) -> List[int]:
+        return self._getSummary(entry_index).layer_numbers
+
+    ##  Gets the indices of the entries in which a layer starts.
+    def getLayerEntries(self) -> List[int]:
+        return [entry_index for entry_index in range(len(self._data)) if self._getSummary(entry_index).layer_numbers]
+
+    ##  Forgets what was indexed about an entry, after it has been changed.
+    def invalidate(self, entry_index: int) -> None:
+        self._summaries[entry_index] = None
+
+    def _getSummary(self, entry_index: int) -> _EntrySummary:
+        summary = self._summaries[entry_index]
+        if summary is None:
+            summary = _EntrySummary(self._data[entry_index])
+            self._summaries[entry_index] = summary
+        return summary
+
@@ -20,6 +20,8 @@ import importlib.util
 from UM.i18n import i18nCatalog
 from cura.CuraApplication import CuraApplication
 
+from .ScriptPipeline import runScripts
+
 i18n_catalog = i18nCatalog("cura")
 
 if TYPE_CHECKING:
@@ -82,11 +84,7 @@ class PostProcessingPlugin(QObject, Extension):
             return
 
         if ";POSTPROCESSED" not in gcode_list[0]:
-            for script in self._script_list:
-                try:
-                    gcode_list = script.execute(gcode_list)
-                except Exception:
-                    Logger.logException("e", "Exception in post-processing script.")
+            gcode_list = runScripts(self._script_list, gcode_list)
             if len(self._script_list):  # Add comment to g-code if any changes were made.
                 gcode_list[0] += ";POSTPROCESSED\n"
             gcode_dict[active_build_plate_id] = gcode_list
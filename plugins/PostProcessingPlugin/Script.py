@@ -1,7 +1,7 @@
 # Copyright (c) 2015 Jaime van Kessel
 # Copyright (c) 2018 Ultimaker B.V.
 # The PostProcessingPlugin is released under the terms of the AGPLv3 or higher.
-from typing import Optional, Any, Dict, TYPE_CHECKING, List
+from typing import Optional, Any, Callable, Dict, TYPE_CHECKING, List, Tuple
 
 from UM.Signal import Signal, signalemitter
 from UM.i18n import i18nCatalog
@@ -14,6 +14,8 @@ from UM.Settings.InstanceContainer import InstanceContainer
 from UM.Settings.DefinitionContainer import DefinitionContainer
 from UM.Settings.ContainerRegistry import ContainerRegistry
 
+from .GCodeLayerIndex import GCodeLayerIndex
+
 import re
 import json
 import collections
@@ -22,6 +24,8 @@ i18n_catalog = i18nCatalog("cura")
 if TYPE_CHECKING:
     from UM.Settings.Interfaces import DefinitionContainerInterface
 
+_number_regex = re.compile(r"^-?[0-9]+\.?[0-9]*")  # Compiled once, since getValue is called for nearly every line of g-code.
+
 
 ## Base class for scripts. All scripts should inherit the script class.
 @signalemitter
@@ -116,7 +120,7 @@ class Script:
         if not key in line or (';' in line and line.find(key) > line.find(';')):
             return default
         sub_part = line[line.find(key) + 1:]
-        m = re.search('^-?[0-9]+\.?[0-9]*', sub_part)
+        m = _number_regex.search(sub_part)
         if m is None:
             return default
         try:
@@ -181,5 +185,27 @@ class Script:
 
     ##  This is called when the script is executed. 
     #   It gets a list of g-code strings and needs to return a (modified) list.
+    #
+    #   Scripts that implement getLayerTasks don't need to implement this.
     def execute(self, data: List[str]) -> List[str]:
-        raise NotImplementedError()
+        tasks = self.getLayerTasks(GCodeLayerIndex(data))
+        if tasks is None:
+            raise NotImplementedError()
+        function, layer_arguments = tasks
+        for entry_index, argument in layer_arguments:
+            data[entry_index] = function(data[entry_index], argument)
+        return data
+
+    ##  Scripts that change every layer on its own, without needing to know
+    #   about the other layers, can override this so that they only get the
+    #   layers that they change.
+    #
+    #   The function that is returned gets called as ``function(layer,
+    #   argument)`` for each of the layers, and must return the changed layer.
+    #   \param index The index of the g-code, to find the layers to change.
+    #   \return None to get the complete g-code in execute() instead, or the
+    #   function with, for each layer that it needs to change, the index of
+    #   the layer in the g-code list and the argument to call the function
+    #   with.
+    def getLayerTasks(self, index: GCodeLayerIndex) -> Optional[Tuple[Callable[[str, Any], str], List[Tuple[int, Any]]]]:
+        return None
@@ -0,0 +1,47 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# The PostProcessingPlugin is released under the terms of the AGPLv3 or higher.
+
+from typing import List, Optional, TYPE_CHECKING
+
+from UM.Logger import Logger
+
+from .GCodeLayerIndex import GCodeLayerIndex
+
+if TYPE_CHECKING:
+    from .Script import Script
+
+
+##  Runs post-processing scripts on g-code, one after another.
+#
+#   The g-code is indexed once. Scripts that implement getLayerTasks only get
+#   the layers that they change, and the index is only updated for those
+#   layers. Other scripts get the complete g-code, after which it needs to be
+#   indexed again.
+#   \param scripts The scripts to run, in order.
+#   \param data The g-code list, with an entry per layer.
+#   \return The changed g-code list.
+def runScripts(scripts: List["Script"], data: List[str]) -> List[str]:
+    index = None  # type: Optional[GCodeLayerIndex]
+    for script in scripts:
+        try:
+            if index is None:
+                index = GCodeLayerIndex(data)
+            tasks = script.getLayerTasks(index)
+            if tasks is None:
+                data = script.execute(data)
+                index = None  # The script may have changed anything.
+                continue
+
+            function, layer_arguments = tasks
+            entry_indices = [entry_index for entry_index, _ in layer_arguments]
+            layers = (data[entry_index] for entry_index in entry_indices)  # Not a list, so that the old layers can be freed as soon as they are replaced.
+            arguments = (argument for _, argument in layer_arguments)
+            results = map(function, layers, arguments)
+            for entry_index, result in zip(entry_indices, results):
+                if result is not data[entry_index]:
+                    data[entry_index] = result
+                    index.invalidate(entry_index)
+        except Exception:
+            Logger.logException("e", "Exception in post-processing script.")
+            index = None  # The script may have changed some layers before failing.
+    return data
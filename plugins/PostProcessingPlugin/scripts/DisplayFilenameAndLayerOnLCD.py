@@ -9,6 +9,26 @@
 from ..Script import Script
 from UM.Application import Application
 
+
+##  Inserts a line of text after the start of every layer in a piece of g-code.
+def _insertAfterLayerStart(layer, display_text):
+    parts = []
+    start = 0
+    position = layer.find(";LAYER:")
+    while position != -1:
+        if position == 0 or layer[position - 1] == "\n":
+            line_end = layer.find("\n", position)
+            if line_end == -1:  # The last line.
+                parts.append(layer[start:] + "\n" + display_text)
+                start = len(layer)
+                break
+            parts.append(layer[start:line_end + 1] + display_text + "\n")
+            start = line_end + 1
+        position = layer.find(";LAYER:", position + 1)
+    parts.append(layer[start:])
+    return "".join(parts)
+
+
 class DisplayFilenameAndLayerOnLCD(Script):
     def __init__(self):
         super().__init__()
@@ -31,23 +51,16 @@ class DisplayFilenameAndLayerOnLCD(Script):
             }
         }"""
     
-    def execute(self, data):
+    def getLayerTasks(self, index):
         if self.getSettingValueByKey("name") != "":
             name = self.getSettingValueByKey("name")
         else:
             name = Application.getInstance().getPrintInformation().jobName       
         lcd_text = "M117 " + name + " layer "
         i = 0
-        for layer in data:
-            display_text = lcd_text + str(i)
-            layer_index = data.index(layer)
-            lines = layer.split("\n")
-            for line in lines:
-                if line.startswith(";LAYER:"):
-                    line_index = lines.index(line)
-                    lines.insert(line_index + 1, display_text)
-                    i += 1
-            final_lines = "\n".join(lines)
-            data[layer_index] = final_lines
-            
-        return data
+        tasks = []
+        for entry_index in index.getLayerEntries():
+            tasks.append((entry_index, lcd_text + str(i)))
+            i += len(index.getLayerNumbers(entry_index))
+
+        return _insertAfterLayerStart, tasks
@@ -2,6 +2,15 @@
 
 from ..Script import Script
 
+
+##  Adds g-code to the start or the end of a layer.
+def _insertInLayer(layer, insertion):
+    gcode_to_add, before = insertion
+    if before:
+        return gcode_to_add + layer
+    return layer + gcode_to_add
+
+
 class InsertAtLayerChange(Script):
     def __init__(self):
         super().__init__()
@@ -32,19 +41,8 @@ class InsertAtLayerChange(Script):
             }
         }"""
 
-    def execute(self, data):
+    def getLayerTasks(self, index):
         gcode_to_add = self.getSettingValueByKey("gcode_to_add") + "\n"
-        for layer in data:
-            # Check that a layer is being printed
-            lines = layer.split("\n")
-            for line in lines:
-                if ";LAYER:" in line:
-                    index = data.index(layer)
-                    if self.getSettingValueByKey("insert_location") == "before":
-                        layer = gcode_to_add + layer
-                    else:
-                        layer = layer + gcode_to_add
-
-                    data[index] = layer
-                    break
-        return data
+        before = self.getSettingValueByKey("insert_location") == "before"
+        # Only insert in layers that are being printed.
+        return _insertInLayer, [(entry_index, (gcode_to_add, before)) for entry_index in index.getLayerEntries()]
@@ -5,6 +5,12 @@ import re #To perform the search and replace.
 
 from ..Script import Script
 
+
+##  Replaces all occurrences of a regular expression in a layer.
+def _replaceInLayer(layer, replacement):
+    search_regex, replace_string = replacement
+    return re.sub(search_regex, replace_string, layer)
+
 ##  Performs a search-and-replace on all g-code.
 #
 #   Due to technical limitations, the search can't cross the border between
@@ -42,7 +48,7 @@ class SearchAndReplace(Script):
             }
         }"""
 
-    def execute(self, data):
+    def getLayerTasks(self, index):
         search_string = self.getSettingValueByKey("search")
         if not self.getSettingValueByKey("is_regex"):
             search_string = re.escape(search_string) #Need to search for the actual string, not as a regex.
@@ -50,7 +56,4 @@ class SearchAndReplace(Script):
 
         replace_string = self.getSettingValueByKey("replace")
 
-        for layer_number, layer in enumerate(data):
-            data[layer_number] = re.sub(search_regex, replace_string, layer) #Replace all.
-
-        return data
\ No newline at end of file
+        return _replaceInLayer, [(entry_index, (search_regex, replace_string)) for entry_index in range(index.getEntryCount())] #Replace all.
\ No newline at end of file
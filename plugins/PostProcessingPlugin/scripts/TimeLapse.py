@@ -2,6 +2,12 @@
 
 from ..Script import Script
 
+
+##  Adds g-code to the end of a layer.
+def _appendToLayer(layer, gcode_to_append):
+    return layer + gcode_to_append
+
+
 class TimeLapse(Script):
     def __init__(self):
         super().__init__()
@@ -67,7 +73,7 @@ class TimeLapse(Script):
             }
         }"""
 
-    def execute(self, data):
+    def getLayerTasks(self, index):
         feed_rate = self.getSettingValueByKey("park_feed_rate")
         park_print_head = self.getSettingValueByKey("park_print_head")
         x_park = self.getSettingValueByKey("head_park_x")
@@ -82,14 +88,5 @@ class TimeLapse(Script):
         gcode_to_append += trigger_command + ";Snap Photo\n"
         gcode_to_append += self.putValue(G = 4, P = pause_length) + ";Wait for camera\n"
         gcode_to_append += ";TimeLapse End\n"
-        for layer in data:
-            # Check that a layer is being printed
-            lines = layer.split("\n")
-            for line in lines:
-                if ";LAYER:" in line:
-                    index = data.index(layer)
-                    layer += gcode_to_append
-
-                    data[index] = layer
-                    break
-        return data
+        # Take a photo at the end of every layer that is printed.
+        return _appendToLayer, [(entry_index, gcode_to_append) for entry_index in index.getLayerEntries()]
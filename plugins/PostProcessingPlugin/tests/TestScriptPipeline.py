@@ -0,0 +1,131 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# The PostProcessingPlugin is released under the terms of the AGPLv3 or higher.
+
+from unittest.mock import MagicMock, patch
+
+from UM.Logger import Logger
+
+from ..GCodeLayerIndex import GCodeLayerIndex
+from ..Script import Script
+from ..ScriptPipeline import runScripts
+from ..scripts.DisplayFilenameAndLayerOnLCD import DisplayFilenameAndLayerOnLCD
+from ..scripts.InsertAtLayerChange import InsertAtLayerChange
+from ..scripts.SearchAndReplace import SearchAndReplace
+from ..scripts.TimeLapse import TimeLapse
+
+
+##  Creates a g-code list like CuraEngine sends it: a header, the start
+#   g-code, an entry per layer and the end g-code.
+def createGCodeList(layer_count = 5):
+    data = [";FLAVOR:Marlin\n;LAYER_COUNT:{layer_count}\n".format(layer_count = layer_count), "G28 ;Home\nG1 Z15.0 F6000\n"]
+    for layer_number in range(layer_count):
+        data.append(";LAYER:{layer_number}\nG0 F9000 X10 Y10 Z{z:.1f}\n;TYPE:WALL-OUTER\nG1 F1800 X20 Y10 E{e:.1f}\nG1 X20 Y20 E{e2:.1f} ;Corner\n".format(
+            layer_number = layer_number, z = 0.3 + 0.2 * layer_number, e = layer_number + 0.5, e2 = layer_number + 1.0))
+    data.append("M107\nG28 X0\n")
+    return data
+
+
+##  Creates a script with the given settings, without a setting stack.
+def createScript(script_class, **settings):
+    script = script_class()
+    script.getSettingValueByKey = settings.get
+    return script
+
+
+def test_indexLayers():
+    index = GCodeLayerIndex(createGCodeList())
+
+    assert index.getEntryCount() == 8
+    assert index.getLayerEntries() == [2, 3, 4, 5, 6]
+    assert index.getLayerNumbers(3) == [1]
+
+
+def test_indexInvalidate():
+    data = createGCodeList()
+    index = GCodeLayerIndex(data)
+    index.getLayerNumbers(2)
+
+    data[2] = ";LAYER:10\nG1 Z5 X1\n"
+    index.invalidate(2)
+
+    assert index.getLayerNumbers(2) == [10]
+    assert index.getLayerEntries() == [2, 3, 4, 5, 6]
+
+
+def test_timeLapse():
+    data = createGCodeList()
+    script = createScript(TimeLapse, park_feed_rate = 9000, park_print_head = False, head_park_x = 0, head_park_y = 190, trigger_command = "M240", pause_length = 700)
+
+    result = script.execute(list(data))
+
+    assert result[:2] == data[:2]
+    assert result[-1] == data[-1]
+    for layer, original in zip(result[2:-1], data[2:-1]):
+        assert layer.startswith(original)
+        assert "M240;Snap Photo" in layer[len(original):]
+
+
+def test_insertAtLayerChange():
+    data = createGCodeList()
+    before = runScripts([createScript(InsertAtLayerChange, gcode_to_add = "M117 Before", insert_location = "before")], list(data))
+    after = runScripts([createScript(InsertAtLayerChange, gcode_to_add = "M117 After", insert_location = "after")], list(data))
+
+    assert before[2:-1] == ["M117 Before\n" + layer for layer in data[2:-1]]
+    assert after[2:-1] == [layer + "M117 After\n" for layer in data[2:-1]]
+    assert before[-1] == after[-1] == data[-1]
+
+
+def test_displayFilenameAndLayer():
+    data = createGCodeList()
+    script = createScript(DisplayFilenameAndLayerOnLCD, name = "test")
+
+    result = script.execute(list(data))
+
+    for layer_number, layer in enumerate(result[2:-1]):
+        assert layer.split("\n")[:2] == [";LAYER:{layer_number}".format(layer_number = layer_number), "M117 test layer {layer_number}".format(layer_number = layer_number)]
+    assert result[1] == data[1]
+
+
+def test_searchAndReplace():
+    data = createGCodeList()
+    script = createScript(SearchAndReplace, search = "F[0-9]+", replace = "F1000", is_regex = True)
+
+    result = script.execute(list(data))
+
+    assert result == [layer.replace("F9000", "F1000").replace("F1800", "F1000").replace("F6000", "F1000") for layer in data]
+
+
+##  Scripts that get the complete g-code and scripts that only get layers must
+#   give the same result in any order.
+def test_runScripts():
+    def executeFullList(data):
+        return [layer.replace("G28", "G28 X0 Y0") for layer in data]
+    full_list_script = MagicMock(spec = Script)
+    full_list_script.getLayerTasks = MagicMock(return_value = None)
+    full_list_script.execute = MagicMock(side_effect = executeFullList)
+    scripts = [
+        createScript(DisplayFilenameAndLayerOnLCD, name = "test"),
+        full_list_script,
+        createScript(InsertAtLayerChange, gcode_to_add = "M117 Hi", insert_location = "before"),
+        createScript(SearchAndReplace, search = "X20", replace = "X25", is_regex = False)
+    ]
+    data = createGCodeList(layer_count = 100)
+
+    expected = list(data)
+    for script in scripts:
+        expected = script.execute(expected)
+    result = runScripts(scripts, list(data))
+
+    assert result == expected
+
+
+def test_runScriptsFailing():
+    failing_script = MagicMock(spec = Script)
+    failing_script.getLayerTasks = MagicMock(side_effect = ValueError("Oops."))
+    data = createGCodeList()
+    scripts = [failing_script, createScript(SearchAndReplace, search = "G28", replace = "G29", is_regex = False)]
+
+    with patch.object(Logger, "logException"):
+        result = runScripts(scripts, list(data))
+
+    assert result == [layer.replace("G28", "G29") for layer in data]  # The other scripts still run.
@@ -27,6 +27,8 @@ class RemovableDriveOutputDevice(OutputDevice):
 
         self._writing = False
         self._stream = None
+        self._job = None
+        self._writer = None
 
     ##  Request the specified nodes to be written to the removable drive.
     #
@@ -90,6 +92,10 @@ class RemovableDriveOutputDevice(OutputDevice):
             job.setFileName(file_name)
             job.progress.connect(self._onProgress)
             job.finished.connect(self._onFinished)
+            self._job = job
+            if hasattr(writer, "writeProgress"):  # Writers that report their progress while writing, like the 3MF writer.
+                self._writer = writer
+                writer.writeProgress.connect(self._onWriterProgress)
 
             message = Message(catalog.i18nc("@info:progress Don't translate the XML tags <filename>!", "Saving to Removable Drive <filename>{0}</filename>").format(self.getName()), 0, False, -1, catalog.i18nc("@info:title", "Saving"))
             message.show()
@@ -125,7 +131,20 @@ class RemovableDriveOutputDevice(OutputDevice):
     def _onProgress(self, job, progress):
         self.writeProgress.emit(self, progress)
 
+    ##  Show the progress that the writer reports as the progress of the job.
+    def _onWriterProgress(self, writer, progress):
+        if self._job is None:
+            return
+        self._job.progress.emit(self._job, progress)
+        message = self._job.getMessage()
+        if message:
+            message.setProgress(progress)
+
     def _onFinished(self, job):
+        if self._writer is not None:
+            self._writer.writeProgress.disconnect(self._onWriterProgress)
+            self._writer = None
+        self._job = None
         if self._stream:
             # Explicitly closing the stream flushes the write-buffer
             try:
@@ -0,0 +1,131 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from collections import OrderedDict
+import threading
+from typing import Iterable, Optional, TYPE_CHECKING
+
+from UM.Job import Job
+from UM.Logger import Logger
+
+if TYPE_CHECKING:
+    from UM.Mesh.MeshData import MeshData
+    from cura.LayerData import LayerData
+
+
+##  Keeps the meshes of the layers that the layer view showed last, so that
+#   they don't need to be created again when moving the layer slider back and
+#   forth.
+#
+#   The meshes that were used the longest ago are removed when the meshes take
+#   more memory than the maximum. All meshes are removed when they belong to
+#   other layer data than the layer data that is asked for, such as after
+#   slicing again.
+#
+#   The cache is used from the jobs that create the meshes, so it is safe to
+#   use from multiple threads.
+class LayerMeshCache:
+    def __init__(self, max_size: int = 256 * 1024 * 1024) -> None:
+        self._max_size = max_size  # In bytes.
+        self._size = 0
+        self._layer_data = None  # type: Optional[LayerData]
+        self._meshes = OrderedDict()  # type: OrderedDict[int, Optional[MeshData]]  # By layer number, from the least to the most recently used.
+        self._lock = threading.Lock()
+
+        self._hit_count = 0
+        self._miss_count = 0
+
+    ##  Gets the mesh of a layer, creating it if it isn't in the cache.
+    #   \param layer_data The layer data that the layer is in.
+    #   \param layer_number The layer to get the mesh of.
+    #   \return The mesh of the layer, or None if the layer has no lines.
+    def getMesh(self, layer_data: "LayerData", layer_number: int) -> Optional["MeshData"]:
+        with self._lock:
+            if layer_data is not self._layer_data:
+                self._clear()
+                self._layer_data = layer_data
+            if layer_number in self._meshes:
+                self._hit_count += 1
+                self._meshes.move_to_end(layer_number)
+                return self._meshes[layer_number]
+            self._miss_count += 1
+
+        mesh = layer_data.getLayer(layer_number).createMesh()  # Without holding the lock, since this takes a while.
+        if mesh is not None and mesh.getVertices() is None:
+            mesh = None
+
+        with self._lock:
+            if layer_data is self._layer_data and layer_number not in self._meshes:
+                self._meshes[layer_number] = mesh
+                self._size += self._getMeshSize(mesh)
+                while self._size > self._max_size and len(self._meshes) > 1:
+                    _, removed_mesh = self._meshes.popitem(last = False)
+                    self._size -= self._getMeshSize(removed_mesh)
+        return mesh
+
+    ##  Whether the mesh of a layer is in the cache.
+    def contains(self, layer_data: "LayerData", layer_number: int) -> bool:
+        with self._lock:
+            return layer_data is self._layer_data and layer_number in self._meshes
+
+    ##  Gets the layer data that the meshes in the cache belong to.
+    def getLayerData(self) -> Optional["LayerData"]:
+        return self._layer_data
+
+    ##  Removes all meshes, e.g. because the layer data was removed.
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+            self._layer_data = None
+
+    def getHitCount(self) -> int:
+        return self._hit_count
+
+    def getMissCount(self) -> int:
+        return self._miss_count
+
+    ##  Gets how much memory the meshes in the cache take, in bytes.
+    def getSize(self) -> int:
+        return self._size
+
+    def _clear(self) -> None:
+        self._meshes.clear()
+        self._size = 0
+
+    @staticmethod
+    def _getMeshSize(mesh: Optional["MeshData"]) -> int:
+        if mesh is None:
+            return 0
+        size = 0
+        for data in (mesh.getVertices(), mesh.getIndices(), mesh.getColors(), mesh.getNormals()):
+            if data is not None:
+                size += data.nbytes
+        return size
+
+
+##  Creates the meshes of layers in the background, so that they are in the
+#   cache by the time that the layer view needs them.
+class PrefetchLayerMeshesJob(Job):
+    def __init__(self, cache: LayerMeshCache, layer_data: "LayerData", layer_numbers: Iterable[int]) -> None:
+        super().__init__()
+        self._cache = cache
+        self._layer_data = layer_data
+        self._layer_numbers = list(layer_numbers)
+        self._cancel = False
+
+    def run(self) -> None:
+        for layer_number in self._layer_numbers:
+            if self._cancel:
+                return
+            if self._layer_data.getLayer(layer_number) is None or self._cache.contains(self._layer_data, layer_number):
+                continue
+            try:
+                self._cache.getMesh(self._layer_data, layer_number)
+            except Exception:
+                Logger.logException("w", "An exception occurred while creating layer mesh.")
+                return
+            Job.yieldThread()
+
+    def cancel(self) -> None:
+        self._cancel = True
+        super().cancel()
@@ -0,0 +1,76 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+import numpy
+
+if TYPE_CHECKING:
+    from cura.LayerData import LayerData
+
+
+##  Finds which elements of layer data to draw, and where the print head is,
+#   without going through all layers and polygons on every frame.
+#
+#   The cumulative element counts of the layers are computed once. The
+#   cumulative point counts of the polygons in a layer are computed the first
+#   time that the head position in that layer is asked for. The index stays
+#   valid as long as the layer data doesn't change, since layer data can't be
+#   changed.
+class LayerRangeIndex:
+    def __init__(self, layer_data: "LayerData") -> None:
+        self._layer_data = layer_data
+        element_counts = layer_data.getElementCounts()
+        self._layer_numbers = numpy.array(sorted(element_counts.keys()), dtype = numpy.int64)
+        counts = numpy.array([element_counts[layer_number] for layer_number in self._layer_numbers], dtype = numpy.int64)
+        self._cumulative_counts = numpy.concatenate(([0], numpy.cumsum(counts)))  # Element offset at the start of each layer, and the total at the end.
+        self._path_ends = {}  # type: Dict[int, numpy.ndarray]  # For each layer, the path number at the end of each polygon.
+
+    def getLayerData(self) -> "LayerData":
+        return self._layer_data
+
+    ##  Gets the elements to draw for the layers below the current layer.
+    #   \param current_layer The layer that is shown with only part of its paths.
+    #   \param minimum_layer The lowest layer to show.
+    #   \return The index of the first and one past the last element to draw.
+    #   The end is where the current layer starts.
+    def getRange(self, current_layer: int, minimum_layer: int) -> Tuple[int, int]:
+        current_index = self._findLayer(current_layer)
+        if current_index is None:  # Without the current layer, all layers are drawn.
+            current_index = len(self._layer_numbers)
+        minimum_index = int(numpy.searchsorted(self._layer_numbers, minimum_layer, side = "left"))
+        return int(self._cumulative_counts[min(minimum_index, current_index)]), int(self._cumulative_counts[current_index])
+
+    ##  Gets where the print head is at a path in a layer.
+    #
+    #   Consecutive polygons share a point: the last point of a polygon is the
+    #   first point of the next one. That point is counted only once.
+    #   \return The position of the head, in the coordinates of the layer
+    #   data, or None if the layer doesn't exist or doesn't have that many
+    #   paths.
+    def getHeadPosition(self, layer_number: int, path_number: int) -> Optional[numpy.ndarray]:
+        if self._findLayer(layer_number) is None:
+            return None
+        polygons = self._layer_data.getLayer(layer_number).polygons
+        if layer_number not in self._path_ends:
+            point_counts = numpy.array([polygon.data.size // 3 for polygon in polygons], dtype = numpy.int64)
+            point_counts[1:] -= 1  # The shared first point.
+            self._path_ends[layer_number] = numpy.cumsum(point_counts)
+        path_ends = self._path_ends[layer_number]
+
+        polygon_index = int(numpy.searchsorted(path_ends, path_number, side = "right"))  # The first polygon that ends after the path.
+        if polygon_index >= len(polygons):
+            return None
+        point_index = path_number
+        if polygon_index > 0:
+            point_index -= int(path_ends[polygon_index - 1])
+            point_index += 1  # Skip the shared first point.
+        return polygons[polygon_index].data[point_index]
+
+    ##  Gets the index of a layer in the sorted layer numbers, or None if there
+    #   is no such layer.
+    def _findLayer(self, layer_number: int) -> Optional[int]:
+        index = int(numpy.searchsorted(self._layer_numbers, layer_number, side = "left"))
+        if index < len(self._layer_numbers) and self._layer_numbers[index] == layer_number:
+            return index
+        return None
@@ -18,8 +18,10 @@ from cura.Settings.ExtruderManager import ExtruderManager
 
 
 import os.path
+from typing import Dict
 
 ## RenderPass used to display g-code paths.
+from .LayerRangeIndex import LayerRangeIndex
 from .NozzleNode import NozzleNode
 
 
@@ -42,6 +44,8 @@ class SimulationPass(RenderPass):
         self._layer_view = None
         self._compatibility_mode = None
 
+        self._layer_range_indices = {}  # type: Dict[int, LayerRangeIndex]  # By the ID of the layer data. Kept while the layer data is rendered.
+
     def setSimulationView(self, layerview):
         self._layer_view = layerview
         self._compatibility_mode = layerview.getCompatibilityMode()
@@ -96,6 +100,7 @@ class SimulationPass(RenderPass):
         active_build_plate = Application.getInstance().getMultiBuildPlateModel().activeBuildPlate
         head_position = None  # Indicates the current position of the print head
         nozzle_node = None
+        layer_range_indices = {}  # type: Dict[int, LayerRangeIndex]
 
         for node in DepthFirstIterator(self._scene.getRoot()):
 
@@ -113,29 +118,18 @@ class SimulationPass(RenderPass):
 
                 # Render all layers below a certain number as line mesh instead of vertices.
                 if self._layer_view._current_layer_num > -1 and ((not self._layer_view._only_show_top_layers) or (not self._layer_view.getCompatibilityMode())):
-                    start = 0
-                    end = 0
-                    element_counts = layer_data.getElementCounts()
-                    for layer in sorted(element_counts.keys()):
-                        # In the current layer, we show just the indicated paths
-                        if layer == self._layer_view._current_layer_num:
-                            # We look for the position of the head, searching the point of the current path
-                            index = self._layer_view._current_path_num
-                            offset = 0
-                            for polygon in layer_data.getLayer(layer).polygons:
-                                # The size indicates all values in the two-dimension array, and the second dimension is
-                                # always size 3 because we have 3D points.
-                                if index >= polygon.data.size // 3 - offset:
-                                    index -= polygon.data.size // 3 - offset
-                                    offset = 1  # This is to avoid the first point when there is more than one polygon, since has the same value as the last point in the previous polygon
-                                    continue
-                                # The head position is calculated and translated
-                                head_position = Vector(polygon.data[index+offset][0], polygon.data[index+offset][1], polygon.data[index+offset][2]) + node.getWorldPosition()
-                                break
-                            break
-                        if self._layer_view._minimum_layer_num > layer:
-                            start += element_counts[layer]
-                        end += element_counts[layer]
+                    layer_range_index = self._layer_range_indices.get(id(layer_data))
+                    if layer_range_index is None or layer_range_index.getLayerData() is not layer_data:
+                        layer_range_index = LayerRangeIndex(layer_data)
+                    layer_range_indices[id(layer_data)] = layer_range_index
+
+                    start, end = layer_range_index.getRange(self._layer_view._current_layer_num, self._layer_view._minimum_layer_num)
+
+                    # We look for the position of the head, searching the point of the current path
+                    head_point = layer_range_index.getHeadPosition(self._layer_view._current_layer_num, self._layer_view._current_path_num)
+                    if head_point is not None:
+                        # The head position is calculated and translated
+                        head_position = Vector(head_point[0], head_point[1], head_point[2]) + node.getWorldPosition()
 
                     # Calculate the range of paths in the last layer
                     current_layer_start = end
@@ -174,6 +168,8 @@ class SimulationPass(RenderPass):
                 if len(batch.items) > 0:
                     batch.render(self._scene.getActiveCamera())
 
+        self._layer_range_indices = layer_range_indices  # Forget the layer data that is no longer rendered.
+
         # The nozzle is drawn when once we know the correct position of the head,
         # but the user is not using the layer slider, and the compatibility mode is not enabled
         if not self._switching_layers and not self._compatibility_mode and self._layer_view.getActivity() and nozzle_node is not None:
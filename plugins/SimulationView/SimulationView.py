@@ -32,6 +32,7 @@ from cura.CuraView import CuraView
 from cura.Scene.ConvexHullNode import ConvexHullNode
 from cura.CuraApplication import CuraApplication
 
+from .LayerMeshCache import LayerMeshCache, PrefetchLayerMeshesJob
 from .NozzleNode import NozzleNode
 from .SimulationPass import SimulationPass
 from .SimulationViewProxy import SimulationViewProxy
@@ -41,6 +42,7 @@ import os.path
 from typing import Optional, TYPE_CHECKING, List, cast
 
 if TYPE_CHECKING:
+    from cura.LayerData import LayerData
     from UM.Scene.SceneNode import SceneNode
     from UM.Scene.Scene import Scene
     from UM.Settings.ContainerStack import ContainerStack
@@ -56,6 +58,8 @@ class SimulationView(CuraView):
     LAYER_VIEW_TYPE_FEEDRATE = 2
     LAYER_VIEW_TYPE_THICKNESS = 3
 
+    _prefetch_layer_count = 5  # How many layers to create the meshes of in advance, in the direction that the layer slider moves.
+
     def __init__(self, parent = None) -> None:
         super().__init__(parent)
 
@@ -65,6 +69,9 @@ class SimulationView(CuraView):
         self._current_layer_mesh = None
         self._current_layer_jumps = None
         self._top_layers_job = None  # type: Optional["_CreateTopLayersJob"]
+        self._layer_mesh_cache = LayerMeshCache()
+        self._prefetch_job = None  # type: Optional[PrefetchLayerMeshesJob]
+        self._layer_direction = 0  # Whether the layer slider last moved up (1) or down (-1).
         self._activity = False
         self._old_max_layers = 0
 
@@ -181,6 +188,7 @@ class SimulationView(CuraView):
     def _onSceneChanged(self, node: "SceneNode") -> None:
         if node.getMeshData() is None:
             self.resetLayerData()
+        self._invalidateLayerMeshCache()
 
         self.setActivity(False)
         self.calculateMaxLayers()
@@ -230,6 +238,7 @@ class SimulationView(CuraView):
 
     def setLayer(self, value: int) -> None:
         if self._current_layer_num != value:
+            self._layer_direction = 1 if value > self._current_layer_num else -1
             self._current_layer_num = value
             if self._current_layer_num < 0:
                 self._current_layer_num = 0
@@ -369,29 +378,32 @@ class SimulationView(CuraView):
                 continue
 
             self.setActivity(True)
-            min_layer_number = sys.maxsize
-            max_layer_number = -sys.maxsize
-            for layer_id in layer_data.getLayers():
-
-                # If a layer doesn't contain any polygons, skip it (for infill meshes taller than print objects
-                if len(layer_data.getLayer(layer_id).polygons) < 1:
-                    continue
-
-                # Store the max and min feedrates and thicknesses for display purposes
-                for p in layer_data.getLayer(layer_id).polygons:
-                    self._max_feedrate = max(float(p.lineFeedrates.max()), self._max_feedrate)
-                    self._min_feedrate = min(float(p.lineFeedrates.min()), self._min_feedrate)
-                    self._max_thickness = max(float(p.lineThicknesses.max()), self._max_thickness)
-                    try:
-                        self._min_thickness = min(float(p.lineThicknesses[numpy.nonzero(p.lineThicknesses)].min()), self._min_thickness)
-                    except:
-                        # Sometimes, when importing a GCode the line thicknesses are zero and so the minimum (avoiding
-                        # the zero) can't be calculated
-                        Logger.log("i", "Min thickness can't be calculated because all the values are zero")
-                if max_layer_number < layer_id:
-                    max_layer_number = layer_id
-                if min_layer_number > layer_id:
-                    min_layer_number = layer_id
+
+            # Store the max and min feedrates and thicknesses for display purposes.
+            # These were computed when the layer data was created.
+            statistics = layer_data.getStatistics()
+            feedrate_range = statistics.getFeedrateRange()
+            if feedrate_range is not None:
+                self._min_feedrate = min(feedrate_range[0], self._min_feedrate)
+                self._max_feedrate = max(feedrate_range[1], self._max_feedrate)
+            thickness_range = statistics.getThicknessRange()
+            if thickness_range is not None:
+                self._max_thickness = max(thickness_range[1], self._max_thickness)
+                if thickness_range[0] == numpy.inf:
+                    # Sometimes, when importing a GCode the line thicknesses are zero and so the minimum (avoiding
+                    # the zero) can't be calculated
+                    Logger.log("i", "Min thickness can't be calculated because all the values are zero")
+                else:
+                    self._min_thickness = min(thickness_range[0], self._min_thickness)
+
+            # If a layer doesn't contain any polygons, skip it (for infill meshes taller than print objects
+            layer_numbers = statistics.getLayerNumbers()
+            if layer_numbers:
+                min_layer_number = layer_numbers[0]
+                max_layer_number = layer_numbers[-1]
+            else:
+                min_layer_number = sys.maxsize
+                max_layer_number = -sys.maxsize
             layer_count = max_layer_number - min_layer_number
 
             if new_max_layers < layer_count:
@@ -554,10 +566,13 @@ class SimulationView(CuraView):
         if self._top_layers_job:
             self._top_layers_job.finished.disconnect(self._updateCurrentLayerMesh)
             self._top_layers_job.cancel()
+        if self._prefetch_job:
+            self._prefetch_job.cancel()  # Don't compete with creating the layers that are needed now.
+            self._prefetch_job = None
 
         self.setBusy(True)
 
-        self._top_layers_job = _CreateTopLayersJob(self._controller.getScene(), self._current_layer_num, self._solid_layers)
+        self._top_layers_job = _CreateTopLayersJob(self._controller.getScene(), self._current_layer_num, self._solid_layers, self._layer_mesh_cache)
         self._top_layers_job.finished.connect(self._updateCurrentLayerMesh)  # type: ignore  # mypy doesn't understand the whole private class thing that's going on here.
         self._top_layers_job.start()  # type: ignore
 
@@ -574,6 +589,44 @@ class SimulationView(CuraView):
 
         self._top_layers_job = None  # type: Optional["_CreateTopLayersJob"]
 
+        layer_data = job.getLayerData()
+        if layer_data is not None:
+            self._startPrefetchLayers(layer_data)
+
+    ##  Creates the meshes of the next few layers in the background, in the
+    #   direction that the layer slider moves, so that moving it further is
+    #   quick.
+    def _startPrefetchLayers(self, layer_data: "LayerData") -> None:
+        if self._layer_direction > 0:
+            first_layer = self._current_layer_num + 1
+        elif self._layer_direction < 0:
+            first_layer = self._current_layer_num - self._solid_layers  # The layer below the lowest one that is shown.
+        else:
+            return
+        layer_numbers = [first_layer + self._layer_direction * i for i in range(self._prefetch_layer_count)]
+        layer_numbers = [layer_number for layer_number in layer_numbers if 0 <= layer_number <= self._max_layers]
+        if not layer_numbers:
+            return
+
+        self._prefetch_job = PrefetchLayerMeshesJob(self._layer_mesh_cache, layer_data, layer_numbers)
+        self._prefetch_job.start()
+
+    ##  Removes the cached layer meshes when the layer data that they belong to
+    #   is no longer in the scene, like after the back-end cleared it or a new
+    #   slice result replaced it.
+    def _invalidateLayerMeshCache(self) -> None:
+        cached_layer_data = self._layer_mesh_cache.getLayerData()
+        if cached_layer_data is None:
+            return
+        for node in DepthFirstIterator(self._controller.getScene().getRoot()):  # type: ignore
+            if node.callDecoration("getLayerData") is cached_layer_data:
+                return
+
+        if self._prefetch_job:
+            self._prefetch_job.cancel()
+            self._prefetch_job = None
+        self._layer_mesh_cache.clear()
+
     def _updateWithPreferences(self) -> None:
         self._solid_layers = int(Application.getInstance().getPreferences().getValue("view/top_layer_count"))
         self._only_show_top_layers = bool(Application.getInstance().getPreferences().getValue("view/only_show_top_layers"))
@@ -614,14 +667,20 @@ class SimulationView(CuraView):
 
 
 class _CreateTopLayersJob(Job):
-    def __init__(self, scene: "Scene", layer_number: int, solid_layers: int) -> None:
+    def __init__(self, scene: "Scene", layer_number: int, solid_layers: int, layer_mesh_cache: LayerMeshCache) -> None:
         super().__init__()
 
         self._scene = scene
         self._layer_number = layer_number
         self._solid_layers = solid_layers
+        self._layer_mesh_cache = layer_mesh_cache
+        self._layer_data = None  # type: Optional[LayerData]
         self._cancel = False
 
+    ##  Gets the layer data that the layers were created from.
+    def getLayerData(self) -> Optional["LayerData"]:
+        return self._layer_data
+
     def run(self) -> None:
         layer_data = None
         for node in DepthFirstIterator(self._scene.getRoot()):  # type: ignore
@@ -631,6 +690,7 @@ class _CreateTopLayersJob(Job):
 
         if self._cancel or not layer_data:
             return
+        self._layer_data = layer_data
 
         layer_mesh = MeshBuilder()
         for i in range(self._solid_layers):
@@ -639,7 +699,7 @@ class _CreateTopLayersJob(Job):
                 continue
 
             try:
-                layer = layer_data.getLayer(layer_number).createMesh()
+                layer = self._layer_mesh_cache.getMesh(layer_data, layer_number)
             except Exception:
                 Logger.logException("w", "An exception occurred while creating layer mesh.")
                 return
@@ -0,0 +1,129 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock, patch
+
+import numpy
+import pytest
+
+from ..LayerMeshCache import LayerMeshCache, PrefetchLayerMeshesJob
+from ..SimulationView import _CreateTopLayersJob
+
+_solid_layers = 5
+
+
+##  Creates the mesh of a layer with a single triangle.
+def createMesh():
+    mesh = MagicMock()
+    mesh.getVertices = MagicMock(return_value = numpy.zeros((3, 3), dtype = numpy.float32))
+    mesh.getIndices = MagicMock(return_value = numpy.array([[0, 1, 2]], dtype = numpy.int32))
+    mesh.getColors = MagicMock(return_value = numpy.ones((3, 4), dtype = numpy.float32))
+    mesh.getNormals = MagicMock(return_value = None)
+    return mesh
+
+
+##  Creates layer data with the given number of layers. Each layer counts how
+#   often its mesh is created.
+def createLayerData(layer_count = 100):
+    layers = {}
+    for layer_number in range(layer_count):
+        layer = MagicMock()
+        layer.createMesh = MagicMock(side_effect = createMesh)
+        layers[layer_number] = layer
+    layer_data = MagicMock()
+    layer_data.getLayer = MagicMock(side_effect = layers.get)
+    layer_data.layers = layers
+    return layer_data
+
+
+def countCreatedMeshes(layer_data):
+    return sum(layer.createMesh.call_count for layer in layer_data.layers.values())
+
+
+##  Shows the top layers like the layer view does when the layer slider moves.
+def showLayer(layer_data, layer_number, cache):
+    node = MagicMock()
+    node.callDecoration = MagicMock(return_value = layer_data)
+    with patch("UM.Job.Job.yieldThread"):
+        with patch.object(_CreateTopLayersJob, "setResult"):
+            with patch("{module}.DepthFirstIterator".format(module = _CreateTopLayersJob.__module__), MagicMock(return_value = [node])):
+                _CreateTopLayersJob(MagicMock(), layer_number, _solid_layers, cache).run()
+
+
+def test_scrubbing():
+    layer_data = createLayerData()
+    cache = LayerMeshCache()
+
+    scrubbed_layers = list(range(10, 60)) + list(range(60, 10, -1)) + list(range(10, 40))
+    for layer_number in scrubbed_layers:
+        showLayer(layer_data, layer_number, cache)
+
+    assert countCreatedMeshes(layer_data) == len(range(10 - _solid_layers + 1, 60 + 1))  # Every layer that was shown is created once.
+    assert cache.getMissCount() == countCreatedMeshes(layer_data)
+    assert cache.getHitCount() / (cache.getHitCount() + cache.getMissCount()) > 0.9
+
+
+def test_prefetch():
+    layer_data = createLayerData()
+    cache = LayerMeshCache()
+    showLayer(layer_data, 20, cache)
+    created_meshes = countCreatedMeshes(layer_data)
+
+    with patch("UM.Job.Job.yieldThread"):
+        PrefetchLayerMeshesJob(cache, layer_data, range(21, 26)).run()
+    assert countCreatedMeshes(layer_data) == created_meshes + 5
+
+    misses = cache.getMissCount()
+    for layer_number in range(21, 26):
+        showLayer(layer_data, layer_number, cache)
+    assert cache.getMissCount() == misses  # Everything was already prefetched.
+    assert countCreatedMeshes(layer_data) == created_meshes + 5
+
+
+def test_prefetchBeyondLastLayer():
+    layer_data = createLayerData(layer_count = 10)
+    cache = LayerMeshCache()
+
+    with patch("UM.Job.Job.yieldThread"):
+        PrefetchLayerMeshesJob(cache, layer_data, range(8, 13)).run()
+
+    assert countCreatedMeshes(layer_data) == 2
+
+
+def test_newLayerData():
+    old_layer_data = createLayerData()
+    new_layer_data = createLayerData()
+    cache = LayerMeshCache()
+    showLayer(old_layer_data, 20, cache)
+
+    showLayer(new_layer_data, 20, cache)  # Like after slicing again.
+
+    assert countCreatedMeshes(new_layer_data) == _solid_layers
+    assert not cache.contains(old_layer_data, 20)
+    assert cache.getLayerData() is new_layer_data
+
+
+def test_clear():
+    layer_data = createLayerData()
+    cache = LayerMeshCache()
+    showLayer(layer_data, 20, cache)
+
+    cache.clear()  # Like when the layer data was removed.
+
+    assert cache.getSize() == 0
+    assert cache.getLayerData() is None
+    showLayer(layer_data, 20, cache)
+    assert countCreatedMeshes(layer_data) == 2 * _solid_layers
+
+
+@pytest.mark.parametrize("max_meshes", [1, 3, 10])
+def test_memoryBound(max_meshes):
+    layer_data = createLayerData()
+    mesh_size = LayerMeshCache._getMeshSize(createMesh())
+    cache = LayerMeshCache(max_size = mesh_size * max_meshes)
+
+    for layer_number in range(30):
+        cache.getMesh(layer_data, layer_number)
+
+    assert cache.getSize() == mesh_size * max_meshes
+    assert [cache.contains(layer_data, layer_number) for layer_number in range(30)] == [False] * (30 - max_meshes) + [True] * max_meshes  # The most recently used ones.
@@ -0,0 +1,113 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock
+
+import numpy
+import pytest
+
+from ..LayerRangeIndex import LayerRangeIndex
+
+
+##  Creates layer data with layers of polygons with the given numbers of
+#   points. Each layer has two elements per point.
+def createLayerData(point_counts_per_layer):
+    layers = {}
+    element_counts = {}
+    next_coordinate = 0
+    for layer_number, point_counts in point_counts_per_layer.items():
+        polygons = []
+        for point_count in point_counts:
+            polygon = MagicMock()
+            polygon.data = numpy.arange(next_coordinate, next_coordinate + point_count * 3, dtype = numpy.float32).reshape((-1, 3))
+            next_coordinate += point_count * 3
+            polygons.append(polygon)
+        layer = MagicMock()
+        layer.polygons = polygons
+        layers[layer_number] = layer
+        element_counts[layer_number] = 2 * sum(point_counts)
+    layer_data = MagicMock()
+    layer_data.getLayer = MagicMock(side_effect = layers.get)
+    layer_data.getElementCounts = MagicMock(return_value = element_counts)
+    return layer_data
+
+
+##  Finds the range and the head position like SimulationPass did, by going
+#   through all layers and polygons.
+def findByLoop(layer_data, current_layer, minimum_layer, path_number):
+    start = 0
+    end = 0
+    head_position = None
+    element_counts = layer_data.getElementCounts()
+    for layer in sorted(element_counts.keys()):
+        if layer == current_layer:
+            index = path_number
+            offset = 0
+            for polygon in layer_data.getLayer(layer).polygons:
+                if index >= polygon.data.size // 3 - offset:
+                    index -= polygon.data.size // 3 - offset
+                    offset = 1
+                    continue
+                head_position = polygon.data[index + offset]
+                break
+            break
+        if minimum_layer > layer:
+            start += element_counts[layer]
+        end += element_counts[layer]
+    return start, end, head_position
+
+
+def assertSameAsLoop(layer_data, current_layer, minimum_layer, path_number):
+    index = LayerRangeIndex(layer_data)
+    expected_start, expected_end, expected_head_position = findByLoop(layer_data, current_layer, minimum_layer, path_number)
+
+    assert index.getRange(current_layer, minimum_layer) == (expected_start, expected_end)
+    head_position = index.getHeadPosition(current_layer, path_number)
+    if expected_head_position is None:
+        assert head_position is None
+    else:
+        assert numpy.array_equal(head_position, expected_head_position)
+
+
+@pytest.mark.parametrize("current_layer, minimum_layer", [(0, 0), (3, 0), (3, 2), (3, 3), (5, 1), (7, 0), (-1, 0), (100, 4)])
+def test_range(current_layer, minimum_layer):
+    layer_data = createLayerData({layer_number: [4, 6] for layer_number in range(8)})
+    assertSameAsLoop(layer_data, current_layer, minimum_layer, 0)
+
+
+def test_rangeWithGaps():
+    layer_data = createLayerData({-2: [3], 0: [5], 4: [2, 2], 9: [7]})  # Raft layers and layers that are missing.
+    for current_layer in range(-3, 11):
+        for minimum_layer in range(-3, current_layer + 1):
+            assertSameAsLoop(layer_data, current_layer, minimum_layer, 0)
+
+
+def test_headPosition():
+    layer_data = createLayerData({0: [4], 1: [3, 5, 2, 6], 2: [2]})
+    for path_number in range(15):  # Including the paths beyond the end of the layer.
+        assertSameAsLoop(layer_data, 1, 0, path_number)
+
+
+def test_headPositionRandom():
+    random = numpy.random.RandomState(46)
+    layer_data = createLayerData({layer_number: random.randint(2, 30, size = random.randint(1, 10)).tolist() for layer_number in range(50)})
+    for _ in range(500):
+        current_layer = random.randint(0, 50)
+        assertSameAsLoop(layer_data, current_layer, random.randint(0, current_layer + 1), random.randint(0, 150))
+
+
+def test_headPositionMissingLayer():
+    layer_data = createLayerData({0: [4], 2: [4]})
+    assert LayerRangeIndex(layer_data).getHeadPosition(1, 0) is None
+
+
+def test_headPositionComputedOnce():
+    layer_data = createLayerData({0: [4, 4]})
+    index = LayerRangeIndex(layer_data)
+    index.getHeadPosition(0, 0)
+    polygons_calls = layer_data.getLayer.call_count
+
+    head_position = index.getHeadPosition(0, 5)
+
+    assert numpy.array_equal(head_position, layer_data.getLayer(0).polygons[1].data[2])  # Paths 0 to 3 are in the first polygon. Path 4 is after the shared point of the second one.
+    assert layer_data.getLayer.call_count == polygons_calls + 2  # Once by the index, once above.
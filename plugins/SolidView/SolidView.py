@@ -11,6 +11,8 @@ from UM.Settings.Validator import ValidatorState
 from UM.Math.Color import Color
 from UM.View.GL.OpenGL import OpenGL
 
+from cura.Scene.ConvexHullBatch import ConvexHullBatch
+from cura.Scene.ConvexHullNode import ConvexHullNode
 from cura.Settings.ExtruderManager import ExtruderManager
 
 import math
@@ -31,6 +33,8 @@ class SolidView(View):
         self._extruders_model = None
         self._theme = None
 
+        self._convex_hull_batch = ConvexHullBatch()
+
     def beginRendering(self):
         scene = self.getController().getScene()
         renderer = self.getRenderer()
@@ -76,7 +80,12 @@ class SolidView(View):
             else:
                 self._enabled_shader.setUniformValue("u_overhangAngle", math.cos(math.radians(0)))
 
+        hull_nodes = []
         for node in DepthFirstIterator(scene.getRoot()):
+            if type(node) is ConvexHullNode:
+                hull_nodes.append(node)  # These are all drawn at once, below.
+                continue
+
             if not node.render(renderer):
                 if node.getMeshData() and node.isVisible() and not node.callDecoration("getLayerData"):
                     uniforms = {}
@@ -137,5 +146,7 @@ class SolidView(View):
                 if node.callDecoration("isGroup") and Selection.isSelected(node):
                     renderer.queueNode(scene.getRoot(), mesh = node.getBoundingBoxMesh(), mode = RenderBatch.RenderMode.LineLoop)
 
+        self._convex_hull_batch.render(renderer, hull_nodes)
+
     def endRendering(self):
         pass
@@ -6,7 +6,6 @@ from typing import cast
 from Charon.VirtualFile import VirtualFile
 
 from UM.Mesh.MeshReader import MeshReader
-from UM.MimeTypeDatabase import MimeType, MimeTypeDatabase
 from UM.PluginRegistry import PluginRegistry
 from cura.Scene.CuraSceneNode import CuraSceneNode
 from plugins.GCodeReader.GCodeReader import GCodeReader
@@ -16,14 +15,6 @@ class UFPReader(MeshReader):
 
     def __init__(self) -> None:
         super().__init__()
-
-        MimeTypeDatabase.addMimeType(
-            MimeType(
-                name = "application/x-ufp",
-                comment = "Ultimaker Format Package",
-                suffixes = ["ufp"]
-            )
-        )
         self._supported_extensions = [".ufp"]
 
     def _read(self, file_name: str) -> CuraSceneNode:
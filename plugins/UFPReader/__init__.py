@@ -2,8 +2,9 @@
 #Cura is released under the terms of the LGPLv3 or higher.
 
 from UM.i18n import i18nCatalog
+from UM.MimeTypeDatabase import MimeType, MimeTypeDatabase
 
-from . import UFPReader
+from cura.ReaderWriters.LazyMeshReader import LazyMeshReader
 
 i18n_catalog = i18nCatalog("cura")
 
@@ -20,7 +21,20 @@ def getMetaData():
     }
 
 
+def _createReader():
+    from . import UFPReader
+    return UFPReader.UFPReader()
+
+
 def register(app):
     app.addNonSliceableExtension(".ufp")
-    return {"mesh_reader": UFPReader.UFPReader()}
+    MimeTypeDatabase.addMimeType(
+        MimeType(
+            name = "application/x-ufp",
+            comment = "Ultimaker Format Package",
+            suffixes = ["ufp"]
+        )
+    )
+    # Only import the reader (and Charon) when the first UFP file is read.
+    return {"mesh_reader": LazyMeshReader(getMetaData()["mesh_reader"], _createReader)}
 
@@ -8,6 +8,7 @@ import io  # To create the correct buffers for sending data to the printer.
 import json
 import os
 
+from UM.FileHandler.FileWriter import FileWriter  # For typing.
 from UM.FileHandler.FileHandler import FileHandler
 from UM.FileHandler.WriteFileJob import WriteFileJob  # To call the file writer asynchronously.
 from UM.i18n import i18nCatalog
@@ -81,6 +82,7 @@ class ClusterUM3OutputDevice(NetworkedPrinterOutputDevice):
 
         self._error_message = None  # type: Optional[Message]
         self._write_job_progress_message = None  # type: Optional[Message]
+        self._write_job_writer = None  # type: Optional[FileWriter]
         self._progress_message = None  # type: Optional[Message]
 
         self._active_printer = None  # type: Optional[PrinterOutputModel]
@@ -190,6 +192,9 @@ class ClusterUM3OutputDevice(NetworkedPrinterOutputDevice):
                                                    title = i18n_catalog.i18nc("@info:title", "Sending Data"),
                                                    use_inactivity_timer = False)
         self._write_job_progress_message.show()
+        if hasattr(mesh_format.writer, "writeProgress"):  # Writers that report their progress while writing, like the 3MF writer.
+            self._write_job_writer = mesh_format.writer
+            self._write_job_writer.writeProgress.connect(self._onWriteJobWriterProgress)
 
         if mesh_format.preferred_format is not None:
             self._dummy_lambdas = (target_printer, mesh_format.preferred_format, stream)
@@ -198,7 +203,14 @@ class ClusterUM3OutputDevice(NetworkedPrinterOutputDevice):
             yield True  # Return that we had success!
             yield  # To prevent having to catch the StopIteration exception.
 
+    def _onWriteJobWriterProgress(self, writer: FileWriter, progress: float) -> None:
+        if self._write_job_progress_message:
+            self._write_job_progress_message.setProgress(progress)
+
     def _sendPrintJobWaitOnWriteJobFinished(self, job: WriteFileJob) -> None:
+        if self._write_job_writer is not None:
+            self._write_job_writer.writeProgress.disconnect(self._onWriteJobWriterProgress)
+            self._write_job_writer = None
         if self._write_job_progress_message:
             self._write_job_progress_message.hide()
 
@@ -1,6 +1,7 @@
 from typing import List, Optional
 
 from cura.CuraApplication import CuraApplication
+from cura.PrinterOutput.CompressGCodeJob import CompressGCodeJob
 from cura.PrinterOutput.NetworkedPrinterOutputDevice import NetworkedPrinterOutputDevice, AuthState
 from cura.PrinterOutput.Models.PrinterOutputModel import PrinterOutputModel
 from cura.PrinterOutput.Models.PrintJobOutputModel import PrintJobOutputModel
@@ -19,7 +20,7 @@ from UM.Scene.SceneNode import SceneNode
 from UM.Settings.ContainerRegistry import ContainerRegistry
 
 from PyQt5.QtNetwork import QNetworkRequest
-from PyQt5.QtCore import QTimer, QUrl
+from PyQt5.QtCore import QFile, QIODevice, QTimer, QUrl
 from PyQt5.QtWidgets import QMessageBox
 
 from .LegacyUM3PrinterOutputController import LegacyUM3PrinterOutputController
@@ -268,17 +269,31 @@ class LegacyUM3OutputDevice(NetworkedPrinterOutputDevice):
         self._progress_message.addAction("Abort", i18n_catalog.i18nc("@action:button", "Cancel"), None, "")
         self._progress_message.actionTriggered.connect(self._progressMessageActionTriggered)
         self._progress_message.show()
-        
-        compressed_gcode = self._compressGCode()
-        if compressed_gcode is None:
-            # Abort was called.
+
+        self._compressGCode(on_finished = self._onGCodeCompressed)
+
+    def _onGCodeCompressed(self, job: CompressGCodeJob) -> None:
+        if not self._sending_gcode or job.isAborted() or job.hasError():
+            # Abort was called, or the g-code couldn't be compressed.
+            self._stopSendingGCode(job)
+            return
+
+        compressed_gcode = QFile(job.getPath())
+        if not compressed_gcode.open(QIODevice.ReadOnly):
+            Logger.log("e", "Unable to open the compressed g-code in {path}.".format(path = job.getPath()))
+            self._stopSendingGCode(job)
             return
 
         file_name = "%s.gcode.gz" % CuraApplication.getInstance().getPrintInformation().jobName
-        self.postForm("print_job", "form-data; name=\"file\";filename=\"%s\"" % file_name, compressed_gcode,
-                      on_finished=self._onPostPrintJobFinished)
+        reply = self.postForm("print_job", "form-data; name=\"file\";filename=\"%s\"" % file_name, compressed_gcode,
+                              on_finished=self._onPostPrintJobFinished)
+        if reply is None:
+            self._stopSendingGCode(job)
 
-        return
+    def _stopSendingGCode(self, job: CompressGCodeJob) -> None:
+        job.close()
+        self._progress_message.hide()
+        self._sending_gcode = False
 
     def _progressMessageActionTriggered(self, message_id=None, action_id=None):
         if action_id == "Abort":
@@ -291,6 +306,9 @@ class LegacyUM3OutputDevice(NetworkedPrinterOutputDevice):
     def _onPostPrintJobFinished(self, reply):
         self._progress_message.hide()
         self._sending_gcode = False
+        if self._compress_gcode_job is not None:
+            self._compress_gcode_job.close()
+            self._compress_gcode_job = None
 
     def _onUploadPrintJobProgress(self, bytes_sent, bytes_total):
         if bytes_total > 0:
@@ -240,6 +240,10 @@ _variant_translations_materials = {
 #
 #   It converts the machine instances and profiles.
 class VersionUpgrade21to22(VersionUpgrade):
+    ##  Upgrading machine instances schedules extra files to be upgraded, so
+    #   this can't run in Cura's parallel upgrade pipeline.
+    HasSideEffects = True
+
     ##  Gets the version number from a config file.
     #
     #   In all config files that concern this version upgrade, the version
@@ -12,6 +12,10 @@ from UM.VersionUpgrade import VersionUpgrade # Superclass of the plugin.
 import UM.VersionUpgrade
 
 class VersionUpgrade22to24(VersionUpgrade):
+    ##  Upgrading machine instances writes extra files, so this can't run in
+    #   Cura's parallel upgrade pipeline.
+    HasSideEffects = True
+
     def upgradeMachineInstance(self, serialised: str, filename: str) -> Optional[Tuple[List[str], List[str]]]:
         # All of this is needed to upgrade custom variant machines from old Cura to 2.4 where
         # `definition_changes` instance container has been introduced. Variant files which
@@ -24,6 +24,10 @@ _split_settings = { #These settings should be copied to all settings it was spli
 #
 #   All of these methods are essentially stateless.
 class VersionUpgrade25to26(VersionUpgrade):
+    ##  Upgrading machine stacks writes extra files and counts the machines it
+    #   upgraded, so this can't run in Cura's parallel upgrade pipeline.
+    HasSideEffects = True
+
     def __init__(self) -> None:
         super().__init__()
         self._current_fdm_printer_count = 2
@@ -1,8 +1,9 @@
 # Seva Alekseyev with National Institutes of Health, 2016
 
-from . import X3DReader
-
 from UM.i18n import i18nCatalog
+
+from cura.ReaderWriters.LazyMeshReader import LazyMeshReader
+
 catalog = i18nCatalog("cura")
 
 def getMetaData():
@@ -16,5 +17,11 @@ def getMetaData():
     }
 
 
+def _createReader():
+    from . import X3DReader
+    return X3DReader.X3DReader()
+
+
 def register(app):
-    return {"mesh_reader": X3DReader.X3DReader()}
+    # Only import the reader when the first X3D file is read.
+    return {"mesh_reader": LazyMeshReader(getMetaData()["mesh_reader"], _createReader)}
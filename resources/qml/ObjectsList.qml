@@ -130,7 +130,7 @@ Rectangle
         Rectangle
             {
                 height: childrenRect.height
-                color: Cura.ObjectsModel.getItem(index).isSelected ? palette.highlight : index % 2 ? palette.base : palette.alternateBase
+                color: model.isSelected ? palette.highlight : index % 2 ? palette.base : palette.alternateBase
                 width: parent.width
                 Label
                 {
@@ -138,8 +138,8 @@ Rectangle
                     anchors.left: parent.left
                     anchors.leftMargin: UM.Theme.getSize("default_margin").width
                     width: parent.width - 2 * UM.Theme.getSize("default_margin").width - 30
-                    text: (index >= 0) && Cura.ObjectsModel.getItem(index) ? Cura.ObjectsModel.getItem(index).name : "";
-                    color: Cura.ObjectsModel.getItem(index).isSelected ? palette.highlightedText : (Cura.ObjectsModel.getItem(index).isOutsideBuildArea ? palette.mid : palette.text)
+                    text: model.name
+                    color: model.isSelected ? palette.highlightedText : (model.isOutsideBuildArea ? palette.mid : palette.text)
                     elide: Text.ElideRight
                 }
 
@@ -150,8 +150,8 @@ Rectangle
                     anchors.left: nodeNameLabel.right
                     anchors.leftMargin: UM.Theme.getSize("default_margin").width
                     anchors.right: parent.right
-                    text: Cura.ObjectsModel.getItem(index).buildPlateNumber != -1 ? Cura.ObjectsModel.getItem(index).buildPlateNumber + 1 : "";
-                    color: Cura.ObjectsModel.getItem(index).isSelected ? palette.highlightedText : palette.text
+                    text: model.buildPlateNumber != -1 ? model.buildPlateNumber + 1 : ""
+                    color: model.isSelected ? palette.highlightedText : palette.text
                     elide: Text.ElideRight
                 }
 
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Compares two sets of benchmark results, as stored by the benchmarks in
+# tests/benchmarks when CURA_BENCHMARK_RESULTS is set. Exits with an error if
+# any benchmark got slower or used more memory than the threshold allows.
+
+import argparse
+import json
+import sys
+from typing import Any, Dict
+
+COLOR_WARNING = "\033[93m"
+COLOR_ENDC = "\033[0m"
+
+
+def load_results(file_name: str) -> Dict[str, Dict[str, Any]]:
+    with open(file_name, "r", encoding = "utf-8") as f:
+        return json.load(f)["benchmarks"]
+
+
+def format_change(baseline: float, result: float) -> str:
+    if baseline == 0:
+        return "n/a"
+    return "{change:+.1f}%".format(change = (result - baseline) / baseline * 100)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Compare benchmark results with a baseline.")
+    parser.add_argument("baseline", help = "The JSON file with the results to compare with.")
+    parser.add_argument("results", help = "The JSON file with the new results.")
+    parser.add_argument("--threshold", type = float, default = 10.0, help = "How many percent slower or larger a benchmark may get before it counts as a regression.")
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    results = load_results(args.results)
+
+    regressions = []
+    print("{name:<50} {time:>30} {memory:>36}".format(name = "Benchmark", time = "Minimum time (s)", memory = "Peak memory (MiB)"))
+    for name in sorted(set(baseline) | set(results)):
+        if name not in results:
+            print("{name:<50} only in the baseline".format(name = name))
+            continue
+        if name not in baseline:
+            print("{name:<50} new".format(name = name))
+            continue
+        old, new = baseline[name], results[name]
+        line = "{name:<50} {old_time:9.4f} -> {new_time:9.4f} {time_change:>8} {old_memory:10.1f} -> {new_memory:10.1f} {memory_change:>8}".format(
+            name = name,
+            old_time = old["min_time"], new_time = new["min_time"], time_change = format_change(old["min_time"], new["min_time"]),
+            old_memory = old["peak_memory"] / 1024 / 1024, new_memory = new["peak_memory"] / 1024 / 1024, memory_change = format_change(old["peak_memory"], new["peak_memory"]))
+        limit = 1 + args.threshold / 100
+        if new["min_time"] > old["min_time"] * limit or new["peak_memory"] > old["peak_memory"] * limit:
+            regressions.append(name)
+            line = COLOR_WARNING + line + COLOR_ENDC
+        print(line)
+
+    if regressions:
+        print("{count} benchmark(s) regressed by more than {threshold}%: {names}".format(count = len(regressions), threshold = args.threshold, names = ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import io
+import os
+import shutil
+import tempfile
+import unittest.mock
+import zipfile
+
+import pytest
+
+from cura.Backups.Backup import Backup
+from cura.Backups.BackupsManager import BackupsManager
+
+
+def _writeFile(path, contents):
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    with open(path, "wb") as f:
+        f.write(contents)
+
+
+def _readFile(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def application():
+    result = unittest.mock.MagicMock()
+    result.getVersion = unittest.mock.MagicMock(return_value = "4.1.0")
+    return result
+
+
+##  A data directory with a bit of everything, which the back-ups are made of
+#   and restored to.
+@pytest.fixture
+def data_directory(tmpdir):
+    path = os.path.join(str(tmpdir), "data")
+    _writeFile(os.path.join(path, "cura.cfg"), b"[general]\nversion = 6\n")
+    _writeFile(os.path.join(path, "machine_instances", "my_printer.global.cfg"), b"[general]\nversion = 4\n")
+    _writeFile(os.path.join(path, "quality_changes", "my_profile.inst.cfg"), b"[general]\nversion = 4\n")
+    _writeFile(os.path.join(path, "cura.log"), b"Not backed up.")
+
+    def factoryReset():
+        shutil.rmtree(path)
+        os.makedirs(path)
+
+    with unittest.mock.patch("cura.Backups.Backup.Resources.getDataStoragePath", unittest.mock.MagicMock(return_value = path)), \
+            unittest.mock.patch("cura.Backups.Backup.Resources.factoryReset", unittest.mock.MagicMock(side_effect = factoryReset)), \
+            unittest.mock.patch("cura.Backups.Backup.Platform.isLinux", unittest.mock.MagicMock(return_value = False)), \
+            unittest.mock.patch("cura.Backups.Backup.Message", unittest.mock.MagicMock()):
+        yield path
+
+
+##  Records the temporary files that are created, to check if they get
+#   removed.
+@pytest.fixture
+def temporary_files():
+    created_paths = []
+    original_mkstemp = tempfile.mkstemp
+
+    def mkstemp(*args, **kwargs):
+        file_descriptor, path = original_mkstemp(*args, **kwargs)
+        created_paths.append(path)
+        return file_descriptor, path
+
+    with unittest.mock.patch("cura.Backups.Backup.tempfile.mkstemp", mkstemp):
+        yield created_paths
+
+
+def test_makeAndRestore(application, data_directory, temporary_files):
+    backup = Backup(application)
+    backup.makeFromCurrent()
+
+    assert backup.zip_file_path == temporary_files[0]
+    assert backup._zip_file is None  # The archive is not kept in memory.
+    assert backup.meta_data["cura_release"] == "4.1.0"
+    assert backup.meta_data["machine_count"] == "1"
+    assert backup.meta_data["profile_count"] == "1"
+    with zipfile.ZipFile(backup.zip_file_path) as archive:
+        assert "cura.log" not in archive.namelist()
+
+    # Change the data after making the back-up. Restoring must undo that.
+    _writeFile(os.path.join(data_directory, "cura.cfg"), b"Changed.")
+    os.remove(os.path.join(data_directory, "quality_changes", "my_profile.inst.cfg"))
+
+    restored_backup = Backup(application, zip_file_path = backup.zip_file_path, meta_data = backup.meta_data)
+    assert restored_backup.restore()
+    assert _readFile(os.path.join(data_directory, "cura.cfg")) == b"[general]\nversion = 6\n"
+    assert _readFile(os.path.join(data_directory, "quality_changes", "my_profile.inst.cfg")) == b"[general]\nversion = 4\n"
+    os.remove(backup.zip_file_path)
+
+
+##  The archive can still be restored from memory, like CuraDrive used to.
+def test_restoreFromBytes(application, data_directory):
+    backup = Backup(application)
+    backup.makeFromCurrent()
+    zip_file = backup.zip_file
+    os.remove(backup.zip_file_path)
+    shutil.rmtree(os.path.join(data_directory, "machine_instances"))
+
+    assert Backup(application, zip_file = zip_file, meta_data = backup.meta_data).restore()
+    assert os.path.exists(os.path.join(data_directory, "machine_instances", "my_printer.global.cfg"))
+
+
+def test_restoreNewerVersion(application, data_directory):
+    backup = Backup(application)
+    backup.makeFromCurrent()
+
+    newer_backup = Backup(application, zip_file_path = backup.zip_file_path, meta_data = {"cura_release": "99.0.0"})
+    assert not newer_backup.restore()
+    os.remove(backup.zip_file_path)
+
+
+##  A back-up that fails doesn't leave its temporary archive behind.
+def test_makeFromCurrentFailureRemovesTemporaryFile(application, data_directory, temporary_files):
+    backup = Backup(application)
+    with unittest.mock.patch("cura.Backups.Backup.ZipFile", unittest.mock.MagicMock(side_effect = OSError("The disk is full!"))):
+        backup.makeFromCurrent()
+
+    assert backup.zip_file_path is None
+    assert backup.meta_data is None
+    assert len(temporary_files) == 1
+    assert not os.path.exists(temporary_files[0])
+
+
+##  Getting the back-up as bytes doesn't leave its temporary archive behind.
+def test_createBackupRemovesTemporaryFile(application, data_directory, temporary_files):
+    zip_file, meta_data = BackupsManager(application).createBackup()
+
+    with zipfile.ZipFile(io.BytesIO(zip_file)) as archive:
+        assert "cura.cfg" in archive.namelist()
+    assert meta_data["cura_release"] == "4.1.0"
+    assert len(temporary_files) == 1
+    assert not os.path.exists(temporary_files[0])
+
+
+def test_incrementalBackupAndRestore(tmpdir, application, data_directory):
+    chunk_store_path = os.path.join(str(tmpdir), "chunks")
+    manager = BackupsManager(application)
+    manifest, meta_data = manager.createIncrementalBackup(chunk_store_path)
+    assert meta_data["machine_count"] == "1"
+
+    _writeFile(os.path.join(data_directory, "cura.cfg"), b"Changed.")
+    manager.restoreIncrementalBackup(chunk_store_path, manifest, meta_data)
+
+    assert _readFile(os.path.join(data_directory, "cura.cfg")) == b"[general]\nversion = 6\n"
+    application.windowClosed.assert_called_once_with(save_data = False)  # Cura restarts to load the restored data.
@@ -0,0 +1,111 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import unittest.mock
+
+import pytest
+
+from cura.Backups.ChunkStore import ChunkStore
+from cura.Backups.IncrementalBackup import IncrementalBackup
+
+
+def _writeFile(path, contents):
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    with open(path, "wb") as f:
+        f.write(contents)
+
+
+def _readFile(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def data_directory(tmpdir):
+    path = os.path.join(str(tmpdir), "data")
+    _writeFile(os.path.join(path, "cura.cfg"), b"[general]\nversion = 6\n")
+    _writeFile(os.path.join(path, "quality_changes", "my_profile.inst.cfg"), b"[general]\nversion = 4\n")
+    _writeFile(os.path.join(path, "cura.log"), b"Ignored.")
+    _writeFile(os.path.join(path, "cache", "something.cache"), b"Ignored too.")
+    return path
+
+
+@pytest.fixture
+def backup(tmpdir):
+    return IncrementalBackup(ChunkStore(os.path.join(str(tmpdir), "chunks")), [r"cura\.log", r"cache"])
+
+
+def test_chunkStoreDeduplicates(tmpdir):
+    store = ChunkStore(str(tmpdir))
+    chunk_hash, is_new = store.putChunk(b"Some data")
+    assert is_new
+    assert store.putChunk(b"Some data") == (chunk_hash, False)
+    assert store.getChunk(chunk_hash) == b"Some data"
+    assert store.getMissingChunks([chunk_hash, "0" * 64]) == ["0" * 64]
+
+
+def test_chunkStoreMissingChunk(tmpdir):
+    with pytest.raises(KeyError):
+        ChunkStore(str(tmpdir)).getChunk("0" * 64)
+
+
+def test_createIgnoresFiles(backup, data_directory):
+    manifest = backup.create(data_directory)
+    assert sorted(IncrementalBackup.getFileNames(manifest)) == ["cura.cfg", "quality_changes/my_profile.inst.cfg"]
+
+
+def test_createIsIncremental(backup, data_directory):
+    manifest = backup.create(data_directory)
+    assert backup.getStoredBytes() > 0
+
+    # Nothing changed, so nothing new is stored.
+    manifest = backup.create(data_directory, manifest)
+    assert backup.getStoredBytes() == 0
+
+    # Only the changed file is stored.
+    new_contents = b"[general]\nversion = 4\nname = Changed\n"
+    _writeFile(os.path.join(data_directory, "quality_changes", "my_profile.inst.cfg"), new_contents)
+    backup.create(data_directory, manifest)
+    assert backup.getStoredBytes() == len(new_contents)
+
+
+def test_createLargeFileInChunks(tmpdir, backup, data_directory):
+    backup.ChunkSize = 16
+    _writeFile(os.path.join(data_directory, "large.bin"), bytes(range(100)))
+    manifest = backup.create(data_directory)
+    assert len(manifest["files"]["large.bin"]["chunks"]) == 7  # 100 bytes in chunks of 16.
+
+
+def test_restore(tmpdir, backup, data_directory):
+    manifest = backup.create(data_directory)
+    IncrementalBackup.saveManifest(manifest, os.path.join(str(tmpdir), "manifest.json"))
+    manifest = IncrementalBackup.loadManifest(os.path.join(str(tmpdir), "manifest.json"))
+
+    target_directory = os.path.join(str(tmpdir), "restored")
+    assert backup.restore(manifest, target_directory)
+    assert _readFile(os.path.join(target_directory, "cura.cfg")) == _readFile(os.path.join(data_directory, "cura.cfg"))
+    assert _readFile(os.path.join(target_directory, "quality_changes", "my_profile.inst.cfg")) == _readFile(os.path.join(data_directory, "quality_changes", "my_profile.inst.cfg"))
+    assert not os.path.exists(os.path.join(target_directory, "cura.log"))
+
+
+def test_restoreMissingChunks(tmpdir, data_directory):
+    backup = IncrementalBackup(ChunkStore(os.path.join(str(tmpdir), "chunks")), [r"cura\.log", r"cache"])
+    manifest = backup.create(data_directory)
+    empty_store_backup = IncrementalBackup(ChunkStore(os.path.join(str(tmpdir), "empty")), [])
+
+    target_directory = os.path.join(str(tmpdir), "restored")
+    assert not empty_store_backup.restore(manifest, target_directory)
+    assert not os.path.exists(target_directory)  # Nothing was restored.
+
+
+##  A failing write doesn't leave the temporary file of the restore behind.
+def test_restoreWriteFails(tmpdir, backup, data_directory):
+    manifest = backup.create(data_directory)
+    target_directory = os.path.join(str(tmpdir), "restored")
+
+    with unittest.mock.patch.object(backup._chunk_store, "getChunk", unittest.mock.MagicMock(side_effect = OSError("The disk is full!"))):
+        with pytest.raises(OSError):
+            backup.restore(manifest, target_directory)
+
+    assert not [file_name for _, _, file_names in os.walk(target_directory) for file_name in file_names if file_name.endswith(".restore")]
@@ -0,0 +1,45 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import gzip
+import os
+
+from cura.PrinterOutput.CompressGCodeJob import CompressGCodeJob
+
+gcode = [";LAYER:{layer}\n".format(layer = layer) + "G1 X{x} Y{x} E{x}\n".format(x = layer) * 100 for layer in range(2000)]
+
+
+def test_compress():
+    job = CompressGCodeJob(gcode)
+    job.BatchSize = 10000  # Compress in many batches.
+    job.run()
+
+    assert job.isDone()
+    assert not job.hasError()
+    assert job.getResult() == job.getPath()
+    with open(job.getPath(), "rb") as f:
+        assert gzip.decompress(f.read()).decode("utf-8") == "".join(gcode)
+
+    job.close()
+    assert not os.path.exists(job.getPath())
+
+
+def test_abort():
+    job = CompressGCodeJob(gcode)
+    job.abort()
+    job.run()
+
+    assert job.isDone()
+    assert job.isAborted()
+    assert job.getResult() is None
+    job.close()
+    assert not os.path.exists(job.getPath())
+
+
+def test_closeWhileRunning():
+    job = CompressGCodeJob(gcode)
+    job.close()  # Before it even starts, which should abort it and remove the file once it stops.
+    job.run()
+
+    assert job.isAborted()
+    assert not os.path.exists(job.getPath())
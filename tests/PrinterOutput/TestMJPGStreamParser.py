@@ -0,0 +1,102 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import pytest
+
+from cura.PrinterOutput.MJPGStreamParser import MJPGStreamParser
+
+
+def createFrame(content: bytes) -> bytes:
+    return b"\xff\xd8" + content + b"\xff\xd9"
+
+
+def createPart(frame: bytes) -> bytes:
+    return b"--boundary\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n"
+
+
+def createSizedPart(frame: bytes) -> bytes:
+    return "--boundary\r\nContent-Type: image/jpeg\r\nContent-Length: {length}\r\n\r\n".format(length = len(frame)).encode() + frame + b"\r\n"
+
+
+def test_singleFrame():
+    parser = MJPGStreamParser()
+    frame = createFrame(b"first")
+    assert parser.feed(createPart(frame)) == frame
+
+
+def test_frameSplitOverChunks():
+    parser = MJPGStreamParser()
+    frame = createFrame(b"split")
+    data = createPart(frame)
+
+    # Split the data everywhere, including in the middle of the markers.
+    results = [parser.feed(data[index:index + 1]) for index in range(len(data))]
+
+    assert [result for result in results if result is not None] == [frame]
+
+
+##  A thumbnail in the EXIF data of a frame is a JPEG image itself. Its end
+#   marker doesn't end the frame.
+def test_frameWithThumbnail():
+    parser = MJPGStreamParser()
+    frame = createFrame(b"exif" + createFrame(b"thumbnail") + b"image")
+    data = createPart(frame)
+
+    assert parser.feed(data) == frame
+    results = [parser.feed(data[index:index + 1]) for index in range(len(data))]
+    assert [result for result in results if result is not None] == [frame]
+
+
+##  With a Content-Length, the frame is taken as a whole, even if it contains
+#   data that looks like markers.
+def test_frameWithContentLength():
+    parser = MJPGStreamParser()
+    frame = createFrame(b"stray \xff\xd9 end and \xff\xd8 start")
+    data = createSizedPart(frame) * 2
+
+    assert parser.feed(data) == frame
+    results = [parser.feed(data[index:index + 1]) for index in range(len(data))]
+    assert [result for result in results if result is not None] == [frame, frame]
+
+
+def test_partsWithAndWithoutContentLength():
+    parser = MJPGStreamParser()
+    frames = [createFrame(str(index).encode()) for index in range(4)]
+    data = createSizedPart(frames[0]) + createPart(frames[1]) + createSizedPart(frames[2]) + createPart(frames[3])
+
+    results = [parser.feed(data[index:index + 1]) for index in range(len(data))]
+    assert [result for result in results if result is not None] == frames
+
+
+def test_onlyLatestFrame():
+    parser = MJPGStreamParser()
+    frames = [createFrame(str(index).encode()) for index in range(5)]
+    assert parser.feed(b"".join(createPart(frame) for frame in frames)) == frames[-1]
+    assert parser.feed(b"") is None  # The older frames are dropped, not kept for later.
+
+
+def test_bufferOnlyHoldsCurrentFrame():
+    parser = MJPGStreamParser()
+    for index in range(1000):
+        parser.feed(createPart(createFrame(b"x" * 1000)))
+    parser.feed(b"\xff\xd8" + b"y" * 100)
+    assert len(parser._buffer) == 102
+
+
+def test_frameTooLarge():
+    parser = MJPGStreamParser()
+    parser.feed(b"\xff\xd8")
+    with pytest.raises(ValueError):
+        parser.feed(b"x" * (MJPGStreamParser.MaximumFrameSize + 1))
+
+    frame = createFrame(b"after reset")
+    assert parser.feed(createPart(frame)) == frame
+
+
+def test_contentLengthTooLarge():
+    parser = MJPGStreamParser()
+    with pytest.raises(ValueError):
+        parser.feed("--boundary\r\nContent-Length: {length}\r\n\r\n".format(length = MJPGStreamParser.MaximumFrameSize + 1).encode())
+
+    frame = createFrame(b"after reset")
+    assert parser.feed(createSizedPart(frame)) == frame
@@ -0,0 +1,108 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+
+from cura.Settings.ContainerMetadataCache import ContainerMetadataCache
+
+
+def _writeFile(path, contents):
+    with open(path, "w") as f:
+        f.write(contents)
+
+
+def test_getMissing(tmpdir):
+    cache = ContainerMetadataCache(os.path.join(str(tmpdir), "metadata.cache"))
+    cache.load()
+    assert cache.get(os.path.join(str(tmpdir), "does_not_exist.inst.cfg")) is None
+
+
+def test_roundTrip(tmpdir):
+    cache_path = os.path.join(str(tmpdir), "metadata.cache")
+    container_path = os.path.join(str(tmpdir), "container.inst.cfg")
+    _writeFile(container_path, "[general]\nversion = 4\n")
+    metadata = [{"id": "container", "setting_version": 7}, {"id": "container_sibling", "setting_version": 7}]
+
+    cache = ContainerMetadataCache(cache_path, "4.1")
+    cache.load()
+    cache.put(container_path, metadata)
+    cache.save()
+    assert os.path.exists(cache_path)
+
+    cache = ContainerMetadataCache(cache_path, "4.1")
+    cache.load()
+    assert cache.get(container_path) == metadata
+
+
+##  A file that changed on disk must be parsed again.
+def test_changedFileInvalidates(tmpdir):
+    cache_path = os.path.join(str(tmpdir), "metadata.cache")
+    container_path = os.path.join(str(tmpdir), "container.inst.cfg")
+    _writeFile(container_path, "[general]\nversion = 4\n")
+
+    cache = ContainerMetadataCache(cache_path)
+    cache.load()
+    cache.put(container_path, [{"id": "container"}])
+    _writeFile(container_path, "[general]\nversion = 4\nname = Changed\n")
+    assert cache.get(container_path) is None
+
+
+##  Metadata that depends on other files is only used while those are the same.
+def test_changedDependenciesInvalidate(tmpdir):
+    cache_path = os.path.join(str(tmpdir), "metadata.cache")
+    container_path = os.path.join(str(tmpdir), "material.xml.fdm_material")
+    _writeFile(container_path, "<fdmmaterial/>")
+
+    cache = ContainerMetadataCache(cache_path)
+    cache.load()
+    cache.put(container_path, [{"id": "material"}], "installed_machines")
+    assert cache.get(container_path, "installed_machines") == [{"id": "material"}]
+    assert cache.get(container_path, "other_machines") is None
+    assert cache.get(container_path) is None
+
+
+def test_applicationVersionInvalidates(tmpdir):
+    cache_path = os.path.join(str(tmpdir), "metadata.cache")
+    container_path = os.path.join(str(tmpdir), "container.inst.cfg")
+    _writeFile(container_path, "[general]\nversion = 4\n")
+
+    cache = ContainerMetadataCache(cache_path, "4.0")
+    cache.load()
+    cache.put(container_path, [{"id": "container"}])
+    cache.save()
+
+    cache = ContainerMetadataCache(cache_path, "4.1")
+    cache.load()
+    assert len(cache) == 0
+    assert cache.get(container_path) is None
+
+
+def test_corruptCacheFile(tmpdir):
+    cache_path = os.path.join(str(tmpdir), "metadata.cache")
+    _writeFile(cache_path, "This is not a pickle.")
+
+    cache = ContainerMetadataCache(cache_path)
+    cache.load()  # Should not raise.
+    assert len(cache) == 0
+
+
+##  Files that are not looked up any more (e.g. deleted) are dropped on save.
+def test_staleEntriesDropped(tmpdir):
+    cache_path = os.path.join(str(tmpdir), "metadata.cache")
+    kept_path = os.path.join(str(tmpdir), "kept.inst.cfg")
+    removed_path = os.path.join(str(tmpdir), "removed.inst.cfg")
+    _writeFile(kept_path, "kept")
+    _writeFile(removed_path, "removed")
+
+    cache = ContainerMetadataCache(cache_path)
+    cache.load()
+    cache.put(kept_path, [{"id": "kept"}])
+    cache.put(removed_path, [{"id": "removed"}])
+    cache.save()
+
+    cache.load()
+    assert cache.get(kept_path) is not None
+    cache.save()
+
+    cache.load()
+    assert len(cache) == 1
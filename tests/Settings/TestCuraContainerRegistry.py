@@ -178,4 +178,95 @@ def test_loadMetadataValidation(container_registry, definition_container, parame
         assert parameters["id"] in container_registry.metadata
         assert container_registry.metadata[parameters["id"]] == parameters["metadata"]
     else:
-        assert parameters["id"] not in container_registry.metadata
\ No newline at end of file
+        assert parameters["id"] not in container_registry.metadata
+
+##  Creates a provider of one material file that contains two containers, which
+#   side-loads the second one when parsing the file like the local container
+#   provider does.
+def _createMaterialFileProvider(container_registry, file_path):
+    provider = unittest.mock.MagicMock()
+    provider.getAllIds = unittest.mock.MagicMock(return_value = ["material"])
+    provider.getContainerFilePathById = unittest.mock.MagicMock(return_value = file_path)
+
+    def loadMetadata(container_id):
+        container_registry.metadata["material_variant"] = {"id": "material_variant", "type": "material"}
+        return {"id": container_id, "type": "material"}
+    provider.loadMetadata = unittest.mock.MagicMock(side_effect = loadMetadata)
+    return provider
+
+
+def _createMetadataCache(tmpdir):
+    from cura.Settings.ContainerMetadataCache import ContainerMetadataCache
+    cache = ContainerMetadataCache(os.path.join(str(tmpdir), "metadata.cache"))
+    cache.load()
+    return cache
+
+
+##  Files with more than one container are parsed by their provider if they
+#   are not in the cache yet. All containers of the file get cached.
+def test_loadProviderMetadataColdCache(container_registry, tmpdir):
+    file_path = os.path.join(str(tmpdir), "material.xml.fdm_material")
+    with open(file_path, "w") as f:
+        f.write("<fdmmaterial/>")
+    container_registry._metadata_cache = _createMetadataCache(tmpdir)
+    provider = _createMaterialFileProvider(container_registry, file_path)
+
+    assert container_registry._loadProviderMetadata(provider, "material") == {"id": "material", "type": "material"}
+    provider.loadMetadata.assert_called_once_with("material")
+    assert sorted(metadata["id"] for metadata in container_registry._metadata_cache.get(file_path)) == ["material", "material_variant"]
+
+
+##  Files with more than one container are not parsed again if they are in the
+#   cache. The other containers in the file are registered from the cache.
+def test_loadProviderMetadataWarmCache(container_registry, tmpdir):
+    file_path = os.path.join(str(tmpdir), "material.xml.fdm_material")
+    with open(file_path, "w") as f:
+        f.write("<fdmmaterial/>")
+    container_registry._metadata_cache = _createMetadataCache(tmpdir)
+    container_registry._material_dependencies = "installed_machines"
+    container_registry._metadata_cache.put(file_path, [{"id": "material", "type": "material"}, {"id": "material_variant", "type": "material"}], "installed_machines")
+    provider = _createMaterialFileProvider(container_registry, file_path)
+
+    assert container_registry._loadProviderMetadata(provider, "material") == {"id": "material", "type": "material"}
+    provider.loadMetadata.assert_not_called()
+    assert container_registry.metadata["material_variant"] == {"id": "material_variant", "type": "material"}
+    source_provider = container_registry.source_provider["material_variant"]
+    assert source_provider.getBaseContainerId("material_variant") == "material"  # So it gets loaded by loading the material file.
+    source_provider.getContainerFilePathById("material_variant")
+    provider.getContainerFilePathById.assert_called_with("material")
+
+
+##  The metadata of material files depends on the installed machines and build
+#   plates, so they are parsed again if those changed.
+def test_loadProviderMetadataChangedMaterialDependencies(container_registry, tmpdir):
+    file_path = os.path.join(str(tmpdir), "material.xml.fdm_material")
+    with open(file_path, "w") as f:
+        f.write("<fdmmaterial/>")
+    container_registry._metadata_cache = _createMetadataCache(tmpdir)
+    container_registry._metadata_cache.put(file_path, [{"id": "material", "type": "material"}], "old_machines")
+    container_registry._material_dependencies = "new_machines"
+    provider = _createMaterialFileProvider(container_registry, file_path)
+
+    assert container_registry._loadProviderMetadata(provider, "material") == {"id": "material", "type": "material"}
+    provider.loadMetadata.assert_called_once_with("material")
+    assert container_registry._metadata_cache.get(file_path, "new_machines") is not None
+
+
+##  Material files are not parsed at all when loading all metadata with a warm
+#   cache.
+def test_loadAllMetadataWarmCache(container_registry, tmpdir):
+    from cura.CuraApplication import CuraApplication
+    file_path = os.path.join(str(tmpdir), "material.xml.fdm_material")
+    with open(file_path, "w") as f:
+        f.write("<fdmmaterial/>")
+    provider = _createMaterialFileProvider(container_registry, file_path)
+    container_registry._providers = [provider]
+    container_registry._metadata_cache = _createMetadataCache(tmpdir)
+    container_registry._metadata_cache.put(file_path, [{"id": "material", "setting_version": CuraApplication.SettingVersion}, {"id": "material_variant", "setting_version": CuraApplication.SettingVersion}])
+    container_registry._metadata_cache.save()
+
+    container_registry.loadAllMetadata()
+
+    provider.loadMetadata.assert_not_called()
+    assert "material" in container_registry.metadata
+    assert "material_variant" in container_registry.metadata
@@ -0,0 +1,183 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import unittest.mock
+
+import pytest
+
+from UM.Settings.Interfaces import PropertyEvaluationContext
+from UM.Settings.SettingFunction import SettingFunction
+from UM.Settings.SettingRelation import RelationType
+from UM.Signal import Signal
+
+import cura.Settings.CuraContainerStack
+from cura.Settings.ExtruderManager import ExtruderManager
+
+container_indexes = cura.Settings.CuraContainerStack._ContainerIndexes
+
+
+##  Creates a container with the given setting values. Setting properties on it
+#   emits propertyChanged, like instance containers do.
+def createContainer(container_type, values = None, properties = None):
+    all_properties = {}
+    for key, value in (values or {}).items():
+        all_properties[(key, "value")] = value
+    all_properties.update(properties or {})
+
+    container = unittest.mock.MagicMock()
+    container.getId = unittest.mock.MagicMock(return_value = "{type}_{id}".format(type = container_type, id = id(container)))
+    container.getMetaDataEntry = lambda entry, default = None: container_type if entry == "type" else default
+    container.getProperty = unittest.mock.MagicMock(side_effect = lambda key, property_name, context = None: all_properties.get((key, property_name)))
+    container.hasProperty = lambda key, property_name: (key, property_name) in all_properties
+    container.getAllKeys = lambda: {key for key, _ in all_properties}
+    container.propertyChanged = Signal()
+
+    def setProperty(key, property_name, value, *args, **kwargs):
+        all_properties[(key, property_name)] = value
+        container.propertyChanged.emit(key, property_name)
+    container.setProperty = setProperty
+    return container
+
+
+##  Creates a definition with settings that are settable per extruder, where
+#   wall_thickness depends on layer_height.
+def createDefinition():
+    values = {
+        "layer_height": 0.1,
+        "wall_thickness": SettingFunction("layer_height * 2"),
+        "infill_line_distance": 1,
+        "material_print_temperature": 200,
+        "machine_disallowed_areas": []
+    }
+    properties = {(key, "settable_per_extruder"): True for key in values}
+    properties[("material_print_temperature", "limit_to_extruder")] = "0"
+    definition = createContainer("definition", values, properties)
+
+    dependents = {"layer_height": ["wall_thickness"]}
+    def findDefinitions(key):
+        setting_definition = unittest.mock.MagicMock()
+        setting_definition.relations = []
+        for dependent in dependents.get(key, []):
+            relation = unittest.mock.MagicMock()
+            relation.type = RelationType.RequiredByTarget
+            relation.target.key = dependent
+            setting_definition.relations.append(relation)
+        return [setting_definition] if key in values else []
+    definition.findDefinitions = findDefinitions
+    return definition
+
+
+@pytest.fixture()
+def machine(global_stack, extruder_stack):
+    global_stack._containers[container_indexes.Definition] = createDefinition()
+    for index, container_type in container_indexes.IndexTypeMap.items():
+        if index not in (container_indexes.Definition, container_indexes.DefinitionChanges):
+            global_stack._containers[index] = createContainer(container_type)
+            extruder_stack._containers[index] = createContainer(container_type)
+    extruder_definition = createContainer("definition")
+    extruder_definition.findDefinitions = lambda key: []
+    extruder_stack._containers[container_indexes.Definition] = extruder_definition
+
+    # ExtruderStack.setNextStack calls registerExtruder for backward compatibility, but we do not need a complete extruder manager
+    ExtruderManager._ExtruderManager__instance = unittest.mock.MagicMock()
+    extruder_stack.setMetaDataEntry("position", "0")
+    extruder_stack.setNextStack(global_stack)
+    return global_stack, extruder_stack
+
+
+def test_cachedResult(machine):
+    global_stack, _ = machine
+    assert global_stack.getProperty("layer_height", "value") == 0.1
+    call_count = global_stack.definition.getProperty.call_count
+
+    assert global_stack.getProperty("layer_height", "value") == 0.1
+
+    assert global_stack.definition.getProperty.call_count == call_count  # From the cache.
+
+
+def test_contextSkipsCache(machine):
+    global_stack, _ = machine
+    global_stack.getProperty("layer_height", "value")
+    call_count = global_stack.definition.getProperty.call_count
+
+    assert global_stack.getProperty("layer_height", "value", PropertyEvaluationContext()) == 0.1
+
+    assert global_stack.definition.getProperty.call_count > call_count
+
+
+def test_mutableResultNotCached(machine):
+    global_stack, _ = machine
+    global_stack.getProperty("machine_disallowed_areas", "value").append([[0, 0], [1, 0], [1, 1]])  # Changing the result of one call must not affect the next.
+
+    assert "machine_disallowed_areas" not in global_stack._property_cache
+
+
+def test_userChange(machine):
+    global_stack, _ = machine
+    assert global_stack.getProperty("layer_height", "value") == 0.1
+    assert global_stack.getProperty("wall_thickness", "value") == pytest.approx(0.2)
+
+    global_stack.userChanges.setProperty("layer_height", "value", 0.15)
+
+    assert global_stack.getProperty("layer_height", "value") == 0.15
+    assert global_stack.getProperty("wall_thickness", "value") == pytest.approx(0.3)  # Depends on the layer height through the definition.
+
+
+def test_qualityChangesFormula(machine):
+    global_stack, _ = machine
+    global_stack.qualityChanges.setProperty("infill_line_distance", "value", SettingFunction("layer_height * 10"))  # A relation that the definition doesn't know about.
+    assert global_stack.getProperty("infill_line_distance", "value") == pytest.approx(1)
+
+    global_stack.userChanges.setProperty("layer_height", "value", 0.2)
+
+    assert global_stack.getProperty("infill_line_distance", "value") == pytest.approx(2)
+
+
+def test_qualityChangesChange(machine):
+    global_stack, _ = machine
+    assert global_stack.getProperty("layer_height", "value") == 0.1
+
+    global_stack.qualityChanges.setProperty("layer_height", "value", 0.3)
+
+    assert global_stack.getProperty("layer_height", "value") == 0.3
+
+
+def test_replaceQualityChanges(machine):
+    global_stack, _ = machine
+    assert global_stack.getProperty("layer_height", "value") == 0.1
+
+    global_stack.qualityChanges = createContainer("quality_changes", {"layer_height": 0.06})
+
+    assert global_stack.getProperty("layer_height", "value") == 0.06
+    global_stack.qualityChanges.setProperty("layer_height", "value", 0.08)  # The new container is watched too.
+    assert global_stack.getProperty("layer_height", "value") == 0.08
+
+
+def test_globalChangeInExtruder(machine):
+    global_stack, extruder_stack = machine
+    assert extruder_stack.getProperty("wall_thickness", "value") == pytest.approx(0.2)
+
+    global_stack.userChanges.setProperty("layer_height", "value", 0.2)
+
+    assert extruder_stack.getProperty("wall_thickness", "value") == pytest.approx(0.4)
+
+
+def test_extruderChangeInGlobal(machine):
+    global_stack, extruder_stack = machine
+    assert global_stack.getProperty("material_print_temperature", "value") == 200  # Limited to the extruder.
+
+    extruder_stack.userChanges.setProperty("material_print_temperature", "value", 210)
+
+    assert global_stack.getProperty("material_print_temperature", "value") == 210
+    assert extruder_stack.getProperty("material_print_temperature", "value") == 210
+
+
+def test_extruderEnabled(machine):
+    global_stack, extruder_stack = machine
+    global_stack.getProperty("layer_height", "value")
+    extruder_stack.getProperty("layer_height", "value")
+
+    extruder_stack.setEnabled(False)  # Changes the extruders that extruderValues() looks at.
+
+    assert global_stack._property_cache == {}
+    assert extruder_stack._property_cache == {}
@@ -0,0 +1,148 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import configparser
+import io
+import os
+
+import pytest
+
+from cura.Settings.VersionUpgradePipeline import VersionUpgradePipeline
+
+
+def _getVersion(serialised):
+    parser = configparser.ConfigParser(interpolation = None)
+    parser.read_string(serialised)
+    return int(parser["general"]["version"])
+
+
+def _makeUpgrade(new_version):
+    def upgrade(serialised, filename):
+        parser = configparser.ConfigParser(interpolation = None)
+        parser.read_string(serialised)
+        parser["general"]["version"] = str(new_version)
+        parser["general"]["steps"] = parser["general"].get("steps", "") + str(new_version)
+        result = io.StringIO()
+        parser.write(result)
+        return [filename], [result.getvalue()]
+    return upgrade
+
+
+def _splitUpgrade(serialised, filename):
+    return [filename, filename + "_extra"], [serialised.replace("version = 2", "version = 3"), serialised.replace("version = 2", "version = 3")]
+
+
+class _UpgradeWithSideEffects:
+    HasSideEffects = True
+
+    def upgrade(self, serialised, filename):
+        return [filename], [serialised]
+
+
+@pytest.fixture
+def pipeline(tmpdir):
+    upgrades = {
+        ("user", 1): ("user", 2, _makeUpgrade(2)),
+        ("user", 2): ("user", 3, _makeUpgrade(3)),
+        ("user", 3): ("user", 4, _makeUpgrade(4)),
+    }
+    sources = {"user": {"get_version": _getVersion, "location": {"./user"}}}
+    return VersionUpgradePipeline(upgrades, sources, {"user": ".inst.cfg"}, os.path.join(str(tmpdir), "journal"))
+
+
+def _writeFile(directory, name, version):
+    os.makedirs(directory, exist_ok = True)
+    with open(os.path.join(directory, name), "w") as f:
+        f.write("[general]\nversion = {version}\n".format(version = version))
+
+
+def _readFile(path):
+    parser = configparser.ConfigParser(interpolation = None)
+    with open(path) as f:
+        parser.read_string(f.read())
+    return parser
+
+
+def test_getChainComposesSteps(pipeline):
+    chain = pipeline.getChain("user", 1)
+    assert chain.final_type == "user"
+    assert chain.final_version == 4
+    assert len(chain.functions) == 3
+
+    assert len(pipeline.getChain("user", 3).functions) == 1
+    assert pipeline.getChain("user", 4) is None  # Already up to date.
+
+
+def test_getChainSideEffects(tmpdir):
+    upgrades = {
+        ("user", 1): ("user", 2, _UpgradeWithSideEffects().upgrade),
+        ("user", 2): ("user", 3, _makeUpgrade(3)),
+    }
+    pipeline = VersionUpgradePipeline(upgrades, {}, {}, str(tmpdir))
+    assert pipeline.getChain("user", 1) is None  # Left for Uranium's version upgrade manager.
+    assert pipeline.getChain("user", 2) is not None
+
+
+def test_upgrade(tmpdir, pipeline):
+    user_directory = os.path.join(str(tmpdir), "user")
+    _writeFile(user_directory, "old.inst.cfg", 1)
+    _writeFile(user_directory, "newer.inst.cfg", 3)
+    _writeFile(user_directory, "current.inst.cfg", 4)
+
+    assert pipeline.upgrade([str(tmpdir)]) == 2
+
+    upgraded = _readFile(os.path.join(user_directory, "old.inst.cfg"))
+    assert upgraded["general"]["version"] == "4"
+    assert upgraded["general"]["steps"] == "234"  # Went through every intermediate version.
+    assert _readFile(os.path.join(user_directory, "newer.inst.cfg"))["general"]["steps"] == "4"
+    assert "steps" not in _readFile(os.path.join(user_directory, "current.inst.cfg"))["general"]
+
+    # The originals are kept as backup.
+    assert os.path.exists(os.path.join(str(tmpdir), "old", "1", "user", "old.inst.cfg"))
+    assert os.path.exists(os.path.join(str(tmpdir), "old", "3", "user", "newer.inst.cfg"))
+    assert not os.listdir(os.path.join(str(tmpdir), "journal"))
+
+
+def test_upgradeSplitsFiles(tmpdir):
+    upgrades = {
+        ("user", 2): ("user", 3, _splitUpgrade),
+        ("user", 3): ("user", 4, _makeUpgrade(4)),
+    }
+    sources = {"user": {"get_version": _getVersion, "location": {"./user"}}}
+    pipeline = VersionUpgradePipeline(upgrades, sources, {"user": ".inst.cfg"}, os.path.join(str(tmpdir), "journal"))
+    user_directory = os.path.join(str(tmpdir), "user")
+    _writeFile(user_directory, "split.inst.cfg", 2)
+
+    pipeline.upgrade([str(tmpdir)])
+
+    assert _readFile(os.path.join(user_directory, "split.inst.cfg"))["general"]["version"] == "4"
+    assert _readFile(os.path.join(user_directory, "split_extra.inst.cfg"))["general"]["version"] == "4"
+
+
+##  A result recorded by an interrupted run is used instead of upgrading the
+#   file again.
+def test_upgradeResumesFromJournal(tmpdir, pipeline):
+    user_directory = os.path.join(str(tmpdir), "user")
+    _writeFile(user_directory, "old.inst.cfg", 1)
+    source_file = pipeline._findSourceFiles([str(tmpdir)])[0]
+    from cura.Settings.VersionUpgradePipeline import _UpgradeResult
+    absolute_path = os.path.join(user_directory, "old.inst.cfg")
+    pipeline._writeJournalEntry(source_file, _UpgradeResult(absolute_path, 1, "user", [("old", "[general]\nversion = 4\nsteps = journal\n")]))
+
+    assert pipeline.upgrade([str(tmpdir)]) == 1
+
+    assert _readFile(absolute_path)["general"]["steps"] == "journal"
+
+
+##  Upgraded files stay in the location of the original, also if the type has
+#   multiple locations.
+def test_upgradeKeepsLocation(tmpdir):
+    upgrades = {("user", 3): ("user", 4, _makeUpgrade(4))}
+    sources = {"user": {"get_version": _getVersion, "location": {"./user", "./materials"}}}
+    pipeline = VersionUpgradePipeline(upgrades, sources, {"user": ".inst.cfg"}, os.path.join(str(tmpdir), "journal"))
+    _writeFile(os.path.join(str(tmpdir), "user"), "in_user.inst.cfg", 3)
+
+    pipeline.upgrade([str(tmpdir)])
+
+    assert _readFile(os.path.join(str(tmpdir), "user", "in_user.inst.cfg"))["general"]["version"] == "4"
+    assert not os.path.exists(os.path.join(str(tmpdir), "materials", "in_user.inst.cfg"))
@@ -0,0 +1,179 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import unittest.mock
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cura.AutoSave import AutoSave
+from cura.Utils.BackgroundFileWriter import BackgroundFileWriter
+
+
+def createContainer(container_id, path = "", dirty = True):
+    container = MagicMock()
+    container.getId = MagicMock(return_value = container_id)
+    container.getPath = MagicMock(return_value = path)
+    container.isDirty = MagicMock(return_value = dirty)
+    container.getMetaDataEntry = MagicMock(return_value = False)
+    container.serialize = MagicMock(return_value = "serialized " + container_id)
+    return container
+
+
+@pytest.fixture
+def container_registry():
+    registry = MagicMock()
+    registry.isReadOnly = MagicMock(return_value = False)
+    return registry
+
+
+@pytest.fixture
+def auto_save(application, container_registry):
+    application.getPreferences().getValue = MagicMock(return_value = 10000)
+    application.getGlobalContainerStack = MagicMock(return_value = None)
+    application.getSaveDataEnabled = MagicMock(return_value = True)
+    application.started = True
+    with patch("UM.Settings.ContainerRegistry.ContainerRegistry.getInstance", MagicMock(return_value = container_registry)):
+        result = AutoSave(application)
+        result._writer = MagicMock()
+        yield result
+
+
+def test_onlyDirtyContainersAreSaved(auto_save, container_registry):
+    dirty_container = createContainer("dirty", path = "/dirty.inst.cfg")
+    clean_container = createContainer("clean", path = "/clean.inst.cfg", dirty = False)
+    auto_save._onContainerChanged(dirty_container)
+    auto_save._onContainerChanged(clean_container)
+
+    auto_save._onTimeout()
+
+    auto_save._writer.write.assert_called_once_with("/dirty.inst.cfg", "serialized dirty", on_error = unittest.mock.ANY)
+    dirty_container.setDirty.assert_called_once_with(False)
+    clean_container.serialize.assert_not_called()
+
+
+##  Machine and nozzle specific profiles of a material are saved in the file of
+#   their base material, once per autosave.
+def test_materialSubProfilesSaveBaseFile(auto_save, container_registry):
+    base_material = createContainer("pla", path = "/pla.xml.fdm_material", dirty = False)
+    sub_profiles = [createContainer("pla_" + nozzle, path = "/pla.xml.fdm_material") for nozzle in ("0.4", "0.8")]
+    for sub_profile in sub_profiles:
+        sub_profile.getMetaDataEntry = MagicMock(side_effect = lambda key, default = None: "pla" if key == "base_file" else default)
+        sub_profile.serialize = MagicMock(side_effect = NotImplementedError("Saved as part of the base material."))
+        auto_save._onContainerChanged(sub_profile)
+    container_registry.findContainers = MagicMock(side_effect = lambda id: [base_material] if id == "pla" else [])
+
+    auto_save._onTimeout()
+
+    auto_save._writer.write.assert_called_once_with("/pla.xml.fdm_material", "serialized pla", on_error = unittest.mock.ANY)
+    for sub_profile in sub_profiles:
+        sub_profile.setDirty.assert_called_once_with(False)
+
+
+##  If writing a file fails, its container is dirty again and gets saved again
+#   on the next autosave.
+def test_failedWriteIsRetried(auto_save, application):
+    container = createContainer("container", path = "/container.inst.cfg")
+    auto_save._onContainerChanged(container)
+    auto_save._onTimeout()
+
+    on_error = auto_save._writer.write.call_args[1]["on_error"]
+    on_error()  # Called by the writer on its own thread.
+    application.callLater.assert_called_once_with(auto_save._onWriteFailed, container)
+    auto_save._onWriteFailed(container)  # Then on the Qt thread.
+
+    container.setDirty.assert_called_with(True)
+    auto_save._onTimeout()
+    assert container.serialize.call_count == 2
+
+
+##  A change to only the user changes of an extruder gets saved too.
+def test_extruderChangeIsSaved(auto_save, application):
+    extruder_user_changes = createContainer("extruder_user", path = "/extruder_user.inst.cfg", dirty = False)
+    extruder = createContainer("extruder", path = "/extruder.extruder.cfg", dirty = False)
+    extruder.getContainers = MagicMock(return_value = [extruder_user_changes])
+    global_stack = createContainer("global", path = "/global.global.cfg", dirty = False)
+    global_stack.getContainers = MagicMock(return_value = [])
+    global_stack.extruders = {"0": extruder}
+    application.getGlobalContainerStack = MagicMock(return_value = global_stack)
+    auto_save._onGlobalStackChanged()
+    auto_save._onTimeout()
+
+    extruder_user_changes.isDirty = MagicMock(return_value = True)
+    extruder.propertyChanged.connect.call_args[0][0]("infill_sparse_density", "value")  # Emitted by the extruder only.
+    auto_save._onTimeout()
+
+    auto_save._writer.write.assert_called_once_with("/extruder_user.inst.cfg", "serialized extruder_user", on_error = unittest.mock.ANY)
+
+
+def test_changesAreCoalesced(auto_save):
+    container = createContainer("container", path = "/container.inst.cfg")
+    for _ in range(100):
+        auto_save._onContainerChanged(container)
+
+    auto_save._onTimeout()
+    auto_save._onTimeout()  # Nothing changed since the previous save.
+
+    assert container.serialize.call_count == 1
+
+
+def test_newContainersGoThroughRegistry(auto_save, container_registry):
+    container = createContainer("new")  # Never saved, so it has no path yet.
+    auto_save._onContainerChanged(container)
+
+    auto_save._onTimeout()
+
+    container_registry.saveContainer.assert_called_once_with(container)
+    auto_save._writer.write.assert_not_called()
+
+
+def test_removedContainersAreNotSaved(auto_save):
+    container = createContainer("removed", path = "/removed.inst.cfg")
+    auto_save._onContainerChanged(container)
+    auto_save._onContainerRemoved(container)
+
+    auto_save._onTimeout()
+
+    container.serialize.assert_not_called()
+
+
+def test_nothingSavedWhenSavingDisabled(auto_save, application):
+    application.getSaveDataEnabled = MagicMock(return_value = False)
+    container = createContainer("container", path = "/container.inst.cfg")
+    auto_save._onContainerChanged(container)
+    auto_save._preferences_changed = True
+
+    auto_save._onTimeout()
+
+    container.serialize.assert_not_called()
+    application.savePreferences.assert_not_called()
+
+
+def test_exitFlushesWrites(auto_save, application):
+    auto_save._onApplicationExit()
+
+    auto_save._writer.flush.assert_called_once_with()
+    application.triggerNextExitCheck.assert_called_once_with()
+
+
+def test_backgroundFileWriter(tmpdir):
+    writer = BackgroundFileWriter()
+    path = os.path.join(str(tmpdir), "file.cfg")
+    writer.write(path, "first")
+    writer.write(path, "second")
+
+    assert writer.flush(timeout = 10)
+    assert not writer.isBusy()
+    with open(path) as f:
+        assert f.read() == "second"
+
+
+def test_backgroundFileWriterError(tmpdir):
+    writer = BackgroundFileWriter()
+    on_error = MagicMock()
+    with patch("cura.Utils.BackgroundFileWriter.SaveFile", MagicMock(side_effect = OSError("The disk is full!"))):
+        writer.write(os.path.join(str(tmpdir), "file.cfg"), "data", on_error = on_error)
+        assert writer.flush(timeout = 10)
+
+    on_error.assert_called_once_with()
@@ -0,0 +1,123 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cura.BuildVolume import BuildVolume
+
+global_settings = {
+    "machine_width": 200,
+    "machine_depth": 200,
+    "machine_center_is_zero": False,
+    "machine_disallowed_areas": [[[-10, -10], [10, -10], [10, 10], [-10, 10]]],
+    "prime_tower_size": 20,
+    "prime_tower_circular": False,
+    "prime_tower_position_x": 150,
+    "prime_tower_position_y": 150
+}
+
+resolved_settings = {
+    "prime_tower_enable": True,
+    "prime_tower_brim_enable": False,
+    "adhesion_type": "skirt"
+}
+
+
+def createExtruder(extruder_id: str):
+    extruder_settings = {
+        "machine_nozzle_offset_x": 0,
+        "machine_nozzle_offset_y": 0,
+        "prime_blob_enable": True,
+        "extruder_prime_pos_x": 10,
+        "extruder_prime_pos_y": 20,
+        "nozzle_disallowed_areas": [],
+        "brim_line_count": 10,
+        "skirt_brim_line_width": 0.4,
+        "initial_layer_line_width_factor": 100
+    }
+    extruder = MagicMock(name = extruder_id)
+    extruder.getId = MagicMock(return_value = extruder_id)
+    extruder.isEnabled = True
+    extruder.settings = extruder_settings
+    extruder.getProperty = MagicMock(side_effect = lambda key, property_name: extruder_settings[key])
+    return extruder
+
+
+@pytest.fixture
+def extruders():
+    return [createExtruder("left"), createExtruder("right")]
+
+
+@pytest.fixture
+def build_volume(application, extruders):
+    global_stack = MagicMock(name = "global_stack")
+    global_stack.getProperty = MagicMock(side_effect = lambda key, property_name: global_settings[key])
+    global_stack.getMetaDataEntry = MagicMock(return_value = True)
+
+    extruder_manager = MagicMock(name = "extruder_manager")
+    extruder_manager.getUsedExtruderStacks = MagicMock(return_value = extruders)
+    extruder_manager.getActiveExtruderStacks = MagicMock(return_value = extruders)
+    extruder_manager.getResolveOrValue = MagicMock(side_effect = lambda key: resolved_settings[key])
+
+    with patch("cura.BuildVolume.Message"), patch("cura.BuildVolume.Platform"):
+        result = BuildVolume(application)
+    result._global_container_stack = global_stack
+    result.getEdgeDisallowedSize = MagicMock(return_value = 3)
+    with patch("cura.Settings.ExtruderManager.ExtruderManager.getInstance", MagicMock(return_value = extruder_manager)):
+        yield result
+
+
+def test_updateDisallowedAreas(build_volume):
+    build_volume._updateDisallowedAreas()
+
+    # Machine disallowed area, borders around the edge, a prime blob for each extruder and the prime tower.
+    assert len(build_volume.getDisallowedAreas()) == 2 * (1 + 4 + 1 + 1)
+    assert not build_volume.hasErrors()
+
+
+def test_stagesOnlyRecomputeWhenInputsChange(build_volume, extruders):
+    build_volume._computeDisallowedAreasStatic = MagicMock(wraps = build_volume._computeDisallowedAreasStatic)
+    build_volume._computeDisallowedAreasPrimeBlob = MagicMock(wraps = build_volume._computeDisallowedAreasPrimeBlob)
+    build_volume._computeDisallowedAreasPrinted = MagicMock(wraps = build_volume._computeDisallowedAreasPrinted)
+    build_volume._updateDisallowedAreas()
+    assert build_volume._computeDisallowedAreasStatic.call_count == 2  # With and without border.
+    assert build_volume._computeDisallowedAreasPrimeBlob.call_count == 1
+    assert build_volume._computeDisallowedAreasPrinted.call_count == 1
+    disallowed_areas = build_volume.getDisallowedAreas()
+    disallowed_areas_no_brim = build_volume.getDisallowedAreasNoBrim()
+
+    # Nothing changed, so nothing gets computed and the result is the very same.
+    build_volume._updateDisallowedAreas()
+    assert build_volume._computeDisallowedAreasStatic.call_count == 2
+    assert build_volume._computeDisallowedAreasPrimeBlob.call_count == 1
+    assert build_volume._computeDisallowedAreasPrinted.call_count == 1
+    assert build_volume.getDisallowedAreas() is disallowed_areas
+    assert build_volume.getDisallowedAreasNoBrim() is disallowed_areas_no_brim
+
+    # Moving the prime position only affects the prime blobs.
+    extruders[1].settings["extruder_prime_pos_x"] = 30
+    build_volume._updateDisallowedAreas()
+    assert build_volume._computeDisallowedAreasStatic.call_count == 2
+    assert build_volume._computeDisallowedAreasPrimeBlob.call_count == 2
+    assert build_volume._computeDisallowedAreasPrinted.call_count == 1
+    assert build_volume.getDisallowedAreas() is not disallowed_areas
+
+    # A different border affects the areas with border, but not the ones without.
+    build_volume.getEdgeDisallowedSize = MagicMock(return_value = 5)
+    build_volume._updateDisallowedAreas()
+    assert build_volume._computeDisallowedAreasStatic.call_count == 3
+    assert build_volume._computeDisallowedAreasPrimeBlob.call_count == 3
+    assert build_volume._computeDisallowedAreasPrinted.call_count == 1
+
+
+def test_stagesAreNotModified(build_volume, extruders):
+    extruders[0].settings["nozzle_disallowed_areas"] = [[[50, 50], [60, 50], [60, 60], [50, 60]]]
+    build_volume._updateDisallowedAreas()
+    area_count = len(build_volume.getDisallowedAreas())
+
+    # Combining them again (here because the nozzle disallowed areas changed) may not add to the areas of the stages.
+    extruders[0].settings["nozzle_disallowed_areas"] = [[[50, 50], [70, 50], [70, 70], [50, 70]]]
+    build_volume._updateDisallowedAreas()
+    assert len(build_volume.getDisallowedAreas()) == area_count
@@ -0,0 +1,121 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock, patch
+
+import numpy
+
+from UM.Mesh.MeshBuilder import MeshBuilder
+
+from cura.Scene.ConvexHullBatch import ConvexHullBatch
+
+
+def createMesh(offset: float):
+    builder = MeshBuilder()
+    builder.addConvexPolygon(numpy.array([[0, 0], [10, 0], [10, 10], [0, 10]], dtype = numpy.float32) + offset, 0.1)
+    return builder.build()
+
+
+def createTriangleMesh(offset: float):
+    builder = MeshBuilder()
+    builder.addConvexPolygon(numpy.array([[0, 0], [10, 0], [10, 10]], dtype = numpy.float32) + offset, 0.1)
+    return builder.build()
+
+
+def getPackedVertices(hull_nodes):
+    meshes = []
+    for hull_node in hull_nodes:
+        meshes.append(hull_node.getMeshData())
+        if hull_node.getConvexHullHeadMesh():
+            meshes.append(hull_node.getConvexHullHeadMesh())
+    return numpy.concatenate([mesh.getVertices()[mesh.getIndices().ravel()] if mesh.hasIndices() else mesh.getVertices() for mesh in meshes])
+
+
+def createHullNode(offset: float, head_mesh = None, rendered = True):
+    hull_node = MagicMock()
+    hull_node.shouldBeRendered = MagicMock(return_value = rendered)
+    hull_node.getMeshData = MagicMock(return_value = createMesh(offset))
+    hull_node.getConvexHullHeadMesh = MagicMock(return_value = head_mesh)
+    return hull_node
+
+
+def test_renderInOneCall():
+    hull_nodes = [createHullNode(0), createHullNode(20, head_mesh = createMesh(19)), createHullNode(40, rendered = False)]
+    renderer = MagicMock()
+
+    ConvexHullBatch().render(renderer, hull_nodes)
+
+    assert renderer.queueNode.call_count == 1
+    mesh = renderer.queueNode.call_args[1]["mesh"]
+    expected_vertices = numpy.concatenate([hull_nodes[0].getMeshData().getVertices(), hull_nodes[1].getMeshData().getVertices(), hull_nodes[1].getConvexHullHeadMesh().getVertices()])
+    assert numpy.array_equal(mesh.getVertices(), expected_vertices)
+
+
+##  The shader lights the hulls, so they need their normals.
+def test_packNormals():
+    hull_nodes = [createHullNode(0), createHullNode(20, head_mesh = createMesh(19))]
+    renderer = MagicMock()
+
+    ConvexHullBatch().render(renderer, hull_nodes)
+
+    mesh = renderer.queueNode.call_args[1]["mesh"]
+    source_meshes = [hull_nodes[0].getMeshData(), hull_nodes[1].getMeshData(), hull_nodes[1].getConvexHullHeadMesh()]
+    assert all(source_mesh.hasNormals() for source_mesh in source_meshes)
+    expected_normals = numpy.concatenate([source_mesh.getNormals() for source_mesh in source_meshes])
+    assert mesh.hasNormals()
+    assert numpy.array_equal(mesh.getNormals(), expected_normals)
+
+
+def test_reuseMesh():
+    hull_nodes = [createHullNode(0), createHullNode(20)]
+    renderer = MagicMock()
+    batch = ConvexHullBatch()
+
+    batch.render(renderer, hull_nodes)
+    batch.render(renderer, hull_nodes)
+    first_mesh = renderer.queueNode.call_args_list[0][1]["mesh"]
+    assert renderer.queueNode.call_args_list[1][1]["mesh"] is first_mesh  # Nothing changed, so the same mesh is drawn again.
+
+    hull_nodes[1].getMeshData.return_value = createMesh(30)  # The hull of the second node was recomputed.
+    batch.render(renderer, hull_nodes)
+    assert renderer.queueNode.call_args_list[2][1]["mesh"] is not first_mesh
+
+
+##  Dragging an object changes its hull every frame. Only that hull gets
+#   written into the packed mesh then.
+def test_updateChangedHull():
+    hull_nodes = [createHullNode(0), createHullNode(20, head_mesh = createMesh(19)), createHullNode(40)]
+    renderer = MagicMock()
+    batch = ConvexHullBatch()
+    batch.render(renderer, hull_nodes)
+
+    hull_nodes[1].getMeshData.return_value = createMesh(25)
+    with patch.object(batch, "_packMeshes") as pack_meshes:
+        batch.render(renderer, hull_nodes)
+    pack_meshes.assert_not_called()
+
+    mesh = renderer.queueNode.call_args[1]["mesh"]
+    assert numpy.array_equal(mesh.getVertices(), getPackedVertices(hull_nodes))
+    assert mesh.hasNormals()
+    assert len(mesh.getNormals()) == len(mesh.getVertices())
+
+
+##  If the new hull has a different shape, everything after it moves, so it's
+#   all packed again.
+def test_repackChangedVertexCount():
+    hull_nodes = [createHullNode(0), createHullNode(20), createHullNode(40)]
+    renderer = MagicMock()
+    batch = ConvexHullBatch()
+    batch.render(renderer, hull_nodes)
+
+    hull_nodes[1].getMeshData.return_value = createTriangleMesh(20)
+    batch.render(renderer, hull_nodes)
+
+    mesh = renderer.queueNode.call_args[1]["mesh"]
+    assert numpy.array_equal(mesh.getVertices(), getPackedVertices(hull_nodes))
+
+
+def test_nothingToRender():
+    renderer = MagicMock()
+    ConvexHullBatch().render(renderer, [createHullNode(0, rendered = False)])
+    renderer.queueNode.assert_not_called()
@@ -0,0 +1,262 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from UM.Scene.SceneNode import SceneNode
+from UM.Signal import Signal
+
+from cura.Settings.ExtruderManager import ExtruderManager
+
+_node_count = 500
+_support_values = {"support_enable": False, "support_bottom_enable": False, "support_roof_enable": False}
+
+
+##  Creates a container that emits propertyChanged.
+def createContainer(container_id):
+    container = MagicMock(name = container_id)
+    container.propertyChanged = Signal()
+    return container
+
+
+##  Creates a stack with the given setting values. When a setting is changed,
+#   its user changes emit propertyChanged right away. Like a real container
+#   stack, the stack itself doesn't emit it right away.
+def createStack(stack_id, values):
+    stack = MagicMock(name = stack_id)
+    stack.getId = MagicMock(return_value = stack_id)
+    stack.id = stack_id
+    stack.values = dict(values)
+    stack.getProperty = MagicMock(side_effect = lambda key, property_name, context = None: stack.values.get(key) if property_name == "value" else None)
+    stack.propertyChanged = Signal()
+    stack.containersChanged = Signal()
+    stack.userChanges = createContainer(stack_id + "_user")
+    stack.getContainers = MagicMock(side_effect = lambda: [stack.userChanges])
+
+    def setValue(key, value):
+        stack.values[key] = value
+        stack.userChanges.propertyChanged.emit(key, "value")
+    stack.setValue = setValue
+    return stack
+
+
+def createGlobalStack(stack_id = "global"):
+    global_stack = createStack(stack_id, {
+        "wall_0_extruder_nr": -1,
+        "wall_x_extruder_nr": -1,
+        "roofing_extruder_nr": -1,
+        "top_bottom_extruder_nr": -1,
+        "infill_extruder_nr": -1,
+        "support_infill_extruder_nr": 1,
+        "support_extruder_nr_layer_0": 1,
+        "support_bottom_extruder_nr": 1,
+        "support_roof_extruder_nr": 1,
+        "adhesion_type": "none",
+        "adhesion_extruder_nr": 2,
+        "prime_tower_brim_enable": False
+    })
+    global_stack.extruders = {str(position): createStack("{machine}_extruder_{position}".format(machine = stack_id, position = position), _support_values) for position in range(3)}
+    global_stack.extrudersChanged = Signal()
+    return global_stack
+
+
+##  Creates a printable node, optionally with per-object settings.
+def createNode(active_extruder = None, per_object_values = None):
+    node = SceneNode()
+    node.setSelectable(True)
+    node.decorations = {
+        "getActiveExtruder": active_extruder,
+        "getActiveExtruderChangedSignal": Signal(),
+        "getStack": createStack("per_object", dict(_support_values, **per_object_values)) if per_object_values is not None else None
+    }
+    node.callDecoration = MagicMock(side_effect = lambda function, *args, **kwargs: node.decorations.get(function))
+    return node
+
+
+##  A scene of 500 nodes that all print with the first extruder.
+@pytest.fixture()
+def scene_root():
+    root = SceneNode()
+    for _ in range(_node_count):
+        root.addChild(createNode())
+    return root
+
+
+@pytest.fixture()
+def extruder_manager(application, scene_root):
+    global_stack = createGlobalStack()
+    application.getGlobalContainerStack = MagicMock(return_value = global_stack)
+    application.getController().getScene().getRoot = MagicMock(return_value = scene_root)
+    application.getMachineManager().extruderChanged = Signal()
+    application.getMachineManager().defaultExtruderPosition = "0"
+
+    container_registry = MagicMock()
+    container_registry.findContainerStacks = MagicMock(side_effect = lambda id: [stack for stack in [application.getGlobalContainerStack()] + list(application.getGlobalContainerStack().extruders.values()) if stack.getId() == id])
+
+    ExtruderManager._ExtruderManager__instance = None
+    with patch("cura.CuraApplication.CuraApplication.getInstance", MagicMock(return_value = application)):
+        manager = ExtruderManager()
+    with patch("UM.Settings.ContainerRegistry.ContainerRegistry.getInstance", MagicMock(return_value = container_registry)):
+        yield manager
+    ExtruderManager._ExtruderManager__instance = None
+
+
+def getUsedExtruderIds(extruder_manager):
+    return sorted(stack.getId() for stack in extruder_manager.getUsedExtruderStacks())
+
+
+##  Counts the setting values that were asked from the stacks of the machine
+#   and of the nodes.
+def countPropertyCalls(application, scene_root):
+    global_stack = application.getGlobalContainerStack()
+    stacks = [global_stack] + list(global_stack.extruders.values())
+    stacks += [node.decorations["getStack"] for node in scene_root.getChildren() if node.decorations["getStack"] is not None]
+    return sum(stack.getProperty.call_count for stack in stacks)
+
+
+def test_cachedCallCost(extruder_manager, application, scene_root):
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0"]
+    first_call_cost = countPropertyCalls(application, scene_root)
+    assert first_call_cost >= _node_count * 8  # Support and limit to extruder settings for every node.
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0"]
+
+    assert countPropertyCalls(application, scene_root) == first_call_cost  # Nothing is evaluated again.
+
+
+def test_resultIsCopy(extruder_manager):
+    extruder_manager.getUsedExtruderStacks().clear()
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0"]
+
+
+def test_nodeAdded(extruder_manager, scene_root):
+    getUsedExtruderIds(extruder_manager)
+
+    scene_root.addChild(createNode(active_extruder = "global_extruder_1"))
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_1"]
+
+
+def test_nodeAddedToGroup(extruder_manager, scene_root):
+    group = scene_root.getChildren()[0]
+    getUsedExtruderIds(extruder_manager)
+
+    group.addChild(createNode(active_extruder = "global_extruder_1"))
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_1"]
+
+
+def test_nodeRemoved(extruder_manager, scene_root):
+    node = createNode(active_extruder = "global_extruder_1")
+    scene_root.addChild(node)
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_1"]
+
+    scene_root.removeChild(node)
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0"]
+    node.decorations["getActiveExtruderChangedSignal"].emit()  # No longer in the scene, so no longer listened to.
+    assert extruder_manager._used_extruder_stacks is not None
+
+
+def test_decoratorsChanged(extruder_manager, scene_root):
+    node = scene_root.getChildren()[0]
+    getUsedExtruderIds(extruder_manager)
+
+    node.decorations["getStack"] = createStack("per_object", dict(_support_values, support_enable = True))  # Like adding per-object settings.
+    node.decorations["getActiveExtruder"] = "global_extruder_0"
+    node.decoratorsChanged.emit(node)
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_1"]  # With support.
+    node.decorations["getStack"].setValue("support_enable", False)  # The new per-object stack is listened to.
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0"]
+
+
+def test_perObjectSettingChanged(extruder_manager, scene_root):
+    node = createNode(active_extruder = "global_extruder_0", per_object_values = {"support_enable": False})
+    scene_root.addChild(node)
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0"]
+
+    node.decorations["getStack"].setValue("support_enable", True)
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_1"]
+
+
+def test_perObjectActiveExtruderChanged(extruder_manager, scene_root):
+    node = scene_root.getChildren()[0]
+    getUsedExtruderIds(extruder_manager)
+
+    node.decorations["getActiveExtruder"] = "global_extruder_2"
+    node.decorations["getActiveExtruderChangedSignal"].emit()
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_2"]
+
+
+def test_globalSettingChanged(extruder_manager, application):
+    getUsedExtruderIds(extruder_manager)
+
+    application.getGlobalContainerStack().setValue("adhesion_type", "brim")
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_2"]
+
+
+def test_extruderSettingChanged(extruder_manager, application):
+    getUsedExtruderIds(extruder_manager)
+
+    application.getGlobalContainerStack().extruders["0"].setValue("support_enable", True)
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_1"]
+
+
+def test_extruderContainersChanged(extruder_manager, application):
+    getUsedExtruderIds(extruder_manager)
+
+    extruder_stack = application.getGlobalContainerStack().extruders["0"]
+    extruder_stack.values["support_enable"] = True  # Like a different quality profile.
+    extruder_stack.containersChanged.emit(MagicMock())
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_1"]
+
+
+##  After the containers of a stack changed, the new containers are listened
+#   to.
+def test_newContainersListenedTo(extruder_manager, application):
+    getUsedExtruderIds(extruder_manager)
+
+    extruder_stack = application.getGlobalContainerStack().extruders["0"]
+    old_user_changes = extruder_stack.userChanges
+    extruder_stack.userChanges = createContainer("new_user")
+    extruder_stack.containersChanged.emit(extruder_stack.userChanges)
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0"]
+
+    extruder_stack.setValue("support_enable", True)
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_1"]
+
+    old_user_changes.propertyChanged.emit("support_enable", "value")  # No longer listened to.
+    assert extruder_manager._used_extruder_stacks is not None
+
+
+def test_defaultExtruderChanged(extruder_manager, application):
+    global_stack = application.getGlobalContainerStack()
+    global_stack.values["adhesion_type"] = "brim"
+    global_stack.values["adhesion_extruder_nr"] = -1  # Uses the default extruder.
+    extruder_manager.clearUsedExtruderStacks()
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0"]
+
+    application.getMachineManager().defaultExtruderPosition = "1"
+    application.getMachineManager().extruderChanged.emit()
+
+    assert getUsedExtruderIds(extruder_manager) == ["global_extruder_0", "global_extruder_1"]
+
+
+def test_globalStackChanged(extruder_manager, application):
+    getUsedExtruderIds(extruder_manager)
+    old_global_stack = application.getGlobalContainerStack()
+
+    application.getGlobalContainerStack = MagicMock(return_value = createGlobalStack("other"))  # Like switching to a different printer.
+
+    assert getUsedExtruderIds(extruder_manager) == ["other_extruder_0"]
+    old_global_stack.setValue("adhesion_type", "brim")  # No longer listened to.
+    assert extruder_manager._used_extruder_stacks is not None
@@ -0,0 +1,96 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock
+
+import numpy
+import pytest
+
+from cura.Layer import Layer
+from cura.LayerPolygon import LayerPolygon
+from cura.LayerStatistics import LayerStatistics
+
+
+def createPolygon(random, line_count, zero_thickness = False):
+    polygon = MagicMock()
+    polygon.types = random.randint(0, LayerPolygon.getNumberOfTypes(), size = (line_count, 1)).astype(numpy.uint8)
+    polygon.lineFeedrates = random.uniform(10, 150, size = (line_count, 1)).astype(numpy.float32)
+    polygon.lineThicknesses = random.uniform(0.1, 0.3, size = (line_count, 1)).astype(numpy.float32)
+    travels = numpy.logical_or(polygon.types == LayerPolygon.MoveCombingType, polygon.types == LayerPolygon.MoveRetractionType)
+    polygon.lineThicknesses[travels] = 0  # Like g-code files have.
+    if zero_thickness:
+        polygon.lineThicknesses[:] = 0
+    return polygon
+
+
+def createLayers(seed, layer_count = 30):
+    random = numpy.random.RandomState(seed)
+    layers = {}
+    for layer_number in range(-3, layer_count - 3):
+        layer = Layer(layer_number)
+        if layer_number != 10:  # An empty layer, like above an infill mesh.
+            for _ in range(random.randint(1, 5)):
+                layer.polygons.append(createPolygon(random, random.randint(1, 50)))
+        layers[layer_number] = layer
+    return layers
+
+
+##  How SimulationView used to find the ranges, going through every polygon.
+def scanRanges(layers, min_layer = -numpy.inf, max_layer = numpy.inf, line_types = None):
+    feedrates = []
+    thicknesses = []
+    for layer_number, layer in layers.items():
+        if not min_layer <= layer_number <= max_layer:
+            continue
+        for polygon in layer.polygons:
+            mask = numpy.ones(len(polygon.types), dtype = bool) if line_types is None else numpy.isin(polygon.types.ravel(), line_types)
+            feedrates.append(polygon.lineFeedrates.ravel()[mask])
+            thicknesses.append(polygon.lineThicknesses.ravel()[mask])
+    feedrates = numpy.concatenate(feedrates)
+    thicknesses = numpy.concatenate(thicknesses)
+    if len(feedrates) == 0:
+        return None, None
+    nonzero_thicknesses = thicknesses[thicknesses != 0]
+    min_thickness = float(nonzero_thicknesses.min()) if len(nonzero_thicknesses) else numpy.inf
+    return (float(feedrates.min()), float(feedrates.max())), (min_thickness, float(thicknesses.max()))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fullRange(seed):
+    layers = createLayers(seed)
+    statistics = LayerStatistics.fromLayers(layers)
+
+    feedrate_range, thickness_range = scanRanges(layers)
+    assert statistics.getFeedrateRange() == feedrate_range
+    assert statistics.getThicknessRange() == thickness_range
+    assert statistics.getLayerNumbers() == [layer_number for layer_number in sorted(layers) if layers[layer_number].polygons]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_partialRange(seed):
+    layers = createLayers(seed)
+    statistics = LayerStatistics.fromLayers(layers)
+    random = numpy.random.RandomState(seed + 100)
+
+    for _ in range(20):
+        min_layer, max_layer = sorted(random.randint(-5, 30, size = 2))
+        line_types = list(random.choice(LayerPolygon.getNumberOfTypes(), size = random.randint(1, 4), replace = False))
+        feedrate_range, thickness_range = scanRanges(layers, min_layer, max_layer, line_types)
+        assert statistics.getFeedrateRange(min_layer, max_layer, line_types) == feedrate_range
+        assert statistics.getThicknessRange(min_layer, max_layer, line_types) == thickness_range
+
+
+def test_allThicknessesZero():
+    layer = Layer(0)
+    layer.polygons.append(createPolygon(numpy.random.RandomState(1), 20, zero_thickness = True))
+    statistics = LayerStatistics.fromLayers({0: layer})
+
+    assert statistics.getThicknessRange() == (numpy.inf, 0)
+
+
+def test_noLayers():
+    statistics = LayerStatistics.fromLayers({0: Layer(0)})
+
+    assert statistics.getLayerNumbers() == []
+    assert statistics.getFeedrateRange() is None
+    assert statistics.getThicknessRange(min_layer = 0, line_types = [1]) is None
@@ -0,0 +1,44 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import unittest.mock
+
+from cura.ReaderWriters.LazyMeshReader import LazyMeshReader
+from cura.ReaderWriters.LazyProfileReader import LazyProfileReader
+
+
+def test_acceptsFileWithoutActivating():
+    create_reader = unittest.mock.MagicMock()
+    reader = LazyMeshReader([{"extension": "x3d", "description": "X3D File"}], create_reader)
+
+    assert reader.acceptsFile("model.x3d")
+    assert not reader.acceptsFile("model.stl")
+    create_reader.assert_not_called()
+    assert not reader.isActivated()
+
+
+def test_activatesOnFirstRead():
+    actual_reader = unittest.mock.MagicMock()
+    create_reader = unittest.mock.MagicMock(return_value = actual_reader)
+    reader = LazyMeshReader([{"extension": "x3d", "description": "X3D File"}], create_reader)
+    reader.setPluginId("X3DReader")
+
+    reader.read("model.x3d")
+    reader.read("other_model.x3d")
+
+    create_reader.assert_called_once_with()  # Only created once.
+    actual_reader.setPluginId.assert_called_once_with("X3DReader")
+    assert actual_reader.read.call_count == 2
+    assert reader.isActivated()
+
+
+def test_profileReaderActivatesOnFirstRead():
+    actual_reader = unittest.mock.MagicMock()
+    create_reader = unittest.mock.MagicMock(return_value = actual_reader)
+    reader = LazyProfileReader(create_reader)
+    create_reader.assert_not_called()
+
+    reader.read("profile.ini")
+
+    create_reader.assert_called_once_with()
+    actual_reader.read.assert_called_once_with("profile.ini")
@@ -0,0 +1,146 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from UM.Scene.SceneNode import SceneNode
+
+from cura.UI.ObjectsModel import ObjectsModel
+
+
+##  A scene of mocked nodes, which the objects model walks through instead of
+#   the real scene.
+class FakeScene:
+    def __init__(self) -> None:
+        self.root = MagicMock(spec = SceneNode)
+        self.root.getParent = MagicMock(return_value = None)
+        self.root.getMeshData = MagicMock(return_value = None)
+        self.root.callDecoration = MagicMock(return_value = None)
+        self.nodes = []
+        self.root.getChildren = MagicMock(side_effect = lambda: self.nodes)
+
+    def addNode(self, name: str, build_plate_number: int = 0) -> SceneNode:
+        node = MagicMock(spec = SceneNode)
+        node.getName = MagicMock(return_value = name)
+        node.setName = MagicMock(side_effect = lambda new_name: node.getName.configure_mock(return_value = new_name))
+        node.getParent = MagicMock(return_value = self.root)
+        node.getChildren = MagicMock(return_value = [])
+        node.getMeshData = MagicMock(return_value = MagicMock())
+        node.decorations = {"isSliceable": True, "isGroup": False, "getBuildPlateNumber": build_plate_number}
+        node.callDecoration = MagicMock(side_effect = lambda decoration: node.decorations.get(decoration))
+        self.nodes.append(node)
+        return node
+
+    def iterate(self, root):
+        return [self.root] + self.nodes
+
+
+@pytest.fixture
+def scene():
+    return FakeScene()
+
+
+@pytest.fixture
+def objects_model(application, scene):
+    application.getPreferences().getValue = MagicMock(return_value = False)
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value = application)), \
+            patch("cura.UI.ObjectsModel.DepthFirstIterator", scene.iterate):
+        model = ObjectsModel()
+        model._update_timer = MagicMock()
+        yield model
+
+
+def test_update(objects_model, scene):
+    scene.addNode("b")
+    scene.addNode("a")
+    scene.addNode("a")
+    objects_model._update()
+
+    assert [item["name"] for item in objects_model.items] == ["a", "a(1)", "b"]
+
+
+def test_addAndRemove(objects_model, scene):
+    scene.addNode("a")
+    scene.addNode("c")
+    objects_model._update()
+
+    node = scene.addNode("b")
+    objects_model._updateSceneDelayed(scene.root)
+    assert objects_model._update_timer.start.call_count == 1
+
+    objects_model.setItems = MagicMock()
+    objects_model.insertItem = MagicMock(wraps = objects_model.insertItem)
+    objects_model._update()
+    objects_model.insertItem.assert_called_once_with(1, objects_model.getItem(1))
+    assert objects_model.getItem(1)["node"] is node
+
+    scene.nodes.remove(node)
+    objects_model.removeItem = MagicMock(wraps = objects_model.removeItem)
+    objects_model._update()
+    objects_model.removeItem.assert_called_once_with(1)
+    assert [item["name"] for item in objects_model.items] == ["a", "c"]
+    objects_model.setItems.assert_not_called()
+
+
+def test_transformationChangeIgnored(objects_model, scene):
+    node = scene.addNode("a")
+    objects_model._update()
+
+    for _ in range(10):  # Dragging the node around.
+        objects_model._updateSceneDelayed(node)
+    objects_model._update_timer.start.assert_not_called()
+
+    node.setName("b")
+    objects_model._updateSceneDelayed(node)
+    objects_model._update_timer.start.assert_called_once_with()
+
+
+def test_buildPlateChanged(objects_model, scene):
+    scene.addNode("a")
+    node = scene.addNode("b")
+    objects_model._update()
+
+    node.decorations["getBuildPlateNumber"] = 1
+    objects_model._updateSceneDelayed(node)
+    objects_model._update_timer.start.assert_called_once_with()
+
+    objects_model.setProperty = MagicMock(wraps = objects_model.setProperty)
+    objects_model._update()
+    objects_model.setProperty.assert_called_once_with(1, "buildPlateNumber", 1)
+    assert objects_model.getItem(1)["buildPlateNumber"] == 1
+
+
+##  The build volume marks a node as outside of the build area after the last
+#   scene change of a drag.
+def test_outsideBuildAreaChanged(objects_model, scene):
+    node = scene.addNode("a")
+    node.isOutsideBuildArea = MagicMock(return_value = False)
+    node.outsideBuildAreaChanged = MagicMock()
+    objects_model._update()
+    node.outsideBuildAreaChanged.connect.assert_called_once_with(objects_model._updateDelayed)
+
+    objects_model._updateSceneDelayed(node)  # The last scene change of the drag.
+    objects_model._update_timer.start.assert_not_called()
+    node.isOutsideBuildArea = MagicMock(return_value = True)
+    node.outsideBuildAreaChanged.connect.call_args[0][0](node)  # Emitted by the node after the build volume checked it.
+    objects_model._update_timer.start.assert_called_once_with()
+
+    objects_model._update()
+    assert objects_model.getItem(0)["isOutsideBuildArea"]
+
+    scene.nodes.remove(node)
+    objects_model._update()
+    node.outsideBuildAreaChanged.disconnect.assert_called_once_with(objects_model._updateDelayed)
+
+
+def test_rename(objects_model, scene):
+    node = scene.addNode("a")
+    scene.addNode("b")
+    objects_model._update()
+
+    node.setName("c")
+    objects_model._update()
+
+    assert [item["name"] for item in objects_model.items] == ["b", "c"]
@@ -0,0 +1,116 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import random
+from unittest.mock import MagicMock, patch
+
+import numpy
+import pytest
+
+from UM.Math.AxisAlignedBox import AxisAlignedBox
+from UM.Math.Polygon import Polygon
+from UM.Math.Vector import Vector
+from UM.Scene.SceneNode import SceneNode
+
+from cura.OneAtATimeIterator import OneAtATimeIterator
+
+
+def createNode(x: float, y: float, size: float, head_size: float) -> SceneNode:
+    node = SceneNode()
+    hull = Polygon(numpy.array([[x, y], [x + size, y], [x + size, y + size], [x, y + size]], dtype = numpy.float32))
+    head_hull = Polygon(numpy.array([[x - head_size, y - head_size], [x + size + head_size, y - head_size], [x + size + head_size, y + size + head_size], [x - head_size, y + size + head_size]], dtype = numpy.float32))
+    decorations = {"getConvexHull": hull, "getConvexHullHead": head_hull}
+    node.callDecoration = MagicMock(side_effect = lambda decoration: decorations.get(decoration))
+    node.getBoundingBox = MagicMock(return_value = AxisAlignedBox(minimum = Vector(x, 0, y), maximum = Vector(x + size, 10, y + size)))
+    return node
+
+
+def createIterator(nodes, head_coordinates):
+    root = SceneNode()
+    root.getChildren = MagicMock(return_value = nodes)
+
+    extruder = MagicMock(isEnabled = True)
+    extruder.getProperty = MagicMock(return_value = 0)
+    global_stack = MagicMock()
+    global_stack.extruders = {"0": extruder}
+    global_stack.getHeadAndFansCoordinates = MagicMock(return_value = head_coordinates)
+    global_stack.getProperty = MagicMock(side_effect = lambda key, property_name: {"machine_width": 200, "machine_depth": 200}[key])
+
+    application = MagicMock()
+    application.getGlobalContainerStack = MagicMock(return_value = global_stack)
+    with patch("cura.CuraApplication.CuraApplication.getInstance", MagicMock(return_value = application)):
+        return OneAtATimeIterator(root)
+
+
+##  The order as it was determined before: compare every pair, then sort by the flipped bounds.
+def referenceOrder(nodes, transform_x, transform_y):
+    for node in nodes:
+        bounding_box = node.getBoundingBox()
+        box = Polygon([[bounding_box.left, bounding_box.front], [bounding_box.left, bounding_box.back], [bounding_box.right, bounding_box.back], [bounding_box.right, bounding_box.front]])
+        for other_node in nodes:
+            if other_node is not node and box.intersectsPolygon(other_node.callDecoration("getConvexHullHead")):
+                return []
+
+    keys = []
+    for node in nodes:
+        points = node.callDecoration("getConvexHull").getPoints()
+        min_x = 200 - float(points[:, 0].max()) if transform_x < 0 else float(points[:, 0].min())
+        min_y = 200 - float(points[:, 1].max()) if transform_y < 0 else float(points[:, 1].min())
+        keys.append([min_x, min_y])
+    return [node for _, node in sorted(zip(keys, nodes), key = lambda pair: pair[0])]
+
+
+@pytest.mark.parametrize("head_coordinates, transform_x, transform_y", [
+    ([[-20, 10], [10, 10], [10, -10], [-20, -10]], -1, 1),  # The head is mostly left of the nozzle, so start at the right.
+    ([[-10, 20], [30, 20], [30, -10], [-10, -10]], 1, -1),
+    ([[-10, 5], [30, 5], [30, -20], [-10, -20]], 1, 1)
+])
+@pytest.mark.parametrize("seed", range(5))
+def test_orderParity(head_coordinates, transform_x, transform_y, seed):
+    OneAtATimeIterator._cached_order = (None, [])
+    random.seed(seed)
+    nodes = [createNode(x = (index % 8) * 25 + random.uniform(0, 5), y = (index // 8) * 25 + random.uniform(0, 5), size = 10, head_size = random.uniform(0, 5)) for index in range(60)]
+
+    iterator = createIterator(nodes, head_coordinates)
+    iterator._fillStack()
+
+    assert len(iterator._node_stack) == len(nodes)
+    assert iterator._node_stack == referenceOrder(nodes, transform_x, transform_y)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_collisionParity(seed):
+    OneAtATimeIterator._cached_order = (None, [])
+    random.seed(seed)
+    nodes = [createNode(x = random.uniform(0, 190), y = random.uniform(0, 190), size = 10, head_size = random.uniform(0, 3)) for _ in range(8)]  # Some of these collide, some don't.
+
+    iterator = createIterator(nodes, [[-20, 10], [10, 10], [10, -10], [-20, -10]])
+    iterator._fillStack()
+
+    assert iterator._node_stack == referenceOrder(nodes, -1, 1)
+
+
+def test_collision():
+    OneAtATimeIterator._cached_order = (None, [])
+    nodes = [createNode(0, 0, 10, 2), createNode(11, 0, 10, 2)]  # The head of one hits the other.
+    iterator = createIterator(nodes, [[-20, 10], [10, 10], [10, -10], [-20, -10]])
+    iterator._fillStack()
+    assert iterator._node_stack == []
+
+
+def test_cachedOrder():
+    OneAtATimeIterator._cached_order = (None, [])
+    nodes = [createNode(0, 0, 10, 2), createNode(50, 0, 10, 2)]
+    head_coordinates = [[-20, 10], [10, 10], [10, -10], [-20, -10]]
+    iterator = createIterator(nodes, head_coordinates)
+    iterator._fillStack()
+
+    iterator._hasCollisions = MagicMock()
+    iterator._fillStack()  # Nothing changed.
+    iterator._hasCollisions.assert_not_called()
+
+    moved_node = createNode(100, 0, 10, 2)
+    nodes[1].callDecoration = moved_node.callDecoration
+    nodes[1].getBoundingBox = moved_node.getBoundingBox
+    iterator._fillStack()
+    iterator._hasCollisions.assert_called_once()  # The node moved, so the order is computed again.
@@ -0,0 +1,104 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import importlib.util
+import os
+import random
+
+import pytest
+
+from cura.GCodeAnalysis.PlannerSimulator import PlannerSimulator
+
+
+##  Loads scripts/check_gcode_buffer.py, which the simulator must agree with.
+def loadScript():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "check_gcode_buffer.py")
+    spec = importlib.util.spec_from_file_location("check_gcode_buffer", path)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+    return script
+
+
+##  Creates g-code that looks somewhat like sliced g-code: short and long
+#   extrusions and travels at various speeds, retractions, layer changes and
+#   some commands that don't move.
+def createGCode(seed, layer_count = 20, moves_per_layer = 200):
+    random.seed(seed)
+    lines = [";FLAVOR:Griffin\n", "M82\n", "G28\n", "M104 S200\n", ""]
+    x, y, e = 100.0, 100.0, 0.0
+    for layer_number in range(layer_count):
+        lines.append(";LAYER:{layer_number}\n".format(layer_number = layer_number))
+        lines.append("G0 F9000 Z{z:.2f}\n".format(z = 0.3 + 0.2 * layer_number))
+        for _ in range(moves_per_layer):
+            choice = random.random()
+            length = random.choice([0.05, 0.3, 2.0, 15.0, 80.0]) * random.random()
+            x = min(max(x + random.uniform(-1, 1) * length, 0), 200)
+            y = min(max(y + random.uniform(-1, 1) * length, 0), 200)
+            if choice < 0.2:
+                lines.append("G0 F{feedrate} X{x:.3f} Y{y:.3f}\n".format(feedrate = random.choice([6000, 9000]), x = x, y = y))
+            elif choice < 0.25:
+                lines.append("G10\n" if random.random() < 0.5 else "G11\n")
+            elif choice < 0.28:
+                e -= 6.5
+                lines.append("G1 F2700 E{e:.5f}\n".format(e = e))
+                e += 6.5
+                lines.append("G1 F2700 E{e:.5f} ; Prime again.\n".format(e = e))
+            elif choice < 0.3:
+                lines.append("M106 S255\n")
+            elif choice < 0.31:  # A curve made of many tiny segments, which the printer can't be sent fast enough.
+                for _ in range(40):
+                    x, y, e = x + 0.05, y + 0.02, e + 0.002
+                    lines.append("G1 X{x:.3f} Y{y:.3f} E{e:.5f}\n".format(x = x, y = y, e = e))
+            else:
+                e += length * 0.03
+                lines.append("G1 F{feedrate} X{x:.3f} Y{y:.3f} E{e:.5f}\n".format(feedrate = random.choice([1500, 1800, 2400, 3600, 4800]), x = x, y = y, e = e))
+    lines.append("M107\n")
+    return lines
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_parity(seed):
+    lines = createGCode(seed)
+    script = loadScript()
+    script.buf = script.CommandBuffer(lines)  # The script reads its buffer from this global.
+    script.buf.process()
+
+    result = PlannerSimulator().simulate(lines)
+
+    expected_times = [command.estimated_exec_time for command in script.buf._all_commands]
+    assert list(result.getCommandTimes()) == pytest.approx(expected_times, rel = 1e-6, abs = 1e-9)
+    assert result.getTotalTime() == pytest.approx(script.buf.total_time, rel = 1e-9)
+    expected_frames = [(frame["start_line"], frame["end_line"], frame["cmd_count"]) for frame in script.buf._bad_frame_ranges]
+    assert [(frame.start_command, frame.end_command, frame.command_count) for frame in result.getBadFrames()] == expected_frames
+    assert expected_frames  # Make sure that this tests finding them at all.
+
+
+def test_layerStatistics():
+    lines = createGCode(seed = 1337, layer_count = 5)
+    result = PlannerSimulator().simulate(lines)
+
+    assert sorted(result.getLayerTimes().keys()) == [0, 1, 2, 3, 4]
+    assert sum(result.getLayerTimes().values()) == pytest.approx(result.getTotalTime())  # There's no time before the first layer.
+    assert sum(result.getLayerBadFrameCounts().values()) == len(result.getBadFrames())
+    for frame in result.getBadFrames():
+        assert lines[frame.start_line].strip() and not lines[frame.start_line].startswith(";")
+
+
+def test_setPosition():
+    plain = PlannerSimulator().simulate(["G1 F1200 X10 E1\n", "G1 X20 E2\n"])
+    reset = PlannerSimulator().simulate(["G1 F1200 X10 E1\n", "G92 E0\n", "G1 X20 E1\n"])  # The same move, after resetting E.
+
+    assert list(reset.getCommandTimes()[[0, 2]]) == pytest.approx(list(plain.getCommandTimes()))
+    assert reset.getCommandTimes()[1] == 0
+
+
+def test_dwell():
+    result = PlannerSimulator().simulate(["G4 P1500\n", "G4 S2\n", "G4 P0\n"])
+    assert list(result.getCommandTimes()) == [1.5, 2, 0]
+
+
+def test_empty():
+    result = PlannerSimulator().simulate([";Nothing to do.\n", "\n"])
+    assert result.getTotalTime() == 0
+    assert result.getBadFrames() == []
+    assert result.getLayerTimes() == {}
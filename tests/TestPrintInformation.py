@@ -1,4 +1,7 @@
 import functools
+import json
+
+import pytest
 
 from UM.Qt.Duration import Duration
 from cura.UI import PrintInformation
@@ -148,4 +151,119 @@ def test_defineAbbreviatedMachineName():
     # Test not ultimaker printer, name suffix should have first letter from the printer name
     project_name = ["HelloWorld", ".3mf"]
     print_information.setProjectName(project_name[0] + project_name[1])
-    assert printer_name[0] + "_" + project_name[0] == print_information._job_name
\ No newline at end of file
+    assert printer_name[0] + "_" + project_name[0] == print_information._job_name
+
+##  Creates print information for a machine with two extruders, with a material
+#   with a GUID and a diameter of 2mm in each of them.
+def getMultiExtruderPrintInformation(build_plate_count, material_settings):
+    mock_application = MagicMock(name = "mock_application")
+    mock_application.getInstance = MagicMock(return_value = mock_application)
+    mocked_preferences = MagicMock(name = "mocked_preferences")
+    mocked_preferences.getValue = MagicMock(side_effect = lambda key: json.dumps(material_settings) if key == "cura/material_settings" else None)
+    mock_application.getPreferences = MagicMock(return_value = mocked_preferences)
+
+    global_container_stack = MagicMock()
+    global_container_stack.extruders = {"0": createExtruderStack("pla"), "1": createExtruderStack("pva")}
+    mock_application.getGlobalContainerStack = MagicMock(return_value = global_container_stack)
+
+    multi_build_plate_model = MagicMock()
+    multi_build_plate_model.maxBuildPlate = build_plate_count - 1
+    multi_build_plate_model.activeBuildPlate = 0
+    mock_application.getMultiBuildPlateModel = MagicMock(return_value = multi_build_plate_model)
+
+    return PrintInformation.PrintInformation(mock_application)
+
+
+def createExtruderStack(material_guid):
+    extruder_stack = MagicMock()
+    extruder_stack.getProperty = MagicMock(return_value = 2)  # The material diameter.
+    extruder_stack.getMetaDataEntry = MagicMock(return_value = {"density": 1, "weight": 1000})
+    extruder_stack.material = createMaterial(material_guid)
+    return extruder_stack
+
+
+def createMaterial(material_guid):
+    material = MagicMock()
+    material.getId = MagicMock(return_value = material_guid + "_material")
+    material.getMetaDataEntry = MagicMock(return_value = material_guid)
+    material.getName = MagicMock(return_value = material_guid.upper())
+    return material
+
+
+def test_materialCostsPerBuildPlate():
+    print_information = getMultiExtruderPrintInformation(3, {"pla": {"spool_weight": 1000, "spool_cost": 20}, "pva": {"spool_weight": 500, "spool_cost": 50}})
+
+    print_information._onPrintDurationMessage(0, {}, [1000])
+    print_information._onPrintDurationMessage(1, {}, [2000, 1000])
+    print_information._onPrintDurationMessage(2, {}, [0, 500])
+
+    # A gram per cm^3, so a gram per 1000mm^3 of material.
+    assert print_information._material_weights == {0: [1], 1: [2, 1], 2: [0, 0.5]}
+    assert print_information._material_costs == {0: [pytest.approx(0.02)], 1: [pytest.approx(0.04), pytest.approx(0.1)], 2: [0, pytest.approx(0.05)]}
+    assert print_information._material_names == {0: ["PLA"], 1: ["PLA", "PVA"], 2: ["PLA", "PVA"]}
+    assert print_information.materialCosts == [pytest.approx(0.02)]  # Of the active build plate.
+
+
+def test_spoolCostChanged():
+    material_settings = {"pla": {"spool_weight": 1000, "spool_cost": 20}, "pva": {"spool_weight": 500, "spool_cost": 50}}
+    print_information = getMultiExtruderPrintInformation(3, material_settings)
+    print_information._onPrintDurationMessage(0, {}, [1000])
+    print_information._onPrintDurationMessage(1, {}, [2000, 1000])
+    print_information._onPrintDurationMessage(2, {}, [0, 500])
+
+    material_settings["pva"]["spool_cost"] = 100
+    with patch.object(print_information, "_updateBuildPlateInformation", wraps = print_information._updateBuildPlateInformation) as update_build_plate:
+        print_information._onPreferencesChanged("cura/material_settings")
+
+    assert print_information._material_costs == {0: [pytest.approx(0.02)], 1: [pytest.approx(0.04), pytest.approx(0.2)], 2: [0, pytest.approx(0.1)]}
+    assert sorted(call[0][0] for call in update_build_plate.call_args_list) == [1, 2]  # The first build plate doesn't use PVA.
+
+
+def test_spoolCostUnchanged():
+    material_settings = {"pla": {"spool_weight": 1000, "spool_cost": 20}}
+    print_information = getMultiExtruderPrintInformation(2, material_settings)
+    print_information._onPrintDurationMessage(0, {}, [1000])
+    print_information._onPrintDurationMessage(1, {}, [2000, 1000])
+
+    material_settings["abs"] = {"spool_weight": 750, "spool_cost": 30}  # A material that isn't used.
+    with patch.object(print_information, "_updateBuildPlateInformation") as update_build_plate:
+        print_information._onPreferencesChanged("cura/material_settings")
+
+    update_build_plate.assert_not_called()
+
+
+def test_preferencesParsedOnce():
+    print_information = getMultiExtruderPrintInformation(50, {"pla": {"spool_weight": 1000, "spool_cost": 20}})
+    preferences = print_information._application.getPreferences()
+
+    for build_plate_number in range(50):
+        print_information._onPrintDurationMessage(build_plate_number, {}, [1000, 1000])
+
+    material_settings_reads = [call for call in preferences.getValue.call_args_list if call[0][0] == "cura/material_settings"]
+    assert len(material_settings_reads) == 1
+
+
+def test_materialChanged():
+    print_information = getMultiExtruderPrintInformation(3, {"pla": {"spool_weight": 1000, "spool_cost": 20}, "abs": {"spool_weight": 1000, "spool_cost": 40}})
+    print_information._onPrintDurationMessage(0, {}, [1000])
+    print_information._onPrintDurationMessage(1, {}, [2000, 1000])
+    print_information._onPrintDurationMessage(2, {}, [0, 500])
+
+    print_information._application.getGlobalContainerStack().extruders["1"].material = createMaterial("abs")
+    with patch.object(print_information, "_updateBuildPlateInformation", wraps = print_information._updateBuildPlateInformation) as update_build_plate:
+        print_information._onActiveMaterialsChanged()
+
+    assert print_information._material_names == {0: ["PLA"], 1: ["PLA", "ABS"], 2: ["PLA", "ABS"]}
+    assert print_information._material_costs == {0: [pytest.approx(0.02)], 1: [pytest.approx(0.04), pytest.approx(0.04)], 2: [0, pytest.approx(0.02)]}
+    assert sorted(call[0][0] for call in update_build_plate.call_args_list) == [1, 2]  # The first build plate only uses the first extruder.
+
+
+def test_materialUnchanged():
+    print_information = getMultiExtruderPrintInformation(3, {})
+    for build_plate_number in range(3):
+        print_information._onPrintDurationMessage(build_plate_number, {}, [1000, 1000])
+
+    with patch.object(print_information, "_emitMaterialInformationChanged") as emit_changed:
+        print_information._onActiveMaterialsChanged()  # Like when a material changed on a different printer.
+
+    emit_changed.assert_not_called()
@@ -0,0 +1,37 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks finding places for many objects on the build plate.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkArrange.py
+
+from cura.Arranging.Arrange import Arrange
+from cura.Arranging.ShapeArray import ShapeArray
+
+from SyntheticData import createOutlines
+
+_object_count = 100
+
+
+##  Places all objects one after the other, like arranging a scene does.
+#   \return The number of objects that fit.
+def _arrange(shape_arrays):
+    arranger = Arrange.create(fixed_nodes = [])
+    placed_count = 0
+    last_priority = 0
+    for hull_shape_arr, offset_shape_arr in shape_arrays:
+        best_spot = arranger.bestSpot(hull_shape_arr, start_prio = last_priority)
+        if best_spot.x is None:
+            continue
+        last_priority = best_spot.priority
+        arranger.place(best_spot.x, best_spot.y, offset_shape_arr)
+        placed_count += 1
+    return placed_count
+
+
+def test_arrangeObjects(benchmark):
+    shape_arrays = [(ShapeArray.fromPolygon(outline, scale = 0.5), ShapeArray.fromPolygon(outline * 1.3, scale = 0.5)) for outline in createOutlines(_object_count)]  # The offset shape includes the space between objects.
+
+    placed_count = benchmark(_arrange, setup = lambda: (shape_arrays, ), rounds = 3)
+
+    assert placed_count > 0
@@ -0,0 +1,44 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks computing the convex hulls of the objects in a scene.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkConvexHullDecorator.py
+
+from unittest.mock import MagicMock, patch
+
+from UM.Math.Matrix import Matrix
+from UM.Mesh.MeshData import MeshData
+
+from cura.Scene.ConvexHullDecorator import ConvexHullDecorator
+
+from SyntheticData import createMeshVertices
+
+_object_count = 100
+_triangles_per_object = 20000
+
+
+##  Creates a decorator for a node with a new mesh, so that nothing is cached.
+def _createDecorator(vertices, settings):
+    node = MagicMock()
+    node.getMeshData = MagicMock(return_value = MeshData(vertices = vertices))
+    node.getWorldTransformation = MagicMock(return_value = Matrix())
+    per_mesh_stack = MagicMock()
+    per_mesh_stack.getProperty = MagicMock(side_effect = lambda key, property_name: settings[key])
+    node.callDecoration = MagicMock(side_effect = {"isGroup": False, "getStack": per_mesh_stack}.get)
+
+    decorator = ConvexHullDecorator()
+    decorator._node = node  # Rather than setNode, which starts recomputing the hull later.
+    decorator._global_stack = MagicMock()
+    return decorator
+
+
+def test_compute2DConvexHull(benchmark):
+    meshes = [createMeshVertices(_triangles_per_object, seed = index) for index in range(_object_count)]
+    settings = {"xy_offset": 0.2, "xy_offset_layer_0": 0.0, "mold_enabled": False}
+
+    with patch("cura.CuraApplication.CuraApplication.getInstance", MagicMock(return_value = MagicMock())):
+        hulls = benchmark(lambda decorators: [decorator._compute2DConvexHull() for decorator in decorators],
+                          setup = lambda: ([_createDecorator(vertices, settings) for vertices in meshes], ), rounds = 3)
+
+    assert all(len(hull.getPoints()) >= 3 for hull in hulls)
@@ -0,0 +1,114 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks finding the extruders that are used by a scene of 500 nodes, which
+# the build volume and the slice job ask for many times after every change.
+# Once with the cached result, and once computing it again for every call.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkExtruderManager.py
+
+import unittest.mock
+
+import pytest
+
+from UM.Scene.SceneNode import SceneNode
+from UM.Signal import Signal
+
+from cura.Settings.ExtruderManager import ExtruderManager
+
+_node_count = 500
+_calls = 100  # Calls to getUsedExtruderStacks that are measured.
+
+
+class _Container:
+    def __init__(self) -> None:
+        self.propertyChanged = Signal()
+
+
+##  A stack with setting values, without the overhead of evaluating settings,
+#   so that the benchmark measures the extruder manager.
+class _Stack:
+    def __init__(self, stack_id, values) -> None:
+        self.id = stack_id
+        self._values = values
+        self._containers = [_Container(), _Container()]
+        self.propertyChanged = Signal()
+        self.containersChanged = Signal()
+        self.extrudersChanged = Signal()
+        self.extruders = {}
+
+    def getId(self):
+        return self.id
+
+    def getContainers(self):
+        return self._containers
+
+    def getProperty(self, key, property_name, context = None):
+        return self._values.get(key)
+
+
+def _createMachine():
+    global_stack = _Stack("global", {
+        "wall_0_extruder_nr": -1,
+        "wall_x_extruder_nr": -1,
+        "roofing_extruder_nr": -1,
+        "top_bottom_extruder_nr": -1,
+        "infill_extruder_nr": -1,
+        "support_infill_extruder_nr": 1,
+        "support_extruder_nr_layer_0": 1,
+        "adhesion_type": "brim",
+        "adhesion_extruder_nr": 0
+    })
+    global_stack.extruders = {str(position): _Stack("extruder_{position}".format(position = position), {"support_enable": position == 1, "support_bottom_enable": False, "support_roof_enable": False}) for position in range(2)}
+    return global_stack
+
+
+##  Nodes that print with either extruder.
+def _createScene():
+    root = SceneNode()
+    active_extruder_changed = Signal()
+    for index in range(_node_count):
+        node = SceneNode()
+        node.setSelectable(True)
+        decorations = {"getActiveExtruder": "extruder_{position}".format(position = index % 2), "getActiveExtruderChangedSignal": active_extruder_changed}
+        node.callDecoration = lambda function, *args, decorations = decorations, **kwargs: decorations.get(function)
+        root.addChild(node)
+    return root
+
+
+@pytest.fixture(scope = "module")
+def extruder_manager():
+    global_stack = _createMachine()
+    stacks_by_id = {stack.getId(): stack for stack in [global_stack] + list(global_stack.extruders.values())}
+    application = unittest.mock.MagicMock()
+    application.getGlobalContainerStack = unittest.mock.MagicMock(return_value = None)  # Not registering the extruders when creating the extruder manager.
+    application.getController().getScene().getRoot = unittest.mock.MagicMock(return_value = _createScene())
+    application.getMachineManager().extruderChanged = Signal()
+    container_registry = unittest.mock.MagicMock()
+    container_registry.findContainerStacks = lambda id: [stacks_by_id[id]]
+
+    ExtruderManager._ExtruderManager__instance = None
+    with unittest.mock.patch("cura.CuraApplication.CuraApplication.getInstance", unittest.mock.MagicMock(return_value = application)):
+        manager = ExtruderManager()
+    application.getGlobalContainerStack = unittest.mock.MagicMock(return_value = global_stack)
+    with unittest.mock.patch("UM.Settings.ContainerRegistry.ContainerRegistry.getInstance", unittest.mock.MagicMock(return_value = container_registry)):
+        yield manager
+    ExtruderManager._ExtruderManager__instance = None
+
+
+##  Asks for the used extruders after a change, so the first call computes them
+#   and the others get the cached result.
+def test_usedExtruderStacksCached(benchmark, extruder_manager):
+    def getUsedExtruderStacks():
+        for _ in range(_calls):
+            extruder_manager.getUsedExtruderStacks()
+    benchmark(getUsedExtruderStacks, setup = lambda: extruder_manager.clearUsedExtruderStacks() or ())
+
+
+##  Computes the used extruders for every call, like before they were cached.
+def test_usedExtruderStacksUncached(benchmark, extruder_manager):
+    def getUsedExtruderStacks():
+        for _ in range(_calls):
+            extruder_manager.clearUsedExtruderStacks()
+            extruder_manager.getUsedExtruderStacks()
+    benchmark(getUsedExtruderStacks)
@@ -0,0 +1,41 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks reading a large g-code file into layer data.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkFlavorParser.py
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "plugins", "GCodeReader"))
+
+from FlavorParser import FlavorParser
+from SyntheticData import createGCode
+
+_layer_count = 100
+_moves_per_layer = 5000
+
+
+def test_processGCodeStream(benchmark):
+    gcode = createGCode(_layer_count, _moves_per_layer)
+
+    application = MagicMock()
+    application.getPreferences().getValue = MagicMock(return_value = False)
+    application.getTheme().getColor().getRgbF = MagicMock(return_value = (0.5, 0.5, 0.5, 1.0))
+    extruder = MagicMock()
+    extruder.getProperty = MagicMock(return_value = 2.85)
+    application.getGlobalContainerStack().extruders = {"0": extruder}
+    application.getGlobalContainerStack().getProperty = MagicMock(return_value = True)
+    extruder_manager = MagicMock()
+    extruder_manager.getActiveExtruderStacks = MagicMock(return_value = [])
+
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value = application)), \
+            patch("cura.CuraApplication.CuraApplication.getInstance", MagicMock(return_value = application)), \
+            patch("FlavorParser.ExtruderManager.getInstance", MagicMock(return_value = extruder_manager)), \
+            patch("FlavorParser.Message", MagicMock()), \
+            patch("FlavorParser.CuraSceneNode", MagicMock()):
+        scene_node = benchmark(lambda parser: parser.processGCodeStream(gcode), setup = lambda: (FlavorParser(), ), rounds = 3)
+
+    assert scene_node is not None
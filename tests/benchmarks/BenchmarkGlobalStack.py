@@ -0,0 +1,109 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks evaluating all settings of a machine, as happens when the
+# settings are shown or a slice is started.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkGlobalStack.py
+
+import unittest.mock
+
+from UM.Settings.DefinitionContainer import DefinitionContainer
+from UM.Settings.InstanceContainer import InstanceContainer
+from UM.Settings.Interfaces import PropertyEvaluationContext
+
+import cura.Settings.CuraContainerStack
+from cura.CuraApplication import CuraApplication
+from cura.Settings.ExtruderManager import ExtruderManager
+from cura.Settings.ExtruderStack import ExtruderStack
+from cura.Settings.GlobalStack import GlobalStack
+
+from SyntheticData import createDefinition
+
+_setting_count = 2000
+
+
+_extruder_count = 2
+
+
+def _createDefinitionChanges(container_id):
+    # The definition changes can't be an empty container.
+    definition_changes = InstanceContainer(container_id = container_id)
+    definition_changes.setMetaDataEntry("type", "definition_changes")
+    definition_changes.getMetaData()["setting_version"] = CuraApplication.SettingVersion
+    return definition_changes
+
+
+def _createGlobalStack():
+    definition = DefinitionContainer(container_id = "BenchmarkDefinition")
+    definition.deserialize(createDefinition(_setting_count))
+
+    global_stack = GlobalStack("BenchmarkGlobalStack")
+    global_stack._containers[cura.Settings.CuraContainerStack._ContainerIndexes.DefinitionChanges] = _createDefinitionChanges("BenchmarkDefinitionChanges")
+    global_stack.definition = definition
+    return global_stack
+
+
+##  Creates a global stack with extruders. The extruders use the definition of
+#   the global stack too.
+def _createMachine():
+    global_stack = _createGlobalStack()
+    extruder_stacks = []
+    for position in range(_extruder_count):
+        extruder_stack = ExtruderStack("BenchmarkExtruderStack{position}".format(position = position))
+        extruder_stack._containers[cura.Settings.CuraContainerStack._ContainerIndexes.DefinitionChanges] = _createDefinitionChanges("BenchmarkExtruderDefinitionChanges{position}".format(position = position))
+        extruder_stack.definition = global_stack.definition
+        extruder_stack.setMetaDataEntry("position", str(position))
+        with unittest.mock.patch.object(ExtruderManager, "getInstance"):  # Registering the extruder needs an application otherwise.
+            extruder_stack.setNextStack(global_stack)
+        extruder_stacks.append(extruder_stack)
+    return global_stack, extruder_stacks
+
+
+##  Gets the settings like StartSliceJob does: the values of all settings of
+#   the global stack and the extruders, which of those to send per extruder, and
+#   which extruder the global settings are limited to.
+#   \param create_context Creates the evaluation context to pass for every
+#   setting.
+def _gatherSliceSettings(global_stack, extruder_stacks, keys, create_context):
+    result = {}
+    for stack in [global_stack] + extruder_stacks:
+        result[stack.getId()] = {key: stack.getProperty(key, "value", create_context()) for key in keys}
+    for stack in extruder_stacks:
+        for key in keys:
+            stack.getProperty(key, "settable_per_extruder", create_context())
+    for key in keys:
+        global_stack.getProperty(key, "limit_to_extruder", create_context())
+    return result
+
+
+def test_getPropertyAllSettings(benchmark):
+    global_stack = _createGlobalStack()
+    keys = ["setting_{index}".format(index = index) for index in range(_setting_count)]
+
+    values = benchmark(lambda: [global_stack.getProperty(key, "value") for key in keys], rounds = 5)
+
+    assert all(value is not None for value in values)
+
+
+##  Gathers the settings for a slice after changing one setting, as happens
+#   when slicing again after a change. Most results come from the cache.
+def test_startSliceJobSettingsCached(benchmark):
+    global_stack, extruder_stacks = _createMachine()
+    keys = ["setting_{index}".format(index = index) for index in range(_setting_count)]
+    _gatherSliceSettings(global_stack, extruder_stacks, keys, lambda: None)
+
+    def changeSetting():
+        global_stack.definitionChanges.propertyChanged.emit("setting_5", "value")  # Like after the setting changed.
+        return global_stack, extruder_stacks, keys, lambda: None
+
+    benchmark(_gatherSliceSettings, setup = changeSetting)
+
+
+##  Gathers the settings for a slice with an evaluation context, which isn't
+#   cached, so every setting is evaluated again like before the cache existed.
+def test_startSliceJobSettingsUncached(benchmark):
+    global_stack, extruder_stacks = _createMachine()
+    keys = ["setting_{index}".format(index = index) for index in range(_setting_count)]
+
+    benchmark(_gatherSliceSettings, setup = lambda: (global_stack, extruder_stacks, keys, PropertyEvaluationContext))
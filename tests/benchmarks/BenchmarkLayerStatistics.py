@@ -0,0 +1,75 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks finding the ranges of feedrates and line thicknesses for the
+# legend of the layer view: computing them once when the layer data is
+# created, answering queries afterwards, and scanning all polygons every time
+# like the layer view used to do.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkLayerStatistics.py
+
+import sys
+
+import numpy
+import pytest
+
+from cura.Layer import Layer
+from cura.LayerPolygon import LayerPolygon
+from cura.LayerStatistics import LayerStatistics
+
+_layer_count = 2000
+_polygons_per_layer = 20
+_lines_per_polygon = 250
+
+
+##  Has the line data of a LayerPolygon, without creating the colours and
+#   caches that the benchmarks don't need.
+class _Polygon:
+    def __init__(self, random: numpy.random.RandomState) -> None:
+        line_types = random.choice([LayerPolygon.Inset0Type, LayerPolygon.InsetXType, LayerPolygon.SkinType, LayerPolygon.InfillType, LayerPolygon.MoveCombingType], size = _lines_per_polygon)
+        self.types = numpy.repeat(line_types[::10], 10)[:_lines_per_polygon].reshape((-1, 1)).astype(numpy.uint8)
+        self.lineFeedrates = random.choice([30.0, 45.0, 60.0, 150.0], size = (_lines_per_polygon, 1)).astype(numpy.float32)
+        self.lineThicknesses = numpy.full((_lines_per_polygon, 1), 0.2, dtype = numpy.float32)
+
+
+@pytest.fixture(scope = "module")
+def layers():
+    random = numpy.random.RandomState(6)
+    result = {}
+    for layer_number in range(_layer_count):
+        layer = Layer(layer_number)
+        layer.polygons.extend(_Polygon(random) for _ in range(_polygons_per_layer))
+        result[layer_number] = layer
+    return result
+
+
+def test_computeStatistics(benchmark, layers):
+    benchmark(LayerStatistics.fromLayers, setup = lambda: (layers, ))
+
+
+def test_queryStatistics(benchmark, layers):
+    statistics = LayerStatistics.fromLayers(layers)
+
+    def query():
+        statistics.getFeedrateRange()
+        statistics.getThicknessRange()
+        statistics.getFeedrateRange(min_layer = _layer_count // 4, max_layer = _layer_count // 2, line_types = [LayerPolygon.SkinType, LayerPolygon.InfillType])
+    benchmark(query)
+
+
+##  Finds the ranges like SimulationView.calculateMaxLayers did, by going
+#   through all polygons after every slice.
+def test_scanPolygons(benchmark, layers):
+    def scan():
+        max_feedrate = sys.float_info.min
+        min_feedrate = sys.float_info.max
+        max_thickness = sys.float_info.min
+        min_thickness = sys.float_info.max
+        for layer in layers.values():
+            for p in layer.polygons:
+                max_feedrate = max(float(p.lineFeedrates.max()), max_feedrate)
+                min_feedrate = min(float(p.lineFeedrates.min()), min_feedrate)
+                max_thickness = max(float(p.lineThicknesses.max()), max_thickness)
+                min_thickness = min(float(p.lineThicknesses[numpy.nonzero(p.lineThicknesses)].min()), min_thickness)
+        return min_feedrate, max_feedrate, min_thickness, max_thickness
+    benchmark(scan)
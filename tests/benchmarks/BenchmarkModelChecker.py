@@ -0,0 +1,111 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks the model checker with 1000 models in the scene: loading them,
+# dragging one of them around and checking all of them, like the model checker
+# did after every change.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkModelChecker.py
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from UM.Scene.SceneNode import SceneNode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "plugins"))
+
+from ModelChecker.ModelChecker import ModelChecker
+
+_node_count = 1000
+_drag_events = 200  # Scene changes while dragging a model.
+
+
+##  A box with a size.
+class _BoundingBox:
+    def __init__(self, size) -> None:
+        self.width, self.depth, self.height = size
+
+
+##  A model without mesh data and without the overhead of mocks, so that the
+#   benchmark measures the model checker.
+class _Node(SceneNode):
+    def __init__(self, name, size, decorations, children = None) -> None:  # Not calling the constructor of SceneNode, which this doesn't need.
+        self._name = name
+        self._bounding_box = _BoundingBox(size)
+        self._decorations = decorations
+        self._children = children or []
+
+    def getName(self):
+        return self._name
+
+    def getChildren(self):
+        return self._children
+
+    def getBoundingBox(self):
+        return self._bounding_box
+
+    def callDecoration(self, function, *args, **kwargs):
+        return self._decorations.get(function)
+
+
+def _createNode(index):
+    size = (20 + index % 200, 20 + index % 150, 10 + index % 100)
+    return _Node("Model {index}".format(index = index), size, {"isSliceable": True, "getActiveExtruderPosition": str(index % 2)})
+
+
+@pytest.fixture(scope = "module")
+def scene():
+    nodes = [_createNode(index) for index in range(_node_count)]
+    return _Node("Root", (0, 0, 0), {}, nodes), nodes
+
+
+@pytest.fixture()
+def model_checker(scene):
+    root, _ = scene
+    application = MagicMock()
+    application.getController().getScene().getRoot = MagicMock(return_value = root)
+    extruders = {"0": MagicMock(), "1": MagicMock()}
+    extruders["0"].material.getProperty = MagicMock(return_value = 0.2)
+    extruders["1"].material.getProperty = MagicMock(return_value = 1.5)
+    application.getGlobalContainerStack().extruders = extruders
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value = application)):
+        model_checker = ModelChecker()
+        model_checker._change_timer = MagicMock()
+        yield model_checker
+
+
+##  Loads all models, each of which changes the scene, and then checks them.
+def test_loadNodes(benchmark, model_checker, scene):
+    root, nodes = scene
+    def loadNodes():
+        for node in nodes:
+            model_checker._onChanged(root)
+            model_checker._onChanged(node)
+        model_checker._checkObjects()
+    benchmark(loadNodes, setup = lambda: model_checker._node_results.clear() or ())
+
+
+##  Drags one model around after all models were checked.
+def test_dragNode(benchmark, model_checker, scene):
+    _, nodes = scene
+    model_checker._checkObjects()
+    def dragNode():
+        for _ in range(_drag_events):
+            model_checker._onChanged(nodes[0])
+        model_checker._checkObjects()
+    benchmark(dragNode)
+
+
+##  Checks all models again after every change while dragging, like the model
+#   checker did before it kept the results of the models.
+def test_dragNodeCheckingAll(benchmark, model_checker, scene):
+    _, nodes = scene
+    def dragNode():
+        for _ in range(_drag_events):
+            model_checker._node_results.clear()
+            model_checker._material_shrinkage = None
+            model_checker.checkObjectsForShrinkage()
+    benchmark(dragNode, rounds = 3)
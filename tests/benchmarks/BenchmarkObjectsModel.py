@@ -0,0 +1,69 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks the objects list while dragging objects around in a large scene.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkObjectsModel.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from UM.Scene.SceneNode import SceneNode
+
+from cura.UI.ObjectsModel import ObjectsModel
+
+_drag_events = 10000  # Number of scene changes caused by dragging, e.g. a few seconds of dragging a group of objects.
+
+
+def _createNode(root, index):
+    node = MagicMock(spec = SceneNode)
+    node.getName = MagicMock(return_value = "Object {index}".format(index = index))
+    node.getParent = MagicMock(return_value = root)
+    node.getChildren = MagicMock(return_value = [])
+    node.getMeshData = MagicMock(return_value = MagicMock())
+    decorations = {"isSliceable": True, "isGroup": False, "getBuildPlateNumber": 0}
+    node.callDecoration = MagicMock(side_effect = decorations.get)
+    return node
+
+
+##  An objects list of a scene with many objects, kept up to date.
+@pytest.fixture(params = [300, 1000])
+def scene(request):
+    root = MagicMock(spec = SceneNode)
+    root.getParent = MagicMock(return_value = None)
+    root.getMeshData = MagicMock(return_value = None)
+    root.callDecoration = MagicMock(return_value = None)
+    nodes = [_createNode(root, index) for index in range(request.param)]
+    root.getChildren = MagicMock(return_value = nodes)
+
+    application = MagicMock()
+    application.getPreferences().getValue = MagicMock(return_value = False)
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value = application)), \
+            patch("cura.UI.ObjectsModel.DepthFirstIterator", lambda node: [root] + nodes):
+        model = ObjectsModel()
+        model._update_timer = MagicMock()
+        model._update()
+        yield model, nodes
+
+
+def test_dragStorm(benchmark, scene):
+    model, nodes = scene
+
+    def drag():
+        for index in range(_drag_events):
+            model._updateSceneDelayed(nodes[index % 10])  # Dragging a selection of ten objects.
+    benchmark(drag)
+    assert model._update_timer.start.call_count == 0
+
+
+##  What every one of the drag events would eventually have caused before.
+def test_update(benchmark, scene):
+    model, _ = scene
+    benchmark(model._update)
+
+
+##  What every update did before: rebuild the whole list.
+def test_rebuildList(benchmark, scene):
+    model, _ = scene
+    benchmark(lambda: model.setItems(list(model.items)))
@@ -0,0 +1,66 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks simulating the planner on a large synthetic g-code file, and
+# compares it with scripts/check_gcode_buffer.py on a part of that file.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkPlannerSimulator.py
+
+import importlib.util
+import os
+import random
+
+from cura.GCodeAnalysis.PlannerSimulator import PlannerSimulator
+
+_move_count = 5000000
+_moves_per_layer = 5000
+_script_move_count = 50000  # The script takes too long for the complete file.
+
+
+##  Generates the lines of a g-code file with the given number of moves,
+#   without keeping them all in memory.
+def _generateGCode(move_count):
+    random.seed(42)
+    yield ";FLAVOR:Griffin\n"
+    yield "M82\n"
+    x, y, e = 100.0, 100.0, 0.0
+    for index in range(move_count):
+        if index % _moves_per_layer == 0:
+            layer_number = index // _moves_per_layer
+            yield ";LAYER:{layer_number}\n".format(layer_number = layer_number)
+            yield "G0 F9000 Z{z:.2f}\n".format(z = 0.3 + 0.1 * layer_number)
+            continue
+        length = random.choice([0.05, 0.5, 5.0, 40.0]) * random.random()
+        x = min(max(x + random.uniform(-1, 1) * length, 0), 200)
+        y = min(max(y + random.uniform(-1, 1) * length, 0), 200)
+        if index % 10 == 0:
+            yield "G0 F9000 X{x:.3f} Y{y:.3f}\n".format(x = x, y = y)
+        else:
+            e += length * 0.03
+            yield "G1 F{feedrate} X{x:.3f} Y{y:.3f} E{e:.5f}\n".format(feedrate = random.choice([1500, 2400, 3600]), x = x, y = y, e = e)
+
+
+def test_simulate(benchmark):
+    result = benchmark(lambda: PlannerSimulator().simulate(_generateGCode(_move_count)), rounds = 1)
+    assert len(result.getLayerTimes()) == _move_count // _moves_per_layer
+
+
+##  The simulator on the part of the file that the script can handle, to
+#   compare with test_checkGCodeBufferScript.
+def test_simulateScriptPart(benchmark):
+    lines = list(_generateGCode(_script_move_count))
+    result = benchmark(lambda: PlannerSimulator().simulate(lines))
+    assert len(result.getLayerTimes()) == _script_move_count // _moves_per_layer
+
+
+def test_checkGCodeBufferScript(benchmark):
+    lines = list(_generateGCode(_script_move_count))
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts", "check_gcode_buffer.py")
+    spec = importlib.util.spec_from_file_location("check_gcode_buffer", path)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+
+    def process():
+        script.buf = script.CommandBuffer(lines)
+        script.buf.process()
+    benchmark(process, rounds = 1)
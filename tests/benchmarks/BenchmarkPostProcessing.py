@@ -0,0 +1,79 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks running five post-processing scripts after each other on a
+# g-code file of a million lines: one script at a time on the complete g-code,
+# and with the pipeline of the post-processing plugin.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkPostProcessing.py
+
+import os
+import re
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "plugins"))
+
+from PostProcessingPlugin.ScriptPipeline import runScripts
+from PostProcessingPlugin.scripts.DisplayFilenameAndLayerOnLCD import DisplayFilenameAndLayerOnLCD
+from PostProcessingPlugin.scripts.InsertAtLayerChange import InsertAtLayerChange
+from PostProcessingPlugin.scripts.PauseAtHeight import PauseAtHeight
+from PostProcessingPlugin.scripts.SearchAndReplace import SearchAndReplace
+from PostProcessingPlugin.scripts.TimeLapse import TimeLapse
+from SyntheticData import createGCode
+
+_layer_count = 200
+_moves_per_layer = 5000  # A million lines in total.
+
+_machine_settings = {
+    "machine_firmware_retract": False,
+    "machine_nozzle_temp_enabled": True,
+    "layer_height_0": 0.3
+}
+
+
+@pytest.fixture(scope = "module")
+def gcode_list():
+    gcode = createGCode(_layer_count, _moves_per_layer)
+    layers = re.split(r"\n(?=;LAYER:)", gcode)  # Like CuraEngine sends it: an entry per layer.
+    return [entry + "\n" for entry in layers]
+
+
+@pytest.fixture(scope = "module")
+def scripts():
+    settings = [
+        (DisplayFilenameAndLayerOnLCD, {"name": "benchmark"}),
+        (InsertAtLayerChange, {"gcode_to_add": "M117 Layer change", "insert_location": "before"}),
+        (PauseAtHeight, {"pause_at": "layer_no", "pause_height": 5.0, "pause_layer": _layer_count // 2, "head_park_x": 190, "head_park_y": 190,
+                         "retraction_amount": 1, "retraction_speed": 25, "extrude_amount": 0, "extrude_speed": 3.3333, "redo_layers": 0, "standby_temperature": 0}),
+        (SearchAndReplace, {"search": "F1800", "replace": "F2400", "is_regex": False}),
+        (TimeLapse, {"park_feed_rate": 9000, "park_print_head": True, "head_park_x": 0, "head_park_y": 190, "trigger_command": "M240", "pause_length": 700})
+    ]
+    result = []
+    for script_class, values in settings:
+        script = script_class()
+        script.getSettingValueByKey = values.get
+        result.append(script)
+    return result
+
+
+@pytest.fixture(autouse = True)
+def application():
+    application = MagicMock()
+    application.getGlobalContainerStack().getProperty = MagicMock(side_effect = lambda key, property_name: _machine_settings[key])
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value = application)):
+        yield application
+
+
+def test_executeScripts(benchmark, gcode_list, scripts):
+    def executeScripts(data):
+        for script in scripts:
+            data = script.execute(data)
+        return data
+    benchmark(executeScripts, setup = lambda: (list(gcode_list), ))
+
+
+def test_runScripts(benchmark, gcode_list, scripts):
+    benchmark(runScripts, setup = lambda: (scripts, list(gcode_list)))
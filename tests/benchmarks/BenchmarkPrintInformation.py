@@ -0,0 +1,77 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks updating the material lengths, weights and costs of 50 build
+# plates with two extruders, after the spool cost of a material changes and
+# after the material of an extruder changes.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkPrintInformation.py
+
+import json
+from unittest.mock import MagicMock
+
+from cura.UI.PrintInformation import PrintInformation
+
+_build_plate_count = 50
+
+
+##  Material settings in the preferences of a user who entered the spool costs
+#   of many materials.
+def _createMaterialSettings():
+    material_settings = {"material_{index}".format(index = index): {"spool_weight": 750, "spool_cost": 25} for index in range(200)}
+    material_settings["pla"] = {"spool_weight": 1000, "spool_cost": 20}
+    material_settings["pva"] = {"spool_weight": 500, "spool_cost": 50}
+    return material_settings
+
+
+def _createMaterial(material_guid):
+    material = MagicMock()
+    material.getId = MagicMock(return_value = material_guid + "_material")
+    material.getMetaDataEntry = MagicMock(return_value = material_guid)
+    material.getName = MagicMock(return_value = material_guid.upper())
+    return material
+
+
+def _createExtruderStack(material_guid):
+    extruder_stack = MagicMock()
+    extruder_stack.getProperty = MagicMock(return_value = 2.85)
+    extruder_stack.getMetaDataEntry = MagicMock(return_value = {"density": 1.24, "weight": 750})
+    extruder_stack.material = _createMaterial(material_guid)
+    return extruder_stack
+
+
+##  Creates print information with the slice results of all build plates. Only
+#   the first half of the build plates uses the second extruder.
+def _createPrintInformation(material_settings):
+    application = MagicMock()
+    application.getInstance = MagicMock(return_value = application)
+    preferences = MagicMock()
+    preferences.getValue = MagicMock(side_effect = lambda key: json.dumps(material_settings) if key == "cura/material_settings" else None)
+    application.getPreferences = MagicMock(return_value = preferences)
+    global_stack = MagicMock()
+    global_stack.extruders = {"0": _createExtruderStack("pla"), "1": _createExtruderStack("pva")}
+    application.getGlobalContainerStack = MagicMock(return_value = global_stack)
+    application.getMultiBuildPlateModel().maxBuildPlate = _build_plate_count - 1
+
+    print_information = PrintInformation(application)
+    for build_plate_number in range(_build_plate_count):
+        material_amounts = [20000., 5000.] if build_plate_number < _build_plate_count // 2 else [20000.]
+        print_information._onPrintDurationMessage(build_plate_number, {"travel": 100}, material_amounts)
+    return print_information
+
+
+def test_spoolCostChanged(benchmark):
+    def setup():
+        material_settings = _createMaterialSettings()
+        print_information = _createPrintInformation(material_settings)
+        material_settings["pva"]["spool_cost"] = 60
+        return (print_information, )
+    benchmark(lambda print_information: print_information._onPreferencesChanged("cura/material_settings"), setup = setup)
+
+
+def test_materialChanged(benchmark):
+    def setup():
+        print_information = _createPrintInformation(_createMaterialSettings())
+        print_information._application.getGlobalContainerStack().extruders["1"].material = _createMaterial("material_0")
+        return (print_information, )
+    benchmark(lambda print_information: print_information._onActiveMaterialsChanged(), setup = setup)
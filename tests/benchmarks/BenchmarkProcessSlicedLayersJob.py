@@ -0,0 +1,43 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks turning the layers that CuraEngine sends into layer data.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkProcessSlicedLayersJob.py
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "plugins", "CuraEngineBackend"))
+
+from ProcessSlicedLayersJob import ProcessSlicedLayersJob
+from SyntheticData import createLayerMessages
+
+_layer_count = 200
+_segments_per_layer = 20
+_lines_per_segment = 250
+
+
+def test_processSlicedLayers(benchmark):
+    layers = createLayerMessages(_layer_count, _segments_per_layer, _lines_per_segment)
+
+    application = MagicMock()
+    application.getController().getActiveView().getPluginId = MagicMock(return_value = "SolidView")  # Don't wait for the simulation view.
+    application.getTheme().getColor().getRgbF = MagicMock(return_value = (0.5, 0.5, 0.5, 1.0))
+    application.getPreferences().getValue = MagicMock(return_value = False)
+    application.getGlobalContainerStack().getProperty = MagicMock(return_value = True)
+    application.getGlobalContainerStack().material.getMetaDataEntry = MagicMock(return_value = "#ffc924")
+    extruder_manager = MagicMock()
+    extruder_manager.getActiveExtruderStacks = MagicMock(return_value = [])
+    node_class = MagicMock()
+
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value = application)), \
+            patch("ProcessSlicedLayersJob.ExtruderManager.getInstance", MagicMock(return_value = extruder_manager)), \
+            patch("ProcessSlicedLayersJob.OpenGLContext.isLegacyOpenGL", MagicMock(return_value = False)), \
+            patch("ProcessSlicedLayersJob.Message", MagicMock()), \
+            patch("ProcessSlicedLayersJob.CuraSceneNode", node_class):
+        benchmark(lambda job: job.run(), setup = lambda: (ProcessSlicedLayersJob(layers), ), rounds = 3)
+
+    layer_data_decorator = node_class.return_value.addDecorator.call_args[0][0]
+    assert len(layer_data_decorator.getLayerData().getLayers()) == _layer_count
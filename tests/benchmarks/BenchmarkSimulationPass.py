@@ -0,0 +1,97 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks what the simulation view computes on every frame while playing
+# back a print of 3000 layers: which elements to draw and where the print head
+# is. Once with the index of the layer data, and once by going through all
+# layers and polygons like the simulation pass used to do.
+# This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkSimulationPass.py
+
+import os
+import sys
+
+import numpy
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "plugins"))
+
+from SimulationView.LayerRangeIndex import LayerRangeIndex
+
+_layer_count = 3000
+_polygons_per_layer = 30
+_points_per_polygon = 20
+
+# The frames that are played back: some paths in every 30th layer.
+_frames = [(layer_number, path_number) for layer_number in range(0, _layer_count, 30) for path_number in range(0, 500, 50)]
+
+
+##  Has the layers and element counts of layer data, without creating the
+#   meshes that the benchmarks don't need.
+class _LayerData:
+    def __init__(self) -> None:
+        random = numpy.random.RandomState(46)
+        self._layers = {}
+        self._element_counts = {}
+        for layer_number in range(_layer_count):
+            layer = _Layer([random.random_sample((_points_per_polygon, 3)).astype(numpy.float32) for _ in range(_polygons_per_layer)])
+            self._layers[layer_number] = layer
+            self._element_counts[layer_number] = 2 * _polygons_per_layer * _points_per_polygon
+
+    def getLayer(self, layer_number: int) -> "_Layer":
+        return self._layers.get(layer_number)
+
+    def getElementCounts(self):
+        return self._element_counts
+
+
+class _Layer:
+    def __init__(self, polygon_data) -> None:
+        self.polygons = [_Polygon(data) for data in polygon_data]
+
+
+class _Polygon:
+    def __init__(self, data: numpy.ndarray) -> None:
+        self.data = data
+
+
+@pytest.fixture(scope = "module")
+def layer_data():
+    return _LayerData()
+
+
+##  Plays back with the index, including creating the index like the
+#   simulation pass does on the first frame after slicing.
+def test_playbackWithIndex(benchmark, layer_data):
+    def playback():
+        index = LayerRangeIndex(layer_data)
+        for layer_number, path_number in _frames:
+            index.getRange(layer_number, 0)
+            index.getHeadPosition(layer_number, path_number)
+    benchmark(playback)
+
+
+##  Plays back by going through all layers and polygons on every frame, like
+#   SimulationPass.render did.
+def test_playbackByLoop(benchmark, layer_data):
+    def playback():
+        for layer_number, path_number in _frames:
+            start = 0
+            end = 0
+            element_counts = layer_data.getElementCounts()
+            for layer in sorted(element_counts.keys()):
+                if layer == layer_number:
+                    index = path_number
+                    offset = 0
+                    for polygon in layer_data.getLayer(layer).polygons:
+                        if index >= polygon.data.size // 3 - offset:
+                            index -= polygon.data.size // 3 - offset
+                            offset = 1
+                            continue
+                        polygon.data[index + offset]  # The position of the head.
+                        break
+                    break
+                if 0 > layer:
+                    start += element_counts[layer]
+                end += element_counts[layer]
+    benchmark(playback)
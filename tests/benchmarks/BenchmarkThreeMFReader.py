@@ -0,0 +1,58 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks loading a synthetic 3MF file with many objects. This isn't
+# collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkThreeMFReader.py
+
+import os
+import sys
+import zipfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "plugins", "3MFReader"))
+
+from ThreeMFReader import ThreeMFReader
+
+_object_count = 300
+_triangles_per_object = 5000
+
+
+##  Creates a 3MF file with a grid of objects, each a strip of triangles.
+def _createThreeMFFile(path):
+    model_path = path + ".model"
+    with open(model_path, "wb") as f:
+        f.write(b"<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+                b"<model unit=\"millimeter\" xml:lang=\"en-US\" xmlns=\"http://schemas.microsoft.com/3dmanufacturing/core/2015/02\"><resources>")
+        for object_id in range(1, _object_count + 1):
+            f.write("<object id=\"{object_id}\" type=\"model\"><mesh><vertices>".format(object_id = object_id).encode("utf-8"))
+            f.write("".join("<vertex x=\"{x}\" y=\"{y}\" z=\"{z}\" />".format(x = index % 2, y = index // 2 * 0.01, z = object_id % 7)
+                            for index in range(_triangles_per_object + 2)).encode("utf-8"))
+            f.write(b"</vertices><triangles>")
+            f.write("".join("<triangle v1=\"{0}\" v2=\"{1}\" v3=\"{2}\" />".format(index, index + 1, index + 2)
+                            for index in range(_triangles_per_object)).encode("utf-8"))
+            f.write(b"</triangles></mesh></object>")
+        f.write(b"</resources><build>")
+        for object_id in range(1, _object_count + 1):
+            f.write("<item objectid=\"{object_id}\" transform=\"1 0 0 0 1 0 0 0 1 {x} {y} 0\" />".format(object_id = object_id, x = object_id % 20 * 10, y = object_id // 20 * 10).encode("utf-8"))
+        f.write(b"</build></model>")
+    with zipfile.ZipFile(path, "w", compression = zipfile.ZIP_DEFLATED) as archive:
+        archive.write(model_path, "3D/3dmodel.model")
+
+
+@pytest.mark.parametrize("max_workers", [0, None])  # On the calling thread, or in a pool with one thread per core.
+def test_readSyntheticThreeMF(benchmark, tmpdir, max_workers):
+    file_path = os.path.join(str(tmpdir), "benchmark.3mf")
+    _createThreeMFFile(file_path)
+    application = MagicMock()
+    application.getGlobalContainerStack = MagicMock(return_value = None)
+    application.getMultiBuildPlateModel().activeBuildPlate = 0
+    reader = ThreeMFReader(max_workers = max_workers)
+
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value = application)), \
+            patch("cura.Settings.SettingOverrideDecorator.ExtruderManager.getInstance", MagicMock()):
+        nodes = benchmark(reader.read, setup = lambda: (file_path, ), rounds = 3)
+
+    assert len(nodes) == _object_count
@@ -0,0 +1,67 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Benchmarks the version upgrade pipeline on a synthetic configuration
+# directory. This isn't collected by the normal test run. Run it explicitly:
+#   pytest tests/benchmarks/BenchmarkVersionUpgradePipeline.py
+
+import importlib
+import os
+import sys
+
+from cura.Settings.VersionUpgradePipeline import VersionUpgradePipeline
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "plugins", "VersionUpgrade"))
+
+# Upgrades from Cura 3.0 to the latest version. These have no side effects so they can run in the pipeline.
+_upgrade_plugins = ["VersionUpgrade30to31", "VersionUpgrade32to33", "VersionUpgrade33to34", "VersionUpgrade34to35", "VersionUpgrade35to40", "VersionUpgrade40to41"]
+
+_file_count = 3000
+
+_user_file = """[general]
+version = 2
+name = Benchmark {index}
+definition = fdmprinter
+
+[metadata]
+type = user
+setting_version = 3
+
+[values]
+layer_height = 0.{index}
+infill_sparse_density = {index}
+"""
+
+
+def _createPipeline(journal_path):
+    upgrades = {}
+    sources = {}
+    for plugin_name in _upgrade_plugins:
+        metadata = importlib.import_module(plugin_name).getMetaData()
+        upgrades.update(metadata["version_upgrade"])
+        for configuration_type, source in metadata["sources"].items():
+            sources.setdefault(configuration_type, {"get_version": source["get_version"], "location": set()})["location"] |= source["location"]
+    return VersionUpgradePipeline(upgrades, sources, {"user": ".inst.cfg"}, journal_path)
+
+
+def _createConfigurationDirectory(directory):
+    user_directory = os.path.join(directory, "user")
+    os.makedirs(user_directory)
+    for index in range(_file_count):
+        with open(os.path.join(user_directory, "benchmark_{index}.inst.cfg".format(index = index)), "w") as f:
+            f.write(_user_file.format(index = index))
+
+
+def test_upgradeSyntheticConfiguration(benchmark, tmpdir):
+    round_directories = []
+
+    ##  Every round upgrades a fresh configuration directory.
+    def setup():
+        round_directory = os.path.join(str(tmpdir), "round_{index}".format(index = len(round_directories)))
+        round_directories.append(round_directory)
+        configuration_directory = os.path.join(round_directory, "configuration")
+        _createConfigurationDirectory(configuration_directory)
+        return _createPipeline(os.path.join(round_directory, "journal")), [configuration_directory]
+
+    upgraded_count = benchmark(lambda pipeline, directories: pipeline.upgrade(directories), setup = setup, rounds = 3)
+    assert upgraded_count == _file_count
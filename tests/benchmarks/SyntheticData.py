@@ -0,0 +1,138 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Generates the input data for the benchmarks. Everything is generated from a
+# fixed seed, so that every run measures the same work.
+
+import json
+from typing import List
+
+import numpy
+
+from cura.LayerPolygon import LayerPolygon
+
+
+##  Looks like a path segment in the Layer message that CuraEngine sends.
+#
+#   A path segment has a point more than it has lines.
+class FakePathSegment:
+    def __init__(self, random: numpy.random.RandomState, extruder: int, line_count: int) -> None:
+        self.extruder = extruder
+        self.point_type = 0  # Point2D.
+        line_types = random.choice([LayerPolygon.Inset0Type, LayerPolygon.InsetXType, LayerPolygon.SkinType, LayerPolygon.InfillType, LayerPolygon.MoveCombingType], size = line_count)
+        line_types = numpy.repeat(line_types[::8], 8)[:line_count]  # Types come in runs, like in real g-code.
+        self.line_type = line_types.astype(numpy.uint8).tobytes()
+        self.points = (numpy.cumsum(random.uniform(-2, 2, size = (line_count + 1, 2)), axis = 0) * 1000).astype(numpy.float32).tobytes()
+        self.line_width = numpy.full(line_count, 0.4, dtype = numpy.float32).tobytes()
+        self.line_thickness = numpy.full(line_count, 0.2, dtype = numpy.float32).tobytes()
+        self.line_feedrate = random.choice([30.0, 45.0, 60.0, 150.0], size = line_count).astype(numpy.float32).tobytes()
+
+
+##  Looks like the Layer and LayerOptimized messages that CuraEngine sends.
+class FakeLayer:
+    def __init__(self, random: numpy.random.RandomState, layer_id: int, segment_count: int, lines_per_segment: int) -> None:
+        self.id = layer_id
+        self.height = 300 + 200 * layer_id  # In microns.
+        self.thickness = 200
+        self._segments = [FakePathSegment(random, extruder = index % 2, line_count = lines_per_segment) for index in range(segment_count)]
+
+    def repeatedMessageCount(self, field_name: str) -> int:
+        return len(self._segments) if field_name == "path_segment" else 0
+
+    def getRepeatedMessage(self, field_name: str, index: int) -> FakePathSegment:
+        return self._segments[index]
+
+
+def createLayerMessages(layer_count: int, segments_per_layer: int, lines_per_segment: int) -> List[FakeLayer]:
+    random = numpy.random.RandomState(1)
+    return [FakeLayer(random, layer_id, segments_per_layer, lines_per_segment) for layer_id in range(layer_count)]
+
+
+##  Creates the vertices of a mesh: a lumpy blob of triangles with many
+#   duplicate vertices, like a mesh that isn't indexed.
+def createMeshVertices(triangle_count: int, seed: int = 2) -> numpy.ndarray:
+    random = numpy.random.RandomState(seed)
+    directions = random.normal(size = (triangle_count, 3))
+    directions /= numpy.linalg.norm(directions, axis = 1)[:, numpy.newaxis]
+    corners = directions * random.uniform(20, 25, size = (triangle_count, 1))
+    triangles = corners[:, numpy.newaxis, :] + random.uniform(-1, 1, size = (triangle_count, 3, 3))
+    return triangles.reshape((-1, 3)).astype(numpy.float32)
+
+
+##  Creates convex outlines of objects, in millimetres around the origin.
+def createOutlines(count: int) -> List[numpy.ndarray]:
+    random = numpy.random.RandomState(3)
+    outlines = []
+    for _ in range(count):
+        angles = numpy.sort(random.uniform(0, 2 * numpy.pi, size = 12))
+        radius = random.uniform(5, 20)
+        outlines.append(numpy.column_stack([numpy.cos(angles), numpy.sin(angles)]) * radius)
+    return outlines
+
+
+##  Creates g-code like CuraEngine writes it, with layer and feature comments.
+def createGCode(layer_count: int, moves_per_layer: int) -> str:
+    random = numpy.random.RandomState(4)
+    lines = [";FLAVOR:Marlin", ";LAYER_COUNT:{layer_count}".format(layer_count = layer_count), "M82", "G28", "G92 E0"]
+    e = 0.0
+    features = [";TYPE:WALL-OUTER", ";TYPE:WALL-INNER", ";TYPE:SKIN", ";TYPE:FILL"]
+    for layer_number in range(layer_count):
+        lines.append(";LAYER:{layer_number}".format(layer_number = layer_number))
+        lines.append("G0 F9000 Z{z:.2f}".format(z = 0.3 + 0.2 * layer_number))
+        coordinates = random.uniform(10, 200, size = (moves_per_layer, 2))
+        extrusions = random.uniform(0.01, 0.5, size = moves_per_layer)
+        for index in range(moves_per_layer):
+            if index % 500 == 0:
+                lines.append(features[(index // 500) % len(features)])
+            x, y = coordinates[index]
+            if index % 20 == 0:
+                lines.append("G0 F9000 X{x:.3f} Y{y:.3f}".format(x = x, y = y))
+            else:
+                e += extrusions[index]
+                lines.append("G1 F1800 X{x:.3f} Y{y:.3f} E{e:.5f}".format(x = x, y = y, e = e))
+    lines.append("M107")
+    return "\n".join(lines)
+
+
+##  Creates a machine definition with many settings whose values depend on
+#   each other, like fdmprinter does.
+#
+#   In every category of a hundred settings, the first ten have just a value.
+#   The next forty are computed from three of those, and the rest are computed
+#   from two of the computed ones and one with just a value.
+def createDefinition(setting_count: int) -> str:
+    random = numpy.random.RandomState(5)
+    categories = {}  # type: dict
+    for category_index in range(setting_count // 100):
+        first_index = category_index * 100
+        children = {}
+        for index in range(first_index, first_index + 100):
+            setting = {
+                "label": "Setting {index}".format(index = index),
+                "description": "A setting to benchmark with.",
+                "type": "float",
+                "default_value": float(index),
+                "settable_per_mesh": True,
+                "settable_per_extruder": True
+            }
+            if index - first_index >= 50:
+                dependencies = list(first_index + 10 + random.choice(40, size = 2, replace = False)) + [first_index + random.randint(10)]
+            elif index - first_index >= 10:
+                dependencies = list(first_index + random.choice(10, size = 3, replace = False))
+            else:
+                dependencies = []
+            if dependencies:
+                setting["value"] = "setting_{0} * 0.5 + setting_{1} * 0.25 + max(setting_{2}, 1) * 0.25".format(*dependencies)
+            children["setting_{index}".format(index = index)] = setting
+        categories["category_{index}".format(index = category_index)] = {
+            "label": "Category {index}".format(index = category_index),
+            "description": "A category to benchmark with.",
+            "type": "category",
+            "children": children
+        }
+    return json.dumps({
+        "name": "Benchmark Definition",
+        "version": 2,
+        "metadata": {"type": "machine"},
+        "settings": categories
+    })
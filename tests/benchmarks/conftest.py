@@ -0,0 +1,116 @@
+# Copyright (c) 2019 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+# Provides the benchmark fixture for the benchmarks in this folder. See
+# docs/How_to_run_the_benchmarks.md for how to run them and compare results.
+
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pytest
+
+_results = {}  # type: Dict[str, Dict[str, Any]]  # The measurements of each benchmark that ran in this session, by name.
+
+_benchmarks_directory = os.path.dirname(os.path.abspath(__file__))
+
+
+##  Whether this folder (or something in it) was given on the command line.
+#
+#   The benchmarks are only collected then, so that they stay out of the
+#   normal test run.
+def _isBenchmarkRun(config) -> bool:
+    invocation_params = getattr(config, "invocation_params", None)  # Not available before pytest 5.1.
+    invocation_dir = invocation_params.dir if invocation_params is not None else config.invocation_dir
+    for argument in config.args:
+        path = os.path.abspath(os.path.join(str(invocation_dir), str(argument).split("::")[0]))
+        if path == _benchmarks_directory or path.startswith(_benchmarks_directory + os.sep):
+            return True
+    return False
+
+
+##  Collects the Benchmark*.py files as well when the benchmarks are run,
+#   since they don't match the python_files pattern of pytest.ini.
+def pytest_configure(config) -> None:
+    if _isBenchmarkRun(config):
+        config.addinivalue_line("python_files", "Benchmark*.py")
+
+
+##  Measures the wall time and peak memory of a piece of code.
+#
+#   Call it with the function to measure. Every round calls the function once.
+#   The time is measured without tracing memory, since tracing slows Python
+#   down a lot. The peak memory is measured in a separate round afterwards,
+#   with tracemalloc. That only counts memory allocated by Python, which
+#   includes numpy arrays.
+class Benchmark:
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    ##  Measures the function.
+    #   \param function The function to measure.
+    #   \param setup Called before every round, outside of the measurement. It
+    #   returns the arguments to call the function with, so that every round can
+    #   start from a fresh state.
+    #   \param rounds How many times to measure the time.
+    #   \return What the function returned in the last round.
+    def __call__(self, function: Callable[..., Any], setup: Optional[Callable[[], Tuple]] = None, rounds: int = 5) -> Any:
+        durations = []
+        result = None
+        for _ in range(rounds):
+            arguments = setup() if setup is not None else ()
+            gc.collect()
+            start_time = time.perf_counter()
+            result = function(*arguments)
+            durations.append(time.perf_counter() - start_time)
+
+        arguments = setup() if setup is not None else ()
+        result = None  # So that the result of a previous round doesn't count as memory in use.
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = function(*arguments)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        _results[self._name] = {
+            "rounds": rounds,
+            "min_time": min(durations),
+            "median_time": statistics.median(durations),
+            "peak_memory": peak_memory
+        }
+        return result
+
+
+@pytest.fixture()
+def benchmark(request) -> Benchmark:
+    return Benchmark(request.node.name)
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    if not _results:
+        return
+    terminalreporter.section("benchmarks")
+    for name in sorted(_results):
+        result = _results[name]
+        terminalreporter.write_line("{name:<60} min {min_time:9.4f}s  median {median_time:9.4f}s  peak {peak_memory:8.1f} MiB".format(
+            name = name, min_time = result["min_time"], median_time = result["median_time"], peak_memory = result["peak_memory"] / 1024 / 1024))
+
+    # Store the results if requested, to compare them later with scripts/compare_benchmarks.py.
+    output_path = os.environ.get("CURA_BENCHMARK_RESULTS")
+    if output_path:
+        with open(output_path, "w", encoding = "utf-8") as f:
+            json.dump({
+                "python": sys.version,
+                "platform": platform.platform(),
+                "processor": platform.processor(),
+                "benchmarks": _results
+            }, f, indent = 4, sort_keys = True)
+        terminalreporter.write_line("Stored the results in {path}".format(path = output_path))